@@ -1,11 +1,34 @@
+import importlib
+
 import colorama as cra
 from .common import *
 from .math import *
 from .geometry import *
-from .scene import *
 from .frame import *
-from .collision import *
+# NOTE: dynamics first, the world imports the broadphase and the
+# detector, which import the body back
 from .dynamics import *
-from .render import *
+from .collision import *
 
 cra.init()
+
+
+# NOTE: the gui modules import taichi, load them on the first use,
+# so the headless sim never imports taichi
+def __getattr__(name: str):
+    if name == 'Scene':
+        from .scene import Scene
+        return Scene
+    elif name == 'Camera':
+        from .common.camera import Camera
+        return Camera
+    elif name == 'ti_init':
+        from .common.ti_setup import ti_init
+        return ti_init
+    elif name == 'Render':
+        from .render.render import Render
+        return Render
+    elif name in ('scene', 'render'):
+        return importlib.import_module('.' + name, __name__)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,8 +1,6 @@
 from typing import List, Optional, Tuple, cast
 
-import numpy as np
-
-from ...math.matrix import Matrix
+from ...math.linalg import Vec2
 from ...geometry.shape import Capsule, Edge, Polygon, Sector, Shape
 from ...geometry.shape import ShapePrimitive
 from ...geometry.geom_algo import GeomAlgo2D
@@ -12,16 +10,16 @@ from .gjk import GJK, PointPair
 class ContactGenerator():
     class ClipEdge():
         def __init__(self):
-            self._p1: Matrix = Matrix([0.0, 0.0], 'vec')
-            self._p2: Matrix = Matrix([0.0, 0.0], 'vec')
-            self._normal: Matrix = Matrix([0.0, 0.0], 'vec')
+            self._p1: Vec2 = Vec2(0.0, 0.0)
+            self._p2: Vec2 = Vec2(0.0, 0.0)
+            self._normal: Vec2 = Vec2(0.0, 0.0)
 
         def is_empty(self) -> bool:
             return self._p1.is_origin() and self._p2.is_origin()
 
     @staticmethod
-    def dump_vertices(prim: ShapePrimitive) -> List[Matrix]:
-        vertices: List[Matrix] = []
+    def dump_vertices(prim: ShapePrimitive) -> List[Vec2]:
+        vertices: List[Vec2] = []
 
         assert prim._shape is not None
         if prim._shape.type == Shape.Type.Capsule:
@@ -45,8 +43,8 @@ class ContactGenerator():
         return vertices
 
     @staticmethod
-    def find_clip_edge(vertices: List[Matrix], idx: int,
-                       normal: Matrix) -> ClipEdge:
+    def find_clip_edge(vertices: List[Vec2], idx: int,
+                       normal: Vec2) -> ClipEdge:
         edg1 = ContactGenerator.ClipEdge()
         edg2 = ContactGenerator.ClipEdge()
         edg1._p2 = vertices[idx]
@@ -66,10 +64,10 @@ class ContactGenerator():
 
         # compare which is closest to normal
         final_edg: ContactGenerator.ClipEdge = ContactGenerator.ClipEdge()
-        p: Matrix = Matrix([0.0, 0.0], 'vec')
+        p: Vec2 = Vec2(0.0, 0.0)
 
-        tmp_val1: float = np.fabs((edg1._p2 - edg1._p1).dot(normal))
-        tmp_val2: float = np.fabs((edg2._p2 - edg2._p1).dot(normal))
+        tmp_val1: float = abs((edg1._p2 - edg1._p1).dot(normal))
+        tmp_val2: float = abs((edg2._p2 - edg2._p1).dot(normal))
         if tmp_val1 >= tmp_val2:
             final_edg = edg2
             p = (edg2._p2 - edg2._p1).normal().perpendicular()
@@ -90,8 +88,8 @@ class ContactGenerator():
         return final_edg
 
     @staticmethod
-    def dump_clip_edge(prim: ShapePrimitive, vertices: List[Matrix],
-                       normal: Matrix) -> ClipEdge:
+    def dump_clip_edge(prim: ShapePrimitive, vertices: List[Vec2],
+                       normal: Vec2) -> ClipEdge:
         edg: ContactGenerator.ClipEdge = ContactGenerator.ClipEdge()
 
         if len(vertices) == 2:
@@ -110,7 +108,7 @@ class ContactGenerator():
 
     @staticmethod
     def recognize(prima: ShapePrimitive, primb: ShapePrimitive,
-                  normal: Matrix) -> Tuple[ClipEdge, ClipEdge]:
+                  normal: Vec2) -> Tuple[ClipEdge, ClipEdge]:
         assert prima._shape is not None
         assert primb._shape is not None
         typea = prima._shape.type
@@ -125,8 +123,8 @@ class ContactGenerator():
                 return (ContactGenerator.ClipEdge(),
                         ContactGenerator.ClipEdge())
 
-        verta: List[Matrix] = ContactGenerator.dump_vertices(prima)
-        vertb: List[Matrix] = ContactGenerator.dump_vertices(primb)
+        verta: List[Vec2] = ContactGenerator.dump_vertices(prima)
+        vertb: List[Vec2] = ContactGenerator.dump_vertices(primb)
         edga = ContactGenerator.dump_clip_edge(prima, verta, -normal)
         edgb = ContactGenerator.dump_clip_edge(primb, vertb, normal)
 
@@ -134,15 +132,15 @@ class ContactGenerator():
 
     @staticmethod
     def clip(clip_edga: ClipEdge, clip_edgb: ClipEdge,
-             normal: Matrix) -> List[PointPair]:
+             normal: Vec2) -> List[PointPair]:
         res: List[PointPair] = []
 
         if clip_edga.is_empty() or clip_edgb.is_empty():
             return res
 
         # find reference edge
-        tmp1: Matrix = Matrix([0.0, 0.0], 'vec')
-        tmp2: Matrix = Matrix([0.0, 0.0], 'vec')
+        tmp1: Vec2 = Vec2(0.0, 0.0)
+        tmp2: Vec2 = Vec2(0.0, 0.0)
         tmp1.set_value(clip_edga._p1 - clip_edga._p2)
         tmp2.set_value(clip_edgb._p1 - clip_edgb._p2)
         d1: float = tmp1.dot(normal)
@@ -152,15 +150,15 @@ class ContactGenerator():
         incident_edge: ContactGenerator.ClipEdge = clip_edgb
         swap: bool = False
 
-        if np.fabs(d1) > np.fabs(d2):
+        if abs(d1) > abs(d2):
             # edge B is reference edge
             ref_edg = clip_edgb
             incident_edge = clip_edga
             swap = True
 
         # 1. clip left region
-        u: Matrix = (ref_edg._p2 - ref_edg._p1).normal()
-        ref_anchor1: Matrix = u.perpendicular() + ref_edg._p1
+        u: Vec2 = (ref_edg._p2 - ref_edg._p1).normal()
+        ref_anchor1: Vec2 = u.perpendicular() + ref_edg._p1
 
         if not GeomAlgo2D.is_point_on_same_side(
                 ref_edg._p1, ref_anchor1, ref_edg._p2, incident_edge._p1):
@@ -176,7 +174,7 @@ class ContactGenerator():
 
         # 2. clip right region
         u.negate()
-        ref_anchor2: Matrix = u.perpendicular() + ref_edg._p2
+        ref_anchor2: Vec2 = u.perpendicular() + ref_edg._p2
         if not GeomAlgo2D.is_point_on_same_side(
                 ref_edg._p2, ref_anchor2, ref_edg._p1, incident_edge._p1):
 
@@ -190,8 +188,7 @@ class ContactGenerator():
                 ref_edg._p2, ref_anchor2, incident_edge._p1, incident_edge._p2)
 
         # 3. clip normal region
-        ref_anchor3: Matrix = (ref_edg._p2 +
-                               ref_edg._p1) / 2.0 + ref_edg._normal
+        ref_anchor3: Vec2 = (ref_edg._p2 + ref_edg._p1) / 2.0 + ref_edg._normal
 
         p1_on_clip_area: bool = GeomAlgo2D.is_point_on_same_side(
             ref_edg._p1, ref_edg._p2, ref_anchor3, incident_edge._p1)
@@ -214,12 +211,10 @@ class ContactGenerator():
 
         # p1 and p2 are inside, clip nothing, just go to project
         # 4. project to reference edge
-        pp1: Matrix = GeomAlgo2D.point_to_line_segment(ref_edg._p1,
-                                                       ref_edg._p2,
-                                                       incident_edge._p1)
-        pp2: Matrix = GeomAlgo2D.point_to_line_segment(ref_edg._p1,
-                                                       ref_edg._p2,
-                                                       incident_edge._p2)
+        pp1: Vec2 = GeomAlgo2D.point_to_line_segment(ref_edg._p1, ref_edg._p2,
+                                                     incident_edge._p1)
+        pp2: Vec2 = GeomAlgo2D.point_to_line_segment(ref_edg._p1, ref_edg._p2,
+                                                     incident_edge._p2)
 
         pair1: PointPair = PointPair()
         pair2: PointPair = PointPair()
@@ -1,22 +1,19 @@
 from __future__ import annotations
 from typing import List, Optional, Tuple, cast
 
-import numpy as np
-
-from ...math.matrix import Matrix
+from ...math.linalg import Vec2, Mat2
 from ...common.config import Config
+from ...common.profiler import Profiler
 from ...geometry.geom_algo import GeomAlgo2D
 from ...geometry.shape import Capsule, Circle, Edge, Ellipse, Point
 from ...geometry.shape import Polygon, Sector, Shape, ShapePrimitive
 
 
 class Minkowski():
-    def __init__(self,
-                 pa: Matrix = Matrix([0.0, 0.0], 'vec'),
-                 pb: Matrix = Matrix([0.0, 0.0], 'vec')):
-        self._pa: Matrix = pa
-        self._pb: Matrix = pb
-        self._res: Matrix = self._pa - self._pb
+    def __init__(self, pa: Vec2 = Vec2(0.0, 0.0), pb: Vec2 = Vec2(0.0, 0.0)):
+        self._pa: Vec2 = pa
+        self._pb: Vec2 = pb
+        self._res: Vec2 = self._pa - self._pb
 
     def __eq__(self, other) -> bool:
         return self._pa == other._pa and self._pb == other._pb
@@ -51,7 +48,7 @@ class Simplex():
 
         return False
 
-    def last_vertex(self) -> Matrix:
+    def last_vertex(self) -> Vec2:
         vert_len: int = len(self._vertices)
         if vert_len == 2:
             return self._vertices[vert_len - 1]._res
@@ -67,10 +64,9 @@ class Simplex():
                 simplex._vertices[2]._res)
 
         elif vert_len == 2:
-            oa: Matrix = -simplex._vertices[0]._res
-            ob: Matrix = -simplex._vertices[1]._res
-            return GeomAlgo2D.is_point_on_segment(oa, ob,
-                                                  Matrix([0.0, 0.0], 'vec'))
+            oa: Vec2 = -simplex._vertices[0]._res
+            ob: Vec2 = -simplex._vertices[1]._res
+            return GeomAlgo2D.is_point_on_segment(oa, ob, Vec2(0.0, 0.0))
 
         else:
             return False
@@ -78,22 +74,22 @@ class Simplex():
 
 class PenetrationInfo():
     def __init__(self):
-        self._normal: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._normal: Vec2 = Vec2(0.0, 0.0)
         self._penetration: float = 0.0
 
 
 class PenetrationSource():
     def __init__(self):
-        self._a1: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._a2: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._b1: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._b2: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._a1: Vec2 = Vec2(0.0, 0.0)
+        self._a2: Vec2 = Vec2(0.0, 0.0)
+        self._b1: Vec2 = Vec2(0.0, 0.0)
+        self._b2: Vec2 = Vec2(0.0, 0.0)
 
 
 class PointPair():
     def __init__(self):
-        self._pa: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._pb: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._pa: Vec2 = Vec2(0.0, 0.0)
+        self._pb: Vec2 = Vec2(0.0, 0.0)
 
     def __eq__(self, other) -> bool:
         return self._pa == other._pa and self._pb == other._pb
@@ -102,8 +98,7 @@ class PointPair():
         return not (self._pa == other._pa and self._pb == other._pb)
 
     def is_empty(self) -> bool:
-        return self._pa == Matrix([0.0, 0.0], 'vec') and self._pb == Matrix(
-            [0.0, 0.0], 'vec')
+        return self._pa == Vec2(0.0, 0.0) and self._pb == Vec2(0.0, 0.0)
 
 
 class GJK():
@@ -129,9 +124,9 @@ class GJK():
         '''
         simplex: Simplex = Simplex()
         is_found: bool = False
-        dirn: Matrix = primb._xform - prima._xform
+        dirn: Vec2 = primb._xform - prima._xform
 
-        if dirn == Matrix([0.0, 0.0], 'vec'):
+        if dirn == Vec2(0.0, 0.0):
             dirn.set_value([1.0, 1.0])
 
         diff: Minkowski = GJK.support(prima, primb, dirn)
@@ -139,7 +134,9 @@ class GJK():
         dirn.negate()
 
         removed: List[Minkowski] = []
+        iter_num: int = 0
         for i in range(iter_val):
+            iter_num += 1
             diff = GJK.support(prima, primb, dirn)
             simplex._vertices.append(diff)
             # print(f'i: {i}')
@@ -178,6 +175,7 @@ class GJK():
                         break
                 removed.append(res)
 
+        Profiler.count('gjk_iterations', iter_num)
         return (is_found, simplex)
 
     @staticmethod
@@ -206,10 +204,12 @@ class GJK():
 
         # edg: Simplex = Simplex()
         simplex: Simplex = src
-        normal: Matrix = Matrix([0.0, 0.0], 'vec')
+        normal: Vec2 = Vec2(0.0, 0.0)
         p: Minkowski = Minkowski()
 
+        iter_num: int = 0
         for i in range(iter_val):
+            iter_num += 1
             (idx1, idx2) = GJK.find_edge_closest_to_origin(simplex)
             normal = GJK.calc_direction_by_edge(simplex._vertices[idx1]._res,
                                                 simplex._vertices[idx2]._res,
@@ -217,7 +217,7 @@ class GJK():
 
             if GeomAlgo2D.is_point_on_segment(simplex._vertices[idx1]._res,
                                               simplex._vertices[idx2]._res,
-                                              Matrix([0.0, 0.0], 'vec')):
+                                              Vec2(0.0, 0.0)):
                 normal.negate()
 
             p = GJK.support(prima, primb, normal)
@@ -227,6 +227,7 @@ class GJK():
 
             simplex.insert(idx1, p)
 
+        Profiler.count('epa_iterations', iter_num)
         return simplex
 
     @staticmethod
@@ -245,10 +246,10 @@ class GJK():
         '''
 
         res: PenetrationInfo = PenetrationInfo()
-        edg1: Matrix = src._a1 - src._b1
-        edg2: Matrix = src._a2 - src._b2
-        normal: Matrix = GJK.calc_direction_by_edge(edg1, edg2, False).normal()
-        origin_to_edge: float = np.fabs(normal.dot(edg1))
+        edg1: Vec2 = src._a1 - src._b1
+        edg2: Vec2 = src._a2 - src._b2
+        normal: Vec2 = GJK.calc_direction_by_edge(edg1, edg2, False).normal()
+        origin_to_edge: float = abs(normal.dot(edg1))
         res._normal = normal.negate()
         res._penetration = origin_to_edge
 
@@ -256,7 +257,7 @@ class GJK():
 
     @staticmethod
     def support(prima: ShapePrimitive, primb: ShapePrimitive,
-                dirn: Matrix) -> Minkowski:
+                dirn: Vec2) -> Minkowski:
         return Minkowski(GJK.find_farthest_point(prima, dirn),
                          GJK.find_farthest_point(primb, -dirn))
 
@@ -283,10 +284,9 @@ class GJK():
 
         vert_len: int = len(simplex._vertices)
         for i in range(vert_len - 1):
-            a: Matrix = simplex._vertices[i]._res
-            b: Matrix = simplex._vertices[i + 1]._res
-            p: Matrix = GeomAlgo2D.point_to_line_segment(
-                a, b, Matrix([0.0, 0.0], 'vec'))
+            a: Vec2 = simplex._vertices[i]._res
+            b: Vec2 = simplex._vertices[i + 1]._res
+            p: Vec2 = GeomAlgo2D.point_to_line_segment(a, b, Vec2(0.0, 0.0))
 
             proj: float = p.len()
 
@@ -295,7 +295,7 @@ class GJK():
                 idx2 = i + 1
                 dist_min = proj
 
-            elif np.isclose(dist_min, proj):
+            elif Config.isclose(dist_min, proj):
                 length1: float = a.len_square() + b.len_square()
                 length2: float = simplex._vertices[idx1]._res.len_square(
                 ) + simplex._vertices[idx2]._res.len_square()
@@ -307,24 +307,24 @@ class GJK():
         return (idx1, idx2)
 
     @staticmethod
-    def find_farthest_point(prim: ShapePrimitive, dirn: Matrix) -> Matrix:
+    def find_farthest_point(prim: ShapePrimitive, dirn: Vec2) -> Vec2:
         '''Find farthest projection point in given direction
 
         Parameters
         ----------
         prim : ShapePrimitive
             primitive
-        dirn : Matrix
+        dirn : Vec2
             given direction
 
         Returns
         -------
-        Matrix
+        Vec2
             farthest point's val
         '''
-        target: Matrix = Matrix([0.0, 0.0], 'vec')
-        rot: Matrix = Matrix.rotate_mat(-prim._rot)
-        rot_dir: Matrix = rot * dirn
+        target: Vec2 = Vec2(0.0, 0.0)
+        rot: Mat2 = Mat2.rotate_mat(-prim._rot)
+        rot_dir: Vec2 = rot * dirn
 
         assert prim._shape is not None
         if prim._shape.type == Shape.Type.Polygon:
@@ -343,8 +343,8 @@ class GJK():
 
         elif prim._shape.type == Shape.Type.Edge:
             edg: Edge = cast(Edge, prim._shape)
-            dot1: float = Matrix.dot_product(edg.start, dirn)
-            dot2: float = Matrix.dot_product(edg.end, dirn)
+            dot1: float = Vec2.dot_product(edg.start, dirn)
+            dot2: float = Vec2.dot_product(edg.end, dirn)
             target = edg.start if dot1 > dot2 else edg.end
 
         elif prim._shape.type == Shape.Type.Point:
@@ -364,35 +364,35 @@ class GJK():
 
         # calc gemo algo in origin-base axis system
         # return the 'target' back in former coord
-        rot.set_value(Matrix.rotate_mat(prim._rot))
+        rot.set_value(Mat2.rotate_mat(prim._rot))
         target = rot * target + prim._xform
         # print(f'target: {target}')
         return target
 
     @staticmethod
-    def find_farthest_point2(vertices: List[Matrix],
-                             dirn: Matrix) -> Tuple[Matrix, int]:
+    def find_farthest_point2(vertices: List[Vec2],
+                             dirn: Vec2) -> Tuple[Vec2, int]:
         '''find the farthest point of polygon
         in a given direction
 
         Parameters
         ----------
-        vertices : List[Matrix]
+        vertices : List[Vec2]
             polygon's vertices
-        dirn : Matrix
+        dirn : Vec2
             given direction
 
         Returns
         -------
-        Tuple[Matrix, int]
+        Tuple[Vec2, int]
             pos and its index in polygon's vertices list
         '''
         val_max: float = Config.NegativeMin
-        tgt_max: Matrix = Matrix([0.0, 0.0], 'vec')
+        tgt_max: Vec2 = Vec2(0.0, 0.0)
         tgt_idx: int = 0
         vert_len: int = len(vertices)
         for i in range(vert_len):
-            tmp: float = Matrix.dot_product(vertices[i], dirn)
+            tmp: float = Vec2.dot_product(vertices[i], dirn)
             if val_max < tmp:
                 val_max = tmp
                 tgt_max = vertices[i]
@@ -440,33 +440,33 @@ class GJK():
         return None
 
     @staticmethod
-    def calc_direction_by_edge(pa: Matrix,
-                               pb: Matrix,
-                               point_to_origin: bool = True) -> Matrix:
+    def calc_direction_by_edge(pa: Vec2,
+                               pb: Vec2,
+                               point_to_origin: bool = True) -> Vec2:
         '''Given two points, calculate the perpendicular vector and
         the orientation is user-defined.
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             point a
-        pb : Matrix
+        pb : Vec2
             point b
         point_to_origin : bool, optional
             if point the origin, by default True
 
         Returns
         -------
-        Matrix
+        Vec2
             perpendicular vector
         '''
 
-        ao: Matrix = -pa
-        ab: Matrix = pb - pa
-        perp_of_ab: Matrix = ab.perpendicular()
+        ao: Vec2 = -pa
+        ab: Vec2 = pb - pa
+        perp_of_ab: Vec2 = ab.perpendicular()
 
-        if (Matrix.dot_product(ao, perp_of_ab) < 0
-                and point_to_origin) or (Matrix.dot_product(ao, perp_of_ab) > 0
+        if (Vec2.dot_product(ao, perp_of_ab) < 0
+                and point_to_origin) or (Vec2.dot_product(ao, perp_of_ab) > 0
                                          and not point_to_origin):
             perp_of_ab.negate()
 
@@ -494,7 +494,7 @@ class GJK():
         '''
 
         simplex: Simplex = Simplex()
-        dirn: Matrix = primb._xform - prima._xform
+        dirn: Vec2 = primb._xform - prima._xform
 
         # calc two minkowski
         m: Minkowski = GJK.support(prima, primb, dirn)
@@ -534,14 +534,14 @@ class GJK():
     def dump_points(src: PenetrationSource) -> PointPair:
         res: PointPair = PointPair()
 
-        a_s1: Matrix = src._a1
-        b_s1: Matrix = src._a2
-        a_s2: Matrix = src._b1
-        b_s2: Matrix = src._b2
+        a_s1: Vec2 = src._a1
+        b_s1: Vec2 = src._a2
+        a_s2: Vec2 = src._b1
+        b_s2: Vec2 = src._b2
 
-        a: Matrix = src._a1 - src._b1
-        b: Matrix = src._a2 - src._b2
-        lval: Matrix = b - a
+        a: Vec2 = src._a1 - src._b1
+        b: Vec2 = src._a2 - src._b2
+        lval: Vec2 = b - a
         ll: float = lval.dot(lval)
         la: float = lval.dot(a)
         lambda2: float = -la / ll
@@ -550,7 +550,7 @@ class GJK():
         res._pa.set_value(a_s1 * lambda1 + b_s1 * lambda2)
         res._pb.set_value(a_s2 * lambda1 + b_s2 * lambda2)
 
-        if lval == Matrix([0.0, 0.0], 'vec') or lambda2 < 0:
+        if lval == Vec2(0.0, 0.0) or lambda2 < 0:
             res._pa.set_value([a_s1.x, a_s1.y])
             res._pb.set_value([a_s2.x, a_s2.y])
 
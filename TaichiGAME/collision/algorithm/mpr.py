@@ -3,7 +3,7 @@ from typing import List, Dict, Optional, Tuple
 import numpy as np
 
 from .gjk import Simplex, Minkowski, GJK
-from ...math.matrix import Matrix
+from ...math.linalg import Vec2, Mat2
 from ...geometry.shape import ShapePrimitive
 from ...geometry.geom_algo import GeomAlgo2D
 
@@ -16,7 +16,7 @@ class MPR():
     '''
     @staticmethod
     def discover(prima: ShapePrimitive,
-                 primb: ShapePrimitive) -> Tuple[Matrix, Simplex]:
+                 primb: ShapePrimitive) -> Tuple[Vec2, Simplex]:
         '''Discover a portal for next collision test
 
         Parameters
@@ -28,18 +28,18 @@ class MPR():
 
         Returns
         -------
-        Tuple[Matrix, Simplex]
+        Tuple[Vec2, Simplex]
             return a vector from center of simplex to origin, an initial simplex
         '''
 
         simplex: Simplex = Simplex()
-        ctra: Matrix = Matrix.rotate_mat(prima._rot) * prima._shape.center()
-        ctrb: Matrix = Matrix.rotate_mat(primb._rot) * primb._shape.center()
-        origin: Matrix = primb._xform - prima._xform
+        ctra: Vec2 = Mat2.rotate_mat(prima._rot) * prima._shape.center()
+        ctrb: Vec2 = Mat2.rotate_mat(primb._rot) * primb._shape.center()
+        origin: Vec2 = primb._xform - prima._xform
         v0: Minkowski = Minkowski(ctra + prima._xform, ctrb + primb._xform)
-        dirn: Matrix = ctrb - ctra + origin
+        dirn: Vec2 = ctrb - ctra + origin
 
-        if dirn == Matrix([0.0, 0.0], 'vec'):
+        if dirn == Vec2(0.0, 0.0):
             dirn.set_value([1.0, 1.0])
 
         v1: Minkowski = GJK.support(prima, primb, dirn)
@@ -56,7 +56,7 @@ class MPR():
     def refine(prima: ShapePrimitive,
                primb: ShapePrimitive,
                src: Simplex,
-               center_to_origin: Matrix,
+               center_to_origin: Vec2,
                iter_val: int = 50) -> Tuple[bool, Simplex]:
         '''Refine portal close to origin
 
@@ -68,7 +68,7 @@ class MPR():
             primitive b
         src : Simplex
             init simplex
-        center_to_origin : Matrix
+        center_to_origin : Vec2
             none
         iter_val : int, optional
             iter num, by default 50
@@ -81,9 +81,9 @@ class MPR():
 
         simplex: Simplex = src
         is_colliding: bool = False
-        v1: Matrix = Matrix([0.0, 0.0], 'vec')
-        v2: Matrix = Matrix([0.0, 0.0], 'vec')
-        dirn: Matrix = Matrix([0.0, 0.0], 'vec')
+        v1: Vec2 = Vec2(0.0, 0.0)
+        v2: Vec2 = Vec2(0.0, 0.0)
+        dirn: Vec2 = Vec2(0.0, 0.0)
 
         for i in range(iter_val):
             v1 = simplex._vertices[1]._res
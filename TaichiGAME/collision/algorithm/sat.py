@@ -1,8 +1,6 @@
 from typing import List, Dict, Optional, Tuple
 
-import numpy as np
-
-from ...math.matrix import Matrix
+from ...math.linalg import Vec2, Mat2
 from ...common.config import Config
 from .gjk import PointPair
 from ...geometry.geom_algo import GeomAlgo2D
@@ -11,19 +9,19 @@ from ...geometry.shape import Circle, Edge, Ellipse, Polygon, Shape, ShapePrimit
 
 class ProjectedPoint():
     def __init__(self):
-        self._vertex: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._vertex: Vec2 = Vec2(0.0, 0.0)
         self._val: float = 0.0
         self._idx: int = -1
 
     def __eq__(self, other) -> bool:
-        return self._vertex == other._vertex and np.isclose(
+        return self._vertex == other._vertex and Config.isclose(
             self._val, other._val)
 
 
 class ProjectedEdge():
     def __init__(self):
-        self._vertex1 = Matrix([0.0, 0.0], 'vec')
-        self._vertex2 = Matrix([0.0, 0.0], 'vec')
+        self._vertex1 = Vec2(0.0, 0.0)
+        self._vertex2 = Vec2(0.0, 0.0)
 
 
 class ProjectedSegment():
@@ -81,7 +79,7 @@ class SATResult():
     def __init__(self):
         self._contact_pair: List[PointPair] = []
         self._contact_pair_count: int = 0
-        self._normal: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._normal: Vec2 = Vec2(0.0, 0.0)
         self._penetration: float = 0.0
         self._is_colliding: bool = False
 
@@ -113,17 +111,17 @@ class SAT():
         circle: Circle = prima._shape
         edg: Edge = primb._shape
 
-        actual_start: Matrix = primb._xform + edg.start
-        actual_end: Matrix = primb._xform + edg.end
-        normal: Matrix = (actual_start - actual_end).normal()
+        actual_start: Vec2 = primb._xform + edg.start
+        actual_end: Vec2 = primb._xform + edg.end
+        normal: Vec2 = (actual_start - actual_end).normal()
 
         if (actual_start - prima._xform).dot(normal) < 0 and (
                 actual_end - primb._xform).dot(normal) < 0:
             normal.negate()
 
-        proj_point: Matrix = GeomAlgo2D.point_to_line_segment(
+        proj_point: Vec2 = GeomAlgo2D.point_to_line_segment(
             actual_start, actual_end, prima._xform)
-        diff: Matrix = proj_point - prima._xform
+        diff: Vec2 = proj_point - prima._xform
 
         res._normal = diff.normal()
         length: float = diff.len()
@@ -146,7 +144,7 @@ class SAT():
         cira: Circle = prima._shape
         cirb: Circle = primb._shape
 
-        ba: Matrix = prima._xform - primb._xform
+        ba: Vec2 = prima._xform - primb._xform
         dp: float = cira.radius + cirb.radius
         length: float = ba.len()
 
@@ -172,16 +170,16 @@ class SAT():
         res: SATResult = SATResult()
 
         len_min: float = Config.Max
-        closest: Matrix = Matrix([0.0, 0.0], 'vec')
+        closest: Vec2 = Vec2(0.0, 0.0)
 
         for elem in polyb.vertices:
-            vertex: Matrix = primb.translate(elem)
+            vertex: Vec2 = primb.translate(elem)
             length: float = (vertex - prima._xform).len_square()
             if len_min > length:
                 len_min = length
                 closest = vertex
 
-        normal: Matrix = closest.normal()
+        normal: Vec2 = closest.normal()
         seg_cir: ProjectedSegment = SAT._axis_projection(prima, cira, normal)
         seg_poly: ProjectedSegment = SAT._axis_projection(primb, polyb, normal)
 
@@ -198,10 +196,10 @@ class SAT():
 
         vert_len: int = len(polyb.vertices)
         for i in range(vert_len - 1):
-            v1: Matrix = primb.translate(polyb.vertices[i])
-            v2: Matrix = primb.translate(polyb.vertices[i + 1])
-            edg: Matrix = v1 - v2
-            normal: Matrix = edg.perpendicular().normal()
+            v1: Vec2 = primb.translate(polyb.vertices[i])
+            v2: Vec2 = primb.translate(polyb.vertices[i + 1])
+            edg: Vec2 = v1 - v2
+            normal: Vec2 = edg.perpendicular().normal()
 
             segc = SAT._axis_projection(prima, cira, normal)
             segp = SAT._axis_projection(primb, polyb, normal)
@@ -232,7 +230,7 @@ class SAT():
             polya: Polygon = prima._shape
             polyb: Polygon = primb._shape
 
-            final_normal: Matrix = Matrix([0.0, 0.0], 'vec')
+            final_normal: Vec2 = Vec2(0.0, 0.0)
             len_min: float = Config.Max
             colliding_axis: int = 0
 
@@ -241,10 +239,10 @@ class SAT():
 
             polya_len: int = len(polya.vertices)
             for i in range(polya_len - 1):
-                v1: Matrix = prima.translate(polya.vertices[i])
-                v2: Matrix = prima.translate(polya.vertices[i + 1])
-                edg: Matrix = v1 - v2
-                normal: Matrix = edg.perpendicular().normal()
+                v1: Vec2 = prima.translate(polya.vertices[i])
+                v2: Vec2 = prima.translate(polya.vertices[i + 1])
+                edg: Vec2 = v1 - v2
+                normal: Vec2 = edg.perpendicular().normal()
 
                 sega: ProjectedSegment = SAT._axis_projection(
                     prima, polya, normal)
@@ -337,7 +335,7 @@ class SAT():
 
     @staticmethod
     def _axis_projection(prim: ShapePrimitive, shape: Shape,
-                         normal: Matrix) -> ProjectedSegment:
+                         normal: Vec2) -> ProjectedSegment:
         if shape.type() == Shape.Type.Polygon:
             point_min: ProjectedPoint = ProjectedPoint()
             point_max: ProjectedPoint = ProjectedPoint()
@@ -347,7 +345,7 @@ class SAT():
 
             shape_len: int = len(shape.vertices)
             for i in range(shape_len):
-                vertex: Matrix = prim.translate(shape.vertices[i])
+                vertex: Vec2 = prim.translate(shape.vertices[i])
                 value: float = vertex.dot(normal)
 
                 if value < point_min._val:
@@ -386,13 +384,13 @@ class SAT():
             elli_min: ProjectedPoint = ProjectedPoint()
             elli_max: ProjectedPoint = ProjectedPoint()
 
-            rot_dir: Matrix = Matrix.rotate_mat(-prim._rot) * -normal
+            rot_dir: Vec2 = Mat2.rotate_mat(-prim._rot) * -normal
             elli_min._vertex = GeomAlgo2D.calc_ellipse_project_on_point(
                 shape.A(), shape.B(), rot_dir)
             elli_min._vertex = prim.translate(elli_min._vertex)
             elli_min._val = elli_min._vertex.dot(normal)
 
-            rot_dir = Matrix.rotate_mat(-prim._rot) * normal
+            rot_dir = Mat2.rotate_mat(-prim._rot) * normal
             elli_max._vertex = GeomAlgo2D.calc_ellipse_project_on_point(
                 shape.A(), shape.B(), rot_dir)
             elli_max._vertex = prim.translate(elli_max._vertex)
@@ -408,10 +406,10 @@ class SAT():
             capsule_min: ProjectedPoint = ProjectedPoint()
             capsule_max: ProjectedPoint = ProjectedPoint()
 
-            dirn: Matrix = Matrix.rotate_mat(-prim._rot) * normal
-            p1: Matrix = GeomAlgo2D.calc_capsule_project_on_point(
+            dirn: Vec2 = Mat2.rotate_mat(-prim._rot) * normal
+            p1: Vec2 = GeomAlgo2D.calc_capsule_project_on_point(
                 shape.width, shape.height, dirn)
-            p2: Matrix = GeomAlgo2D.calc_capsule_project_on_point(
+            p2: Vec2 = GeomAlgo2D.calc_capsule_project_on_point(
                 shape.width, shape.height, -dirn)
             p1 = prim.translate(p1)
             p2 = prim.translate(p2)
@@ -432,10 +430,10 @@ class SAT():
             sector_min: ProjectedPoint = ProjectedPoint()
             sector_max: ProjectedPoint = ProjectedPoint()
 
-            dirn: Matrix = Matrix.rotate_mat(-prim._rot) * normal
-            p1: Matrix = GeomAlgo2D.calc_sector_project_on_point(
+            dirn: Vec2 = Mat2.rotate_mat(-prim._rot) * normal
+            p1: Vec2 = GeomAlgo2D.calc_sector_project_on_point(
                 shape.start, shape.span, shape.radius, dirn)
-            p2: Matrix = GeomAlgo2D.calc_sector_project_on_point(
+            p2: Vec2 = GeomAlgo2D.calc_sector_project_on_point(
                 shape.start, shape.span, shape.radius, -dirn)
             p1 = prim.translate(p1)
             p2 = prim.translate(p2)
@@ -1,4 +1,6 @@
 from .aabb import *
 from .dbvh import *
 from .dbvt import *
-from .grid import *
\ No newline at end of file
+from .grid import *
+from .pair_manager import *
+from .sap import *
\ No newline at end of file
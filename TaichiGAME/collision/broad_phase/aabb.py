@@ -4,7 +4,7 @@ from typing import Optional, Tuple, cast
 import numpy as np
 
 from ...common.config import Config
-from ...math.matrix import Matrix
+from ...math.linalg import Vec2, Mat2
 from ...geometry.geom_algo import GeomAlgo2D
 from ...geometry.shape import Circle, Edge, Ellipse
 from ...geometry.shape import Polygon, Shape, ShapePrimitive
@@ -14,7 +14,7 @@ from ..algorithm.gjk import GJK
 
 class AABB():
     def __init__(self, width: float = 0.0, height: float = 0.0):
-        self._pos: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._pos: Vec2 = Vec2(0.0, 0.0)
         self._width: float = width
         self._height: float = height
 
@@ -23,36 +23,32 @@ class AABB():
             self._height, other._height) and self._pos == other._pos
 
     @property
-    def pos(self) -> Matrix:
+    def pos(self) -> Vec2:
         return self._pos
 
     @pos.setter
-    def pos(self, pos: Matrix) -> None:
-        self._pos = pos
+    def pos(self, pos: Vec2) -> None:
+        self._pos = Vec2.from_value(pos)
 
     @property
-    def top_left(self) -> Matrix:
-        return Matrix([
-            -self._width / 2.0 + self._pos.x, self._height / 2.0 + self._pos.y
-        ], 'vec')
+    def top_left(self) -> Vec2:
+        return Vec2(-self._width / 2.0 + self._pos.x,
+                    self._height / 2.0 + self._pos.y)
 
     @property
-    def top_right(self) -> Matrix:
-        return Matrix([
-            self._width / 2.0 + self._pos.x, self._height / 2.0 + self._pos.y
-        ], 'vec')
+    def top_right(self) -> Vec2:
+        return Vec2(self._width / 2.0 + self._pos.x,
+                    self._height / 2.0 + self._pos.y)
 
     @property
-    def bot_left(self) -> Matrix:
-        return Matrix([
-            -self._width / 2.0 + self._pos.x, -self._height / 2.0 + self._pos.y
-        ], 'vec')
+    def bot_left(self) -> Vec2:
+        return Vec2(-self._width / 2.0 + self._pos.x,
+                    -self._height / 2.0 + self._pos.y)
 
     @property
-    def bot_right(self) -> Matrix:
-        return Matrix([
-            self._width / 2.0 + self._pos.x, -self._height / 2.0 + self._pos.y
-        ], 'vec')
+    def bot_right(self) -> Vec2:
+        return Vec2(self._width / 2.0 + self._pos.x,
+                    -self._height / 2.0 + self._pos.y)
 
     def collide(self, aabb) -> bool:
         '''check if two aabbs are overlapping
@@ -119,9 +115,9 @@ class AABB():
 
     def is_empty(self) -> bool:
         return np.isclose(self._width, 0.0) and np.isclose(
-            self._height, 0.0) and self._pos == Matrix([0.0, 0.0], 'vec')
+            self._height, 0.0) and self._pos == Vec2(0.0, 0.0)
 
-    def raycast(self, start: Matrix, dirn: Matrix) -> bool:
+    def raycast(self, start: Vec2, dirn: Vec2) -> bool:
         return AABB._raycast(self, start, dirn)
 
     @staticmethod
@@ -136,7 +132,7 @@ class AABB():
             x_min: float = Config.Max
             y_min: float = Config.Max
             for v in polygon.vertices:
-                vertex: Matrix = Matrix.rotate_mat(prim._rot) * v
+                vertex: Vec2 = Mat2.rotate_mat(prim._rot) * v
 
                 if x_max < vertex.x:
                     x_max = vertex.x
@@ -157,29 +153,29 @@ class AABB():
         elif prim._shape.type == Shape.Type.Ellipse:
             ellipse: Ellipse = cast(Ellipse, prim._shape)
 
-            top_dir: Matrix = Matrix([0.0, 1.0], 'vec')
-            left_dir: Matrix = Matrix([-1.0, 0.0], 'vec')
-            bot_dir: Matrix = Matrix([0.0, -1.0], 'vec')
-            right_dir: Matrix = Matrix([1.0, 0.0], 'vec')
+            top_dir: Vec2 = Vec2(0.0, 1.0)
+            left_dir: Vec2 = Vec2(-1.0, 0.0)
+            bot_dir: Vec2 = Vec2(0.0, -1.0)
+            right_dir: Vec2 = Vec2(1.0, 0.0)
 
-            top_dir = Matrix.rotate_mat(-prim._rot) * top_dir
-            left_dir = Matrix.rotate_mat(-prim._rot) * left_dir
-            bot_dir = Matrix.rotate_mat(-prim._rot) * bot_dir
-            right_dir = Matrix.rotate_mat(-prim._rot) * right_dir
+            top_dir = Mat2.rotate_mat(-prim._rot) * top_dir
+            left_dir = Mat2.rotate_mat(-prim._rot) * left_dir
+            bot_dir = Mat2.rotate_mat(-prim._rot) * bot_dir
+            right_dir = Mat2.rotate_mat(-prim._rot) * right_dir
 
-            top: Matrix = GeomAlgo2D.calc_ellipse_project_on_point(
+            top: Vec2 = GeomAlgo2D.calc_ellipse_project_on_point(
                 ellipse.A(), ellipse.B(), top_dir)
-            left: Matrix = GeomAlgo2D.calc_ellipse_project_on_point(
+            left: Vec2 = GeomAlgo2D.calc_ellipse_project_on_point(
                 ellipse.A(), ellipse.B(), left_dir)
-            bot: Matrix = GeomAlgo2D.calc_ellipse_project_on_point(
+            bot: Vec2 = GeomAlgo2D.calc_ellipse_project_on_point(
                 ellipse.A(), ellipse.B(), bot_dir)
-            right: Matrix = GeomAlgo2D.calc_ellipse_project_on_point(
+            right: Vec2 = GeomAlgo2D.calc_ellipse_project_on_point(
                 ellipse.A(), ellipse.B(), right_dir)
 
-            top = Matrix.rotate_mat(prim._rot) * top
-            left = Matrix.rotate_mat(prim._rot) * left
-            bot = Matrix.rotate_mat(prim._rot) * bot
-            right = Matrix.rotate_mat(prim._rot) * right
+            top = Mat2.rotate_mat(prim._rot) * top
+            left = Mat2.rotate_mat(prim._rot) * left
+            bot = Mat2.rotate_mat(prim._rot) * bot
+            right = Mat2.rotate_mat(prim._rot) * right
 
             res._height = np.fabs(top.y - bot.y)
             res._width = np.fabs(right.x - left.x)
@@ -204,10 +200,8 @@ class AABB():
             res._height = 1.0
 
         elif prim._shape.type == Shape.Type.Capsule:
-            p1: Matrix = GJK.find_farthest_point(prim, Matrix([1.0, 0.0],
-                                                              'vec'))
-            p2: Matrix = GJK.find_farthest_point(prim, Matrix([0.0, 1.0],
-                                                              'vec'))
+            p1: Vec2 = GJK.find_farthest_point(prim, Vec2(1.0, 0.0))
+            p2: Vec2 = GJK.find_farthest_point(prim, Vec2(0.0, 1.0))
 
             p1 -= prim._xform
             p2 -= prim._xform
@@ -233,7 +227,7 @@ class AABB():
         return AABB.from_prim(prim, factor)
 
     @staticmethod
-    def from_box(top_left: Matrix, bot_right: Matrix) -> AABB:
+    def from_box(top_left: Vec2, bot_right: Vec2) -> AABB:
         res: AABB = AABB()
         res._width = bot_right.x - top_left.x
         res._height = top_left.y - bot_right.y
@@ -256,10 +250,10 @@ class AABB():
         bool
             True: collide, otherwise not
         '''
-        src_top_left: Matrix = src.top_left
-        src_bot_right: Matrix = src.bot_right
-        tgt_top_left: Matrix = target.top_left
-        tgt_bot_right: Matrix = target.bot_right
+        src_top_left: Vec2 = src.top_left
+        src_bot_right: Vec2 = src.bot_right
+        tgt_top_left: Vec2 = target.top_left
+        tgt_bot_right: Vec2 = target.bot_right
 
         return not (src_bot_right.x < tgt_top_left.x
                     or tgt_bot_right.x < src_top_left.x
@@ -290,10 +284,10 @@ class AABB():
         elif target.is_empty():
             return src
 
-        src_top_left: Matrix = src.top_left
-        src_bot_right: Matrix = src.bot_right
-        tgt_top_left: Matrix = target.top_left
-        tgt_bot_right: Matrix = target.bot_right
+        src_top_left: Vec2 = src.top_left
+        src_bot_right: Vec2 = src.bot_right
+        tgt_top_left: Vec2 = target.top_left
+        tgt_bot_right: Vec2 = target.bot_right
 
         x_min: float = np.fmin(src_top_left.x, tgt_top_left.x)
         x_max: float = np.fmax(src_bot_right.x, tgt_bot_right.x)
@@ -324,10 +318,10 @@ class AABB():
         bool
             True: is subset, otherwise not
         '''
-        src_top_left: Matrix = src.top_left
-        src_bot_right: Matrix = src.bot_right
-        tgt_top_left: Matrix = target.top_left
-        tgt_bot_right: Matrix = target.bot_right
+        src_top_left: Vec2 = src.top_left
+        src_bot_right: Vec2 = src.bot_right
+        tgt_top_left: Vec2 = target.top_left
+        tgt_bot_right: Vec2 = target.bot_right
 
         x_ck1: bool = src_bot_right.x >= tgt_bot_right.x
         x_ck2: bool = tgt_top_left.x >= src_top_left.x
@@ -341,8 +335,8 @@ class AABB():
         aabb._height += factor
 
     @staticmethod
-    def _raycast(aabb: AABB, start: Matrix, dirn: Matrix) -> bool:
-        res: Optional[Tuple[Matrix, Matrix]] = GeomAlgo2D.raycast_aabb(
+    def _raycast(aabb: AABB, start: Vec2, dirn: Vec2) -> bool:
+        res: Optional[Tuple[Vec2, Vec2]] = GeomAlgo2D.raycast_aabb(
             start, dirn, aabb.top_left, aabb.bot_right)
 
         if res is None:
@@ -352,3 +346,45 @@ class AABB():
         return GeomAlgo2D.is_point_on_AABB(
             p1, aabb.top_left, aabb.bot_right) and GeomAlgo2D.is_point_on_AABB(
                 p2, aabb.top_left, aabb.bot_right)
+
+
+def aabb_bounds(aabb: AABB) -> Tuple[float, float, float, float]:
+    '''(x min, y min, x max, y max) of the aabb, the bounds the
+    broadphases keep per body'''
+    hw: float = aabb._width / 2.0
+    hh: float = aabb._height / 2.0
+    return (aabb._pos.x - hw, aabb._pos.y - hh, aabb._pos.x + hw,
+            aabb._pos.y + hh)
+
+
+def bounds_overlap(a: Tuple[float, float, float, float],
+                   b: Tuple[float, float, float, float]) -> bool:
+    '''check if two bounds are overlapping, touching counts'''
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def ray_bounds(
+    px: float, py: float, dx: float, dy: float,
+    bounds: Tuple[float, float, float,
+                  float]) -> Optional[Tuple[float, float]]:
+    '''enter and exit params of the ray in the bounds by the slabs, None
+    if the ray misses the bounds'''
+    t_enter: float = 0.0
+    t_exit: float = Config.Max
+    for p, d, lo, hi in ((px, dx, bounds[0], bounds[2]), (py, dy, bounds[1],
+                                                          bounds[3])):
+        if d == 0.0:
+            if p < lo or p > hi:
+                return None
+            continue
+
+        ta: float = (lo - p) / d
+        tb: float = (hi - p) / d
+        if ta > tb:
+            ta, tb = tb, ta
+        t_enter = max(t_enter, ta)
+        t_exit = min(t_exit, tb)
+        if t_enter > t_exit:
+            return None
+
+    return (t_enter, t_exit)
@@ -2,7 +2,7 @@ from typing import List, Dict, Optional, Tuple
 
 import numpy as np
 
-from ...math.matrix import Matrix
+from ...math.linalg import Vec2
 from ...common.config import Config
 from ...dynamics.body import Body
 from ..broad_phase.aabb import AABB
@@ -195,7 +195,7 @@ class DBVH():
     def root(self) -> Optional[Node]:
         return self._root
 
-    def raycast(self, start: Matrix, dirn: Matrix) -> List[Body]:
+    def raycast(self, start: Vec2, dirn: Vec2) -> List[Body]:
         res: List[Body] = []
         self._raycast(res, self._root, start, dirn)
         return res
@@ -231,8 +231,8 @@ class DBVH():
         if node.is_leaf():
             nodes.append(node)
 
-    def _raycast(self, res: List[Body], node: Optional[Node], start: Matrix,
-                 dirn: Matrix):
+    def _raycast(self, res: List[Body], node: Optional[Node], start: Vec2,
+                 dirn: Vec2):
         if node == None:
             return
 
@@ -3,17 +3,25 @@ from typing import List, Dict, Optional, Union, Tuple
 
 import numpy as np
 
-from ...math.matrix import Matrix
+from ...math.linalg import Vec2
 from ...common.config import Config
+from ...common.profiler import Profiler
 from ...dynamics.body import Body
-from .aabb import AABB
+from .aabb import AABB, aabb_bounds
 
 
 class DBVT():
     '''Dynamic Bounding Volume Tree
     This is implemented by dynamic array-arranged.
+
+    The nodes are the rows of a pool of numpy arrays: the min and max
+    bounds, the parent and child indices and the height of the nodes.
+    The queries walk the tree by a frontier of nodes instead of the
+    recursion, and test all the nodes of the frontier against the boxes
+    at once, so the deep trees do not hit the recursion limit.
     '''
     class Node():
+        '''view of a node of the pool, made by `tree`'''
         def __init__(self):
             self._body: Optional[Body] = None
             self._aabb: AABB = AABB()
@@ -42,12 +50,77 @@ class DBVT():
             self._left_idx = -1
             self._right_idx = -1
 
+        def clone(self) -> DBVT.Node:
+            res: DBVT.Node = DBVT.Node()
+            res._body = self._body
+            res._aabb = AABB(self._aabb._width, self._aabb._height)
+            res._aabb._pos = Vec2(self._aabb._pos.x, self._aabb._pos.y)
+            res._parent_idx = self._parent_idx
+            res._left_idx = self._left_idx
+            res._right_idx = self._right_idx
+            return res
+
     def __init__(self):
+        # NOTE: the fat aabb of a leaf is the tight aabb expanded by the
+        # factor plus the ratio of the size of the body, then stretched
+        # along the velocity by the predict factor times the step
+        # displacement, like the aabb multiplier of box2d. A body is
+        # only reinserted when its tight aabb leaves the fat one
         self._fat_expansion_factor: float = 0.5
+        self._fat_ratio: float = 0.1
+        self._predict_factor: float = 4.0
+        self._reinsertions: int = 0
+        # NOTE: the move buffer of the bodies inserted or reinserted and
+        # of the removed bodies since the last `take_moves`, and the
+        # tight bounds of the last insert or update of the bodies
+        self._moved: Dict[Body, None] = {}
+        self._removed: List[Body] = []
+        self._tight: Dict[Body, Tuple[float, float, float, float]] = {}
         self._root_idx: int = -1
-        self._tree: List[DBVT.Node] = []
+        # NOTE: the pool rows in use, the free rows below are in the
+        # empty list, the bounds of the free rows are 0.0 and their
+        # indices -1
+        self._size: int = 0
+        self._lo: np.ndarray = np.zeros((0, 2))
+        self._hi: np.ndarray = np.zeros((0, 2))
+        self._parent: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._left: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._right: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._height: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._bodies: List[Optional[Body]] = []
         self._empty_list: List[int] = []
         self._body_table: Dict[Body, int] = {}
+        # NOTE: the tree is shared with a snapshot, copy it on write
+        self._shared: bool = False
+
+    @property
+    def fat_expansion_factor(self) -> float:
+        return self._fat_expansion_factor
+
+    @fat_expansion_factor.setter
+    def fat_expansion_factor(self, val: float) -> None:
+        self._fat_expansion_factor = val
+
+    @property
+    def fat_ratio(self) -> float:
+        return self._fat_ratio
+
+    @fat_ratio.setter
+    def fat_ratio(self, val: float) -> None:
+        self._fat_ratio = val
+
+    @property
+    def predict_factor(self) -> float:
+        return self._predict_factor
+
+    @predict_factor.setter
+    def predict_factor(self, val: float) -> None:
+        self._predict_factor = val
+
+    @property
+    def reinsertions(self) -> int:
+        '''count of the reinsertions by `update` since the last clear'''
+        return self._reinsertions
 
     def query(self, val: Union[Body, AABB]) -> List[Body]:
         res: List[Body] = []
@@ -62,7 +135,34 @@ class DBVT():
         self._query_nodes(self._root_idx, aabb, res)
         return res
 
-    def raycast(self, start: Matrix, dirn: Matrix) -> List[Body]:
+    def query_pairs(self, bodies: List[Body]) -> List[Tuple[Body, Body]]:
+        '''query the fat aabbs of the bodies at once
+
+        Parameters
+        ----------
+        bodies : List[Body]
+            the bodies in the tree
+
+        Returns
+        -------
+        List[Tuple[Body, Body]]
+            the pairs of the bodies and the other bodies whose fat aabbs
+            overlap theirs, the bodies come first
+        '''
+        if len(bodies) == 0:
+            return []
+
+        nodes: np.ndarray = np.array(
+            [self._body_table[body] for body in bodies], dtype=np.int64)
+        box_idx, leaf_idx = self._query_leaves(self._root_idx, self._lo[nodes],
+                                               self._hi[nodes])
+        keep: np.ndarray = leaf_idx != nodes[box_idx]
+        return [
+            (bodies[i], self._leaf_body(j))
+            for i, j in zip(box_idx[keep].tolist(), leaf_idx[keep].tolist())
+        ]
+
+    def raycast(self, start: Vec2, dirn: Vec2) -> List[Body]:
         res: List[Body] = []
         self._raycast(res, self._root_idx, start, dirn)
         return res
@@ -72,19 +172,36 @@ class DBVT():
         self._generate(self._root_idx, pairs)
         return pairs
 
-    def insert(self, body: Body) -> None:
+    def insert(self, body: Body, dt: float = 0.0) -> None:
+        '''insert the body with its fat aabb
+
+        Parameters
+        ----------
+        body : Body
+            the body with its shape set
+        dt : float
+            time step to predict the displacement of the body, no
+            prediction if 0.0
+        '''
+        self._own()
         new_node_idx: int = self._allocate_node()
-        self._tree[new_node_idx]._body = body
-        self._tree[new_node_idx]._aabb = AABB.from_body(body)
-        # expand outline a litte
-        self._tree[new_node_idx]._aabb.expand(self._fat_expansion_factor)
+        tight: Tuple[float, float, float,
+                     float] = aabb_bounds(AABB.from_body(body))
+        fat: Tuple[float, float, float,
+                   float] = self._fat_bounds(tight, body, dt)
+        self._lo[new_node_idx] = fat[0:2]
+        self._hi[new_node_idx] = fat[2:4]
+        self._height[new_node_idx] = 1
+        self._bodies[new_node_idx] = body
         self._body_table[body] = new_node_idx
+        self._tight[body] = tight
+        self._moved[body] = None
 
         if self._root_idx == -1:
             self._root_idx = new_node_idx
             return
 
-        if self._tree[self._root_idx].is_leaf():
+        if self._is_leaf(self._root_idx):
             self._root_idx = self._merge(new_node_idx, self._root_idx)
             return
 
@@ -95,7 +212,7 @@ class DBVT():
             self._balance(self._root_idx)
             return
 
-        target_parent_idx: int = self._tree[target_idx]._parent_idx
+        target_parent_idx: int = int(self._parent[target_idx])
         self._separate(target_idx, target_parent_idx)
         box_idx: int = self._merge(new_node_idx, target_idx)
         self._join(box_idx, target_parent_idx)
@@ -103,253 +220,413 @@ class DBVT():
         self._balance(self._root_idx)
 
     def remove(self, body: Body) -> None:
-        is_find: bool = False
-        for v in self._body_table:
-            if v == body:
-                is_find = True
-                break
-
-        if not is_find:
+        if body not in self._body_table:
             return
 
-        parent_idx: int = self._tree[self._body_table[body]]._parent_idx
-        if parent_idx == -1 and self._tree[self._body_table[body]].is_leaf():
+        self._own()
+        self._moved.pop(body, None)
+        self._tight.pop(body, None)
+        self._removed.append(body)
+        leaf_idx: int = self._body_table[body]
+        parent_idx: int = int(self._parent[leaf_idx])
+        if parent_idx == -1 and self._is_leaf(leaf_idx):
             self._root_idx = -1
-            self._remove(self._body_table[body])
+            self._remove(leaf_idx)
             del self._body_table[body]
             return
 
-        another_child: int = self._tree[parent_idx]._right_idx if self._tree[
-            parent_idx]._left_idx == self._body_table[body] else self._tree[
-                parent_idx]._left_idx
-        self._remove(self._body_table[body])
+        another_child: int = self._sibling(leaf_idx, parent_idx)
+        self._remove(leaf_idx)
         self._elevate(another_child)
         self._upgrade(another_child)
         del self._body_table[body]
 
     def clear_all(self) -> None:
-        self._tree = []
+        self._size = 0
+        self._lo = np.zeros((0, 2))
+        self._hi = np.zeros((0, 2))
+        self._parent = np.zeros(0, dtype=np.int64)
+        self._left = np.zeros(0, dtype=np.int64)
+        self._right = np.zeros(0, dtype=np.int64)
+        self._height = np.zeros(0, dtype=np.int64)
+        self._bodies = []
         self._empty_list = []
         self._body_table = {}
         self._root_idx = -1
+        self._shared = False
+        self._reinsertions = 0
+        self._moved = {}
+        self._removed = []
+        self._tight = {}
+
+    def update(self, body: Body, dt: float = 0.0) -> None:
+        '''reinsert the body if its tight aabb left its fat aabb
+
+        Parameters
+        ----------
+        body : Body
+            the moved body
+        dt : float
+            time step to predict the displacement of the body
+        '''
+        if body not in self._body_table:
+            return
+
+        tight: Tuple[float, float, float,
+                     float] = aabb_bounds(AABB.from_body(body))
+        self._tight[body] = tight
+        leaf_idx: int = self._body_table[body]
+        lo: List[float] = self._lo[leaf_idx].tolist()
+        hi: List[float] = self._hi[leaf_idx].tolist()
+        if not (lo[0] <= tight[0] and lo[1] <= tight[1] and tight[2] <= hi[0]
+                and tight[3] <= hi[1]):
+            self._own()
+            self._extract(leaf_idx)
+            self.insert(body, dt)
+            self._reinsertions += 1
+            Profiler.count('dbvt_reinsertions')
+
+    def snapshot(
+        self
+    ) -> Tuple[int, int, Tuple[np.ndarray, ...], List[Optional[Body]],
+               List[int], Dict[Body, int], Dict[Body, None], List[Body]]:
+        '''share the tree with the snapshot, the next change copies it
+
+        The move buffer is copied, so the pairs of the tree saved at the
+        same time are kept up to date by the moves after the restore.
+        '''
+        self._shared = True
+        return (self._root_idx, self._size,
+                (self._lo, self._hi, self._parent, self._left, self._right,
+                 self._height), self._bodies, self._empty_list,
+                self._body_table, dict(self._moved), list(self._removed))
+
+    def restore(
+        self, state: Tuple[int, int, Tuple[np.ndarray, ...],
+                           List[Optional[Body]], List[int], Dict[Body, int],
+                           Dict[Body, None], List[Body]]
+    ) -> None:
+        # NOTE: the tight aabbs are computed again on demand
+        (self._root_idx, self._size, pool, self._bodies, self._empty_list,
+         self._body_table, moved, removed) = state
+        (self._lo, self._hi, self._parent, self._left, self._right,
+         self._height) = pool
+        self._shared = True
+        self._moved = dict(moved)
+        self._removed = list(removed)
+        self._tight = {}
+
+    def take_moves(self) -> Tuple[List[Body], List[Body]]:
+        '''take the move buffer
+
+        Returns
+        -------
+        Tuple[List[Body], List[Body]]
+            the bodies inserted or reinserted, and the removed bodies
+            since the last call
+        '''
+        res: Tuple[List[Body], List[Body]] = (list(self._moved), self._removed)
+        self._moved = {}
+        self._removed = []
+        return res
+
+    def tight_aabb(self, body: Body) -> AABB:
+        '''tight aabb of the body at its last insert or update'''
+        return DBVT._to_aabb(self._tight_bounds(body))
 
-    def update(self, body: Body) -> None:
-        is_find: bool = False
-        for v in self._body_table:
-            if v == body:
-                is_find = True
-                break
+    def fat_aabb(self, body: Body) -> AABB:
+        '''aabb of the leaf of the body'''
+        return self._box(self._body_table[body])
 
-        if not is_find:
+    def _own(self) -> None:
+        if not self._shared:
             return
 
-        thin: AABB = AABB.from_body(body)
-        thin.expand(0.1)
-        if not thin.is_subset(self._tree[self._body_table[body]]._aabb):
-            self._extract(self._body_table[body])
-            self.insert(body)
+        self._lo = self._lo.copy()
+        self._hi = self._hi.copy()
+        self._parent = self._parent.copy()
+        self._left = self._left.copy()
+        self._right = self._right.copy()
+        self._height = self._height.copy()
+        self._bodies = list(self._bodies)
+        self._empty_list = list(self._empty_list)
+        self._body_table = dict(self._body_table)
+        self._shared = False
 
     def tree(self) -> List[Node]:
-        return self._tree
+        '''views of the nodes of the pool, made on each call'''
+        res: List[DBVT.Node] = []
+        for idx in range(self._size):
+            node: DBVT.Node = DBVT.Node()
+            node._body = self._bodies[idx]
+            node._aabb = self._box(idx)
+            node._parent_idx = int(self._parent[idx])
+            node._left_idx = int(self._left[idx])
+            node._right_idx = int(self._right[idx])
+            res.append(node)
+
+        return res
 
     def root_index(self) -> int:
         return self._root_idx
 
-    def _query_nodes(self, node_idx: int, aabb: AABB, res: List[Body]):
-        if node_idx == -1:
-            return
+    def _tight_bounds(self, body: Body) -> Tuple[float, float, float, float]:
+        res: Optional[Tuple[float, float, float,
+                            float]] = self._tight.get(body)
+        if res is None:
+            res = aabb_bounds(AABB.from_body(body))
+            self._tight[body] = res
 
-        overlap: bool = self._tree[node_idx]._aabb.collide(aabb) or self._tree[
-            node_idx]._aabb.is_subset(aabb) or aabb.is_subset(
-                self._tree[node_idx]._aabb)
+        return res
 
-        if not overlap:
-            return
+    def _fat_bounds(self, tight: Tuple[float, float, float, float], body: Body,
+                    dt: float) -> Tuple[float, float, float, float]:
+        x0, y0, x1, y1 = tight
+        margin: float = (self._fat_expansion_factor +
+                         self._fat_ratio * max(x1 - x0, y1 - y0)) / 2.0
+        x0 -= margin
+        y0 -= margin
+        x1 += margin
+        y1 += margin
+        if dt > 0.0 and self._predict_factor > 0.0:
+            disp: Vec2 = body.vel * (self._predict_factor * dt)
+            if disp.x > 0.0:
+                x1 += disp.x
+            else:
+                x0 += disp.x
 
-        if self._tree[node_idx].is_leaf():
-            tmp: Optional[Body] = self._tree[node_idx]._body
-            assert tmp is not None
-            res.append(tmp)
-            return
+            if disp.y > 0.0:
+                y1 += disp.y
+            else:
+                y0 += disp.y
 
-        if self._tree[node_idx].is_branch() or self._tree[node_idx].is_root():
-            self._query_nodes(self._tree[node_idx]._left_idx, aabb, res)
-            self._query_nodes(self._tree[node_idx]._right_idx, aabb, res)
+        return (x0, y0, x1, y1)
 
-    # NOTE: now use the List to return the var
-    def _traverse_lowest_cost(self, node_idx: int, box_idx: int,
-                              cost: List[float], final_idx: List[int]) -> None:
-        def _accumulate_cost(node_idx: int, box_idx: int) -> float:
-            if self._tree[node_idx].is_leaf():
-                return inherit_cost + AABB.unite(
-                    self._tree[node_idx]._aabb,
-                    self._tree[box_idx]._aabb).surface_area()
+    @staticmethod
+    def _to_aabb(bounds: Tuple[float, float, float, float]) -> AABB:
+        res: AABB = AABB(bounds[2] - bounds[0], bounds[3] - bounds[1])
+        res._pos = Vec2((bounds[0] + bounds[2]) / 2.0,
+                        (bounds[1] + bounds[3]) / 2.0)
+        return res
 
-            return self._delta_cost(node_idx, box_idx) + inherit_cost
+    def _box(self, node_idx: int) -> AABB:
+        lo: List[float] = self._lo[node_idx].tolist()
+        hi: List[float] = self._hi[node_idx].tolist()
+        return DBVT._to_aabb((lo[0], lo[1], hi[0], hi[1]))
 
-        if self._tree[box_idx].is_leaf() and not self._tree[box_idx].is_root():
-            final_idx[0] = box_idx
-            return
+    def _is_leaf(self, node_idx: int) -> bool:
+        return self._left[node_idx] == -1 and self._right[node_idx] == -1
+
+    def _leaf_body(self, node_idx: int) -> Body:
+        res: Optional[Body] = self._bodies[node_idx]
+        assert res is not None
+        return res
 
-        area: float = self._tree[box_idx]._aabb.surface_area()
-        union_area: float = AABB.unite(
-            self._tree[node_idx]._aabb,
-            self._tree[box_idx]._aabb).surface_area()
+    def _sibling(self, node_idx: int, parent_idx: int) -> int:
+        left_idx: int = int(self._left[parent_idx])
+        return int(
+            self._right[parent_idx]) if left_idx == node_idx else left_idx
+
+    def _query_leaves(self, node_idx: int, lo: np.ndarray,
+                      hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        '''walk the subtree by a frontier of the (box, node) pairs, the
+        overlaps of each level are tested at once
+
+        Parameters
+        ----------
+        node_idx : int
+            root of the subtree
+        lo : np.ndarray
+            min bounds of the boxes, shape (n, 2)
+        hi : np.ndarray
+            max bounds of the boxes, shape (n, 2)
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            the boxes and the leaves they overlap, as by `AABB.collide`
+        '''
+        box_res: List[np.ndarray] = []
+        leaf_res: List[np.ndarray] = []
+        box_idx: np.ndarray = np.arange(len(lo), dtype=np.int64)
+        nodes: np.ndarray = np.full(len(lo), node_idx, dtype=np.int64)
+        if node_idx == -1:
+            nodes = nodes[:0]
+            box_idx = box_idx[:0]
 
-        cost[0] = 2.0 * area
-        inherit_cost: float = 2.0 * (union_area - area)
+        while len(nodes) > 0:
+            node_lo: np.ndarray = self._lo[nodes]
+            node_hi: np.ndarray = self._hi[nodes]
+            box_lo: np.ndarray = lo[box_idx]
+            box_hi: np.ndarray = hi[box_idx]
+            hit: np.ndarray = np.all((node_lo <= box_hi) & (box_lo <= node_hi),
+                                     axis=1)
+            nodes = nodes[hit]
+            box_idx = box_idx[hit]
 
-        left_idx: int = self._tree[box_idx]._left_idx
-        right_idx: int = self._tree[box_idx]._right_idx
-        left_cost: float = _accumulate_cost(node_idx, left_idx)
-        right_cost: float = _accumulate_cost(node_idx, right_idx)
-        lowest_cost: float = 0.0
-        lowest_const_idx: int = 0
+            leaf: np.ndarray = self._left[nodes] == -1
+            box_res.append(box_idx[leaf])
+            leaf_res.append(nodes[leaf])
 
-        if cost[0] < left_cost and cost[0] < right_cost:
-            final_idx[0] = box_idx
-            return
+            nodes = nodes[~leaf]
+            box_idx = box_idx[~leaf]
+            nodes = np.concatenate((self._left[nodes], self._right[nodes]))
+            box_idx = np.concatenate((box_idx, box_idx))
 
-        if left_cost > right_cost:
-            lowest_cost = right_cost
-            lowest_const_idx = right_idx
-        else:
-            lowest_cost = left_cost
-            lowest_const_idx = left_idx
+        if len(box_res) == 0:
+            return (box_idx, nodes)
 
-        final_idx[0] = lowest_const_idx
-        self._traverse_lowest_cost(node_idx, lowest_const_idx, [lowest_cost],
-                                   final_idx)
+        return (np.concatenate(box_res), np.concatenate(leaf_res))
 
-    def _raycast(self, res: List[Body], node_idx: int, p: Matrix,
-                 d: Matrix) -> None:
-        if node_idx < 0:
+    def _query_nodes(self, node_idx: int, aabb: AABB, res: List[Body]):
+        if node_idx == -1:
             return
 
-        if self._tree[node_idx]._aabb.raycast(p, d):
-            if self._tree[node_idx].is_leaf():
-                tmp: Optional[Body] = self._tree[node_idx]._body
-                assert tmp is not None
-                res.append(tmp)
-            else:
-                self._raycast(res, self._tree[node_idx]._left_idx, p, d)
-                self._raycast(res, self._tree[node_idx]._right_idx, p, d)
+        bounds: Tuple[float, float, float, float] = aabb_bounds(aabb)
+        leaf_idx: np.ndarray = self._query_leaves(node_idx,
+                                                  np.array([bounds[0:2]]),
+                                                  np.array([bounds[2:4]]))[1]
+        res.extend(self._leaf_body(idx) for idx in leaf_idx.tolist())
 
-    def _generate(self, node_idx: int, pairs: List[Tuple[Body, Body]]) -> None:
-        if node_idx < 0 or self._tree[node_idx].is_leaf():
-            return
+    def _traverse_lowest_cost(self, node_idx: int, box_idx: int) -> int:
+        '''descend from the box to the node of the lowest cost to merge
+        the node with'''
+        while True:
+            if self._is_leaf(box_idx) and box_idx != self._root_idx:
+                return box_idx
 
-        left_idx: int = self._tree[node_idx]._left_idx
-        right_idx: int = self._tree[node_idx]._right_idx
-        res: bool = self._tree[left_idx]._aabb.collide(
-            self._tree[right_idx]._aabb)
+            area: float = self._area(box_idx)
+            union_area: float = self._union_area(node_idx, box_idx)
 
-        if res:
-            self._generate2(left_idx, right_idx, pairs)
+            cost: float = 2.0 * area
+            inherit_cost: float = 2.0 * (union_area - area)
 
-        self._generate(left_idx, pairs)
-        self._generate(right_idx, pairs)
+            left_idx: int = int(self._left[box_idx])
+            right_idx: int = int(self._right[box_idx])
+            left_cost: float = self._accumulate_cost(node_idx, left_idx,
+                                                     inherit_cost)
+            right_cost: float = self._accumulate_cost(node_idx, right_idx,
+                                                      inherit_cost)
 
-    def _generate2(self, left_idx: int, right_idx: int,
-                   pairs: List[Tuple[Body, Body]]) -> None:
-        if left_idx < 0 or right_idx < 0:
-            return
+            if cost < left_cost and cost < right_cost:
+                return box_idx
 
-        left_aabb: AABB = self._tree[left_idx]._aabb
-        right_aabb: AABB = self._tree[right_idx]._aabb
-        res: bool = left_aabb.collide(right_aabb) or left_aabb.is_subset(
-            right_aabb) or right_aabb.is_subset(left_aabb)
+            box_idx = right_idx if left_cost > right_cost else left_idx
 
-        if not res:
-            return
+    def _accumulate_cost(self, node_idx: int, box_idx: int,
+                         inherit_cost: float) -> float:
+        if self._is_leaf(box_idx):
+            return inherit_cost + self._union_area(node_idx, box_idx)
 
-        if self._tree[left_idx].is_leaf() and self._tree[right_idx].is_leaf():
-            tmpl: Optional[Body] = self._tree[left_idx]._body
-            tmpr: Optional[Body] = self._tree[right_idx]._body
-            assert tmpl is not None
-            assert tmpr is not None
+        return self._delta_cost(node_idx, box_idx) + inherit_cost
 
-            if tmpl.bitmask & tmpr.bitmask:
-                # if AABB of A & B overlap
-                if AABB.from_body(tmpl).collide(AABB.from_body(tmpr)):
-                    pairs.append((tmpl, tmpr))
+    def _raycast(self, res: List[Body], node_idx: int, p: Vec2,
+                 d: Vec2) -> None:
+        if node_idx < 0:
+            return
 
-        if self._tree[left_idx].is_leaf() and self._tree[right_idx].is_branch(
-        ):
-            self._generate2(left_idx, self._tree[right_idx]._left_idx, pairs)
-            self._generate2(left_idx, self._tree[right_idx]._right_idx, pairs)
+        px: float = p.x
+        py: float = p.y
+        dx: float = d.x
+        dy: float = d.y
+        nodes: np.ndarray = np.array([node_idx], dtype=np.int64)
+        while len(nodes) > 0:
+            lo: np.ndarray = self._lo[nodes]
+            hi: np.ndarray = self._hi[nodes]
+            # NOTE: the slab test of the ray from the start
+            t_enter: np.ndarray = np.zeros(len(nodes))
+            t_exit: np.ndarray = np.full(len(nodes), Config.Max)
+            hit: np.ndarray = np.ones(len(nodes), dtype=bool)
+            for axis, pa, da in ((0, px, dx), (1, py, dy)):
+                if da == 0.0:
+                    hit &= (lo[:, axis] <= pa) & (pa <= hi[:, axis])
+                    continue
+
+                ta: np.ndarray = (lo[:, axis] - pa) / da
+                tb: np.ndarray = (hi[:, axis] - pa) / da
+                t_enter = np.maximum(t_enter, np.minimum(ta, tb))
+                t_exit = np.minimum(t_exit, np.maximum(ta, tb))
+
+            nodes = nodes[hit & (t_enter <= t_exit)]
+            leaf: np.ndarray = self._left[nodes] == -1
+            res.extend(self._leaf_body(idx) for idx in nodes[leaf].tolist())
+            nodes = nodes[~leaf]
+            nodes = np.concatenate((self._left[nodes], self._right[nodes]))
 
-        if self._tree[right_idx].is_leaf() and self._tree[left_idx].is_branch(
-        ):
-            self._generate2(right_idx, self._tree[left_idx]._left_idx, pairs)
-            self._generate2(right_idx, self._tree[left_idx]._right_idx, pairs)
+    def _generate(self, node_idx: int, pairs: List[Tuple[Body, Body]]) -> None:
+        if node_idx < 0 or self._is_leaf(node_idx):
+            return
 
-        if self._tree[left_idx].is_branch(
-        ) and self._tree[right_idx].is_branch():
-            self._generate2(self._tree[left_idx]._left_idx, right_idx, pairs)
-            self._generate2(self._tree[left_idx]._right_idx, right_idx, pairs)
+        # NOTE: query all the leaves at once, each pair is met from both
+        # of its leaves, keep it from the lower one
+        bodies: List[Body] = list(self._body_table)
+        leaves: np.ndarray = np.fromiter(self._body_table.values(),
+                                         dtype=np.int64,
+                                         count=len(bodies))
+        box_idx, leaf_idx = self._query_leaves(node_idx, self._lo[leaves],
+                                               self._hi[leaves])
+        keep: np.ndarray = leaf_idx > leaves[box_idx]
+        box_idx = box_idx[keep]
+        other_idx: np.ndarray = np.zeros(self._size, dtype=np.int64)
+        other_idx[leaves] = np.arange(len(leaves))
+        other_idx = other_idx[leaf_idx[keep]]
+
+        # NOTE: the pairs whose bitmasks match and tight aabbs overlap
+        masks: np.ndarray = np.array([body.bitmask for body in bodies],
+                                     dtype=np.int64)
+        tight: np.ndarray = np.array(
+            [self._tight_bounds(body) for body in bodies]).reshape(-1, 4)
+        ta: np.ndarray = tight[box_idx]
+        tb: np.ndarray = tight[other_idx]
+        keep = ((masks[box_idx] & masks[other_idx]) != 0) & np.all(
+            (ta[:, 0:2] <= tb[:, 2:4]) & (tb[:, 0:2] <= ta[:, 2:4]), axis=1)
+        pairs.extend(
+            (bodies[i], bodies[j])
+            for i, j in zip(box_idx[keep].tolist(), other_idx[keep].tolist()))
 
     def _extract(self, target_idx: int) -> None:
         another_child_index: int = -1
-        tmp: Optional[Body] = None
 
         if target_idx == self._root_idx:
             self._root_idx = -1
-
-            tmp = self._tree[target_idx]._body
-            assert tmp is not None
-            self._body_table[tmp] = -1
-            self._remove(target_idx)
-            return
-
-        if self._tree[target_idx]._parent_idx == self._root_idx:
-            another_child_index = self._tree[
-                self._root_idx]._right_idx if self._tree[
-                    self._root_idx]._left_idx == target_idx else self._tree[
-                        self._root_idx]._left_idx
-
-            self._separate(target_idx, self._root_idx)
-            self._elevate(another_child_index)
-
-            tmp = self._tree[target_idx]._body
-            assert tmp is not None
-            self._body_table[tmp] = -1
+            self._body_table[self._leaf_body(target_idx)] = -1
             self._remove(target_idx)
             return
 
-        parent_idx: int = self._tree[target_idx]._parent_idx
-        another_child_index = self._tree[parent_idx]._right_idx if self._tree[
-            parent_idx]._left_idx == target_idx else self._tree[
-                parent_idx]._left_idx
-
+        parent_idx: int = int(self._parent[target_idx])
+        another_child_index = self._sibling(target_idx, parent_idx)
         self._separate(target_idx, parent_idx)
         self._elevate(another_child_index)
+        self._upgrade(another_child_index)
 
-        tmp = self._tree[target_idx]._body
-        assert tmp is not None
-        self._body_table[tmp] = -1
+        self._body_table[self._leaf_body(target_idx)] = -1
         self._remove(target_idx)
 
     def _merge(self, node_idx: int, leaf_idx: int) -> int:
         parent_idx: int = self._allocate_node()
-        self._tree[leaf_idx]._parent_idx = parent_idx
-        self._tree[node_idx]._parent_idx = parent_idx
-        self._tree[parent_idx]._left_idx = leaf_idx
-        self._tree[parent_idx]._right_idx = node_idx
-        self._tree[parent_idx]._aabb = AABB.unite(self._tree[node_idx]._aabb,
-                                                  self._tree[leaf_idx]._aabb)
+        self._parent[leaf_idx] = parent_idx
+        self._parent[node_idx] = parent_idx
+        self._left[parent_idx] = leaf_idx
+        self._right[parent_idx] = node_idx
+        self._lo[parent_idx] = np.minimum(self._lo[node_idx],
+                                          self._lo[leaf_idx])
+        self._hi[parent_idx] = np.maximum(self._hi[node_idx],
+                                          self._hi[leaf_idx])
+        self._height[parent_idx] = max(self._height[node_idx],
+                                       self._height[leaf_idx]) + 1
         return parent_idx
 
     def _ll(self, node_idx: int) -> None:
-        if node_idx == -1 or self._tree[node_idx].is_root():
+        if node_idx == -1 or (self._parent[node_idx] == -1
+                              and not self._is_leaf(node_idx)):
             return
 
         parent_idx: int = -1
         grand_idx: int = -1
         right_idx: int = -1
-        if self._tree[node_idx]._parent_idx == self._root_idx:
-            parent_idx = self._tree[node_idx]._parent_idx
-            right_idx = self._tree[node_idx]._right_idx
+        if self._parent[node_idx] == self._root_idx:
+            parent_idx = int(self._parent[node_idx])
+            right_idx = int(self._right[node_idx])
             self._separate(node_idx, parent_idx)
             self._separate(right_idx, node_idx)
             self._join(right_idx, parent_idx)
@@ -358,9 +635,9 @@ class DBVT():
             self._upgrade(parent_idx)
             return
 
-        parent_idx = self._tree[node_idx]._parent_idx
-        grand_idx = self._tree[parent_idx]._parent_idx
-        right_idx = self._tree[node_idx]._right_idx
+        parent_idx = int(self._parent[node_idx])
+        grand_idx = int(self._parent[parent_idx])
+        right_idx = int(self._right[node_idx])
 
         self._separate(parent_idx, grand_idx)
         self._separate(node_idx, parent_idx)
@@ -372,15 +649,16 @@ class DBVT():
         self._upgrade(parent_idx)
 
     def _rr(self, node_idx: int) -> None:
-        if node_idx == -1 or self._tree[node_idx].is_root():
+        if node_idx == -1 or (self._parent[node_idx] == -1
+                              and not self._is_leaf(node_idx)):
             return
 
         parent_idx: int = -1
         grand_idx: int = -1
         left_idx: int = -1
-        if self._tree[node_idx]._parent_idx == self._root_idx:
-            parent_idx = self._tree[node_idx]._parent_idx
-            left_idx = self._tree[node_idx]._left_idx
+        if self._parent[node_idx] == self._root_idx:
+            parent_idx = int(self._parent[node_idx])
+            left_idx = int(self._left[node_idx])
             self._separate(node_idx, parent_idx)
             self._separate(left_idx, node_idx)
             self._join(left_idx, parent_idx)
@@ -389,9 +667,9 @@ class DBVT():
             self._upgrade(parent_idx)
             return
 
-        parent_idx = self._tree[node_idx]._parent_idx
-        grand_idx = self._tree[parent_idx]._parent_idx
-        left_idx = self._tree[node_idx]._left_idx
+        parent_idx = int(self._parent[node_idx])
+        grand_idx = int(self._parent[parent_idx])
+        left_idx = int(self._left[node_idx])
 
         self._separate(parent_idx, grand_idx)
         self._separate(node_idx, parent_idx)
@@ -402,134 +680,163 @@ class DBVT():
         self._upgrade(parent_idx)
 
     def _balance(self, target_idx: int) -> None:
-        if target_idx == -1 or self._tree[target_idx].is_leaf():
+        if target_idx == -1 or self._is_leaf(target_idx):
             return
 
-        left_height: int = self._height(self._tree[target_idx]._left_idx)
-        right_height: int = self._height(self._tree[target_idx]._right_idx)
-        if np.fabs(left_height - right_height) <= 1:
+        left_idx: int = int(self._left[target_idx])
+        right_idx: int = int(self._right[target_idx])
+        left_height: int = self._height_of(left_idx)
+        right_height: int = self._height_of(right_idx)
+        if abs(left_height - right_height) <= 1:
             return
 
         # left unbalance
         if left_height > right_height:
-            ll_height: int = self._height(
-                self._tree[self._tree[target_idx]._left_idx]._left_idx)
-            lr_height: int = self._height(
-                self._tree[self._tree[target_idx]._left_idx]._right_idx)
+            ll_height: int = self._height_of(int(self._left[left_idx]))
+            lr_height: int = self._height_of(int(self._right[left_idx]))
 
             # LR case
             if ll_height < lr_height:
-                self._rr(
-                    self._tree[self._tree[target_idx]._left_idx]._right_idx)
+                self._rr(int(self._right[left_idx]))
             else:
-                self._ll(
-                    self._tree[self._tree[target_idx]._left_idx]._left_idx)
+                self._ll(int(self._left[left_idx]))
 
-            self._ll(self._tree[target_idx]._left_idx)
+            self._ll(int(self._left[target_idx]))
 
         else:  # right unbalance
-            rr_height: int = self._height(
-                self._tree[self._tree[target_idx]._right_idx]._right_idx)
-            rl_height: int = self._height(
-                self._tree[self._tree[target_idx]._right_idx]._left_idx)
+            rr_height: int = self._height_of(int(self._right[right_idx]))
+            rl_height: int = self._height_of(int(self._left[right_idx]))
 
             # RL case
             if rr_height < rl_height:
-                self._ll(
-                    self._tree[self._tree[target_idx]._right_idx]._left_idx)
+                self._ll(int(self._left[right_idx]))
             else:
-                self._rr(
-                    self._tree[self._tree[target_idx]._right_idx]._right_idx)
+                self._rr(int(self._right[right_idx]))
 
-            self._rr(self._tree[target_idx]._right_idx)
+            self._rr(int(self._right[target_idx]))
 
-        self._balance(self._tree[target_idx]._left_idx)
-        self._balance(self._tree[target_idx]._right_idx)
-        self._balance(self._tree[target_idx]._parent_idx)
+        self._balance(int(self._left[target_idx]))
+        self._balance(int(self._right[target_idx]))
+        self._balance(int(self._parent[target_idx]))
 
     def _separate(self, source_idx: int, parent_idx: int) -> None:
         if source_idx < 0 or parent_idx < 0:
             return
 
-        if self._tree[parent_idx]._left_idx == source_idx:
-            self._tree[parent_idx]._left_idx = -1
-        elif self._tree[parent_idx]._right_idx == source_idx:
-            self._tree[parent_idx]._right_idx = -1
-        self._tree[source_idx]._parent_idx = -1
+        if self._left[parent_idx] == source_idx:
+            self._left[parent_idx] = -1
+        elif self._right[parent_idx] == source_idx:
+            self._right[parent_idx] = -1
+        self._parent[source_idx] = -1
 
     def _join(self, node_idx: int, box_idx: int) -> None:
         if node_idx < 0 or box_idx < 0:
             return
 
-        if self._tree[box_idx]._left_idx == -1:
-            self._tree[box_idx]._left_idx = node_idx
-        elif self._tree[box_idx]._right_idx == -1:
-            self._tree[box_idx]._right_idx = node_idx
-        self._tree[node_idx]._parent_idx = box_idx
+        if self._left[box_idx] == -1:
+            self._left[box_idx] = node_idx
+        elif self._right[box_idx] == -1:
+            self._right[box_idx] = node_idx
+        self._parent[node_idx] = box_idx
 
     def _remove(self, target_idx: int) -> None:
-        self._tree[target_idx].clear()
+        self._lo[target_idx] = 0.0
+        self._hi[target_idx] = 0.0
+        self._parent[target_idx] = -1
+        self._left[target_idx] = -1
+        self._right[target_idx] = -1
+        self._height[target_idx] = 0
+        self._bodies[target_idx] = None
         self._empty_list.append(target_idx)
 
     def _elevate(self, target_idx: int) -> None:
-        if self._tree[target_idx]._parent_idx == self._root_idx:
+        if self._parent[target_idx] == self._root_idx:
             self._remove(self._root_idx)
             self._root_idx = target_idx
-            self._tree[target_idx]._parent_idx = -1
+            self._parent[target_idx] = -1
             return
 
-        parent_idx: int = self._tree[target_idx]._parent_idx
-        grand_idx: int = self._tree[parent_idx]._parent_idx
+        parent_idx: int = int(self._parent[target_idx])
+        grand_idx: int = int(self._parent[parent_idx])
         self._separate(target_idx, parent_idx)
         self._separate(parent_idx, grand_idx)
         self._join(target_idx, grand_idx)
         self._remove(parent_idx)
 
     def _upgrade(self, node_idx: int) -> None:
-        if node_idx < 0 or self._tree[node_idx].is_leaf():
-            return
-
-        self._tree[node_idx]._aabb = AABB.unite(
-            self._tree[self._tree[node_idx]._left_idx]._aabb,
-            self._tree[self._tree[node_idx]._right_idx]._aabb)
-
-        self._upgrade(self._tree[node_idx]._parent_idx)
+        '''refit the bounds and the heights from the node to the root'''
+        while node_idx >= 0:
+            left_idx: int = int(self._left[node_idx])
+            right_idx: int = int(self._right[node_idx])
+            if left_idx != -1 and right_idx != -1:
+                self._lo[node_idx] = np.minimum(self._lo[left_idx],
+                                                self._lo[right_idx])
+                self._hi[node_idx] = np.maximum(self._hi[left_idx],
+                                                self._hi[right_idx])
+                self._height[node_idx] = max(self._height[left_idx],
+                                             self._height[right_idx]) + 1
+
+            node_idx = int(self._parent[node_idx])
 
     def _calc_lowest_cost_node(self, node_idx: int) -> int:
-        lowest_cost: List[float] = [Config.Max]
-        target_idx: List[int] = [-1]
-
-        # start traverse lowest cost node
-        # the lowest_cost is not returned
-        self._traverse_lowest_cost(node_idx, self._root_idx, lowest_cost,
-                                   target_idx)
-        return target_idx[0]
+        return self._traverse_lowest_cost(node_idx, self._root_idx)
 
     def _total_cost(self, node_idx: int, leaf_idx: int) -> float:
-        total_cost: float = AABB.unite(
-            self._tree[node_idx]._aabb,
-            self._tree[leaf_idx]._aabb).surface_area()
-        cur_idx: int = self._tree[leaf_idx]._parent_idx
+        total_cost: float = self._union_area(node_idx, leaf_idx)
+        cur_idx: int = int(self._parent[leaf_idx])
 
         while cur_idx != -1:
             total_cost += self._delta_cost(node_idx, cur_idx)
-            cur_idx = self._tree[cur_idx]._parent_idx
+            cur_idx = int(self._parent[cur_idx])
 
         return total_cost
 
     def _delta_cost(self, node_idx: int, box_idx: int) -> float:
-        return AABB.unite(self._tree[box_idx]._aabb,
-                          self._tree[node_idx]._aabb).surface_area(
-                          ) - self._tree[box_idx]._aabb.surface_area()
+        return self._union_area(box_idx, node_idx) - self._area(box_idx)
+
+    def _area(self, node_idx: int) -> float:
+        lo: List[float] = self._lo[node_idx].tolist()
+        hi: List[float] = self._hi[node_idx].tolist()
+        return (hi[0] - lo[0] + hi[1] - lo[1]) * 2.0
+
+    def _union_area(self, node_idx: int, box_idx: int) -> float:
+        '''surface area of the union of the two nodes'''
+        alo: List[float] = self._lo[node_idx].tolist()
+        ahi: List[float] = self._hi[node_idx].tolist()
+        blo: List[float] = self._lo[box_idx].tolist()
+        bhi: List[float] = self._hi[box_idx].tolist()
+        return (max(ahi[0], bhi[0]) - min(alo[0], blo[0]) +
+                max(ahi[1], bhi[1]) - min(alo[1], blo[1])) * 2.0
 
     def _allocate_node(self) -> int:
         if len(self._empty_list) > 0:
             return self._empty_list.pop()
 
-        self._tree.append(DBVT.Node())
-        return len(self._tree) - 1
-
-    def _height(self, target_idx: int) -> int:
-        return 0 if target_idx < 0 else np.fmax(
-            self._height(self._tree[target_idx]._left_idx),
-            self._height(self._tree[target_idx]._right_idx)) + 1
+        if self._size == len(self._parent):
+            self._grow()
+
+        self._size += 1
+        return self._size - 1
+
+    def _grow(self) -> None:
+        '''double the pool, the new rows are free'''
+        num: int = len(self._parent)
+        cap: int = max(16, num * 2)
+        lo: np.ndarray = np.zeros((cap, 2))
+        hi: np.ndarray = np.zeros((cap, 2))
+        lo[:num] = self._lo
+        hi[:num] = self._hi
+        self._lo = lo
+        self._hi = hi
+        for name in ('_parent', '_left', '_right'):
+            arr: np.ndarray = np.full(cap, -1, dtype=np.int64)
+            arr[:num] = getattr(self, name)
+            setattr(self, name, arr)
+
+        height: np.ndarray = np.zeros(cap, dtype=np.int64)
+        height[:num] = self._height
+        self._height = height
+        self._bodies.extend([None] * (cap - num))
+
+    def _height_of(self, target_idx: int) -> int:
+        return 0 if target_idx < 0 else int(self._height[target_idx])
@@ -1,26 +1,306 @@
-from typing import List, Dict, Optional, Tuple
+import math
+from typing import List, Dict, Optional, Set, Tuple, Union
 
-import numpy as np
-
-from ...math.matrix import Matrix
-from .aabb import AABB
+from ...math.linalg import Vec2
+from ...common.config import Config
+from ...common.profiler import Profiler
+from ...dynamics.body import Body
+from .aabb import AABB, aabb_bounds, bounds_overlap, ray_bounds
 
 
 class UniformGrid():
-    def __init__(self):
-        self._grid_size: float = 1.0
+    '''Hashed uniform grid broadphase
+
+    The cells are keyed by their integer coords in a dict, so the grid
+    is unbounded and only the occupied cells are stored. Each body keeps
+    its tight aabb and the range of the cells it overlaps, `update` only
+    touches the cells the body entered or left. A pair is reported in
+    the first cell shared by the ranges of its bodies only, so the pairs
+    are unique without a set. The bodies over `LargeCells` cells, like
+    the grounds, are not put in the cells but tested against all bodies.
+
+    The cell size fits the bodies of similar size, such as particles and
+    debris, about the size of the largest common body.
+    '''
+    LargeCells: int = 64
+
+    def __init__(self, cell_size: float = 1.0):
+        assert cell_size > 0.0
+        self._cell_size: float = cell_size
+        self._cells: Dict[Tuple[int, int], List[Body]] = {}
+        # NOTE: the tight bounds (x0, y0, x1, y1) and the cell range
+        # (cx0, cy0, cx1, cy1) of the bodies
+        self._bounds: Dict[Body, Tuple[float, float, float, float]] = {}
+        self._ranges: Dict[Body, Tuple[int, int, int, int]] = {}
+        self._large: List[Body] = []
+        # NOTE: the cell range of all the inserted bodies, only grows
+        # until `clear_all`, it bounds the raycast
+        self._extent: Optional[List[int]] = None
+
+    @property
+    def cell_size(self) -> float:
+        return self._cell_size
+
+    @cell_size.setter
+    def cell_size(self, val: float) -> None:
+        '''set the cell size and insert all the bodies again'''
+        assert val > 0.0
+        bodies: List[Body] = list(self._ranges)
+        self.clear_all()
+        self._cell_size = val
+        for body in bodies:
+            self.insert(body)
+
+    def query(self, val: Union[Body, AABB]) -> List[Body]:
+        '''bodies whose aabb overlaps the aabb of the body or the aabb'''
+        bounds: Tuple[float, float, float, float] = aabb_bounds(
+            AABB.from_body(val) if isinstance(val, Body) else val)
+        rng: Tuple[int, int, int, int] = self._cell_range(bounds)
+        cands: List[Body] = list(self._large)
+        seen: Set[Body] = set()
+        for cx in range(rng[0], rng[2] + 1):
+            for cy in range(rng[1], rng[3] + 1):
+                for body in self._cells.get((cx, cy), ()):
+                    if body not in seen:
+                        seen.add(body)
+                        cands.append(body)
+
+        return [
+            body for body in cands
+            if bounds_overlap(bounds, self._bounds[body])
+        ]
+
+    def raycast(self, start: Vec2, dirn: Vec2) -> List[Body]:
+        '''bodies whose aabb is hit by the ray, walk the cells along the
+        ray by the DDA, from the start to the end of the grid extent
+
+        Returns
+        -------
+        List[Body]
+            the bodies in the cells, in the order of the cells along the
+            ray, then the large bodies
+        '''
+        res: List[Body] = []
+        if self._extent is not None:
+            self._raycast_cells(res, start.x, start.y, dirn.x, dirn.y)
+
+        for body in self._large:
+            if ray_bounds(start.x, start.y, dirn.x, dirn.y,
+                          self._bounds[body]) is not None:
+                res.append(body)
+
+        return res
+
+    def generate(self) -> List[Tuple[Body, Body]]:
+        '''pairs of the bodies whose aabbs overlap and bitmasks match'''
+        pairs: List[Tuple[Body, Body]] = []
+        bounds: Dict[Body, Tuple[float, float, float, float]] = self._bounds
+        ranges: Dict[Body, Tuple[int, int, int, int]] = self._ranges
+        for (cx, cy), cell in self._cells.items():
+            num: int = len(cell)
+            for i in range(num - 1):
+                a: Body = cell[i]
+                ra: Tuple[int, int, int, int] = ranges[a]
+                ba: Tuple[float, float, float, float] = bounds[a]
+                for j in range(i + 1, num):
+                    b: Body = cell[j]
+                    rb: Tuple[int, int, int, int] = ranges[b]
+                    # NOTE: skip the pair in all but its first shared cell
+                    if (ra[0] if ra[0] > rb[0] else rb[0]) != cx or (
+                            ra[1] if ra[1] > rb[1] else rb[1]) != cy:
+                        continue
+
+                    bb: Tuple[float, float, float, float] = bounds[b]
+                    if a.bitmask & b.bitmask and ba[0] <= bb[2] and bb[
+                            0] <= ba[2] and ba[1] <= bb[3] and bb[1] <= ba[3]:
+                        pairs.append((a, b))
+
+        for k, a in enumerate(self._large):
+            ba = bounds[a]
+            for b in self._large[k + 1:]:
+                if a.bitmask & b.bitmask and bounds_overlap(ba, bounds[b]):
+                    pairs.append((a, b))
+
+            for b, bb in bounds.items():
+                if a.bitmask & b.bitmask and bounds_overlap(
+                        ba, bb) and not self._is_large(ranges[b]):
+                    pairs.append((a, b))
+
+        return pairs
+
+    def update(self, body: Body) -> None:
+        '''move the body to the cells of its current aabb'''
+        old: Optional[Tuple[int, int, int, int]] = self._ranges.get(body)
+        if old is None:
+            return
+
+        bounds: Tuple[float, float, float,
+                      float] = aabb_bounds(AABB.from_body(body))
+        self._bounds[body] = bounds
+        rng: Tuple[int, int, int, int] = self._cell_range(bounds)
+        if rng == old:
+            return
+
+        self._ranges[body] = rng
+        old_large: bool = self._is_large(old)
+        new_large: bool = self._is_large(rng)
+        if old_large and not new_large:
+            self._large.remove(body)
+            self._add_cells(body, rng)
+        elif not old_large and new_large:
+            self._remove_cells(body, old)
+            self._large.append(body)
+        elif not old_large:
+            self._remove_cells(body, old, rng)
+            self._add_cells(body, rng, old)
+
+        self._grow_extent(rng)
+        Profiler.count('grid_moves')
+
+    def insert(self, body: Body) -> None:
+        if body in self._ranges:
+            self.update(body)
+            return
+
+        bounds: Tuple[float, float, float,
+                      float] = aabb_bounds(AABB.from_body(body))
+        rng: Tuple[int, int, int, int] = self._cell_range(bounds)
+        self._bounds[body] = bounds
+        self._ranges[body] = rng
+        if self._is_large(rng):
+            self._large.append(body)
+        else:
+            self._add_cells(body, rng)
+
+        self._grow_extent(rng)
+
+    def remove(self, body: Body) -> None:
+        rng: Optional[Tuple[int, int, int, int]] = self._ranges.pop(body, None)
+        if rng is None:
+            return
+
+        del self._bounds[body]
+        if self._is_large(rng):
+            self._large.remove(body)
+        else:
+            self._remove_cells(body, rng)
+
+    def clear_all(self) -> None:
+        self._cells = {}
+        self._bounds = {}
+        self._ranges = {}
+        self._large = []
+        self._extent = None
+
+    def _cell_range(
+        self, bounds: Tuple[float, float, float,
+                            float]) -> Tuple[int, int, int, int]:
+        inv: float = 1.0 / self._cell_size
+        return (math.floor(bounds[0] * inv), math.floor(bounds[1] * inv),
+                math.floor(bounds[2] * inv), math.floor(bounds[3] * inv))
+
+    def _is_large(self, rng: Tuple[int, int, int, int]) -> bool:
+        return (rng[2] - rng[0] + 1) * (rng[3] - rng[1] +
+                                        1) > UniformGrid.LargeCells
+
+    def _grow_extent(self, rng: Tuple[int, int, int, int]) -> None:
+        if self._extent is None:
+            self._extent = list(rng)
+            return
+
+        ext: List[int] = self._extent
+        ext[0] = min(ext[0], rng[0])
+        ext[1] = min(ext[1], rng[1])
+        ext[2] = max(ext[2], rng[2])
+        ext[3] = max(ext[3], rng[3])
+
+    def _add_cells(self,
+                   body: Body,
+                   rng: Tuple[int, int, int, int],
+                   skip: Optional[Tuple[int, int, int, int]] = None) -> None:
+        '''add the body to the cells of the range out of the skip range'''
+        for cx in range(rng[0], rng[2] + 1):
+            for cy in range(rng[1], rng[3] + 1):
+                if skip is not None and skip[0] <= cx <= skip[2] and skip[
+                        1] <= cy <= skip[3]:
+                    continue
+
+                cell: Optional[List[Body]] = self._cells.get((cx, cy))
+                if cell is None:
+                    self._cells[(cx, cy)] = [body]
+                else:
+                    cell.append(body)
+
+    def _remove_cells(
+            self,
+            body: Body,
+            rng: Tuple[int, int, int, int],
+            keep: Optional[Tuple[int, int, int, int]] = None) -> None:
+        '''remove the body from the cells of the range out of the keep
+        range, the empty cells are dropped'''
+        for cx in range(rng[0], rng[2] + 1):
+            for cy in range(rng[1], rng[3] + 1):
+                if keep is not None and keep[0] <= cx <= keep[2] and keep[
+                        1] <= cy <= keep[3]:
+                    continue
+
+                cell: List[Body] = self._cells[(cx, cy)]
+                cell.remove(body)
+                if len(cell) == 0:
+                    del self._cells[(cx, cy)]
+
+    def _raycast_cells(self, res: List[Body], px: float, py: float, dx: float,
+                       dy: float) -> None:
+        size: float = self._cell_size
+        assert self._extent is not None
+        ext: List[int] = self._extent
+        clip: Optional[Tuple[float, float]] = ray_bounds(
+            px, py, dx, dy, (ext[0] * size, ext[1] * size, (ext[2] + 1) * size,
+                             (ext[3] + 1) * size))
+        if clip is None:
+            return
 
-    def generate(self) -> List[Tuple[Matrix, Matrix]]:
-        pass
+        t_enter, t_exit = clip
+        # NOTE: clamp the entry cell into the extent against the rounding
+        cx: int = min(max(math.floor((px + dx * t_enter) / size), ext[0]),
+                      ext[2])
+        cy: int = min(max(math.floor((py + dy * t_enter) / size), ext[1]),
+                      ext[3])
+        step_x: int = 1 if dx > 0.0 else -1
+        step_y: int = 1 if dy > 0.0 else -1
+        # NOTE: the ray params of the next cell borders and of a cell
+        t_next_x: float = Config.Max
+        t_next_y: float = Config.Max
+        t_delta_x: float = 0.0
+        t_delta_y: float = 0.0
+        if dx != 0.0:
+            t_next_x = ((cx + (step_x > 0)) * size - px) / dx
+            t_delta_x = size / abs(dx)
+        if dy != 0.0:
+            t_next_y = ((cy + (step_y > 0)) * size - py) / dy
+            t_delta_y = size / abs(dy)
 
-    def raycast(self, p: Matrix, d: Matrix) -> Matrix:
-        pass
+        seen: Set[Body] = set()
+        while True:
+            for body in self._cells.get((cx, cy), ()):
+                if body in seen:
+                    continue
 
-    def update(self, body):
-        pass
+                seen.add(body)
+                if ray_bounds(px, py, dx, dy, self._bounds[body]) is not None:
+                    res.append(body)
 
-    def insert(self, body):
-        pass
+            # NOTE: the ray without direction is the start point only
+            if dx == 0.0 and dy == 0.0:
+                break
 
-    def remove(self, body):
-        pass
+            if t_next_x < t_next_y:
+                if t_next_x > t_exit:
+                    break
+                cx += step_x
+                t_next_x += t_delta_x
+            else:
+                if t_next_y > t_exit:
+                    break
+                cy += step_y
+                t_next_y += t_delta_y
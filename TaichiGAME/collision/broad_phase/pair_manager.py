@@ -0,0 +1,143 @@
+from typing import List, Dict, Optional, Set, Tuple
+
+from ...dynamics.body import Body
+from .aabb import bounds_overlap
+from .dbvt import DBVT
+
+
+class PairManager():
+    '''Persistent pairs of the dbvt
+
+    The pairs of the overlapping fat leaves of the tree are kept in a
+    dict by the (min id, max id) of the bodies, so the bodies need the
+    unique ids of a world. Only the bodies in the move buffer of the
+    tree, the inserted, reinserted and removed ones, change the fat
+    leaves, so `update_pairs` drops their pairs and queries the tree
+    again for them. The pairs added and removed by the last update are
+    the `added_pairs` and the `removed_pairs`, for the users which keep
+    the state of the pairs, such as the contacts. The keys of the pairs
+    of each body are indexed, so an update only walks the pairs of the
+    moved and removed bodies.
+    '''
+    def __init__(self, dbvt: DBVT):
+        self._dbvt: DBVT = dbvt
+        self._pairs: Dict[Tuple[int, int], Tuple[Body, Body]] = {}
+        self._body_pairs: Dict[Body, Set[Tuple[int, int]]] = {}
+        self._added: List[Tuple[Body, Body]] = []
+        self._removed: List[Tuple[Body, Body]] = []
+        # NOTE: the pairs are shared with a snapshot, copy them on write
+        self._shared: bool = False
+
+    @property
+    def dbvt(self) -> DBVT:
+        return self._dbvt
+
+    @property
+    def added_pairs(self) -> List[Tuple[Body, Body]]:
+        '''pairs started to overlap in the last update'''
+        return self._added
+
+    @property
+    def removed_pairs(self) -> List[Tuple[Body, Body]]:
+        '''pairs stopped to overlap or removed in the last update'''
+        return self._removed
+
+    def update_pairs(self) -> None:
+        '''update the pairs of the moved bodies and the pair events'''
+        self._added = []
+        self._removed = []
+        moved, removed = self._dbvt.take_moves()
+        if len(moved) == 0 and len(removed) == 0:
+            return
+
+        self._own()
+        touched: Set[Body] = set(moved)
+        touched.update(removed)
+        dropped: Dict[Tuple[int, int], Tuple[Body, Body]] = {}
+        for body in touched:
+            for key in self._body_pairs.pop(body, ()):
+                pair: Optional[Tuple[Body, Body]] = self._pairs.pop(key, None)
+                if pair is None:
+                    continue
+
+                dropped[key] = pair
+                # NOTE: the other body is still indexed, else the pair
+                # was dropped with it
+                other: Body = pair[1] if pair[0] is body else pair[0]
+                self._body_pairs[other].discard(key)
+
+        for body, other in self._dbvt.query_pairs(moved):
+            pair = (body, other)
+            if other.id < body.id:
+                pair = (other, body)
+            key: Tuple[int, int] = (pair[0].id, pair[1].id)
+            if key in self._pairs:
+                continue
+
+            self._pairs[key] = pair
+            self._body_pairs.setdefault(pair[0], set()).add(key)
+            self._body_pairs.setdefault(pair[1], set()).add(key)
+            old: Optional[Tuple[Body, Body]] = dropped.pop(key, None)
+            if old != pair:
+                if old is not None and old[0].bitmask & old[1].bitmask:
+                    self._removed.append(old)
+                if pair[0].bitmask & pair[1].bitmask:
+                    self._added.append(pair)
+
+        # NOTE: the dropped pairs not found again stopped to overlap
+        self._removed.extend(pair for pair in dropped.values()
+                             if pair[0].bitmask & pair[1].bitmask)
+
+    def generate(self) -> List[Tuple[Body, Body]]:
+        '''update the pairs, then test them by the tight aabbs
+
+        Returns
+        -------
+        List[Tuple[Body, Body]]
+            the pairs of the overlapping bodies whose bitmasks match,
+            ordered by the ids
+        '''
+        self.update_pairs()
+        dbvt: DBVT = self._dbvt
+        return [
+            pair for pair in self._pairs.values()
+            if pair[0].bitmask & pair[1].bitmask and bounds_overlap(
+                dbvt._tight_bounds(pair[0]), dbvt._tight_bounds(pair[1]))
+        ]
+
+    def snapshot(
+        self
+    ) -> Tuple[Dict[Tuple[int, int], Tuple[Body, Body]], Dict[Body, Set[Tuple[
+            int, int]]]]:
+        '''share the pairs with the snapshot, the next update copies them'''
+        self._shared = True
+        return (self._pairs, self._body_pairs)
+
+    def restore(
+        self, state: Tuple[Dict[Tuple[int, int], Tuple[Body, Body]],
+                           Dict[Body, Set[Tuple[int, int]]]]
+    ) -> None:
+        # NOTE: the pairs match the tree restored with them, so no
+        # pair events are made
+        self._pairs, self._body_pairs = state
+        self._shared = True
+        self._added = []
+        self._removed = []
+
+    def clear_all(self) -> None:
+        self._pairs = {}
+        self._body_pairs = {}
+        self._added = []
+        self._removed = []
+        self._shared = False
+
+    def _own(self) -> None:
+        if not self._shared:
+            return
+
+        self._pairs = dict(self._pairs)
+        self._body_pairs = {
+            body: set(keys)
+            for body, keys in self._body_pairs.items()
+        }
+        self._shared = False
@@ -0,0 +1,287 @@
+from bisect import bisect_left, bisect_right
+from math import inf
+from typing import List, Dict, Optional, Set, Tuple, Union
+
+from ...math.linalg import Vec2
+from ...dynamics.body import Body
+from .aabb import AABB, aabb_bounds, bounds_overlap, ray_bounds
+
+
+class SweepAndPrune():
+    '''Sweep and prune broadphase
+
+    The min and max ends of the aabbs of the bodies are kept sorted per
+    axis. The bodies move a little per step, so `generate` sorts the
+    nearly sorted ends again by the insertion sort in about linear time.
+    Only a min passing a max of another body, or the reverse, changes
+    the overlap of the two bodies, so the overlapping pairs are kept in
+    a dict and only the swapped pairs are tested again. The pairs added
+    and removed by the last `generate` are the `added_pairs` and the
+    `removed_pairs`, for the users which track the pairs over the steps.
+
+    The ends are coded as `proxy * 2 + is_max`. After many inserts the
+    ends are sorted and swept from scratch instead. The queries sort the
+    ends first too, and bisect the x values of the sorted x ends to
+    bound the candidates.
+    '''
+    def __init__(self):
+        self._bodies: List[Optional[Body]] = []
+        self._proxy: Dict[Body, int] = {}
+        self._free: List[int] = []
+        # NOTE: the tight bounds (x0, y0, x1, y1) of the proxies
+        self._boxes: List[Tuple[float, float, float, float]] = []
+        self._ends: List[List[int]] = [[], []]
+        # NOTE: the x values of the x ends, valid while sorted
+        self._xs: List[float] = []
+        self._sorted: bool = True
+        # NOTE: the inserts since the last sort
+        self._new: int = 0
+        # NOTE: the overlapping pairs by the (min, max) proxies, and the
+        # pairs of the keys changed since the last `generate` before
+        # the change, None if they did not overlap
+        self._pairs: Dict[Tuple[int, int], Tuple[Body, Body]] = {}
+        self._touched: Dict[Tuple[int, int], Optional[Tuple[Body, Body]]] = {}
+        # NOTE: the keys of the overlapping pairs per proxy
+        self._links: List[Set[Tuple[int, int]]] = []
+        self._added: List[Tuple[Body, Body]] = []
+        self._removed: List[Tuple[Body, Body]] = []
+
+    @property
+    def added_pairs(self) -> List[Tuple[Body, Body]]:
+        '''pairs started to overlap in the last `generate`'''
+        return self._added
+
+    @property
+    def removed_pairs(self) -> List[Tuple[Body, Body]]:
+        '''pairs stopped to overlap or removed in the last `generate`'''
+        return self._removed
+
+    def query(self, val: Union[Body, AABB]) -> List[Body]:
+        bounds: Tuple[float, float, float, float] = aabb_bounds(
+            AABB.from_body(val) if isinstance(val, Body) else val)
+        return [
+            self._body(proxy) for proxy in self._span(bounds[0], bounds[2])
+            if bounds_overlap(bounds, self._boxes[proxy])
+        ]
+
+    def raycast(self, start: Vec2, dirn: Vec2) -> List[Body]:
+        # NOTE: the ray only goes to the side of its x direction
+        lo: float = start.x if dirn.x >= 0.0 else -inf
+        hi: float = start.x if dirn.x <= 0.0 else inf
+        return [
+            self._body(proxy) for proxy in self._span(lo, hi)
+            if ray_bounds(start.x, start.y, dirn.x, dirn.y, self._boxes[proxy])
+            is not None
+        ]
+
+    def generate(self) -> List[Tuple[Body, Body]]:
+        '''sort the ends, update the overlapping pairs and their events
+
+        Returns
+        -------
+        List[Tuple[Body, Body]]
+            the overlapping pairs whose bitmasks match
+        '''
+        self._sort()
+
+        self._added = []
+        self._removed = []
+        for key, old in self._touched.items():
+            new: Optional[Tuple[Body, Body]] = self._pairs.get(key)
+            if old is not None and old != new and old[0].bitmask & old[
+                    1].bitmask:
+                self._removed.append(old)
+            if new is not None and new != old and new[0].bitmask & new[
+                    1].bitmask:
+                self._added.append(new)
+        self._touched = {}
+
+        return [
+            pair for pair in self._pairs.values()
+            if pair[0].bitmask & pair[1].bitmask
+        ]
+
+    def update(self, body: Body) -> None:
+        '''refresh the aabb of the body, the ends move in `generate`'''
+        proxy: Optional[int] = self._proxy.get(body)
+        if proxy is not None:
+            self._boxes[proxy] = aabb_bounds(AABB.from_body(body))
+            self._sorted = False
+
+    def insert(self, body: Body) -> None:
+        if body in self._proxy:
+            self.update(body)
+            return
+
+        if len(self._free) > 0:
+            proxy: int = self._free.pop()
+            self._bodies[proxy] = body
+        else:
+            proxy = len(self._bodies)
+            self._bodies.append(body)
+            self._boxes.append((0.0, 0.0, 0.0, 0.0))
+            self._links.append(set())
+
+        self._proxy[body] = proxy
+        self.update(body)
+        # NOTE: append the ends, the sort moves them into place and
+        # meets the overlapping bodies on the way
+        for ends in self._ends:
+            ends.append(proxy * 2)
+            ends.append(proxy * 2 + 1)
+        self._new += 1
+
+    def remove(self, body: Body) -> None:
+        proxy: Optional[int] = self._proxy.pop(body, None)
+        if proxy is None:
+            return
+
+        # NOTE: the removal keeps the ends sorted
+        for axis, ends in enumerate(self._ends):
+            for end in (proxy * 2, proxy * 2 + 1):
+                idx: int = ends.index(end)
+                del ends[idx]
+                if axis == 0 and self._sorted:
+                    del self._xs[idx]
+
+        for key in self._links[proxy]:
+            self._links[key[0] + key[1] - proxy].discard(key)
+            self._touched.setdefault(key, self._pairs.pop(key))
+        self._links[proxy] = set()
+
+        self._bodies[proxy] = None
+        self._free.append(proxy)
+
+    def clear_all(self) -> None:
+        self._bodies = []
+        self._proxy = {}
+        self._free = []
+        self._boxes = []
+        self._ends = [[], []]
+        self._xs = []
+        self._sorted = True
+        self._new = 0
+        self._pairs = {}
+        self._touched = {}
+        self._links = []
+        self._added = []
+        self._removed = []
+
+    def _body(self, proxy: int) -> Body:
+        body: Optional[Body] = self._bodies[proxy]
+        assert body is not None
+        return body
+
+    def _span(self, lo: float, hi: float) -> List[int]:
+        '''proxies whose x ends may overlap [lo, hi], by the bisect of the
+        sorted x ends'''
+        self._sort()
+        ends: List[int] = self._ends[0]
+        # NOTE: the overlapping proxies have the min end before `end` and
+        # the max end from `beg` on, so scan the shorter side of the two
+        beg: int = bisect_left(self._xs, lo)
+        end: int = bisect_right(self._xs, hi)
+        if end <= len(ends) - beg:
+            return [val >> 1 for val in ends[:end] if not val & 1]
+
+        return [val >> 1 for val in ends[beg:] if val & 1]
+
+    def _sort(self) -> None:
+        '''sort the ends changed since the last sort'''
+        if self._sorted:
+            return
+
+        if self._new * 4 > len(self._proxy):
+            self._rebuild()
+        else:
+            self._sort_axis(0)
+            self._sort_axis(1)
+        self._new = 0
+        self._sorted = True
+
+    def _test_pair(self, p: int, q: int) -> None:
+        '''set the pair of the two proxies by their overlap'''
+        key: Tuple[int, int] = (p, q) if p < q else (q, p)
+        old: Optional[Tuple[Body, Body]] = self._pairs.get(key)
+        if key not in self._touched:
+            self._touched[key] = old
+
+        if bounds_overlap(self._boxes[p], self._boxes[q]):
+            if old is None:
+                body_a: Optional[Body] = self._bodies[key[0]]
+                body_b: Optional[Body] = self._bodies[key[1]]
+                assert body_a is not None and body_b is not None
+                self._pairs[key] = (body_a, body_b)
+                self._links[p].add(key)
+                self._links[q].add(key)
+        elif old is not None:
+            del self._pairs[key]
+            self._links[p].discard(key)
+            self._links[q].discard(key)
+
+    def _sort_axis(self, axis: int) -> None:
+        ends: List[int] = self._ends[axis]
+        boxes: List[Tuple[float, float, float, float]] = self._boxes
+        vals: List[float] = [
+            boxes[end >> 1][axis + 2 * (end & 1)] for end in ends
+        ]
+        for i in range(1, len(ends)):
+            end: int = ends[i]
+            val: float = vals[i]
+            j: int = i - 1
+            # NOTE: the mins go before the maxes of the same value, so
+            # the order of the ends is the inclusive overlap of the aabbs
+            while j >= 0 and (vals[j] > val or
+                              (vals[j] == val and ends[j] & 1 > end & 1)):
+                other: int = ends[j]
+                if (end ^ other) & 1:
+                    self._test_pair(end >> 1, other >> 1)
+
+                ends[j + 1] = other
+                vals[j + 1] = vals[j]
+                j -= 1
+
+            ends[j + 1] = end
+            vals[j + 1] = val
+
+        if axis == 0:
+            self._xs = vals
+
+    def _rebuild(self) -> None:
+        '''sort the ends from scratch and sweep the x axis for the pairs'''
+        boxes: List[Tuple[float, float, float, float]] = self._boxes
+        for axis in range(2):
+            self._ends[axis].sort(key=lambda end: (boxes[end >> 1][axis + 2 * (
+                end & 1)], end & 1))
+        self._xs = [boxes[end >> 1][2 * (end & 1)] for end in self._ends[0]]
+
+        pairs: Dict[Tuple[int, int], Tuple[Body, Body]] = {}
+        active: List[int] = []
+        for end in self._ends[0]:
+            proxy: int = end >> 1
+            if end & 1:
+                active.remove(proxy)
+                continue
+
+            box: Tuple[float, float, float, float] = boxes[proxy]
+            for other in active:
+                if box[1] <= boxes[other][3] and boxes[other][1] <= box[3]:
+                    key: Tuple[int, int] = (min(proxy,
+                                                other), max(proxy, other))
+                    body_a: Optional[Body] = self._bodies[key[0]]
+                    body_b: Optional[Body] = self._bodies[key[1]]
+                    assert body_a is not None and body_b is not None
+                    pairs[key] = (body_a, body_b)
+            active.append(proxy)
+
+        for key, pair in self._pairs.items():
+            self._touched.setdefault(key, pair)
+        for key in pairs:
+            self._touched.setdefault(key, None)
+        self._pairs = pairs
+
+        for links in self._links:
+            links.clear()
+        for key in pairs:
+            self._links[key[0]].add(key)
+            self._links[key[1]].add(key)
@@ -6,7 +6,7 @@ from ..broad_phase.aabb import AABB
 from ...dynamics.body import Body
 from ..detector import Detector
 from ..broad_phase.dbvh import DBVH
-from ...math.matrix import Matrix
+from ...math.linalg import Vec2
 from ...common.config import Config
 
 
@@ -38,7 +38,7 @@ class CCD():
     def build_trajectory_aabb(
             body: Body,
             dt: float,
-            target: Optional[Matrix] = None) -> Tuple[List[AABBShot], AABB]:
+            target: Optional[Vec2] = None) -> Tuple[List[AABBShot], AABB]:
         assert body != None
 
         traj = []  # HACK: add type hint
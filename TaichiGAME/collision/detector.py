@@ -1,8 +1,7 @@
 from typing import List, Optional
 
-import numpy as np
-
-from ..math.matrix import Matrix
+from ..common.config import Config
+from ..math.linalg import Vec2
 from ..dynamics.body import Body
 from .algorithm.clip import ContactGenerator
 from ..geometry.shape import ShapePrimitive
@@ -16,7 +15,7 @@ class Collsion():
         self._bodya: Optional[Body] = None
         self._bodyb: Optional[Body] = None
         self._contact_list: List[PointPair] = []
-        self._normal: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._normal: Vec2 = Vec2(0.0, 0.0)
         self._penetration: float = 0.0
 
 
@@ -95,7 +94,8 @@ class Detector():
             val_pass: bool = False
             for elem in pair_list:
                 tmp_val: float = (elem._pa - elem._pb).len_square()
-                if np.isclose(tmp_val, res._penetration * res._penetration):
+                if Config.isclose(tmp_val,
+                                  res._penetration * res._penetration):
                     val_pass = True
 
             # if fail, there must be a deeper contact point, use it:
@@ -1,3 +1,17 @@
-from .camera import *
 from .config import *
 from .random import *
+from .profiler import *
+from .handle_table import *
+
+
+# NOTE: the camera and the taichi setup import taichi, load them on
+# the first use, so the headless sim never imports taichi
+def __getattr__(name: str):
+    if name == 'Camera':
+        from .camera import Camera
+        return Camera
+    elif name == 'ti_init':
+        from .ti_setup import ti_init
+        return ti_init
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -415,12 +415,15 @@ class Camera():
             return
 
         assert self._dbvt is not None
-        self.render_dbvt(gui, self._dbvt.tree()[node_idx]._left_idx)
-        self.render_dbvt(gui, self._dbvt.tree()[node_idx]._right_idx)
-
-        aabb: AABB = self._dbvt.tree()[node_idx]._aabb
-        if not self._dbvt.tree()[node_idx].is_leaf():
-            self.render_aabb(gui, aabb)
+        # NOTE: the node views are made on each call of `tree`
+        tree: List[DBVT.Node] = self._dbvt.tree()
+        stack: List[int] = [node_idx]
+        while len(stack) > 0:
+            node: DBVT.Node = tree[stack.pop()]
+            if not node.is_leaf():
+                self.render_aabb(gui, node._aabb)
+                stack.append(node._left_idx)
+                stack.append(node._right_idx)
 
     def render_contact(self, gui: ti.GUI) -> None:
         pass
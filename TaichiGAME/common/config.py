@@ -29,6 +29,10 @@ class Config():
     QueryRaycasOutLineColor: int = 0x33FFFF
     JointPointColor: int = 0xFF0000
     JointLineColor: int = 0x0000FF
+    # taichi, the offline cache of the compiled kernels, see `ti_init`,
+    # the empty dir is the default one of taichi
+    OfflineCache: bool = True
+    OfflineCacheDir: str = ''
 
     T = TypeVar('T', float, int)
 
@@ -42,3 +46,9 @@ class Config():
             return high
         else:
             return num
+
+    @staticmethod
+    def isclose(a: float, b: float) -> bool:
+        '''np.isclose of two scalars with its default tolerances, without
+        the numpy call overhead'''
+        return abs(a - b) <= 1e-08 + 1e-05 * abs(b)
@@ -0,0 +1,113 @@
+from typing import Any, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class HandleTable(Generic[T]):
+    '''Generational handle table with O(1) insert, lookup and removal.
+
+    A handle packs the slot of the object into the low 32 bits and the
+    generation of the slot into the high bits. Removing an object bumps
+    the generation of its slot, so a stale handle never finds the next
+    object of a reused slot. The objects are also kept in a dense list
+    compacted by swap-remove, so iterating them does not skip holes.
+    '''
+    SlotBits: int = 32
+    SlotMask: int = (1 << SlotBits) - 1
+
+    def __init__(self):
+        # NOTE: per slot, the generation starts at 1 so 0 is never
+        # a valid handle
+        self._gens: List[int] = []
+        self._dense_idx: List[int] = []
+        self._free: List[int] = []
+        # NOTE: the dense objects and their handles
+        self._dense: List[T] = []
+        self._handles: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._dense)
+
+    def __contains__(self, handle: int) -> bool:
+        return self._find(handle) >= 0
+
+    @property
+    def values(self) -> List[T]:
+        '''dense list of the objects, changed by insert and remove'''
+        return self._dense
+
+    @property
+    def handles(self) -> List[int]:
+        return self._handles
+
+    def insert(self, obj: T) -> int:
+        '''add the object and return its new handle'''
+        if len(self._free) > 0:
+            slot: int = self._free.pop()
+        else:
+            slot = len(self._gens)
+            self._gens.append(1)
+            self._dense_idx.append(-1)
+
+        handle: int = (self._gens[slot] << HandleTable.SlotBits) | slot
+        self._dense_idx[slot] = len(self._dense)
+        self._dense.append(obj)
+        self._handles.append(handle)
+        return handle
+
+    def get(self, handle: int) -> Optional[T]:
+        idx: int = self._find(handle)
+        return None if idx < 0 else self._dense[idx]
+
+    def remove(self, handle: int) -> Optional[T]:
+        '''remove the object of the handle
+
+        Returns
+        -------
+        Optional[T]
+            the removed object, None if the handle is stale
+        '''
+        idx: int = self._find(handle)
+        if idx < 0:
+            return None
+
+        slot: int = handle & HandleTable.SlotMask
+        res: T = self._dense[idx]
+        last: int = len(self._dense) - 1
+        if idx != last:
+            self._dense[idx] = self._dense[last]
+            self._handles[idx] = self._handles[last]
+            self._dense_idx[self._handles[idx] & HandleTable.SlotMask] = idx
+
+        self._dense.pop()
+        self._handles.pop()
+        self._dense_idx[slot] = -1
+        self._gens[slot] += 1
+        self._free.append(slot)
+        return res
+
+    def clear(self) -> None:
+        for handle in list(self._handles):
+            self.remove(handle)
+
+    def save(self) -> Tuple[List[Any], ...]:
+        '''copy the table state, the objects are not copied'''
+        return (list(self._gens), list(self._dense_idx), list(self._free),
+                list(self._dense), list(self._handles))
+
+    def load(self, state: Tuple[List[Any], ...]) -> None:
+        # NOTE: keep the dense list object, it is shared with the users
+        gens, dense_idx, free, dense, handles = state
+        self._gens = list(gens)
+        self._dense_idx = list(dense_idx)
+        self._free = list(free)
+        self._dense[:] = dense
+        self._handles[:] = handles
+
+    def _find(self, handle: int) -> int:
+        slot: int = handle & HandleTable.SlotMask
+        if slot >= len(self._gens) or self._gens[slot] != (
+                handle >> HandleTable.SlotBits):
+            return -1
+
+        return self._dense_idx[slot]
@@ -0,0 +1,184 @@
+import json
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+
+class Stat():
+    '''running and rolling statistics of one stage or counter'''
+    def __init__(self, window: int = 120):
+        self._calls: int = 0
+        self._total: float = 0.0
+        self._last: float = 0.0
+        self._min: float = 0.0
+        self._max: float = 0.0
+        self._window: Deque[float] = deque(maxlen=window)
+
+    def add(self, val: float) -> None:
+        if self._calls == 0:
+            self._min = val
+            self._max = val
+        else:
+            self._min = min(self._min, val)
+            self._max = max(self._max, val)
+
+        self._calls += 1
+        self._total += val
+        self._last = val
+        self._window.append(val)
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    @property
+    def total(self) -> float:
+        return self._total
+
+    @property
+    def last(self) -> float:
+        return self._last
+
+    @property
+    def min(self) -> float:
+        return self._min
+
+    @property
+    def max(self) -> float:
+        return self._max
+
+    @property
+    def mean(self) -> float:
+        return 0.0 if self._calls == 0 else self._total / self._calls
+
+    @property
+    def rolling_mean(self) -> float:
+        if len(self._window) == 0:
+            return 0.0
+        return sum(self._window) / len(self._window)
+
+    @property
+    def rolling_max(self) -> float:
+        return max(self._window, default=0.0)
+
+    def to_dict(self, scale: float = 1.0) -> Dict[str, float]:
+        return {
+            'calls': self._calls,
+            'total': self._total * scale,
+            'last': self._last * scale,
+            'min': self._min * scale,
+            'max': self._max * scale,
+            'mean': self.mean * scale,
+            'rolling_mean': self.rolling_mean * scale,
+            'rolling_max': self.rolling_max * scale
+        }
+
+
+class Profiler():
+    '''per-stage wall time and per-frame counters of the sim step
+
+    It is a single instance in the project like the RandomGenerator,
+    so the static collision code can count its iterations too. It is
+    disabled by default, then `tic` returns 0.0 and `toc`, `add` and
+    `count` return at once, so the instrumented code pays only a few
+    calls per stage.
+
+    The stage times are in seconds and collected once per frame. The
+    counters are summed over a frame and rolled into their stats by
+    `end_frame`.
+    '''
+    enabled: bool = False
+    window: int = 120
+    frames: int = 0
+    _stages: Dict[str, Stat] = {}
+    _counters: Dict[str, Stat] = {}
+    _frame_counters: Dict[str, int] = {}
+
+    @staticmethod
+    def enable(enabled: bool = True) -> None:
+        Profiler.enabled = enabled
+
+    @staticmethod
+    def reset() -> None:
+        Profiler.frames = 0
+        Profiler._stages = {}
+        Profiler._counters = {}
+        Profiler._frame_counters = {}
+
+    @staticmethod
+    def tic() -> float:
+        return time.perf_counter() if Profiler.enabled else 0.0
+
+    @staticmethod
+    def toc(name: str, start: float) -> None:
+        if Profiler.enabled:
+            Profiler.add(name, time.perf_counter() - start)
+
+    @staticmethod
+    def add(name: str, elapsed: float) -> None:
+        '''add a time sample in seconds to the stage'''
+        if not Profiler.enabled:
+            return
+
+        stat: Optional[Stat] = Profiler._stages.get(name)
+        if stat is None:
+            stat = Stat(Profiler.window)
+            Profiler._stages[name] = stat
+
+        stat.add(elapsed)
+
+    @staticmethod
+    def count(name: str, val: int = 1) -> None:
+        if Profiler.enabled:
+            Profiler._frame_counters[name] = Profiler._frame_counters.get(
+                name, 0) + val
+
+    @staticmethod
+    def end_frame() -> None:
+        '''roll the counters of the frame into their stats'''
+        if not Profiler.enabled:
+            return
+
+        Profiler.frames += 1
+        for name in Profiler._frame_counters:
+            if name not in Profiler._counters:
+                Profiler._counters[name] = Stat(Profiler.window)
+
+        # NOTE: a known counter not hit in this frame adds a zero
+        for name, stat in Profiler._counters.items():
+            stat.add(Profiler._frame_counters.get(name, 0))
+
+        Profiler._frame_counters = {}
+
+    @staticmethod
+    def stage(name: str) -> Optional[Stat]:
+        return Profiler._stages.get(name)
+
+    @staticmethod
+    def counter(name: str) -> Optional[Stat]:
+        return Profiler._counters.get(name)
+
+    @staticmethod
+    def report() -> Dict[str, Any]:
+        '''stats of all stages in ms and of all counters'''
+        return {
+            'frames': Profiler.frames,
+            'stages': {
+                name: stat.to_dict(1e3)
+                for name, stat in Profiler._stages.items()
+            },
+            'counters': {
+                name: stat.to_dict()
+                for name, stat in Profiler._counters.items()
+            }
+        }
+
+    @staticmethod
+    def dump_json(path: Optional[str] = None, indent: int = 2) -> str:
+        '''dump the report as json, also into the file if path is given'''
+        res: str = json.dumps(Profiler.report(), indent=indent)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(res)
+
+        return res
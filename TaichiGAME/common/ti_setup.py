@@ -0,0 +1,26 @@
+from typing import Any
+
+import taichi as ti
+
+from .config import Config
+
+
+def ti_init(arch: Any = None, **kwargs: Any) -> None:
+    '''`ti.init` with the offline cache settings of the Config
+
+    The compiled kernels are saved into the offline cache dir, so the
+    next processes load them instead of compiling them again, see
+    `PhysicsWorld.warmup`. The kwargs are passed to `ti.init` and
+    override the Config, the env vars of taichi, such as
+    `TI_OFFLINE_CACHE_FILE_PATH`, override both.
+
+    Parameters
+    ----------
+    arch : Any
+        arch of `ti.init`, such as `ti.cpu` or `ti.gpu`
+    '''
+    kwargs.setdefault('offline_cache', Config.OfflineCache)
+    if Config.OfflineCacheDir != '':
+        kwargs.setdefault('offline_cache_file_path', Config.OfflineCacheDir)
+
+    ti.init(arch=arch, **kwargs)
@@ -1,4 +1,8 @@
 from .body import *
+from .body_store import *
 from .constraint import *
 from .joint import *
+from .island import *
+from .snapshot import *
 from .phy_world import *
+from .batched_world import *
@@ -0,0 +1,580 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..math.linalg import Vec2
+from ..geometry.shape import Edge, Shape
+from ..collision.broad_phase.aabb import AABB
+from ..collision.detector import Collsion, Detector
+from .body import Body
+from .phy_world import PhysicsWorld
+
+
+class BatchedWorld():
+    '''N independent copies of a template world stepped in lockstep.
+
+    The state of the copies is stored as (num, bodies) arrays and the
+    body params (mass, inertia, shape, fric and restit) are shared with
+    the template. The integration, the broadphase and the contact
+    solver run one numpy op over all copies for each body pair or
+    contact point, so the python overhead scales with the scene size
+    instead of the world count. The circle and edge pairs are detected
+    in batch, the other shapes fall back to `Detector` per copy.
+
+    Joints and sleeping are not supported, a template with joints
+    raises `ValueError`.
+    '''
+    # NOTE: pair kinds of the narrowphase
+    CircleCircle: int = 0
+    CircleEdge: int = 1
+    EdgeCircle: int = 2
+    Generic: int = 3
+
+    def __init__(self, template: PhysicsWorld, num: int):
+        if len(template._joint_list) > 0:
+            raise ValueError('joints are not supported in the batched world')
+
+        assert num > 0
+        store = template.store
+        self._num: int = num
+        self._body_num: int = store.size
+
+        self._gravity: Vec2 = Vec2(template.grav.x, template.grav.y)
+        self._linear_vel_damping: float = template.lin_vel_damping
+        self._ang_vel_damping: float = template.ang_vel_damping
+        self._grav_ena: bool = template.grav_ena
+        self._damping_ena: bool = template.damping_ena
+        self._vel_iter: int = template.vel_iter
+        self._pos_iter: int = template.pos_iter
+        self._penetration_max: float = template.maintainer._penetration_max
+        self._bias_factor: float = template.maintainer._bias_factor
+
+        # shared body params
+        self._mass: np.ndarray = store.mass.copy()
+        self._inv_mass: np.ndarray = store.inv_mass.copy()
+        self._inv_inertia: np.ndarray = store.inv_inertia.copy()
+        self._type: np.ndarray = store.type.copy()
+        self._fric: np.ndarray = np.array([bd.fric for bd in store.bodies])
+        self._restit: np.ndarray = np.array([bd.restit for bd in store.bodies])
+        self._bitmask: List[int] = [bd.bitmask for bd in store.bodies]
+        self._shapes: List[Shape] = [bd.shape for bd in store.bodies]
+        self._radius: np.ndarray = np.array(
+            [BatchedWorld._bound_radius(bd) for bd in store.bodies])
+
+        # NOTE: bodies to run the `Detector` for the generic pairs, the
+        # id keeps the pair order of the template
+        self._scratch: List[Body] = []
+        for i, bd in enumerate(store.bodies):
+            scratch: Body = Body()
+            scratch.shape = bd.shape
+            scratch.id = i + 1
+            self._scratch.append(scratch)
+
+        # per copy state
+        self._pos: np.ndarray = np.repeat(store.pos[None], num, axis=0)
+        self._vel: np.ndarray = np.repeat(store.vel[None], num, axis=0)
+        self._rot: np.ndarray = np.repeat(store.rot[None], num, axis=0)
+        self._ang_vel: np.ndarray = np.repeat(store.ang_vel[None], num, axis=0)
+        self._forces: np.ndarray = np.repeat(store.forces[None], num, axis=0)
+        self._torques: np.ndarray = np.repeat(store.torques[None], num, axis=0)
+        self._init_state: Tuple[np.ndarray, ...] = ()
+        self.save_init()
+
+        self._pair_a: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._pair_b: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._pair_kind: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._build_pairs()
+        # NOTE: accumulated (normal, tangent) impulses of the contact
+        # points of the colliding pairs, (num, 2, 2) for each pair
+        self._accum: Dict[int, np.ndarray] = {}
+
+    @property
+    def num(self) -> int:
+        return self._num
+
+    @property
+    def body_num(self) -> int:
+        return self._body_num
+
+    # NOTE: (num, bodies, ...) arrays, write them to set the
+    # initial conditions of each copy
+    @property
+    def pos(self) -> np.ndarray:
+        return self._pos
+
+    @property
+    def vel(self) -> np.ndarray:
+        return self._vel
+
+    @property
+    def rot(self) -> np.ndarray:
+        return self._rot
+
+    @property
+    def ang_vel(self) -> np.ndarray:
+        return self._ang_vel
+
+    @property
+    def forces(self) -> np.ndarray:
+        return self._forces
+
+    @property
+    def torques(self) -> np.ndarray:
+        return self._torques
+
+    def save_init(self, idx: Optional[np.ndarray] = None) -> None:
+        '''save the current state of the copies as their reset state
+
+        Parameters
+        ----------
+        idx : Optional[np.ndarray], optional
+            index or bool mask of the copies, all copies if None,
+            by default None
+        '''
+        state: Tuple[np.ndarray, ...] = self._state()
+        if idx is None or len(self._init_state) == 0:
+            self._init_state = tuple(arr.copy() for arr in state)
+            return
+
+        for dst, src in zip(self._init_state, state):
+            dst[idx] = src[idx]
+
+    def reset(self, idx: Optional[np.ndarray] = None) -> None:
+        '''reset the copies to their saved initial state
+
+        Parameters
+        ----------
+        idx : Optional[np.ndarray], optional
+            index or bool mask of the copies, all copies if None,
+            by default None
+        '''
+        if idx is None:
+            idx = np.arange(self._num)
+
+        for dst, src in zip(self._state(), self._init_state):
+            dst[idx] = src[idx]
+
+        for acc in self._accum.values():
+            acc[idx] = 0.0
+
+    def sync_world(self, idx: int, world: PhysicsWorld) -> None:
+        '''copy the state of the copy idx into the bodies of the world
+        built from the same template, such as to render it'''
+        store = world.store
+        assert store.size == self._body_num
+        store.pos[:] = self._pos[idx]
+        store.vel[:] = self._vel[idx]
+        store.rot[:] = self._rot[idx]
+        store.ang_vel[:] = self._ang_vel[idx]
+
+    def step(self, dt: float, mask: Optional[np.ndarray] = None) -> None:
+        '''step the copies in lockstep
+
+        Parameters
+        ----------
+        dt : float
+            time step
+        mask : Optional[np.ndarray], optional
+            bool mask of the copies to step, all copies if None,
+            by default None
+        '''
+        wid: np.ndarray = np.arange(
+            self._num) if mask is None else np.flatnonzero(mask)
+        if wid.size == 0:
+            return
+
+        self._step_velocity(wid, dt)
+        slots: List[Tuple] = self._prepare_contacts(wid)
+
+        for i in range(self._vel_iter):
+            for slot in slots:
+                self._solve_velocity(slot)
+
+        self._step_position(wid, dt)
+
+        for i in range(self._pos_iter):
+            for slot in slots:
+                self._solve_position(slot)
+
+    def _state(self) -> Tuple[np.ndarray, ...]:
+        return (self._pos, self._vel, self._rot, self._ang_vel, self._forces,
+                self._torques)
+
+    @staticmethod
+    def _bound_radius(body: Body) -> float:
+        # NOTE: the shape is in the AABB at the origin in any rotation
+        scratch: Body = Body()
+        scratch.shape = body.shape
+        aabb: AABB = AABB.from_body(scratch)
+        return aabb.pos.len() + 0.5 * np.hypot(aabb._width, aabb._height)
+
+    def _build_pairs(self) -> None:
+        pair_a: List[int] = []
+        pair_b: List[int] = []
+        pair_kind: List[int] = []
+        for i in range(self._body_num):
+            for j in range(i + 1, self._body_num):
+                if self._type[i] == Body.Type.Static and self._type[
+                        j] == Body.Type.Static:
+                    continue
+
+                if not self._bitmask[i] & self._bitmask[j]:
+                    continue
+
+                kind_a: Shape.Type = self._shapes[i].type
+                kind_b: Shape.Type = self._shapes[j].type
+                kind: int = BatchedWorld.Generic
+                if kind_a == Shape.Type.Circle and kind_b == Shape.Type.Circle:
+                    kind = BatchedWorld.CircleCircle
+                elif kind_a == Shape.Type.Circle and kind_b == Shape.Type.Edge:
+                    kind = BatchedWorld.CircleEdge
+                elif kind_a == Shape.Type.Edge and kind_b == Shape.Type.Circle:
+                    kind = BatchedWorld.EdgeCircle
+
+                pair_a.append(i)
+                pair_b.append(j)
+                pair_kind.append(kind)
+
+        self._pair_a = np.array(pair_a, dtype=np.int64)
+        self._pair_b = np.array(pair_b, dtype=np.int64)
+        self._pair_kind = np.array(pair_kind, dtype=np.int64)
+
+    def _step_velocity(self, wid: np.ndarray, dt: float) -> None:
+        # NOTE: same op order as `PhysicsWorld.step_velocity`
+        static: np.ndarray = np.flatnonzero(self._type == Body.Type.Static)
+        dynamic: np.ndarray = np.flatnonzero(self._type == Body.Type.Dynamic)
+        moving: np.ndarray = np.flatnonzero(
+            (self._type == Body.Type.Dynamic)
+            | (self._type == Body.Type.Kinematic))
+
+        self._vel[np.ix_(wid, static)] = 0.0
+        self._ang_vel[np.ix_(wid, static)] = 0.0
+
+        if self._grav_ena:
+            grav: np.ndarray = np.array([self._gravity.x, self._gravity.y])
+            self._forces[np.ix_(wid,
+                                dynamic)] += grav * self._mass[dynamic, None]
+
+        if moving.size == 0:
+            return
+
+        lvd: float = 1.0
+        avd: float = 1.0
+        if self._damping_ena:
+            lvd = 1.0 / (1.0 + dt * self._linear_vel_damping)
+            avd = 1.0 / (1.0 + dt * self._ang_vel_damping)
+
+        ix: Tuple[np.ndarray, np.ndarray] = np.ix_(wid, moving)
+        vel: np.ndarray = self._vel[ix]
+        vel += self._forces[ix] * dt * self._inv_mass[moving, None]
+        vel *= lvd
+        self._vel[ix] = vel
+
+        ang_vel: np.ndarray = self._ang_vel[ix]
+        ang_vel += self._inv_inertia[moving] * self._torques[ix] * dt
+        ang_vel *= avd
+        self._ang_vel[ix] = ang_vel
+
+    def _step_position(self, wid: np.ndarray, dt: float) -> None:
+        moving: np.ndarray = np.flatnonzero(
+            (self._type == Body.Type.Dynamic)
+            | (self._type == Body.Type.Kinematic))
+        if moving.size == 0:
+            return
+
+        ix: Tuple[np.ndarray, np.ndarray] = np.ix_(wid, moving)
+        self._pos[ix] += self._vel[ix] * dt
+        self._rot[ix] += self._ang_vel[ix] * dt
+        self._forces[ix] = 0.0
+        self._torques[ix] = 0.0
+
+    def _detect(self, pair: int, wid: np.ndarray) -> Tuple[np.ndarray, ...]:
+        # NOTE: return the colliding copies, the contact points on a
+        # and b (k, 2, 2), the normal from b to a (k, 2) and the
+        # point count (k, )
+        a: int = self._pair_a[pair]
+        b: int = self._pair_b[pair]
+        kind: int = self._pair_kind[pair]
+
+        if kind == BatchedWorld.Generic:
+            return self._detect_generic(a, b, wid)
+
+        if kind == BatchedWorld.CircleCircle:
+            ra: float = self._shapes[a].radius
+            rb: float = self._shapes[b].radius
+            ca: np.ndarray = self._pos[wid, a]
+            cb: np.ndarray = self._pos[wid, b]
+            d: np.ndarray = ca - cb
+            dist: np.ndarray = np.sqrt(d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1])
+            hit: np.ndarray = dist < ra + rb
+            normal: np.ndarray = BatchedWorld._normalize(d[hit], dist[hit])
+            pa: np.ndarray = ca[hit] - normal * ra
+            pb: np.ndarray = cb[hit] + normal * rb
+        else:
+            cir, edg = (a, b) if kind == BatchedWorld.CircleEdge else (b, a)
+            radius: float = self._shapes[cir].radius
+            center: np.ndarray = self._pos[wid, cir]
+            near: np.ndarray = self._nearest_on_edge(edg, wid, center)
+            d = center - near
+            dist = np.sqrt(d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1])
+            hit = dist < radius
+            # normal from the edge to the circle
+            normal = BatchedWorld._normalize(d[hit], dist[hit])
+            pcir: np.ndarray = center[hit] - normal * radius
+            if kind == BatchedWorld.CircleEdge:
+                pa, pb = pcir, near[hit]
+            else:
+                pa, pb = near[hit], pcir
+                normal = -normal
+
+        num: int = int(hit.sum())
+        pts_a: np.ndarray = np.zeros((num, 2, 2))
+        pts_b: np.ndarray = np.zeros((num, 2, 2))
+        pts_a[:, 0] = pa
+        pts_b[:, 0] = pb
+        return (wid[hit], pts_a, pts_b, normal, np.ones(num, dtype=np.int64))
+
+    def _detect_generic(self, a: int, b: int,
+                        wid: np.ndarray) -> Tuple[np.ndarray, ...]:
+        sa: Body = self._scratch[a]
+        sb: Body = self._scratch[b]
+        hit: List[int] = []
+        pts_a: List[np.ndarray] = []
+        pts_b: List[np.ndarray] = []
+        normal: List[Tuple[float, float]] = []
+        count: List[int] = []
+        for w in wid:
+            sa.pos = Vec2(self._pos[w, a, 0], self._pos[w, a, 1])
+            sa.rot = self._rot[w, a]
+            sb.pos = Vec2(self._pos[w, b, 0], self._pos[w, b, 1])
+            sb.rot = self._rot[w, b]
+            res: Collsion = Detector.detect(sa, sb)
+            if not res._is_colliding or len(res._contact_list) == 0:
+                continue
+
+            pa: np.ndarray = np.zeros((2, 2))
+            pb: np.ndarray = np.zeros((2, 2))
+            for k, elem in enumerate(res._contact_list[:2]):
+                pa[k] = (elem._pa.x, elem._pa.y)
+                pb[k] = (elem._pb.x, elem._pb.y)
+
+            hit.append(w)
+            pts_a.append(pa)
+            pts_b.append(pb)
+            normal.append((res._normal.x, res._normal.y))
+            count.append(min(len(res._contact_list), 2))
+
+        if len(hit) == 0:
+            return (np.zeros(0, dtype=np.int64), np.zeros(
+                (0, 2, 2)), np.zeros((0, 2, 2)), np.zeros(
+                    (0, 2)), np.zeros(0, dtype=np.int64))
+
+        return (np.array(hit,
+                         dtype=np.int64), np.array(pts_a), np.array(pts_b),
+                np.array(normal), np.array(count, dtype=np.int64))
+
+    def _nearest_on_edge(self, edg: int, wid: np.ndarray,
+                         point: np.ndarray) -> np.ndarray:
+        shape: Edge = self._shapes[edg]
+        rot: np.ndarray = self._rot[wid, edg]
+        cos: np.ndarray = np.cos(rot)[:, None]
+        sin: np.ndarray = np.sin(rot)[:, None]
+        pos: np.ndarray = self._pos[wid, edg]
+        start: np.ndarray = pos + np.hstack(
+            (cos * shape.start.x - sin * shape.start.y,
+             sin * shape.start.x + cos * shape.start.y))
+        end: np.ndarray = pos + np.hstack(
+            (cos * shape.end.x - sin * shape.end.y,
+             sin * shape.end.x + cos * shape.end.y))
+
+        seg: np.ndarray = end - start
+        seg_len2: np.ndarray = seg[:, 0] * seg[:, 0] + seg[:, 1] * seg[:, 1]
+        rel: np.ndarray = point - start
+        t: np.ndarray = (rel[:, 0] * seg[:, 0] + rel[:, 1] *
+                         seg[:, 1]) / np.where(seg_len2 > 0.0, seg_len2, 1.0)
+        t = np.clip(t, 0.0, 1.0)
+        return start + seg * t[:, None]
+
+    @staticmethod
+    def _normalize(vec: np.ndarray, length: np.ndarray) -> np.ndarray:
+        res: np.ndarray = np.zeros_like(vec)
+        res[:, 1] = 1.0
+        ok: np.ndarray = length > 0.0
+        res[ok] = vec[ok] / length[ok, None]
+        return res
+
+    def _prepare_contacts(self, wid: np.ndarray) -> List[Tuple]:
+        # broadphase by the bounding circles of all pairs in all copies
+        pos: np.ndarray = self._pos[wid]
+        d: np.ndarray = pos[:, self._pair_a] - pos[:, self._pair_b]
+        reach: np.ndarray = self._radius[self._pair_a] + self._radius[
+            self._pair_b]
+        cand: np.ndarray = d[..., 0] * d[..., 0] + d[..., 1] * d[
+            ..., 1] <= reach * reach
+
+        slots: List[Tuple] = []
+        accum: Dict[int, np.ndarray] = {}
+        for pair in np.flatnonzero(cand.any(axis=0)):
+            pair = int(pair)
+            hit, pts_a, pts_b, normal, count = self._detect(
+                pair, wid[cand[:, pair]])
+
+            acc: np.ndarray = self._accum.pop(pair, None)
+            if acc is None:
+                acc = np.zeros((self._num, 2, 2))
+
+            # NOTE: the contact points lost in this step drop their
+            # accumulated impulses, the not stepped copies keep them
+            lost: np.ndarray = np.ones((self._num, 2), dtype=bool)
+            lost[hit, 0] = False
+            lost[hit[count > 1], 1] = False
+            lost[np.setdiff1d(np.arange(self._num), wid)] = False
+            acc[lost] = 0.0
+
+            if hit.size > 0:
+                accum[pair] = acc
+                for k in range(2):
+                    sel: np.ndarray = count > k
+                    if sel.any():
+                        slots.append(
+                            self._prepare_slot(pair, k, hit[sel],
+                                               pts_a[sel, k], pts_b[sel, k],
+                                               normal[sel], acc))
+            elif acc.any():
+                accum[pair] = acc
+
+        # NOTE: the separated pairs of the stepped copies drop the
+        # impulses too, keep the ones of the other copies
+        for pair, acc in self._accum.items():
+            acc[wid] = 0.0
+            if acc.any():
+                accum[pair] = acc
+
+        self._accum = accum
+        return slots
+
+    def _prepare_slot(self, pair: int, k: int, w: np.ndarray, pa: np.ndarray,
+                      pb: np.ndarray, normal: np.ndarray,
+                      acc: np.ndarray) -> Tuple:
+        # NOTE: same as `ContactMaintainer.prepare` for all copies
+        a: int = self._pair_a[pair]
+        b: int = self._pair_b[pair]
+        ra: np.ndarray = pa - self._pos[w, a]
+        rb: np.ndarray = pb - self._pos[w, b]
+        tangent: np.ndarray = np.stack((-normal[:, 1], normal[:, 0]), axis=1)
+
+        im_a: float = self._inv_mass[a]
+        im_b: float = self._inv_mass[b]
+        ii_a: float = self._inv_inertia[a]
+        ii_b: float = self._inv_inertia[b]
+
+        rn_a: np.ndarray = BatchedWorld._cross(ra, normal)
+        rn_b: np.ndarray = BatchedWorld._cross(rb, normal)
+        rt_a: np.ndarray = BatchedWorld._cross(ra, tangent)
+        rt_b: np.ndarray = BatchedWorld._cross(rb, tangent)
+
+        k_normal: np.ndarray = im_a + ii_a * rn_a * rn_a
+        k_normal += im_b + ii_b * rn_b * rn_b
+        k_tangent: np.ndarray = im_a + ii_a * rt_a * rt_a
+        k_tangent += im_b + ii_b * rt_b * rt_b
+
+        eff_normal: np.ndarray = np.where(np.isclose(k_normal, 0), 0.0,
+                                          1.0 / k_normal)
+        eff_tangent: np.ndarray = np.where(np.isclose(k_tangent, 0), 0.0,
+                                           1.0 / k_tangent)
+
+        restit: float = min(self._restit[a], self._restit[b])
+        fric: float = np.sqrt(self._fric[a] * self._fric[b])
+        va: np.ndarray = self._vel[w, a] + BatchedWorld._cross_product2(
+            self._ang_vel[w, a], ra)
+        vb: np.ndarray = self._vel[w, b] + BatchedWorld._cross_product2(
+            self._ang_vel[w, b], rb)
+        vel_bias: np.ndarray = (va - vb) * -restit
+
+        impulse: np.ndarray = normal * acc[w, k, 0, None]
+        impulse += tangent * acc[w, k, 1, None]
+        self._apply_impulse(a, w, impulse, ra)
+        self._apply_impulse(b, w, -impulse, rb)
+
+        return (a, b, k, w, ra, rb, normal, tangent, eff_normal, eff_tangent,
+                vel_bias, fric, acc)
+
+    def _solve_velocity(self, slot: Tuple) -> None:
+        # NOTE: same as `ContactMaintainer.solve_velocity` for all copies
+        (a, b, k, w, ra, rb, normal, tangent, eff_normal, eff_tangent,
+         vel_bias, fric, acc) = slot
+
+        dv: np.ndarray = self._relative_vel(a, b, w, ra, rb)
+        jv: np.ndarray = -1.0 * BatchedWorld._dot(normal, dv - vel_bias)
+        lambda_n: np.ndarray = eff_normal * jv
+        old_impulse: np.ndarray = acc[w, k, 0]
+        new_impulse: np.ndarray = np.fmax(old_impulse + lambda_n, 0)
+        acc[w, k, 0] = new_impulse
+        impulse_n: np.ndarray = normal * (new_impulse - old_impulse)[:, None]
+        self._apply_impulse(a, w, impulse_n, ra)
+        self._apply_impulse(b, w, -impulse_n, rb)
+
+        dv = self._relative_vel(a, b, w, ra, rb)
+        lambda_t: np.ndarray = eff_tangent * -BatchedWorld._dot(tangent, dv)
+        max_t: np.ndarray = fric * new_impulse
+        old_impulse = acc[w, k, 1]
+        new_tangent: np.ndarray = np.clip(old_impulse + lambda_t, -max_t,
+                                          max_t)
+        acc[w, k, 1] = new_tangent
+        impulse_t: np.ndarray = tangent * (new_tangent - old_impulse)[:, None]
+        self._apply_impulse(a, w, impulse_t, ra)
+        self._apply_impulse(b, w, -impulse_t, rb)
+
+    def _solve_position(self, slot: Tuple) -> None:
+        # NOTE: same as `ContactMaintainer.solve_position` for all copies
+        (a, b, k, w, ra, rb, normal, tangent, eff_normal, eff_tangent,
+         vel_bias, fric, acc) = slot
+
+        c: np.ndarray = (ra + self._pos[w, a]) - (rb + self._pos[w, b])
+        # already solved by vel
+        sel: np.ndarray = BatchedWorld._dot(c, normal) >= 0.0
+        if not sel.any():
+            return
+
+        w = w[sel]
+        c = c[sel]
+        length: np.ndarray = np.sqrt(c[:, 0] * c[:, 0] + c[:, 1] * c[:, 1])
+        bias: np.ndarray = self._bias_factor * np.fmax(
+            length - self._penetration_max, 0.0)
+        impulse: np.ndarray = normal[sel] * (eff_normal[sel] * bias)[:, None]
+
+        if self._type[a] != Body.Type.Static:
+            self._pos[w, a] += impulse * self._inv_mass[a]
+            self._rot[w, a] += self._inv_inertia[a] * BatchedWorld._cross(
+                ra[sel], impulse)
+
+        if self._type[b] != Body.Type.Static:
+            self._pos[w, b] -= impulse * self._inv_mass[b]
+            self._rot[w, b] -= self._inv_inertia[b] * BatchedWorld._cross(
+                rb[sel], impulse)
+
+    def _relative_vel(self, a: int, b: int, w: np.ndarray, ra: np.ndarray,
+                      rb: np.ndarray) -> np.ndarray:
+        va: np.ndarray = self._vel[w, a] + BatchedWorld._cross_product2(
+            self._ang_vel[w, a], ra)
+        vb: np.ndarray = self._vel[w, b] + BatchedWorld._cross_product2(
+            self._ang_vel[w, b], rb)
+        return va - vb
+
+    def _apply_impulse(self, idx: int, w: np.ndarray, impulse: np.ndarray,
+                       r: np.ndarray) -> None:
+        self._vel[w, idx] += impulse * self._inv_mass[idx]
+        self._ang_vel[w, idx] += self._inv_inertia[idx] * BatchedWorld._cross(
+            r, impulse)
+
+    @staticmethod
+    def _dot(va: np.ndarray, vb: np.ndarray) -> np.ndarray:
+        return va[:, 0] * vb[:, 0] + va[:, 1] * vb[:, 1]
+
+    @staticmethod
+    def _cross(va: np.ndarray, vb: np.ndarray) -> np.ndarray:
+        return va[:, 0] * vb[:, 1] - va[:, 1] * vb[:, 0]
+
+    @staticmethod
+    def _cross_product2(w: np.ndarray, r: np.ndarray) -> np.ndarray:
+        return np.stack((-w * r[:, 1], w * r[:, 0]), axis=1)
@@ -5,7 +5,8 @@ from typing import Optional, Union
 import numpy as np
 
 from ..common.config import Config
-from ..math.matrix import Matrix
+from ..math.linalg import Vec2, Mat2
+from .body_store import BodyStore
 from ..geometry.shape import Capsule, Ellipse, Point, Edge, Curve
 from ..geometry.shape import Polygon, Sector, Shape, Circle, Rectangle
 
@@ -20,8 +21,8 @@ class Body():
 
     class PhysicsAttribute():
         def __init__(self):
-            self._pos: Matrix = Matrix([0.0, 0.0], 'vec')
-            self._vel: Matrix = Matrix([0.0, 0.0], 'vec')
+            self._pos: Vec2 = Vec2(0.0, 0.0)
+            self._vel: Vec2 = Vec2(0.0, 0.0)
             self._rot: float = 0.0
             self._ang_vel: float = 0.0
 
@@ -29,77 +30,110 @@ class Body():
             self._pos += self._vel * dt
             self._rot += self._ang_vel * dt
 
-    def __init__(self):
+    def __init__(self, store: Optional[BodyStore] = None):
         self._id: int = 0
         self._bitmask: int = 1
 
+        # NOTE: the physics state is stored in the row '_idx' of the
+        # '_store', a body without world owns a private store
+        self._store: BodyStore = store if store is not None else BodyStore(1)
+        self._idx: int = self._store.alloc(self)
+
         self._mass: float = 0.0
         self._inv_mass: float = 0.0
         self._inertia: float = 0.0
         self._inv_inertia: float = 0.0
 
-        self._phy_attr = Body.PhysicsAttribute()
-        self._forces: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._torques: float = 0.0
-
         self._shape: Optional[Union[Point, Polygon, Rectangle, Circle, Ellipse,
                                     Edge, Curve, Capsule, Sector]] = None
         self._type = Body.Type.Static
 
-        self._sleep: bool = False
         self._fric: float = 0.2
         self._restit: float = 0.0
 
+    # NOTE: the vector getters return a copy of the stored value,
+    # assign it back to modify the body, such as 'body.vel += dv'
     @property
-    def pos(self) -> Matrix:
-        return self._phy_attr._pos
+    def pos(self) -> Vec2:
+        arr: np.ndarray = self._store._pos
+        return Vec2(arr.item(self._idx, 0), arr.item(self._idx, 1))
 
     @pos.setter
-    def pos(self, pos: Matrix) -> None:
-        self._phy_attr._pos = pos
+    def pos(self, pos: Vec2) -> None:
+        pos = Vec2.from_value(pos)
+        arr: np.ndarray = self._store._pos
+        arr[self._idx, 0] = pos.x
+        arr[self._idx, 1] = pos.y
+        self._store._dirty[self._idx] |= BodyStore.DirtyPos
 
     @property
-    def vel(self) -> Matrix:
-        return self._phy_attr._vel
+    def vel(self) -> Vec2:
+        arr: np.ndarray = self._store._vel
+        return Vec2(arr.item(self._idx, 0), arr.item(self._idx, 1))
 
     @vel.setter
-    def vel(self, vel: Matrix) -> None:
-        self._phy_attr._vel = vel
+    def vel(self, vel: Vec2) -> None:
+        vel = Vec2.from_value(vel)
+        arr: np.ndarray = self._store._vel
+        arr[self._idx, 0] = vel.x
+        arr[self._idx, 1] = vel.y
+        self._store._dirty[self._idx] |= BodyStore.DirtyVel
 
     @property
     def rot(self) -> float:
-        return self._phy_attr._rot
+        return self._store._rot.item(self._idx)
 
     @rot.setter
     def rot(self, rot: float) -> None:
-        self._phy_attr._rot = rot
+        self._store._rot[self._idx] = rot
+        self._store._dirty[self._idx] |= BodyStore.DirtyRot
 
     @property
     def ang_vel(self) -> float:
-        return self._phy_attr._ang_vel
+        return self._store._ang_vel.item(self._idx)
 
     @ang_vel.setter
     def ang_vel(self, ang_vel: float) -> None:
-        self._phy_attr._ang_vel = ang_vel
+        self._store._ang_vel[self._idx] = ang_vel
+        self._store._dirty[self._idx] |= BodyStore.DirtyAngVel
 
     @property
-    def forces(self) -> Matrix:
-        return self._forces
+    def forces(self) -> Vec2:
+        arr: np.ndarray = self._store._forces
+        return Vec2(arr.item(self._idx, 0), arr.item(self._idx, 1))
 
     @forces.setter
-    def forces(self, forces: Matrix) -> None:
-        self._forces = forces
+    def forces(self, forces: Vec2) -> None:
+        forces = Vec2.from_value(forces)
+        arr: np.ndarray = self._store._forces
+        arr[self._idx, 0] = forces.x
+        arr[self._idx, 1] = forces.y
+        self._store._dirty[self._idx] |= BodyStore.DirtyForces
+
+    def clear_forces(self) -> None:
+        self._store._forces[self._idx] = 0.0
+        self._store._dirty[self._idx] |= BodyStore.DirtyForces
 
     @property
     def torques(self) -> float:
-        return self._torques
+        return self._store._torques.item(self._idx)
 
     @torques.setter
     def torques(self, tor: float) -> None:
-        self._torques = tor
+        self._store._torques[self._idx] = tor
+        self._store._dirty[self._idx] |= BodyStore.DirtyTorques
 
     def clear_torque(self) -> None:
-        self._torques = 0.0
+        self._store._torques[self._idx] = 0.0
+        self._store._dirty[self._idx] |= BodyStore.DirtyTorques
+
+    @property
+    def store(self) -> BodyStore:
+        return self._store
+
+    @property
+    def idx(self) -> int:
+        return self._idx
 
     @property
     def shape(self):
@@ -109,6 +143,7 @@ class Body():
     def shape(self, shape):
         self._shape = shape
         self.calc_inertia()
+        self._store._dirty[self._idx] |= BodyStore.DirtyParams
 
     # NOTE: need to achieve type hint
     @property
@@ -119,6 +154,8 @@ class Body():
     @type.setter
     def type(self, val):
         self._type = val
+        self._store._type[self._idx] = val
+        self._store._dirty[self._idx] |= BodyStore.DirtyParams
 
     @property
     def mass(self) -> float:
@@ -133,7 +170,10 @@ class Body():
         else:
             self._inv_mass = 0.0 if np.isclose(mass, 0) else 1.0 / mass
 
+        self._store._mass[self._idx] = mass
+        self._store._inv_mass[self._idx] = self._inv_mass
         self.calc_inertia()
+        self._store._dirty[self._idx] |= BodyStore.DirtyParams
 
     @property
     def inertia(self) -> float:
@@ -143,8 +183,8 @@ class Body():
     # USE AABB.from_body static method
     # def aabb(self, factor: float = 1.0) -> AABB:
     #     prim: ShapePrimitive = ShapePrimitive()
-    #     prim._xform = self._phy_attr._pos
-    #     prim._rot = self._phy_attr._rot
+    #     prim._xform = self.pos
+    #     prim._rot = self.rot
     #     prim._shape = self._shape
     #     return AABB.from_prim(prim, factor)
 
@@ -155,14 +195,29 @@ class Body():
     @fric.setter
     def fric(self, fric: float) -> None:
         self._fric = fric
+        self._store._dirty[self._idx] |= BodyStore.DirtyParams
 
     @property
     def sleep(self) -> bool:
-        return self._sleep
+        return bool(self._store._sleep[self._idx])
 
     @sleep.setter
     def sleep(self, sleep: bool) -> None:
-        self._sleep = sleep
+        self._store._sleep[self._idx] = sleep
+        self._store._sleep_time[self._idx] = 0.0
+
+    @property
+    def sleep_time(self) -> float:
+        return self._store._sleep_time.item(self._idx)
+
+    def wake(self) -> None:
+        self._store._sleep[self._idx] = False
+        self._store._sleep_time[self._idx] = 0.0
+
+    def is_resting(self) -> bool:
+        '''static or sleeping body, which is never moved by the solver'''
+        return self._type == Body.Type.Static or bool(
+            self._store._sleep[self._idx])
 
     @property
     def inv_mass(self) -> float:
@@ -172,32 +227,50 @@ class Body():
     def inv_inertia(self) -> float:
         return self._inv_inertia
 
+    # NOTE: return a snapshot of the state, not a reference
     @property
     def phy_attr(self) -> PhysicsAttribute:
-        return self._phy_attr
+        info: Body.PhysicsAttribute = Body.PhysicsAttribute()
+        info._pos = self.pos
+        info._vel = self.vel
+        info._rot = self.rot
+        info._ang_vel = self.ang_vel
+        return info
 
     @phy_attr.setter
     def phy_attr(self, info: PhysicsAttribute):
-        self._phy_attr = info
+        self.pos = info._pos
+        self.vel = info._vel
+        self.rot = info._rot
+        self.ang_vel = info._ang_vel
 
     def step_position(self, dt: float) -> None:
-        self._phy_attr._pos += self._phy_attr._vel * dt
-        self._phy_attr._rot += self._phy_attr._ang_vel * dt
+        pos: np.ndarray = self._store._pos
+        vel: np.ndarray = self._store._vel
+        idx: int = self._idx
+        pos[idx, 0] = pos.item(idx, 0) + vel.item(idx, 0) * dt
+        pos[idx, 1] = pos.item(idx, 1) + vel.item(idx, 1) * dt
+        self._store._rot[idx] += self._store._ang_vel.item(idx) * dt
+
+    def apply_impulse(self, impulse: Vec2, r: Vec2) -> None:
+        if self._store._sleep[self._idx]:
+            self.wake()
 
-    def apply_impulse(self, impulse: Matrix, r: Matrix) -> None:
-        self._phy_attr._vel += impulse * self._inv_mass
-        self._phy_attr._ang_vel += self._inv_inertia * r.cross(impulse)
+        vel: np.ndarray = self._store._vel
+        ang_vel: np.ndarray = self._store._ang_vel
+        idx: int = self._idx
+        vel[idx, 0] = vel.item(idx, 0) + impulse.x * self._inv_mass
+        vel[idx, 1] = vel.item(idx, 1) + impulse.y * self._inv_mass
+        ang_vel[idx] = ang_vel.item(idx) + self._inv_inertia * r.cross(impulse)
 
-    def to_local_point(self, point: Matrix) -> Matrix:
-        return Matrix.rotate_mat(-self._phy_attr._rot) * (point -
-                                                          self._phy_attr._pos)
+    def to_local_point(self, point: Vec2) -> Vec2:
+        return Mat2.rotate_mat(-self.rot) * (point - self.pos)
 
-    def to_world_point(self, point: Matrix) -> Matrix:
-        return Matrix.rotate_mat(
-            self._phy_attr._rot) * point + self._phy_attr._pos
+    def to_world_point(self, point: Vec2) -> Vec2:
+        return Mat2.rotate_mat(self.rot) * point + self.pos
 
-    def to_actual_point(self, point: Matrix) -> Matrix:
-        return Matrix.rotate_mat(self._phy_attr._rot) * point
+    def to_actual_point(self, point: Vec2) -> Vec2:
+        return Mat2.rotate_mat(self.rot) * point
 
     @property
     def id(self) -> int:
@@ -222,6 +295,7 @@ class Body():
     @restit.setter
     def restit(self, restit: float):
         self._restit = restit
+        self._store._dirty[self._idx] |= BodyStore.DirtyParams
 
     # NOTE: need to achieve type hint
     def calc_inertia(self):
@@ -234,13 +308,13 @@ class Body():
 
         elif shape_type == Shape.Type.Polygon:
             polygon: Polygon = self._shape
-            center: Matrix = polygon.center()
+            center: Vec2 = polygon.center()
 
             sum1: float = 0.0
             sum2: float = 0.0
             for i in range(len(polygon.vertices) - 1):
-                n1: Matrix = polygon.vertices[i] - center
-                n2: Matrix = polygon.vertices[i + 1] - center
+                n1: Vec2 = polygon.vertices[i] - center
+                n2: Vec2 = polygon.vertices[i + 1] - center
                 cross: float = np.fabs(n1.cross(n2))
                 dot: float = n2.dot(n2) + n2.dot(n1) + n1.dot(n1)
                 sum1 += cross * dot
@@ -292,3 +366,5 @@ class Body():
         else:
             self._inv_inertia = 1.0 / self._inertia if not np.isclose(
                 self._inertia, 0) else 0.0
+
+        self._store._inv_inertia[self._idx] = self._inv_inertia
@@ -0,0 +1,265 @@
+from __future__ import annotations
+from typing import List, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .body import Body
+
+
+class BodyStore():
+    '''Structure-of-arrays storage of the body physics state.
+
+    Every body owns one row of the contiguous arrays below and the
+    `Body` object is only an index-backed view over its row, so the
+    world can integrate, damp and clear forces of all bodies with
+    whole-array operations.
+
+    The dynamic state (pos, vel, rot, ang_vel, forces, torques) only
+    lives in the arrays. The per-body parameters (mass, inv_mass,
+    inv_inertia and type) are written through the body setters, which keep
+    their scalar copy on the body for the sequential solver. The sleep
+    state (sleep, sleep_time) is updated by the world for whole islands.
+
+    Rows are kept dense: removing a body moves the last row into
+    the freed slot and updates the index of the moved body.
+
+    The body setters also set the `Dirty*` bits of their row in
+    `_dirty`, so a world holding a device copy of the rows, such as
+    the taichi PhysicsWorld, only uploads the changed values.
+    '''
+    DirtyPos: int = 1
+    DirtyVel: int = 2
+    DirtyRot: int = 4
+    DirtyAngVel: int = 8
+    DirtyForces: int = 16
+    DirtyTorques: int = 32
+    # NOTE: the mass, shape, type, fric and restit of the body
+    DirtyParams: int = 64
+    DirtyAll: int = 127
+
+    _fields: Tuple[str,
+                   ...] = ('_pos', '_vel', '_rot', '_ang_vel', '_forces',
+                           '_torques', '_mass', '_inv_mass', '_inv_inertia',
+                           '_type', '_sleep', '_sleep_time', '_dirty')
+    # NOTE: the rows saved by a snapshot, the params are not included
+    _state_fields: Tuple[str,
+                         ...] = ('_pos', '_vel', '_rot', '_ang_vel', '_forces',
+                                 '_torques', '_sleep', '_sleep_time')
+
+    def __init__(self, capacity: int = 16):
+        assert capacity > 0
+        self._size: int = 0
+        self._bodies: List[Body] = []
+
+        self._pos: np.ndarray = np.zeros((capacity, 2))
+        self._vel: np.ndarray = np.zeros((capacity, 2))
+        self._rot: np.ndarray = np.zeros(capacity)
+        self._ang_vel: np.ndarray = np.zeros(capacity)
+        self._forces: np.ndarray = np.zeros((capacity, 2))
+        self._torques: np.ndarray = np.zeros(capacity)
+        self._mass: np.ndarray = np.zeros(capacity)
+        self._inv_mass: np.ndarray = np.zeros(capacity)
+        self._inv_inertia: np.ndarray = np.zeros(capacity)
+        # NOTE: default val is the Body.Type.Static
+        self._type: np.ndarray = np.ones(capacity, dtype=np.int8)
+        self._sleep: np.ndarray = np.zeros(capacity, dtype=bool)
+        self._sleep_time: np.ndarray = np.zeros(capacity)
+        self._dirty: np.ndarray = np.zeros(capacity, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._rot.shape[0]
+
+    @property
+    def bodies(self) -> List[Body]:
+        return self._bodies
+
+    # NOTE: the array views below only cover the used rows, and are
+    # invalid after the store grows or a body is removed
+    @property
+    def pos(self) -> np.ndarray:
+        return self._pos[:self._size]
+
+    @property
+    def vel(self) -> np.ndarray:
+        return self._vel[:self._size]
+
+    @property
+    def rot(self) -> np.ndarray:
+        return self._rot[:self._size]
+
+    @property
+    def ang_vel(self) -> np.ndarray:
+        return self._ang_vel[:self._size]
+
+    @property
+    def forces(self) -> np.ndarray:
+        return self._forces[:self._size]
+
+    @property
+    def torques(self) -> np.ndarray:
+        return self._torques[:self._size]
+
+    @property
+    def mass(self) -> np.ndarray:
+        return self._mass[:self._size]
+
+    @property
+    def inv_mass(self) -> np.ndarray:
+        return self._inv_mass[:self._size]
+
+    @property
+    def inv_inertia(self) -> np.ndarray:
+        return self._inv_inertia[:self._size]
+
+    @property
+    def type(self) -> np.ndarray:
+        return self._type[:self._size]
+
+    @property
+    def sleep(self) -> np.ndarray:
+        return self._sleep[:self._size]
+
+    @property
+    def sleep_time(self) -> np.ndarray:
+        return self._sleep_time[:self._size]
+
+    @property
+    def dirty(self) -> np.ndarray:
+        return self._dirty[:self._size]
+
+    def nbytes(self) -> int:
+        return sum(arr.nbytes for arr in self._arrays())
+
+    def reserve(self, capacity: int) -> None:
+        if capacity <= self.capacity:
+            return
+
+        for name in BodyStore._fields:
+            old: np.ndarray = getattr(self, name)
+            new: np.ndarray = np.zeros((capacity, ) + old.shape[1:],
+                                       dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def alloc(self, body: Body) -> int:
+        '''alloc a zero-initialized row for the body
+
+        Parameters
+        ----------
+        body : Body
+            body to view the new row
+
+        Returns
+        -------
+        int
+            row index of the body
+        '''
+        if self._size == self.capacity:
+            self.reserve(self.capacity * 2)
+
+        idx: int = self._size
+        self._pos[idx] = 0.0
+        self._vel[idx] = 0.0
+        self._rot[idx] = 0.0
+        self._ang_vel[idx] = 0.0
+        self._forces[idx] = 0.0
+        self._torques[idx] = 0.0
+        self._mass[idx] = 0.0
+        self._inv_mass[idx] = 0.0
+        self._inv_inertia[idx] = 0.0
+        self._type[idx] = 1
+        self._sleep[idx] = False
+        self._sleep_time[idx] = 0.0
+        # NOTE: a new row is not uploaded anywhere yet
+        self._dirty[idx] = BodyStore.DirtyAll
+
+        self._bodies.append(body)
+        self._size += 1
+        return idx
+
+    def free(self, idx: int) -> None:
+        assert 0 <= idx < self._size
+        last: int = self._size - 1
+        if idx != last:
+            for arr in self._arrays():
+                arr[idx] = arr[last]
+
+            moved: Body = self._bodies[last]
+            moved._idx = idx
+            self._bodies[idx] = moved
+
+        self._bodies.pop()
+        self._size -= 1
+
+    def attach(self, body: Body) -> None:
+        '''move the body's row from its current store into this store
+
+        Parameters
+        ----------
+        body : Body
+            body to move
+        '''
+        src: BodyStore = body._store
+        if src is self:
+            return
+
+        src_idx: int = body._idx
+        idx: int = self.alloc(body)
+        for dst_arr, src_arr in zip(self._arrays(), src._arrays()):
+            dst_arr[idx] = src_arr[src_idx]
+
+        src.free(src_idx)
+        body._store = self
+        body._idx = idx
+
+    def detach(self, body: Body) -> None:
+        '''move the body out of this store into a private store'''
+        if body._store is self:
+            BodyStore(1).attach(body)
+
+    def save_state(self) -> Tuple[np.ndarray, ...]:
+        '''copy the used rows of the dynamic state and the sleep state'''
+        return tuple(
+            getattr(self, name)[:self._size].copy()
+            for name in BodyStore._state_fields)
+
+    def load_state(self, state: Tuple[np.ndarray, ...]) -> None:
+        for name, arr in zip(BodyStore._state_fields, state):
+            getattr(self, name)[:self._size] = arr
+        self._dirty[:self._size] |= BodyStore.DirtyAll & ~BodyStore.DirtyParams
+
+    def reorder(self, bodies: List[Body]) -> None:
+        '''move the rows into the order of the bodies
+
+        Parameters
+        ----------
+        bodies : List[Body]
+            all bodies of the store in the new order
+        '''
+        assert len(bodies) == self._size
+        perm: np.ndarray = np.array([body._idx for body in bodies],
+                                    dtype=np.int64)
+        for arr in self._arrays():
+            arr[:self._size] = arr[perm]
+        # NOTE: the rows moved, so every row is changed
+        self._dirty[:self._size] = BodyStore.DirtyAll
+
+        self._bodies = list(bodies)
+        for i, body in enumerate(bodies):
+            body._idx = i
+
+    def clear_forces(self) -> None:
+        self._forces[:self._size] = 0.0
+        self._torques[:self._size] = 0.0
+
+    def _arrays(self) -> List[np.ndarray]:
+        return [getattr(self, name) for name in BodyStore._fields]
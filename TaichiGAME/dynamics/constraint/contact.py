@@ -1,32 +1,37 @@
-from typing import List, Dict, cast
+from __future__ import annotations
+import math
+from itertools import chain, islice
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, cast
 
 import numpy as np
 
-from ...math.matrix import Matrix
+from ...math.linalg import Vec2
 from ...common.config import Config
 from ...collision.algorithm.gjk import PointPair
 from ...collision.detector import Collsion
 from ..body import Body
 
 
-# FIXME:
 def generate_relation(bodya: Body, bodyb: Body) -> int:
-    # Combine two 32-bit id into one 64-bit id in unique form
+    # Combine two 64-bit handle id into one id in unique form
     ida: int = bodya.id
     idb: int = bodyb.id
+    if ida > idb:
+        ida, idb = idb, ida
 
-    return ida + idb
+    return (ida << 64) | idb
 
 
 class VelocityConstraintPoint():
     def __init__(self):
-        self._ra: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._rb: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._va: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._vb: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._normal: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._tangent: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._vel_bias: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._ra: Vec2 = Vec2(0.0, 0.0)
+        self._rb: Vec2 = Vec2(0.0, 0.0)
+        self._va: Vec2 = Vec2(0.0, 0.0)
+        self._vb: Vec2 = Vec2(0.0, 0.0)
+        self._normal: Vec2 = Vec2(0.0, 0.0)
+        self._tangent: Vec2 = Vec2(0.0, 0.0)
+        self._vel_bias: Vec2 = Vec2(0.0, 0.0)
         self._bias: float = 0.0
         self._penetration: float = 0.0
         self._restit: float = 0.8
@@ -41,12 +46,22 @@ class ContactConstraintPoint():
         self._relation: int = 0
         self._fric: float = 0.2
         self._active: bool = True
-        self._locala: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._localb: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._locala: Vec2 = Vec2(0.0, 0.0)
+        self._localb: Vec2 = Vec2(0.0, 0.0)
         self._bodya: Body = Body()
         self._bodyb: Body = Body()
         self._vcp: VelocityConstraintPoint = VelocityConstraintPoint()
 
+    @staticmethod
+    def _restored() -> ContactConstraintPoint:
+        '''new point for `ContactMaintainer.restore`, which sets its
+        relation, bodies, local points and impulses'''
+        res: ContactConstraintPoint = ContactConstraintPoint.__new__(
+            ContactConstraintPoint)
+        res._fric = 0.2
+        res._vcp = VelocityConstraintPoint()
+        return res
+
 
 class ContactMaintainer():
     def __init__(self):
@@ -55,35 +70,112 @@ class ContactMaintainer():
         self._contact_table: Dict[int, List[ContactConstraintPoint]] = {}
 
     def clear_all(self) -> None:
-        self._contact_table.clear()
+        self._contact_table = {}
+
+    def snapshot(
+        self
+    ) -> Tuple[List[int], List[Body], np.ndarray, np.ndarray, np.ndarray]:
+        '''copy the contacts into flat arrays
+
+        Between the steps all the points are inactive and the next step
+        prepares the points it solves again, so only the relations, the
+        bodies, the local points and the accumulated impulses are kept.
+
+        Returns
+        -------
+        Tuple[List[int], List[Body], np.ndarray, np.ndarray, np.ndarray]
+            the relations of the contact lists in the table order, the
+            (bodya, bodyb) of each point, the point num of each list,
+            the (locala, localb, accum normal impulse, accum tangent
+            impulse) rows and the active flags of the points
+        '''
+        points: List[ContactConstraintPoint] = [
+            ccp for val in self._contact_table.values() for ccp in val
+        ]
+        bodies: List[Body] = list(
+            chain.from_iterable(map(attrgetter('_bodya', '_bodyb'), points)))
+        counts: np.ndarray = np.array(
+            [len(val) for val in self._contact_table.values()], dtype=np.int64)
+        vals: np.ndarray = np.array(list(
+            map(
+                attrgetter('_locala.x', '_locala.y', '_localb.x', '_localb.y',
+                           '_vcp._accum_normal_impulse',
+                           '_vcp._accum_tangent_impulse'), points)),
+                                    dtype=np.float64).reshape(-1, 6)
+        active: np.ndarray = np.array(list(map(attrgetter('_active'), points)),
+                                      dtype=bool)
+        return (list(self._contact_table), bodies, counts, vals, active)
+
+    def restore(
+        self, state: Tuple[List[int], List[Body], np.ndarray, np.ndarray,
+                           np.ndarray]
+    ) -> None:
+        '''write the contacts of the snapshot back, the points of the
+        same relations in the current table are reused'''
+        keys, bodies, counts, vals, active = state
+        old: Dict[int, List[ContactConstraintPoint]] = self._contact_table
+        table: Dict[int, List[ContactConstraintPoint]] = {}
+        points: Iterator[Tuple[Body, Body, bool,
+                               List[float]]] = zip(bodies[0::2], bodies[1::2],
+                                                   active.tolist(),
+                                                   vals.tolist())
+        for key, num in zip(keys, counts.tolist()):
+            val: Optional[List[ContactConstraintPoint]] = old.get(key)
+            if val is None or len(val) != num:
+                val = [ContactConstraintPoint._restored() for i in range(num)]
+
+            for ccp, (bodya, bodyb, flag, row) in zip(val, islice(points,
+                                                                  num)):
+                ccp._relation = key
+                ccp._bodya = bodya
+                ccp._bodyb = bodyb
+                ccp._active = flag
+                ccp._locala = Vec2(row[0], row[1])
+                ccp._localb = Vec2(row[2], row[3])
+                vcp: VelocityConstraintPoint = ccp._vcp
+                vcp._accum_normal_impulse = row[4]
+                vcp._accum_tangent_impulse = row[5]
 
-    def solve_velocity(self, dt: float) -> None:
-        for val in self._contact_table.values():
+            table[key] = val
+
+        self._contact_table = table
+
+    # NOTE: the solvers below run over the whole contact table by
+    # default, or only over the given contacts, such as of an island
+    def solve_velocity(
+        self,
+        dt: float,
+        contacts: Optional[Iterable[List[ContactConstraintPoint]]] = None
+    ) -> None:
+        if contacts is None:
+            contacts = self._contact_table.values()
+
+        for val in contacts:
             if len(val) == 0 or not val[0]._active:
                 continue
 
             for ccp in val:
                 vcp: VelocityConstraintPoint = ccp._vcp
-                wa: Matrix = Matrix.cross_product2(ccp._bodya.ang_vel, vcp._ra)
-                wb: Matrix = Matrix.cross_product2(ccp._bodyb.ang_vel, vcp._rb)
+                wa: Vec2 = Vec2.cross_product2(ccp._bodya.ang_vel, vcp._ra)
+                wb: Vec2 = Vec2.cross_product2(ccp._bodyb.ang_vel, vcp._rb)
                 vcp._va = ccp._bodya.vel + wa
                 vcp._vb = ccp._bodyb.vel + wb
 
-                dv: Matrix = vcp._va - vcp._vb
+                dv: Vec2 = vcp._va - vcp._vb
                 jv: float = -1.0 * vcp._normal.dot(dv - vcp._vel_bias)
                 lambda_n: float = vcp._eff_mass_normal * jv
                 old_impulse: float = vcp._accum_normal_impulse
-                vcp._accum_normal_impulse = np.fmax(old_impulse + lambda_n, 0)
+                vcp._accum_normal_impulse = max(old_impulse + lambda_n, 0.0)
 
                 lambda_n = vcp._accum_normal_impulse - old_impulse
-                impulse_n: Matrix = vcp._normal * lambda_n
+                impulse_n: Vec2 = vcp._normal * lambda_n
 
                 ccp._bodya.apply_impulse(impulse_n, vcp._ra)
                 ccp._bodyb.apply_impulse(-impulse_n, vcp._rb)
 
-                vcp._va = ccp._bodya.vel + Matrix.cross_product2(
+                vcp._va = ccp._bodya.vel + Vec2.cross_product2(
                     ccp._bodya.ang_vel, vcp._ra)
-                vcp._vb = ccp._bodyb.vel + Matrix.cross_product2(
+                vcp._vb = ccp._bodyb.vel + Vec2.cross_product2(
                     ccp._bodyb.ang_vel, vcp._rb)
                 dv = vcp._va - vcp._vb
 
@@ -96,13 +188,20 @@ class ContactMaintainer():
                 vcp._accum_tangent_impulse = Config.clamp(
                     old_impulse + lambda_t, -maxT, maxT)
                 lambda_t = vcp._accum_tangent_impulse - old_impulse
-                impulse_t: Matrix = vcp._tangent * lambda_t
+                impulse_t: Vec2 = vcp._tangent * lambda_t
 
                 ccp._bodya.apply_impulse(impulse_t, vcp._ra)
                 ccp._bodyb.apply_impulse(-impulse_t, vcp._rb)
 
-    def solve_position(self, dt: float) -> None:
-        for val in self._contact_table.values():
+    def solve_position(
+        self,
+        dt: float,
+        contacts: Optional[Iterable[List[ContactConstraintPoint]]] = None
+    ) -> None:
+        if contacts is None:
+            contacts = self._contact_table.values()
+
+        for val in contacts:
             if len(val) == 0 or not val[0]._active:
                 continue
 
@@ -110,18 +209,18 @@ class ContactMaintainer():
                 vcp: VelocityConstraintPoint = ccp._vcp
                 bodya: Body = ccp._bodya
                 bodyb: Body = ccp._bodyb
-                pa: Matrix = vcp._ra + bodya.pos
-                pb: Matrix = vcp._rb + bodyb.pos
-                c: Matrix = pa - pb
+                pa: Vec2 = vcp._ra + bodya.pos
+                pb: Vec2 = vcp._rb + bodyb.pos
+                c: Vec2 = pa - pb
 
                 # already solved by vel
                 if c.dot(vcp._normal) < 0.0:
                     continue
 
-                bias: float = self._bias_factor * np.fmax(
+                bias: float = self._bias_factor * max(
                     c.len() - self._penetration_max, 0.0)
                 val_lambda: float = vcp._eff_mass_normal * bias
-                impulse: Matrix = vcp._normal * val_lambda
+                impulse: Vec2 = vcp._normal * val_lambda
 
                 if bodya.type != Body.Type.Static and not ccp._bodya.sleep:
                     bodya.pos += impulse * bodya.inv_mass
@@ -137,6 +236,12 @@ class ContactMaintainer():
         bodya: Body = collision._bodya
         bodyb: Body = collision._bodyb
 
+        # touched by a awake body, the island of the sleeping
+        # body is woken in the next sleep update
+        if bodya.sleep or bodyb.sleep:
+            bodya.wake()
+            bodyb.wake()
+
         # print(f'bodya id: {bodya.id}')
         # print(f'bodyb id: {bodyb.id}')
         relation: int = generate_relation(bodya, bodyb)
@@ -156,15 +261,13 @@ class ContactMaintainer():
             # print(f'pb: ({elem._pb.x},{elem._pb.y})')
 
             existed: bool = False
-            locala: Matrix = bodya.to_local_point(elem._pa)
-            localb: Matrix = bodyb.to_local_point(elem._pb)
+            locala: Vec2 = bodya.to_local_point(elem._pa)
+            localb: Vec2 = bodyb.to_local_point(elem._pb)
 
             for contact in contact_list:
                 # print('x')
-                is_pointa: bool = np.isclose(contact._locala._val,
-                                             locala._val).all()
-                is_pointb: bool = np.isclose(contact._localb._val,
-                                             localb._val).all()
+                is_pointa: bool = contact._locala == locala
+                is_pointb: bool = contact._localb == localb
 
                 if is_pointa and is_pointb:
                     # satisfy the condition, transmit the old
@@ -197,7 +300,7 @@ class ContactMaintainer():
         ccp._bodyb = collision._bodyb
         ccp._active = True
 
-        ccp._fric = np.sqrt(ccp._bodya.fric * ccp._bodyb.fric)
+        ccp._fric = math.sqrt(ccp._bodya.fric * ccp._bodyb.fric)
 
         vcp: VelocityConstraintPoint = ccp._vcp
         vcp._ra = pair._pa - collision._bodya.pos
@@ -222,28 +325,33 @@ class ContactMaintainer():
         k_tangent: float = im_a + ii_a * rt_a * rt_a
         k_tangent += im_b + ii_b * rt_b * rt_b
 
-        vcp._eff_mass_normal = 0.0 if np.isclose(k_normal,
-                                                 0) else 1.0 / k_normal
-        vcp._eff_mass_tangent = 0.0 if np.isclose(k_tangent,
-                                                  0) else 1.0 / k_tangent
+        vcp._eff_mass_normal = 0.0 if Config.isclose(k_normal,
+                                                     0) else 1.0 / k_normal
+        vcp._eff_mass_tangent = 0.0 if Config.isclose(k_tangent,
+                                                      0) else 1.0 / k_tangent
 
-        vcp._restit = np.fmin(ccp._bodya.restit, ccp._bodyb.restit)
+        vcp._restit = min(ccp._bodya.restit, ccp._bodyb.restit)
         vcp._penetration = collision._penetration
 
-        wa: Matrix = Matrix.cross_product2(ccp._bodya.ang_vel, vcp._ra)
-        wb: Matrix = Matrix.cross_product2(ccp._bodyb.ang_vel, vcp._rb)
+        wa: Vec2 = Vec2.cross_product2(ccp._bodya.ang_vel, vcp._ra)
+        wb: Vec2 = Vec2.cross_product2(ccp._bodyb.ang_vel, vcp._rb)
         vcp._va = ccp._bodya.vel + wa
         vcp._vb = ccp._bodyb.vel + wb
 
         vcp._vel_bias = (vcp._va - vcp._vb) * -vcp._restit
 
         # accumulate inherited impulse
-        impulse: Matrix = vcp._normal * vcp._accum_normal_impulse
+        impulse: Vec2 = vcp._normal * vcp._accum_normal_impulse
         impulse += vcp._tangent * vcp._accum_tangent_impulse
 
         ccp._bodya.apply_impulse(impulse, vcp._ra)
         ccp._bodyb.apply_impulse(-impulse, vcp._rb)
 
+    def remove(self, bodya: Body, bodyb: Body) -> None:
+        '''drop the contacts of the pair, such as when the broadphase
+        pair of the bodies is removed'''
+        self._contact_table.pop(generate_relation(bodya, bodyb), None)
+
     def clear_inactive_points(self) -> None:
         clear_list: List[int] = []
         removed_list: List[ContactConstraintPoint] = []
@@ -253,6 +361,11 @@ class ContactMaintainer():
                 clear_list.append(key)
                 continue
 
+            # NOTE: keep the contacts between resting bodies, they
+            # link the sleeping islands and warm start them on waking
+            if val[0]._bodya.is_resting() and val[0]._bodyb.is_resting():
+                continue
+
             for v1 in val:
                 if not v1._active:
                     removed_list.append(v1)
@@ -0,0 +1,365 @@
+from __future__ import annotations
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from .body import Body
+from .body_store import BodyStore
+from .joint.joint import Joint
+from .constraint.contact import ContactConstraintPoint, ContactMaintainer
+
+if TYPE_CHECKING:
+    from .phy_world import PhysicsWorld
+
+
+class Island():
+    '''a group of non-static bodies linked by contacts or joints
+
+    Static bodies never link two islands, the contacts against a static
+    body belong to the island of the other body.
+    '''
+    def __init__(self):
+        self._bodies: List[Body] = []
+        # NOTE: store rows of the bodies
+        self._rows: List[int] = []
+        self._contacts: List[List[ContactConstraintPoint]] = []
+        self._joints: List[Joint] = []
+
+    @property
+    def bodies(self) -> List[Body]:
+        return self._bodies
+
+    @property
+    def rows(self) -> List[int]:
+        return self._rows
+
+    @property
+    def contacts(self) -> List[List[ContactConstraintPoint]]:
+        return self._contacts
+
+    @property
+    def joints(self) -> List[Joint]:
+        return self._joints
+
+
+class IslandBuilder():
+    '''Union-find over the contact pairs and the joint bodies of a store.
+
+    The nodes are the store rows, so `labels` maps each row to the
+    index of its island, and -1 for the static bodies and the free
+    bodies without any contact or joint.
+    '''
+    def __init__(self):
+        self._islands: List[Island] = []
+        self._labels: np.ndarray = np.zeros(0, dtype=np.int64)
+
+    @property
+    def islands(self) -> List[Island]:
+        return self._islands
+
+    @property
+    def labels(self) -> np.ndarray:
+        return self._labels
+
+    def build(self, store: BodyStore,
+              contact_table: Dict[int, List[ContactConstraintPoint]],
+              joint_list: List[Joint]) -> List[Island]:
+        '''rebuild the islands from the current contacts and joints
+
+        Parameters
+        ----------
+        store : BodyStore
+            store of the world bodies
+        contact_table : Dict[int, List[ContactConstraintPoint]]
+            contact table of the ContactMaintainer
+        joint_list : List[Joint]
+            joints of the world
+
+        Returns
+        -------
+        List[Island]
+            islands with at least one constraint
+        '''
+        parent: List[int] = list(range(store.size))
+        linked: List[bool] = [False] * store.size
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        def node(body: Body) -> int:
+            # NOTE: -1 if the body can not be a island member
+            if body._store is not store or body.type == Body.Type.Static:
+                return -1
+            return body._idx
+
+        def union(nodes: List[int]) -> int:
+            nodes = [v for v in nodes if v >= 0]
+            if len(nodes) == 0:
+                return -1
+
+            root: int = find(nodes[0])
+            linked[nodes[0]] = True
+            for v in nodes[1:]:
+                linked[v] = True
+                other: int = find(v)
+                if other != root:
+                    parent[other] = root
+
+            return nodes[0]
+
+        contact_owner: List[int] = []
+        contact_val: List[List[ContactConstraintPoint]] = []
+        for val in contact_table.values():
+            if len(val) == 0:
+                continue
+
+            owner: int = union([node(val[0]._bodya), node(val[0]._bodyb)])
+            if owner >= 0:
+                contact_owner.append(owner)
+                contact_val.append(val)
+
+        joint_owner: List[int] = []
+        joint_val: List[Joint] = []
+        for joint in joint_list:
+            owner = union([node(body) for body in joint.bodies()])
+            if owner >= 0:
+                joint_owner.append(owner)
+                joint_val.append(joint)
+
+        islands: List[Island] = []
+        labels: np.ndarray = np.full(store.size, -1, dtype=np.int64)
+        root_map: Dict[int, int] = {}
+        for i in range(store.size):
+            if not linked[i]:
+                continue
+
+            root: int = find(i)
+            label: int = root_map.get(root, -1)
+            if label < 0:
+                label = len(islands)
+                root_map[root] = label
+                islands.append(Island())
+
+            labels[i] = label
+            islands[label]._bodies.append(store._bodies[i])
+            islands[label]._rows.append(i)
+
+        for owner, val in zip(contact_owner, contact_val):
+            islands[labels[owner]]._contacts.append(val)
+
+        for owner, joint in zip(joint_owner, joint_val):
+            islands[labels[owner]]._joints.append(joint)
+
+        self._islands = islands
+        self._labels = labels
+        return islands
+
+
+class IslandSolver():
+    '''Solve the contacts and joints of every island on its own.
+
+    It replaces the global velocity/position iterations of the step,
+    the islands are independent, so with `workers` > 1 they are cloned
+    and solved in a process pool, then the body states and the
+    accumulated impulses are merged back. Inside one island the solve
+    order is the same as the global loop.
+    '''
+
+    def __init__(self, workers: int = 1):
+        self._workers: int = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    @workers.setter
+    def workers(self, workers: int) -> None:
+        if workers != self._workers:
+            self.close()
+        self._workers = workers
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def solve(self, world: PhysicsWorld, maintainer: ContactMaintainer,
+              dt: float) -> None:
+        '''prepare, solve and integrate the islands of the world
+
+        `PhysicsWorld.step` calls it in place of the prepare, the vel
+        iterations, `step_position` and the pos iterations if it is set
+        as the `island_solver` of the world
+
+        Parameters
+        ----------
+        world : PhysicsWorld
+            world to solve
+        maintainer : ContactMaintainer
+            contacts of the world
+        dt : float
+            time step
+        '''
+        islands: List[Island] = world.build_islands(maintainer)
+        world.prepare_velocity_constraint(dt)
+
+        awake_joints: Set[int] = set(id(j) for j in world._awake_joint_list)
+        tasks: List[Tuple[Island, List[Joint]]] = []
+        for island in islands:
+            if all(body.is_resting() for body in island._bodies):
+                continue
+
+            joints: List[Joint] = [
+                joint for joint in island._joints if id(joint) in awake_joints
+            ]
+            tasks.append((island, joints))
+
+        params: Tuple[float, int, int, float,
+                      float] = (dt, world.vel_iter, world.pos_iter,
+                                maintainer._penetration_max,
+                                maintainer._bias_factor)
+
+        if self._workers > 1 and len(tasks) > 1:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self._workers)
+
+            packs: List[Tuple[Any, ...]] = [
+                _pack_island(island, joints) + params
+                for island, joints in tasks
+            ]
+            chunk: int = -(-len(packs) // self._workers)
+            for (island, joints), res in zip(
+                    tasks,
+                    self._executor.map(_solve_pack, packs, chunksize=chunk)):
+                _merge_island(island, joints, res)
+        else:
+            for island, joints in tasks:
+                _solve_island(island._bodies, island._contacts, joints,
+                              *params)
+
+        skip: np.ndarray = np.zeros(world.store.size, dtype=bool)
+        for island, joints in tasks:
+            skip[island._rows] = True
+
+        world.step_position(dt, skip)
+
+
+def _solve_island(bodies: List[Body],
+                  contacts: List[List[ContactConstraintPoint]],
+                  joints: List[Joint], dt: float, vel_iter: int, pos_iter: int,
+                  penetration_max: float, bias_factor: float) -> None:
+    # NOTE: same order as the global loop of the scene
+    maintainer: ContactMaintainer = ContactMaintainer()
+    maintainer._penetration_max = penetration_max
+    maintainer._bias_factor = bias_factor
+
+    for i in range(vel_iter):
+        for joint in joints:
+            joint.solve_velocity(dt)
+        maintainer.solve_velocity(dt, contacts)
+
+    for body in bodies:
+        if body.type in (Body.Type.Dynamic,
+                         Body.Type.Kinematic) and not body.sleep:
+            body.step_position(dt)
+
+    for i in range(pos_iter):
+        maintainer.solve_position(dt, contacts)
+        for joint in joints:
+            joint.solve_position(dt)
+
+
+def _clone_body(body: Body) -> Body:
+    # NOTE: a detached copy of the body with the solver related state
+    res: Body = Body()
+    res._id = body._id
+    res._mass = body._mass
+    res._inv_mass = body._inv_mass
+    res._inertia = body._inertia
+    res._inv_inertia = body._inv_inertia
+    res.type = body.type
+    res._fric = body._fric
+    res._restit = body._restit
+    for dst, src in zip(res._store._arrays(), body._store._arrays()):
+        dst[0] = src[body._idx]
+
+    return res
+
+
+def _pack_island(island: Island, joints: List[Joint]) -> Tuple[Any, ...]:
+    memo: Dict[int, Any] = {}
+    for val in island._contacts:
+        for body in (val[0]._bodya, val[0]._bodyb):
+            if id(body) not in memo:
+                memo[id(body)] = _clone_body(body)
+
+    for joint in joints:
+        for body in joint.bodies():
+            if id(body) not in memo:
+                memo[id(body)] = _clone_body(body)
+
+    # NOTE: deepcopy with the memo to replace the body refs by the clones
+    bodies: List[Body] = [memo[id(body)] for body in island._bodies]
+    contacts: List[List[ContactConstraintPoint]] = copy.deepcopy(
+        island._contacts, memo)
+    joints = copy.deepcopy(joints, memo)
+    return (bodies, contacts, joints)
+
+
+def _solve_pack(pack: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    bodies, contacts, joints = pack[:3]
+    _solve_island(bodies, contacts, joints, *pack[3:])
+
+    states: List[Tuple[Any, ...]] = []
+    for body in bodies:
+        store: BodyStore = body._store
+        states.append(
+            (store._pos[0].copy(), store._vel[0].copy(), store._rot[0],
+             store._ang_vel[0], store._sleep[0], store._sleep_time[0]))
+
+    impulses: List[Tuple[float, float]] = [(ccp._vcp._accum_normal_impulse,
+                                            ccp._vcp._accum_tangent_impulse)
+                                           for val in contacts for ccp in val]
+    return (states, impulses, joints)
+
+
+def _copy_joint_state(dst: Joint, src: Joint) -> None:
+    # NOTE: copy the solved state, but keep the body refs of the dst
+    for key, val in vars(src).items():
+        if key == '_prim':
+            for prim_key, prim_val in vars(val).items():
+                if not isinstance(prim_val, Body):
+                    setattr(dst._prim, prim_key, prim_val)
+
+        elif not isinstance(val, Body):
+            setattr(dst, key, val)
+
+
+def _merge_island(island: Island, joints: List[Joint],
+                  res: Tuple[Any, ...]) -> None:
+    states, impulses, solved_joints = res
+    for body, state in zip(island._bodies, states):
+        store: BodyStore = body._store
+        idx: int = body._idx
+        store._pos[idx] = state[0]
+        store._vel[idx] = state[1]
+        store._rot[idx] = state[2]
+        store._ang_vel[idx] = state[3]
+        store._sleep[idx] = state[4]
+        store._sleep_time[idx] = state[5]
+
+    ccps: List[ContactConstraintPoint] = [
+        ccp for val in island._contacts for ccp in val
+    ]
+    for ccp, (normal, tangent) in zip(ccps, impulses):
+        ccp._vcp._accum_normal_impulse = normal
+        ccp._vcp._accum_tangent_impulse = tangent
+
+    for joint, solved in zip(joints, solved_joints):
+        _copy_joint_state(joint, solved)
@@ -2,7 +2,7 @@ from typing import List, Optional
 
 import numpy as np
 
-from ...math.matrix import Matrix
+from ...math.linalg import Vec2, Mat2
 from ..body import Body
 from .joint import Joint, JointType
 
@@ -10,9 +10,9 @@ from .joint import Joint, JointType
 class DistanceJointPrimitive():
     def __init__(self):
         self._bodya: Optional[Body] = None
-        self._local_pointa: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._target_point: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._normal: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._local_pointa: Vec2 = Vec2(0.0, 0.0)
+        self._target_point: Vec2 = Vec2(0.0, 0.0)
+        self._normal: Vec2 = Vec2(0.0, 0.0)
         self._bias_factor: float = 0.3
         self._bias: float = 0.0
         self._dist_min: float = 0.0
@@ -25,13 +25,13 @@ class DistanceConstraintPrimitive():
     def __init__(self):
         self._bodya: Optional[Body] = None
         self._bodyb: Optional[Body] = None
-        self._nearest_pa: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._nearest_pb: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._ra: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._rb: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._bias: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._eff_mass: Matrix = Matrix([0.0, 0.0, 0.0, 0.0])
-        self._impulse: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._nearest_pa: Vec2 = Vec2(0.0, 0.0)
+        self._nearest_pb: Vec2 = Vec2(0.0, 0.0)
+        self._ra: Vec2 = Vec2(0.0, 0.0)
+        self._rb: Vec2 = Vec2(0.0, 0.0)
+        self._bias: Vec2 = Vec2(0.0, 0.0)
+        self._eff_mass: Mat2 = Mat2(0.0, 0.0, 0.0, 0.0)
+        self._impulse: Vec2 = Vec2(0.0, 0.0)
         self._force_max: float = 200.0
 
 
@@ -45,18 +45,19 @@ class DistanceJoint(Joint):
 
     def set_value(self, prim: DistanceJointPrimitive) -> None:
         self._prim = prim
+        self.wake()
 
     def prepare(self, dt: float) -> None:
         assert self._prim._dist_min <= self._prim._dist_max
         assert self._prim._bodya is not None
 
         bodya: Body = self._prim._bodya
-        pa: Matrix = bodya.to_world_point(self._prim._local_pointa)
-        ra: Matrix = pa - bodya.pos
-        pb: Matrix = self._prim._target_point
+        pa: Vec2 = bodya.to_world_point(self._prim._local_pointa)
+        ra: Vec2 = pa - bodya.pos
+        pb: Vec2 = self._prim._target_point
         im_a: float = self._prim._bodya.inv_mass
         ii_a: float = self._prim._bodya.inv_inertia
-        error: Matrix = pb - pa
+        error: Vec2 = pb - pa
         val_len: float = error.len()
         c: float = 0.0
 
@@ -90,11 +91,11 @@ class DistanceJoint(Joint):
 
         assert self._prim._bodya is not None
 
-        ra: Matrix = self._prim._bodya.to_world_point(
+        ra: Vec2 = self._prim._bodya.to_world_point(
             self._prim._local_pointa) - self._prim._bodya.pos
-        va: Matrix = self._prim._bodya.vel + Matrix.cross_product2(
+        va: Vec2 = self._prim._bodya.vel + Vec2.cross_product2(
             self._prim._bodya.ang_vel, ra)
-        dv: Matrix = va
+        dv: Vec2 = va
         jv: float = self._prim._normal.dot(dv)
         jvb: float = -jv + self._prim._bias
         lambda_n: float = self._prim._eff_mass * jvb
@@ -103,7 +104,7 @@ class DistanceJoint(Joint):
         self._prim._accum_impulse = np.fmax(old_impulse + lambda_n, 0)
         lambda_n = self._prim._accum_impulse - old_impulse
 
-        impulse: Matrix = self._prim._normal * lambda_n
+        impulse: Vec2 = self._prim._normal * lambda_n
         self._prim._bodya.apply_impulse(impulse, ra)
 
     def solve_position(self, dt: float) -> None:
@@ -136,11 +137,11 @@ class DistanceConstraint(Joint):
 
         self._prim._ra = self._prim._nearest_pa - bodya.pos
         self._prim._rb = self._prim._nearest_pb - bodyb.pos
-        ra: Matrix = self._prim._ra
-        rb: Matrix = self._prim._rb
-        error: Matrix = self._prim._nearest_pa - self._prim._nearest_pb
+        ra: Vec2 = self._prim._ra
+        rb: Vec2 = self._prim._rb
+        error: Vec2 = self._prim._nearest_pa - self._prim._nearest_pb
 
-        k: Matrix = Matrix([0.0, 0.0, 0.0, 0.0])
+        k: Mat2 = Mat2(0.0, 0.0, 0.0, 0.0)
         data_arr: List[float] = []
         data_arr.append(im_a + ra.y * ra.y * ii_a + im_b + rb.y * rb.y * ii_b)
         data_arr.append(-ra.x * ra.y * ii_a - rb.x * rb.y * ii_b)
@@ -155,17 +156,17 @@ class DistanceConstraint(Joint):
         if self._prim._bodya is None or self._prim._bodyb is None:
             return
 
-        va: Matrix = self._prim._bodya.vel + Matrix.cross_product2(
+        va: Vec2 = self._prim._bodya.vel + Vec2.cross_product2(
             self._prim._bodya.ang_vel, self._prim._ra)
-        vb: Matrix = self._prim._bodyb.vel + Matrix.cross_product2(
+        vb: Vec2 = self._prim._bodyb.vel + Vec2.cross_product2(
             self._prim._bodyb.ang_vel, self._prim._rb)
 
-        jvb: Matrix = va - vb
+        jvb: Vec2 = va - vb
         jvb += self._prim._bias
         jvb.negate()
 
-        J: Matrix = self._prim._eff_mass * jvb
-        old_impulse: Matrix = self._prim._impulse
+        J: Vec2 = self._prim._eff_mass * jvb
+        old_impulse: Vec2 = self._prim._impulse
         self._prim._impulse += J
 
         max_impulse: float = dt * self._prim._force_max
@@ -178,9 +179,10 @@ class DistanceConstraint(Joint):
         self._prim._bodya.apply_impulse(J, self._prim._ra)
         self._prim._bodyb.apply_impulse(-J, self._prim._rb)
 
-    def set_value(self, pa: Matrix, pb: Matrix) -> None:
+    def set_value(self, pa: Vec2, pb: Vec2) -> None:
         self._prim._nearest_pa = pa
         self._prim._nearest_pb = pb
+        self.wake()
 
     def solve_position(self, dt: float) -> None:
         pass
@@ -1,8 +1,12 @@
 from abc import ABC, abstractmethod
 from enum import IntEnum, unique
+from typing import List, Tuple
 
 import numpy as np
 
+from ...math.linalg import Vec2
+from ..body import Body
+
 
 @unique
 class JointType(IntEnum):
@@ -42,10 +46,46 @@ class Joint(ABC):
     @active.setter
     def active(self, active: bool) -> None:
         self._active = active
+        self.wake()
 
     def type(self) -> JointType:
         return self._type
 
+    def bodies(self) -> List[Body]:
+        '''bodies constrained by the joint, from its primitive'''
+        prim = getattr(self, '_prim', None)
+        res: List[Body] = []
+        for name in ('_bodya', '_bodyb'):
+            body = getattr(prim, name, None)
+            if body is not None:
+                res.append(body)
+
+        return res
+
+    def wake(self) -> None:
+        '''wake the bodies of the joint if it is active, called when the
+        joint is activated or its value changed'''
+        if self._active:
+            for body in self.bodies():
+                body.wake()
+
+    def accum_impulse(self) -> Tuple[float, float, float]:
+        '''accumulated impulses of the primitive, the scalar one and the
+        (x, y) of the vector one, 0.0 if the joint has none'''
+        prim = getattr(self, '_prim', None)
+        impulse = getattr(prim, '_impulse', None)
+        return (getattr(prim, '_accum_impulse',
+                        0.0), 0.0 if impulse is None else impulse.x,
+                0.0 if impulse is None else impulse.y)
+
+    def set_accum_impulse(self, val: Tuple[float, float, float]) -> None:
+        prim = getattr(self, '_prim', None)
+        if hasattr(prim, '_accum_impulse'):
+            prim._accum_impulse = val[0]
+
+        if hasattr(prim, '_impulse'):
+            prim._impulse = Vec2(val[1], val[2])
+
     @property
     def id(self) -> int:
         return self._id
@@ -1,6 +1,6 @@
 from typing import List
 
-from ...math.matrix import Matrix
+from ...math.linalg import Vec2, Mat2
 from ..body import Body
 from .joint import Joint, JointType
 
@@ -8,9 +8,9 @@ from .joint import Joint, JointType
 class PointJointPrimitive():
     def __init__(self):
         self._bodya: Body = Body()
-        self._local_pointa: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._target_point: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._normal: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._local_pointa: Vec2 = Vec2(0.0, 0.0)
+        self._target_point: Vec2 = Vec2(0.0, 0.0)
+        self._normal: Vec2 = Vec2(0.0, 0.0)
 
         self._damping: float = 0.0
         self._stiff: float = 0.0
@@ -18,9 +18,9 @@ class PointJointPrimitive():
         self._force_max: float = 1000.0
         self._damping_radio: float = 1.0
         self._gamma: float = 0.0
-        self._bias: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._eff_mass: Matrix = Matrix([0.0, 0.0, 0.0, 0.0])
-        self._impulse: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._bias: Vec2 = Vec2(0.0, 0.0)
+        self._eff_mass: Mat2 = Mat2(0.0, 0.0, 0.0, 0.0)
+        self._impulse: Vec2 = Vec2(0.0, 0.0)
 
 
 class PointJoint(Joint):
@@ -32,6 +32,7 @@ class PointJoint(Joint):
 
     def set_value(self, prim: PointJointPrimitive) -> None:
         self._prim = prim
+        self.wake()
 
     def prepare(self, dt: float) -> None:
         if self._prim._bodya is None:
@@ -56,12 +57,12 @@ class PointJoint(Joint):
         erp: float = Joint.error_reduction_parameter(dt, self._prim._stiff,
                                                      self._prim._damping)
 
-        pa: Matrix = bodya.to_world_point(self._prim._local_pointa)
-        ra: Matrix = pa - bodya.pos
-        pb: Matrix = self._prim._target_point
+        pa: Vec2 = bodya.to_world_point(self._prim._local_pointa)
+        ra: Vec2 = pa - bodya.pos
+        pb: Vec2 = self._prim._target_point
 
         self._prim._bias = (pa - pb) * erp
-        k: Matrix = Matrix([0.0, 0.0, 0.0, 0.0])
+        k: Mat2 = Mat2(0.0, 0.0, 0.0, 0.0)
         data_arr: List[float] = []
         data_arr.append(im_a + ra.y * ra.y * ii_a)
         data_arr.append(-ra.x * ra.y * ii_a)
@@ -79,18 +80,18 @@ class PointJoint(Joint):
         if self._prim._bodya is None:
             return
 
-        ra: Matrix = self._prim._bodya.to_world_point(
+        ra: Vec2 = self._prim._bodya.to_world_point(
             self._prim._local_pointa) - self._prim._bodya.pos
-        va: Matrix = self._prim._bodya.vel + Matrix.cross_product2(
+        va: Vec2 = self._prim._bodya.vel + Vec2.cross_product2(
             self._prim._bodya.ang_vel, ra)
 
-        jvb: Matrix = va
+        jvb: Vec2 = va
         jvb += self._prim._bias
         jvb += self._prim._impulse * self._prim._gamma
         jvb.negate()
 
-        J: Matrix = self._prim._eff_mass * jvb
-        old_impulse: Matrix = self._prim._impulse
+        J: Vec2 = self._prim._eff_mass * jvb
+        old_impulse: Vec2 = self._prim._impulse
         self._prim._impulse += J
 
         max_impulse: float = dt * self._prim._force_max
@@ -14,6 +14,7 @@ class PulleyJoint(Joint):
 
     def set_value(self, prim: PulleyJointPrimitive):
         self._prim = prim
+        self.wake()
 
     def prepare(self, dt: float) -> None:
         raise NotImplementedError
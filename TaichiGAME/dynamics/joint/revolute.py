@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from ...math.matrix import Matrix
+from ...math.linalg import Vec2, Mat2
 from ..body import Body
 from .joint import Joint, JointType
 
@@ -9,17 +9,17 @@ class RevoluteJointPrimitive():
     def __init__(self):
         self._bodya: Optional[Body] = None
         self._bodyb: Optional[Body] = None
-        self._local_pointa: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._local_pointb: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._local_pointa: Vec2 = Vec2(0.0, 0.0)
+        self._local_pointb: Vec2 = Vec2(0.0, 0.0)
         self._damping: float = 0.0
         self._stiff: float = 0.0
         self._freq: float = 8.0
         self._force_max: float = 5000.0
         self._damping_radio: float = 0.2
         self._gamma: float = 0.0
-        self._bias: Matrix = Matrix([0.0, 0.0], 'vec')
-        self._eff_mass: Matrix = Matrix([0.0, 0.0, 0.0, 0.0])
-        self._impulse: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._bias: Vec2 = Vec2(0.0, 0.0)
+        self._eff_mass: Mat2 = Mat2(0.0, 0.0, 0.0, 0.0)
+        self._impulse: Vec2 = Vec2(0.0, 0.0)
 
 
 class RevoluteJoint(Joint):
@@ -31,6 +31,7 @@ class RevoluteJoint(Joint):
 
     def set_value(self, prim: RevoluteJointPrimitive) -> None:
         self._prim = prim
+        self.wake()
 
     def prepare(self, dt: float) -> None:
         if self._prim._bodya is None or self._prim._bodyb is None:
@@ -62,13 +63,13 @@ class RevoluteJoint(Joint):
         erp: float = Joint.error_reduction_parameter(dt, self._prim._stiff,
                                                      self._prim._damping)
 
-        pa: Matrix = bodya.to_world_point(self._prim._local_pointa)
-        ra: Matrix = pa - bodya.pos
-        pb: Matrix = bodyb.to_world_point(self._prim._local_pointb)
-        rb: Matrix = pb - bodyb.pos
+        pa: Vec2 = bodya.to_world_point(self._prim._local_pointa)
+        ra: Vec2 = pa - bodya.pos
+        pb: Vec2 = bodyb.to_world_point(self._prim._local_pointb)
+        rb: Vec2 = pb - bodyb.pos
 
         self._prim._bias = (pa - pb) * erp
-        k: Matrix = Matrix([0.0, 0.0, 0.0, 0.0])
+        k: Mat2 = Mat2(0.0, 0.0, 0.0, 0.0)
 
         data_arr: List[float] = []
         data_arr.append(im_a + ra.y * ra.y * ii_a + im_b + rb.y * rb.y * ii_b)
@@ -89,22 +90,22 @@ class RevoluteJoint(Joint):
         if self._prim._bodya is None or self._prim._bodyb is None:
             return
 
-        ra: Matrix = self._prim._bodya.to_world_point(
+        ra: Vec2 = self._prim._bodya.to_world_point(
             self._prim._local_pointa) - self._prim._bodya.pos
-        va: Matrix = self._prim._bodya.vel + Matrix.cross_product2(
+        va: Vec2 = self._prim._bodya.vel + Vec2.cross_product2(
             self._prim._bodya.ang_vel, ra)
-        rb: Matrix = self._prim._bodyb.to_world_point(
+        rb: Vec2 = self._prim._bodyb.to_world_point(
             self._prim._local_pointb) - self._prim._bodyb.pos
-        vb: Matrix = self._prim._bodyb.vel + Matrix.cross_product2(
+        vb: Vec2 = self._prim._bodyb.vel + Vec2.cross_product2(
             self._prim._bodyb.ang_vel, rb)
 
-        jvb: Matrix = va - vb
+        jvb: Vec2 = va - vb
         jvb += self._prim._bias
         jvb += self._prim._impulse * self._prim._gamma
         jvb.negate()
 
-        J: Matrix = self._prim._eff_mass * jvb
-        old_impulse: Matrix = self._prim._impulse
+        J: Vec2 = self._prim._eff_mass * jvb
+        old_impulse: Vec2 = self._prim._impulse
         self._prim._impulse += J
 
         max_impulse: float = dt * self._prim._force_max
@@ -1,6 +1,6 @@
 import numpy as np
 
-from ...math.matrix import Matrix
+from ...math.linalg import Vec2
 from ..body import Body
 from .joint import Joint, JointType
 
@@ -17,7 +17,7 @@ class RotationJointPrimitive():
 class OrientationJointPrimitive():
     def __init__(self):
         self._bodya: Body = Body()
-        self._target_point: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._target_point: Vec2 = Vec2(0.0, 0.0)
         self._ref_rot: float = 0.0
         self._eff_mass: float = 0.0
         self._bias: float = 0.0
@@ -33,6 +33,7 @@ class RotationJoint(Joint):
 
     def set_value(self, prim: RotationJointPrimitive) -> None:
         self._prim = prim
+        self.wake()
 
     def prepare(self, dt: float) -> None:
         if self._prim._bodya is None or self._prim._bodyb is None:
@@ -71,13 +72,14 @@ class OrientationJoint(Joint):
 
     def set_value(self, prim: OrientationJointPrimitive) -> None:
         self._prim = prim
+        self.wake()
 
     def prepare(self, dt: float) -> None:
         if self._prim._bodya is None:
             return
 
         bodya: Body = self._prim._bodya
-        point: Matrix = self._prim._target_point - bodya.pos
+        point: Vec2 = self._prim._target_point - bodya.pos
         target_rot: float = point.theta()
 
         ii_a: float = self._prim._bodya.inv_inertia
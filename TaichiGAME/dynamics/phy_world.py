@@ -1,8 +1,17 @@
-from typing import Optional, Union, List
+from __future__ import annotations
+from typing import Optional, Set, Union, List, Tuple
 
-from ..math.matrix import Matrix
+import numpy as np
+
+from ..math.linalg import Vec2
 from ..dynamics.body import Body
-from ..common.random import RandomGenerator
+from .body_store import BodyStore
+from ..common.handle_table import HandleTable
+from ..common.profiler import Profiler
+from ..collision.broad_phase.dbvt import DBVT
+from ..collision.broad_phase.pair_manager import PairManager
+from ..collision.detector import Collsion, Detector
+from .constraint.contact import ContactMaintainer
 from .joint.joint import Joint
 from .joint.distance import DistanceJoint, DistanceJointPrimitive
 from .joint.point import PointJoint, PointJointPrimitive
@@ -10,11 +19,13 @@ from .joint.pulley import PulleyJoint, PulleyJointPrimitive
 from .joint.revolute import RevoluteJoint, RevoluteJointPrimitive
 from .joint.rotation import OrientationJoint, OrientationJointPrimitive
 from .joint.rotation import RotationJointPrimitive, RotationJoint
+from .island import Island, IslandBuilder, IslandSolver
+from .snapshot import WorldSnapshot
 
 
 class PhysicsWorld():
     def __init__(self):
-        self._gravity: Matrix = Matrix([0.0, -1.0], 'vec')
+        self._gravity: Vec2 = Vec2(0.0, -1.0)
         self._linear_vel_damping: float = 0.9
         self._ang_vel_damping: float = 0.9
         self._linear_vel_threshold: float = 0.02
@@ -27,85 +38,308 @@ class PhysicsWorld():
 
         self._grav_ena: bool = True
         self._damping_ena: bool = True
-        self._body_list: List[Body] = []
-        self._joint_list: List[Joint] = []
+        self._sleep_ena: bool = True
+        # NOTE: time in seconds a island must stay under the vel
+        # thresholds before it goes to sleep
+        self._sleep_time_threshold: float = 0.5
+        self._store: BodyStore = BodyStore()
+        # NOTE: the ids of the bodies and joints are their handles, the
+        # lists are the dense lists of the tables, compacted by
+        # swap-remove, so the body list keeps the order of store rows
+        self._body_handles: HandleTable[Body] = HandleTable()
+        self._joint_handles: HandleTable[Joint] = HandleTable()
+        self._body_list: List[Body] = self._body_handles.values
+        self._joint_list: List[Joint] = self._joint_handles.values
+        self._awake_joint_list: List[Joint] = []
+        self._island_builder: IslandBuilder = IslandBuilder()
+        # NOTE: the broadphase and the contacts used by `step`, the
+        # bodies need to be inserted into the dbvt after their shape
+        # is set
+        self._dbvt: DBVT = DBVT()
+        self._pair_manager: PairManager = PairManager(self._dbvt)
+        self._maintainer: ContactMaintainer = ContactMaintainer()
+        self._island_solver: Optional[IslandSolver] = None
+
+    def step(self, dt: float) -> None:
+        '''run one step of the full sim pipeline, no gui is needed
+
+        Parameters
+        ----------
+        dt : float
+            time step
+        '''
+        start: float = Profiler.tic()
+        tick: float = start
+        # NOTE: the static and the sleeping bodies do not move
+        store: BodyStore = self._store
+        for idx in np.flatnonzero((store.type != Body.Type.Static)
+                                  & ~store.sleep):
+            self._dbvt.update(self._body_list[idx], dt)
+        Profiler.toc('broadphase_update', tick)
+
+        tick = Profiler.tic()
+        self.step_velocity(dt)
+        Profiler.toc('integrate_velocity', tick)
+
+        tick = Profiler.tic()
+        pot_list: List[Tuple[Body, Body]] = self._pair_manager.generate()
+        # NOTE: the contacts are solved in the order of the pairs, sort
+        # them by the store rows so the results do not depend on the
+        # shape of the tree, such as on its fat margins
+        pot_list.sort(key=lambda pot: (min(pot[0]._idx, pot[1]._idx),
+                                       max(pot[0]._idx, pot[1]._idx)))
+        # NOTE: the contacts of the pairs out of the broadphase are
+        # dropped, even of the resting bodies or of the removed ones
+        for pair in self._pair_manager.removed_pairs:
+            self._maintainer.remove(pair[0], pair[1])
+        Profiler.toc('pair_generation', tick)
+
+        # NOTE: the detect and the prepare of the contacts interleave,
+        # sum them by pair, the tics are 0.0 if the profiler is disabled
+        narrow_time: float = 0.0
+        prepare_time: float = 0.0
+        tested: int = 0
+        colliding: int = 0
+        for pot in pot_list:
+            # NOTE: skip the pairs without any awake body
+            if pot[0].is_resting() and pot[1].is_resting():
+                continue
+
+            tick = Profiler.tic()
+            res: Collsion = Detector.detect(pot[0], pot[1])
+            detected: float = Profiler.tic()
+            narrow_time += detected - tick
+            tested += 1
+            if res._is_colliding:
+                colliding += 1
+                self._maintainer.add(res)
+                prepare_time += Profiler.tic() - detected
+
+        Profiler.add('narrowphase', narrow_time)
+        tick = Profiler.tic()
+        self._maintainer.clear_inactive_points()
+        if self._island_solver is not None:
+            Profiler.add('contact_prepare',
+                         prepare_time + Profiler.tic() - tick)
+            tick = Profiler.tic()
+            self._island_solver.solve(self, self._maintainer, dt)
+            Profiler.toc('island_solve', tick)
+        else:
+            self.build_islands(self._maintainer)
+            self.prepare_velocity_constraint(dt)
+            Profiler.add('contact_prepare',
+                         prepare_time + Profiler.tic() - tick)
+
+            tick = Profiler.tic()
+            for i in range(self._vel_iter):
+                self.solve_velocity_constraint(dt)
+                self._maintainer.solve_velocity(dt)
+            Profiler.toc('velocity_iterations', tick)
+
+            tick = Profiler.tic()
+            self.step_position(dt)
+            Profiler.toc('integrate_position', tick)
+
+            tick = Profiler.tic()
+            for i in range(self._pos_iter):
+                self._maintainer.solve_position(dt)
+                self.solve_position_constraint(dt)
+            Profiler.toc('position_iterations', tick)
+
+        tick = Profiler.tic()
+        self.update_sleep(dt)
+        Profiler.toc('sleep_update', tick)
+
+        if Profiler.enabled:
+            Profiler.count('pairs', len(pot_list))
+            Profiler.count('tested_pairs', tested)
+            Profiler.count('colliding_pairs', colliding)
+            Profiler.count(
+                'contact_points',
+                sum(
+                    len(val)
+                    for val in self._maintainer._contact_table.values()
+                    if len(val) > 0 and val[0]._active))
+
+        self._maintainer.deactivate_all_points()
+        Profiler.toc('step', start)
+        Profiler.end_frame()
 
     def prepare_velocity_constraint(self, dt: float) -> None:
-        for joint in self._joint_list:
-            if joint.active:
-                joint.prepare(dt)
+        # NOTE: the joints between resting bodies are skipped
+        # until one of their bodies wakes
+        self._awake_joint_list = [
+            joint for joint in self._joint_list
+            if joint.active and not all(body.is_resting()
+                                        for body in joint.bodies())
+        ]
+        for joint in self._awake_joint_list:
+            joint.prepare(dt)
+
+    def _moving_index(self) -> np.ndarray:
+        store: BodyStore = self._store
+        body_type: np.ndarray = store.type
+        return np.flatnonzero(((body_type == Body.Type.Dynamic)
+                               | (body_type == Body.Type.Kinematic))
+                              & ~store.sleep)
 
     def step_velocity(self, dt: float) -> None:
-        g: Matrix = self._gravity if self._grav_ena else Matrix([0.0, 0.0],
-                                                                'vec')
+        # NOTE: integrate all bodies in the store by masked array ops,
+        # keep the same op order as the per-body Vec2 impl to get
+        # the bit-compatible results
+        store: BodyStore = self._store
+        body_type: np.ndarray = store.type
+        static: np.ndarray = body_type == Body.Type.Static
+        dynamic: np.ndarray = np.flatnonzero((body_type == Body.Type.Dynamic)
+                                             & ~store.sleep)
+        moving: np.ndarray = self._moving_index()
+
+        store.vel[static] = 0.0
+        store.ang_vel[static] = 0.0
+
+        if self._grav_ena:
+            grav: np.ndarray = np.array([self._gravity.x, self._gravity.y])
+            store.forces[dynamic] += grav * store.mass[dynamic, None]
+
+        if moving.size == 0:
+            return
+
         lvd: float = 1.0
         avd: float = 1.0
-
         if self._damping_ena:
             lvd = 1.0 / (1.0 + dt * self._linear_vel_damping)
             avd = 1.0 / (1.0 + dt * self._ang_vel_damping)
 
-        for body in self._body_list:
-            if body.type == Body.Type.Static:
-                body.vel.clear()
-                body.ang_vel = 0.0
-
-            elif body.type == Body.Type.Dynamic:
-                body.forces += g * body.mass
-                # NOTE: meet the operator overload seq
-                body.vel += body.forces * dt * body.inv_mass
-                body.ang_vel += body.inv_inertia * body.torques * dt
-
-                body.vel *= lvd
-                body.ang_vel *= avd
+        vel: np.ndarray = store.vel[moving]
+        vel += store.forces[moving] * dt * store.inv_mass[moving, None]
+        vel *= lvd
+        store.vel[moving] = vel
 
-            elif body.type == Body.Type.Kinematic:
-                # NOTE: meet the operator overload seq
-                body.vel += body.forces * dt * body.inv_mass
-                body.ang_vel += body.inv_inertia * body.torques * dt
-
-                body.vel *= lvd
-                body.ang_vel *= avd
-
-            elif body.type == Body.Type.Bullet:
-                pass
+        ang_vel: np.ndarray = store.ang_vel[moving]
+        ang_vel += store.inv_inertia[moving] * store.torques[moving] * dt
+        ang_vel *= avd
+        store.ang_vel[moving] = ang_vel
 
     def solve_velocity_constraint(self, dt: float) -> None:
-        for joint in self._joint_list:
-            if joint.active:
-                joint.solve_velocity(dt)
-
-    def step_position(self, dt: float) -> None:
-        for body in self._body_list:
-            if body.type == Body.Type.Static:
-                pass
-            elif body.type == Body.Type.Dynamic:
-                body.pos += body.vel * dt
-                body.rot += body.ang_vel * dt
-                body.forces.clear()
-                body.clear_torque()
-
-            elif body.type == Body.Type.Kinematic:
-                body.pos += body.vel * dt
-                body.rot += body.ang_vel * dt
-                body.forces.clear()
-                body.clear_torque()
-
-            elif body.type == Body.Type.Bullet:
-                pass
+        for joint in self._awake_joint_list:
+            joint.solve_velocity(dt)
+
+    def step_position(self,
+                      dt: float,
+                      skip: Optional[np.ndarray] = None) -> None:
+        '''integrate the position of the awake bodies
+
+        Parameters
+        ----------
+        dt : float
+            time step
+        skip : Optional[np.ndarray], optional
+            bool mask of the store rows already integrated, such as by
+            the IslandSolver, their forces are still cleared, by default None
+        '''
+        store: BodyStore = self._store
+        moving: np.ndarray = self._moving_index()
+        if moving.size == 0:
+            return
+
+        store.forces[moving] = 0.0
+        store.torques[moving] = 0.0
+        if skip is not None:
+            moving = moving[~skip[moving]]
+
+        store.pos[moving] += store.vel[moving] * dt
+        store.rot[moving] += store.ang_vel[moving] * dt
 
     def solve_position_constraint(self, dt: float) -> None:
-        for joint in self._joint_list:
-            if joint.active:
-                joint.solve_position(dt)
+        for joint in self._awake_joint_list:
+            joint.solve_position(dt)
+
+    def build_islands(self, maintainer: ContactMaintainer) -> List[Island]:
+        '''rebuild the islands from the contacts and the joints'''
+        return self._island_builder.build(self._store,
+                                          maintainer._contact_table,
+                                          self._joint_list)
+
+    def update_sleep(self,
+                     dt: float,
+                     maintainer: Optional[ContactMaintainer] = None) -> None:
+        '''put the islands at rest to sleep and wake the touched ones
+
+        A island goes to sleep when all of its bodies stayed under the
+        vel thresholds for `sleep_time_thold` seconds, and wakes as a
+        whole when any of its bodies was woken in this step.
+
+        Parameters
+        ----------
+        dt : float
+            time step
+        maintainer : Optional[ContactMaintainer], optional
+            contacts to rebuild the islands, reuse the islands built
+            in this step if None, by default None
+        '''
+        if not self._sleep_ena:
+            return
+
+        store: BodyStore = self._store
+        movable: np.ndarray = store.type != Body.Type.Static
+        sleep: np.ndarray = store.sleep
+        sleep_time: np.ndarray = store.sleep_time
+        vel: np.ndarray = store.vel
+
+        rest: np.ndarray = (
+            (vel[:, 0] * vel[:, 0] + vel[:, 1] * vel[:, 1]
+             <= self._linear_vel_threshold * self._linear_vel_threshold)
+            & (np.abs(store.ang_vel) <= self._ang_vel_threshold) & movable)
+        sleep_time[rest & ~sleep] += dt
+        sleep_time[~rest] = 0.0
+
+        if maintainer is not None:
+            self.build_islands(maintainer)
+        elif self._island_builder.labels.shape[0] != store.size:
+            # NOTE: bodies changed after the islands were built
+            return
+
+        labels: np.ndarray = self._island_builder.labels
+        linked: np.ndarray = labels >= 0
+        ready: np.ndarray = sleep_time >= self._sleep_time_threshold
+
+        # free bodies sleep alone
+        to_sleep: np.ndarray = movable & ~linked & ~sleep & ready
+        to_wake: np.ndarray = np.zeros(store.size, dtype=bool)
+
+        num: int = len(self._island_builder.islands)
+        if num > 0:
+            lab: np.ndarray = labels[linked]
+            all_ready: np.ndarray = np.ones(num, dtype=bool)
+            any_sleep: np.ndarray = np.zeros(num, dtype=bool)
+            all_sleep: np.ndarray = np.ones(num, dtype=bool)
+            np.logical_and.at(all_ready, lab, ready[linked])
+            np.logical_or.at(any_sleep, lab, sleep[linked])
+            np.logical_and.at(all_sleep, lab, sleep[linked])
+
+            to_sleep[linked] = (all_ready & ~any_sleep)[lab]
+            to_wake[linked] = (any_sleep & ~all_sleep)[lab]
+
+        sleep[to_sleep] = True
+        store.vel[to_sleep] = 0.0
+        store.ang_vel[to_sleep] = 0.0
+        store.forces[to_sleep] = 0.0
+        store.torques[to_sleep] = 0.0
+
+        sleep[to_wake] = False
+        sleep_time[to_wake] = 0.0
+
+    def wake_all(self) -> None:
+        self._store.sleep[:] = False
+        self._store.sleep_time[:] = 0.0
 
     @property
-    def grav(self) -> Matrix:
+    def grav(self) -> Vec2:
         return self._gravity
 
     @grav.setter
-    def grav(self, grav: Matrix) -> None:
-        self._gravity = grav
+    def grav(self, grav: Vec2) -> None:
+        self._gravity = Vec2.from_value(grav)
 
     @property
     def lin_vel_damping(self) -> float:
@@ -187,10 +421,59 @@ class PhysicsWorld():
     def damping_ena(self, damping_ena: bool) -> None:
         self._damping_ena = damping_ena
 
+    @property
+    def sleep_ena(self) -> bool:
+        return self._sleep_ena
+
+    @sleep_ena.setter
+    def sleep_ena(self, sleep_ena: bool) -> None:
+        self._sleep_ena = sleep_ena
+        if not sleep_ena:
+            self.wake_all()
+
+    @property
+    def sleep_time_thold(self) -> float:
+        return self._sleep_time_threshold
+
+    @sleep_time_thold.setter
+    def sleep_time_thold(self, sleep_time_thold: float) -> None:
+        self._sleep_time_threshold = sleep_time_thold
+
+    @property
+    def store(self) -> BodyStore:
+        return self._store
+
+    @property
+    def island_builder(self) -> IslandBuilder:
+        return self._island_builder
+
+    @property
+    def islands(self) -> List[Island]:
+        return self._island_builder.islands
+
+    @property
+    def dbvt(self) -> DBVT:
+        return self._dbvt
+
+    @property
+    def pair_manager(self) -> PairManager:
+        return self._pair_manager
+
+    @property
+    def maintainer(self) -> ContactMaintainer:
+        return self._maintainer
+
+    @property
+    def island_solver(self) -> Optional[IslandSolver]:
+        return self._island_solver
+
+    @island_solver.setter
+    def island_solver(self, island_solver: Optional[IslandSolver]) -> None:
+        self._island_solver = island_solver
+
     def create_body(self) -> Body:
-        body: Body = Body()
-        body.id = RandomGenerator.unique()
-        self._body_list.append(body)
+        body: Body = Body(self._store)
+        body.id = self._body_handles.insert(body)
         return body
 
     def create_joint(
@@ -217,25 +500,91 @@ class PhysicsWorld():
         elif isinstance(prim, OrientationJointPrimitive):
             joint = OrientationJoint(prim)
 
-        joint.id = RandomGenerator.unique()
-        self._joint_list.append(joint)
+        joint.id = self._joint_handles.insert(joint)
+        joint.wake()
+
         return joint
 
+    def get_body(self, handle: int) -> Optional[Body]:
+        '''body of the handle, None if it was removed'''
+        return self._body_handles.get(handle)
+
+    def get_joint(self, handle: int) -> Optional[Joint]:
+        return self._joint_handles.get(handle)
+
     def remove_body(self, body: Body) -> None:
-        for b in self._body_list:
-            if body == b:
-                RandomGenerator.pop(body.id)
-                self._body_list.remove(body)
-                break
+        if self._body_handles.get(body.id) is not body:
+            return
+
+        # NOTE: both swap the last body into the freed row
+        self._body_handles.remove(body.id)
+        self._store.detach(body)
+        self._dbvt.remove(body)
+        # NOTE: let the contacts of a removed body be cleared
+        body.wake()
 
     def remove_joint(self, joint: Joint) -> None:
-        for j in self._joint_list:
-            if joint == j:
-                RandomGenerator.pop(joint.id)
-                self._joint_list.remove(joint)
+        if self._joint_handles.get(joint.id) is joint:
+            self._joint_handles.remove(joint.id)
 
     def clear_all_bodies(self) -> None:
-        self._body_list.clear()
+        for body in list(self._body_list):
+            self._store.detach(body)
+
+        self._body_handles.clear()
+        self._dbvt.clear_all()
+        self._pair_manager.clear_all()
+        self._maintainer.clear_all()
 
     def clear_all_joints(self) -> None:
-        self._joint_list.clear()
+        self._joint_handles.clear()
+
+    def snapshot(self) -> WorldSnapshot:
+        '''save the body state, the contact and joint impulses and the
+        broadphase and its pairs of the world
+
+        Returns
+        -------
+        WorldSnapshot
+            state to pass to `restore`, can be restored many times
+        '''
+        res: WorldSnapshot = WorldSnapshot()
+        res._store_bodies = list(self._store._bodies)
+        res._body_handles = self._body_handles.save()
+        res._joint_handles = self._joint_handles.save()
+        res._body_state = self._store.save_state()
+        res._joint_state = np.array(
+            [joint.accum_impulse() for joint in self._joint_list],
+            dtype=np.float64).reshape(-1, 3)
+        res._contact_state = self._maintainer.snapshot()
+        res._dbvt_state = self._dbvt.snapshot()
+        res._pair_state = self._pair_manager.snapshot()
+        return res
+
+    def restore(self, snap: WorldSnapshot) -> None:
+        '''roll the world back to the snapshot
+
+        The bodies and joints created after the snapshot are removed
+        and the removed ones are added back with their old handles.
+        '''
+        store: BodyStore = self._store
+        if store._bodies != snap._store_bodies:
+            keep: Set[Body] = set(snap._store_bodies)
+            for body in list(store._bodies):
+                if body not in keep:
+                    store.detach(body)
+
+            for body in snap._store_bodies:
+                store.attach(body)
+
+            store.reorder(snap._store_bodies)
+
+        self._body_handles.load(snap._body_handles)
+        self._joint_handles.load(snap._joint_handles)
+        store.load_state(snap._body_state)
+        for joint, val in zip(self._joint_list, snap._joint_state):
+            joint.set_accum_impulse(val)
+
+        self._maintainer.restore(snap._contact_state)
+        self._dbvt.restore(snap._dbvt_state)
+        self._pair_manager.restore(snap._pair_state)
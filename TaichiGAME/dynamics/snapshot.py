@@ -0,0 +1,37 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from .body import Body
+
+
+class WorldSnapshot():
+    '''saved state of a PhysicsWorld, made by `PhysicsWorld.snapshot`
+
+    The body rows, the joint impulses and the contact points are compact
+    array copies. The broadphase tree and its pairs are shared with the
+    world, which copies them on its next change, so taking and restoring
+    a snapshot does not walk the tree nodes or the pairs.
+
+    The body params (mass, shape, type, fric and restit) and the world
+    settings are not saved.
+    '''
+    def __init__(self):
+        self._store_bodies: List[Body] = []
+        self._body_handles: Tuple[List, ...] = ()
+        self._joint_handles: Tuple[List, ...] = ()
+        self._body_state: Tuple[np.ndarray, ...] = ()
+        self._joint_state: np.ndarray = np.zeros((0, 3))
+        self._contact_state: Tuple = ()
+        self._dbvt_state: Tuple = ()
+        self._pair_state: Tuple = ()
+
+    @property
+    def body_num(self) -> int:
+        return len(self._store_bodies)
+
+    def nbytes(self) -> int:
+        '''size of the copied arrays'''
+        return sum(arr.nbytes for arr in self._body_state) + sum(
+            arr.nbytes
+            for arr in self._contact_state[2:]) + self._joint_state.nbytes
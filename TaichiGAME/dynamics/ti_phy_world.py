@@ -1,16 +1,237 @@
-from typing import Optional, Union, List, cast
+from enum import IntEnum, unique
+from typing import Dict, Optional, List, Tuple, cast
 
+import numpy as np
 import taichi as ti
+from taichi._snode.snode_tree import SNodeTree
 
 from ..dynamics.body import Body
+from .body_store import BodyStore
 from .joint.joint import Joint
 from ..common.random import RandomGenerator
+from ..common.profiler import Profiler
 from ..geometry.shape import Capsule, Circle, Edge, Polygon, Shape
 
 
 @ti.data_oriented
 class PhysicsWorld():
-    def __init__(self, body_len: int = 60):
+    '''Taichi version of the PhysicsWorld, the whole step runs in kernels.
+
+    The bodies are views over the rows of a BodyStore, the row `i` of
+    the store is the row `i` of the fields. The state stays in the
+    fields across steps: `init_data`, also called at the start of each
+    step, only uploads the values of the new bodies and the values set
+    through the body setters since the last upload, see the `Dirty*`
+    bits of the BodyStore. `sync_bodies` downloads the asked fields
+    back into the store. Every shape is stored as a convex core plus a
+    radius: a circle is one vertex, an edge and a capsule are two, a
+    polygon is its vertex ring of any size. The core vertices of all
+    bodies are packed into one vertex pool, each body owns the rows
+    [vert_off, vert_off + vert_num) of it, shared by the kernels and
+    the render. The step runs:
+
+    1. the velocity integration
+    2. the world vertices and the aabbs of the bodies
+    3. the uniform grid broadphase, the bodies are sorted into the
+       hashed cells by a counting sort, and each pair is found in the
+       cell of the min corner of the overlap of the aabbs only. The
+       bodies covering more than `CellMax` cells are tested against
+       all bodies. The pairs are sorted by the body index, so the
+       solver order does not depend on the threads
+    4. the narrowphase of the rounded convex cores by SAT and clipping,
+       in parallel over the pairs. It writes the normal, the
+       penetration and at most 2 contact points per pair, warm started
+       from the contacts of the last step. `detect` runs the steps 2-4
+       without stepping, and `contacts` reads their results
+    5. the sequential impulse solver, same as the ContactMaintainer.
+       The contacting pairs are colored in order, so the pairs of a
+       color share no movable body, and the colors are solved one
+       after another, see `Solver`
+    6. the position integration and the position correction, solved
+       as the velocities
+
+    The pairs of a color are solved in parallel, and the sums over the
+    contacts of a body are made in the pair order, so the results do
+    not depend on the thread count. It runs on `ti.cpu` as well as on
+    the gpu. Joints and sleeping are not supported yet.
+
+    The body, the vertex, the grid entry and the pair fields are
+    allocated for `body_len`, `vert_len`, `entry_len` and `pair_len`
+    rows and doubled when more rows are needed, see `reserve`. The
+    grid has a power of two cells, at least twice the body capacity.
+    '''
+    # NOTE: faces whose separations differ less than it are seen as
+    # parallel, then the face of body a is the reference face
+    RefTolerance: float = 0.0005
+    # NOTE: max dist of the local points of the same contact in two
+    # consecutive steps to inherit the accumulated impulses
+    WarmStartDist: float = 0.05
+    # NOTE: max cells covered by the aabb of a body in the grid, the
+    # larger bodies, such as the grounds, are tested against all bodies
+    CellMax: int = 16
+    # NOTE: max colors of the pairs, the pairs of the last color may
+    # share bodies and are solved serially
+    ColorMax: int = 32
+
+    @unique
+    class Solver(IntEnum):
+        '''the order of the contact solver
+
+        Serial: the colors by one serialized kernel, as the Color one
+        without the kernel launch per color, for the small worlds
+        Color: the pairs of each color in parallel, gauss-seidel over
+        the colors
+        Jacobi: all pairs in parallel from the same velocities, each
+        body splits its mass over its contacts. Converges slower, it
+        needs more iterations
+        '''
+        Serial: int = 0
+        Color: int = 1
+        Jacobi: int = 2
+
+    # NOTE: the body attr downloaded by `sync_bodies`, mapped to the
+    # field and the store array
+    SyncFields: Dict[str, Tuple[str, str, int]] = {
+        'pos': ('_pos', '_pos', BodyStore.DirtyPos),
+        'vel': ('_vel', '_vel', BodyStore.DirtyVel),
+        'rot': ('_rot', '_rot', BodyStore.DirtyRot),
+        'ang_vel': ('_ang_vel', '_ang_vel', BodyStore.DirtyAngVel),
+        'forces': ('_force', '_forces', BodyStore.DirtyForces),
+        'torques': ('_torque', '_torques', BodyStore.DirtyTorques),
+    }
+
+    # NOTE: (name, vector size or 0 for scalar, dtype, inner shape) of
+    # the fields with a row per body, they grow with the body count
+    BodyFields: List[Tuple[str, int, type, Tuple[int, ...]]] = [
+        # rot line
+        ('_rot_line_hst', 2, float, ()),
+        ('_rot_line_hed', 2, float, ()),
+        ('_rot_line_vst', 2, float, ()),
+        ('_rot_line_ved', 2, float, ()),
+        ('_mass', 0, float, ()),
+        ('_inertia', 0, float, ()),
+        # same as Body.Type, 0: kinematic 1: static 2: dynamic 3: bullet
+        ('_phy_type', 0, int, ()),
+        # 1: circle 2: edge 3: polygon 4: capsule
+        ('_shape_type', 0, int, ()),
+        # circle
+        ('_cirpos', 2, float, ()),
+        ('_cirspos', 2, float, ()),
+        ('_cir_rad', 0, float, ()),
+        ('_scir_rad', 0, float, ()),
+        # polygon, the vertices are in the vertex pool
+        ('_poly_spos', 2, float, ()),
+        # capsule
+        ('_cap_pos', 2, float, ()),
+        ('_cap_spos', 2, float, ()),
+        ('_cap_width', 0, float, ()),
+        ('_cap_height', 0, float, ()),
+        ('_cap_c1', 2, float, ()),
+        ('_cap_c2', 2, float, ()),
+        ('_cap_p', 2, float, (4, )),
+        ('_cap_rec_a', 2, float, (2, )),
+        ('_cap_rec_b', 2, float, (2, )),
+        ('_cap_rec_c', 2, float, (2, )),
+        # state
+        ('_pos', 2, float, ()),
+        ('_vel', 2, float, ()),
+        ('_rot', 0, float, ()),
+        ('_ang_vel', 0, float, ()),
+        ('_force', 2, float, ()),
+        ('_torque', 0, float, ()),
+        # NOTE: zero for the static bodies
+        ('_inv_mass', 0, float, ()),
+        ('_inv_inertia', 0, float, ()),
+        ('_fric', 0, float, ()),
+        ('_restit', 0, float, ()),
+        # collision shape, the core vertices are the rows
+        # [vert_off, vert_off + vert_num) of the vertex pool
+        ('_vert_off', 0, int, ()),
+        ('_vert_num', 0, int, ()),
+        ('_radius', 0, float, ()),
+        ('_aabb_min', 2, float, ()),
+        ('_aabb_max', 2, float, ()),
+        # broadphase, the covered cells of the aabb, the slot of the
+        # body in each covered cell, the list of the large bodies, and
+        # the pair count and offset of each row
+        ('_cell_lo', 2, int, ()),
+        ('_cell_hi', 2, int, ()),
+        ('_cell_slot', 0, int, (CellMax, )),
+        ('_large_list', 0, int, ()),
+        ('_pair_cnt', 0, int, ()),
+        ('_pair_off', 0, int, ()),
+        # solver, the colors taken by the pairs of the body, the count
+        # and offset of the contacting pairs of the body as b, and the
+        # contact points of the body
+        ('_color_mask', 0, int, ()),
+        ('_pair_b_cnt', 0, int, ()),
+        ('_pair_b_off', 0, int, ()),
+        ('_contact_cnt', 0, int, ()),
+    ]
+    # NOTE: the entry count and the first entry of each hashed cell
+    GridFields: List[Tuple[str, int, type, Tuple[int, ...]]] = [
+        ('_cell_cnt', 0, int, ()),
+        ('_cell_start', 0, int, ()),
+    ]
+    # NOTE: the body and the cell of each grid entry, sorted by cell
+    EntryFields: List[Tuple[str, int, type, Tuple[int, ...]]] = [
+        ('_entry_body', 0, int, ()),
+        ('_entry_cell', 2, int, ()),
+    ]
+    # NOTE: the vertex pool, the fields with a row per core vertex
+    VertFields: List[Tuple[str, int, type, Tuple[int, ...]]] = [
+        # local and world core vertices and the outward normals of the
+        # faces from vert[k] to vert[k + 1]
+        ('_vert', 2, float, ()),
+        ('_norm', 2, float, ()),
+        ('_wvert', 2, float, ()),
+        ('_wnorm', 2, float, ()),
+        # render, the screen faces of the polygons and the edges, and
+        # the fan triangles of the polygons in the first num - 2 rows
+        ('_vert_sst', 2, float, ()),
+        ('_vert_sed', 2, float, ()),
+        ('_tri_a', 2, float, ()),
+        ('_tri_b', 2, float, ()),
+        ('_tri_c', 2, float, ()),
+    ]
+    # NOTE: the fields with a row per broadphase pair
+    PairFields: List[Tuple[str, int, type, Tuple[int, ...]]] = [
+        # pairs of body index, a < b
+        ('_pair', 2, int, ()),
+        # contacts, up to 2 points per pair, the normal is from b to a
+        ('_contact_num', 0, int, ()),
+        ('_normal', 2, float, ()),
+        ('_penetration', 0, float, ()),
+        ('_contact_fric', 0, float, ()),
+        ('_ra', 2, float, (2, )),
+        ('_rb', 2, float, (2, )),
+        ('_locala', 2, float, (2, )),
+        ('_vel_bias', 2, float, (2, )),
+        ('_eff_mass_normal', 0, float, (2, )),
+        ('_eff_mass_tangent', 0, float, (2, )),
+        ('_accum_normal_impulse', 0, float, (2, )),
+        ('_accum_tangent_impulse', 0, float, (2, )),
+        # the impulses to sum per body, and the color of the pair, its
+        # slot in the color, the pairs sorted by the color and the
+        # pairs sorted by the body b
+        ('_impulse', 2, float, (2, )),
+        ('_pair_color', 0, int, ()),
+        ('_pair_slot', 0, int, ()),
+        ('_color_order', 0, int, ()),
+        ('_pair_b_list', 0, int, ()),
+        # contacts of the last step for the warm start, the keys are
+        # sorted as the pairs are
+        ('_prev_key', 0, int, ()),
+        ('_prev_contact_num', 0, int, ()),
+        ('_prev_locala', 2, float, (2, )),
+        ('_prev_normal_impulse', 0, float, (2, )),
+        ('_prev_tangent_impulse', 0, float, (2, )),
+    ]
+
+    def __init__(self,
+                 body_len: int = 60,
+                 pair_len: Optional[int] = None,
+                 vert_len: Optional[int] = None):
         # env var
         self._grav_ena: bool = True
         self._grav: ti.Vector = ti.Vector([0.0, -1.0])
@@ -19,222 +240,1494 @@ class PhysicsWorld():
         self._linear_vel_damping: float = 0.9
         self._ang_vel_damping: float = 0.9
 
+        self._vel_iter: int = 6
+        self._pos_iter: int = 3
+        self._solver: PhysicsWorld.Solver = PhysicsWorld.Solver.Color
+        self._penetration_max: float = 0.01
+        self._bias_factor: float = 0.2
+        # NOTE: the grid cell size, twice the mean aabb extent of the
+        # movable bodies if it is not positive
+        self._cell_size: float = 0.0
+
+        self._store: BodyStore = BodyStore(body_len)
         self._body_list: List[Body] = []
         self._joint_list: List[Joint] = []
 
-        # body physics params
+        # NOTE: the capacities of the field rows, the fields are
+        # re-allocated by doubling them when full. The kernels take
+        # the generation of the fields as a template arg, so they are
+        # compiled again for the new fields
         self._body_len: int = body_len
+        self._pair_len: int = body_len * 4 if pair_len is None else pair_len
+        self._vert_len: int = body_len * 4 if vert_len is None else vert_len
+        self._field_gen: int = 0
+        self._body_tree = self._alloc(PhysicsWorld.BodyFields, self._body_len)
+        self._pair_tree = self._alloc(PhysicsWorld.PairFields, self._pair_len)
+        self._vert_tree = self._alloc(PhysicsWorld.VertFields, self._vert_len)
+        self._grid_len: int = PhysicsWorld._pow2(body_len * 2)
+        self._entry_len: int = body_len * 4
+        self._grid_tree = self._alloc(PhysicsWorld.GridFields, self._grid_len)
+        self._entry_tree = self._alloc(PhysicsWorld.EntryFields,
+                                       self._entry_len)
+        # NOTE: the used rows of the vertex pool, and the offset and the
+        # row count of the pool range of each body, a body keeps its
+        # range while its new shape fits into it
+        self._vert_cnt: int = 0
+        self._vert_range: np.ndarray = np.zeros((body_len, 2), dtype=np.int64)
 
-        # rot line
-        self._rot_line_hst = ti.Vector.field(2, float, shape=self._body_len)
-        self._rot_line_hed = ti.Vector.field(2, float, shape=self._body_len)
-        self._rot_line_vst = ti.Vector.field(2, float, shape=self._body_len)
-        self._rot_line_ved = ti.Vector.field(2, float, shape=self._body_len)
-
-        self._mass = ti.field(float, shape=self._body_len)
-        self._inertia = ti.field(float, shape=self._body_len)
-        # 1: kinematic 2: static 3: dynamic
-        self._phy_type = ti.field(int, shape=self._body_len)
-        # 1: circle 2: Edge 3: triangle 4: rect 5: pentagon
-        # 6: hexagon 7: capsule
-        self._shape_type = ti.field(int, shape=self._body_len)
-        # circle
-        self._cirpos = ti.Vector.field(2, float, shape=self._body_len)
-        self._cirspos = ti.Vector.field(2, float, shape=self._body_len)
-        self._cir_rad = ti.field(float, shape=self._body_len)
-        self._scir_rad = ti.field(float, shape=self._body_len)
-        # edge
-        self._edgpos = ti.Vector.field(2, float, shape=self._body_len)
-        self._edg_st = ti.Vector.field(2, float, shape=self._body_len)
-        self._edg_sst = ti.Vector.field(2, float, shape=self._body_len)
-        self._edg_ed = ti.Vector.field(2, float, shape=self._body_len)
-        self._edg_sed = ti.Vector.field(2, float, shape=self._body_len)
-
-        # polygon triangle
-        self._poly_tripos = ti.Vector.field(2, float, shape=self._body_len)
-        self._poly_trispos = ti.Vector.field(2, float, shape=self._body_len)
-        self._poly_trist = ti.Vector.field(2, float, shape=(self._body_len, 3))
-        self._poly_tried = ti.Vector.field(2, float, shape=(self._body_len, 3))
-        self._poly_trisst = ti.Vector.field(2,
-                                            float,
-                                            shape=(self._body_len, 3))
-        self._poly_trised = ti.Vector.field(2,
-                                            float,
-                                            shape=(self._body_len, 3))
-        self._poly_tri_a = ti.Vector.field(2, float, shape=(self._body_len, 1))
-        self._poly_tri_b = ti.Vector.field(2, float, shape=(self._body_len, 1))
-        self._poly_tri_c = ti.Vector.field(2, float, shape=(self._body_len, 1))
-
-        # polygon rect
-        self._poly_recpos = ti.Vector.field(2, float, shape=self._body_len)
-        self._poly_recspos = ti.Vector.field(2, float, shape=self._body_len)
-        self._poly_recst = ti.Vector.field(2, float, shape=(self._body_len, 4))
-        self._poly_reced = ti.Vector.field(2, float, shape=(self._body_len, 4))
-        self._poly_recsst = ti.Vector.field(2,
-                                            float,
-                                            shape=(self._body_len, 4))
-        self._poly_recsed = ti.Vector.field(2,
-                                            float,
-                                            shape=(self._body_len, 4))
-
-        self._poly_rec_a = ti.Vector.field(2, float, shape=(self._body_len, 2))
-        self._poly_rec_b = ti.Vector.field(2, float, shape=(self._body_len, 2))
-        self._poly_rec_c = ti.Vector.field(2, float, shape=(self._body_len, 2))
-
-        # polygon pen
-        self._poly_penpos = ti.Vector.field(2, float, shape=self._body_len)
-        self._poly_penspos = ti.Vector.field(2, float, shape=self._body_len)
-        self._poly_penst = ti.Vector.field(2, float, shape=(self._body_len, 5))
-        self._poly_pened = ti.Vector.field(2, float, shape=(self._body_len, 5))
-        self._poly_pensst = ti.Vector.field(2,
-                                            float,
-                                            shape=(self._body_len, 5))
-        self._poly_pensed = ti.Vector.field(2,
-                                            float,
-                                            shape=(self._body_len, 5))
-
-        self._poly_pen_a = ti.Vector.field(2, float, shape=(self._body_len, 3))
-        self._poly_pen_b = ti.Vector.field(2, float, shape=(self._body_len, 3))
-        self._poly_pen_c = ti.Vector.field(2, float, shape=(self._body_len, 3))
+        self._body_num = ti.field(int, shape=())
+        self._pair_num = ti.field(int, shape=())
+        self._prev_pair_num = ti.field(int, shape=())
+        # NOTE: the first row of each color in the color order, the
+        # last one is the contacting pair num
+        self._color_start = ti.field(int, shape=PhysicsWorld.ColorMax + 1)
+        self._color_cnt = ti.field(int, shape=PhysicsWorld.ColorMax)
+        self._entry_num = ti.field(int, shape=())
+        self._large_num = ti.field(int, shape=())
+        self._grid_cell = ti.field(float, shape=())
+        # NOTE: the sum of the aabb extents and the count of the movable
+        # bodies
+        self._extent_sum = ti.Vector.field(2, float, shape=())
 
-        # capsule
-        self._cap_pos = ti.Vector.field(2, float, shape=self._body_len)
-        self._cap_spos = ti.Vector.field(2, float, shape=self._body_len)
-        self._cap_width = ti.field(float, shape=self._body_len)
-        self._cap_height = ti.field(float, shape=self._body_len)
-        self._cap_c1 = ti.Vector.field(2, float, shape=self._body_len)
-        self._cap_c2 = ti.Vector.field(2, float, shape=self._body_len)
-        self._cap_p = ti.Vector.field(2, float, shape=(self._body_len, 4))
-        self._cap_rec_a = ti.Vector.field(2, float, shape=(self._body_len, 2))
-        self._cap_rec_b = ti.Vector.field(2, float, shape=(self._body_len, 2))
-        self._cap_rec_c = ti.Vector.field(2, float, shape=(self._body_len, 2))
-
-        self._vel = ti.Vector.field(2, float, shape=self._body_len)
-        self._rot = ti.field(float, shape=self._body_len)
-        self._ang_vel = ti.field(float, shape=self._body_len)
-        self._force = ti.Vector.field(2, float, shape=self._body_len)
-        self._torque = ti.field(float, shape=self._body_len)
+    def _alloc(self, specs: List[Tuple[str, int, type, Tuple[int, ...]]],
+               rows: int) -> SNodeTree:
+        fb: ti.FieldsBuilder = ti.FieldsBuilder()
+        for name, vec, dtype, inner in specs:
+            fld = ti.field(dtype) if vec == 0 else ti.Vector.field(vec, dtype)
+            fb.dense(ti.ij if len(inner) > 0 else ti.i,
+                     (rows, ) + inner).place(fld)
+            setattr(self, name, fld)
+
+        return fb.finalize()
+
+    def _grow(self, specs: List[Tuple[str, int, type, Tuple[int, ...]]],
+              tree: SNodeTree, rows: int) -> SNodeTree:
+        # NOTE: copy the old rows by kernels on the device, then free
+        # the old fields
+        old = tuple(getattr(self, spec[0]) for spec in specs)
+        res: SNodeTree = self._alloc(specs, rows)
+        new = tuple(getattr(self, spec[0]) for spec in specs)
+        # NOTE: the loop over the fields is unrolled, keep it short
+        for i in range(0, len(specs), 32):
+            self._copy_fields(new[i:i + 32], old[i:i + 32])
+        tree.destroy()
+        self._field_gen += 1
+        return res
+
+    @ti.kernel
+    def _copy_fields(self, dst: ti.template(), src: ti.template()):
+        for k in ti.static(range(len(src))):
+            for idx in ti.grouped(src[k]):
+                dst[k][idx] = src[k][idx]
+
+    @staticmethod
+    def _pow2(val: int) -> int:
+        return 1 << max(val - 1, 1).bit_length()
+
+    def reserve(self,
+                body_len: int,
+                pair_len: int = 0,
+                vert_len: int = 0,
+                entry_len: int = 0) -> None:
+        '''grow the capacities to at least the given rows, doubling them
+
+        The kernels are compiled again after a growth, so reserve the
+        capacity of a large scene up front to skip the recompilations.
+        '''
+        if body_len > self._body_len:
+            self._body_len = max(body_len, self._body_len * 2)
+            self._body_tree = self._grow(PhysicsWorld.BodyFields,
+                                         self._body_tree, self._body_len)
+            # NOTE: the pair keys depend on the body capacity
+            self._prev_pair_num[None] = 0
+            vert_range: np.ndarray = np.zeros((self._body_len, 2),
+                                              dtype=np.int64)
+            vert_range[:self._vert_range.shape[0]] = self._vert_range
+            self._vert_range = vert_range
+            if self._body_len * 2 > self._grid_len:
+                self._grid_len = PhysicsWorld._pow2(self._body_len * 2)
+                self._grid_tree = self._grow(PhysicsWorld.GridFields,
+                                             self._grid_tree, self._grid_len)
+
+        if pair_len > self._pair_len:
+            self._pair_len = max(pair_len, self._pair_len * 2)
+            self._pair_tree = self._grow(PhysicsWorld.PairFields,
+                                         self._pair_tree, self._pair_len)
+
+        if vert_len > self._vert_len:
+            self._vert_len = max(vert_len, self._vert_len * 2)
+            self._vert_tree = self._grow(PhysicsWorld.VertFields,
+                                         self._vert_tree, self._vert_len)
+
+        if entry_len > self._entry_len:
+            self._entry_len = max(entry_len, self._entry_len * 2)
+            self._entry_tree = self._grow(PhysicsWorld.EntryFields,
+                                          self._entry_tree, self._entry_len)
 
     def create_body(self):
-        body: Body = Body()
+        body: Body = Body(self._store)
         body.id = RandomGenerator.unique()
         self._body_list.append(body)
         return body
 
-    def init_data(self):
-        bd_len: int = len(self._body_list)
-        for i in range(bd_len):
-            self._mass[i] = self._body_list[i].mass
-            self._inertia[i] = self._body_list[i].inertia
-            self._phy_type[i] = self._body_list[i].type + 1
-            self._vel[i] = ti.Vector(
-                [self._body_list[i].vel.x, self._body_list[i].vel.y])
-            self._rot[i] = self._body_list[i].rot
-            self._ang_vel[i] = self._body_list[i].ang_vel
-            self._force[i] = ti.Vector(
-                [self._body_list[i].forces.x, self._body_list[i].forces.y])
-            self._torque[i] = self._body_list[i].torques
-
-            pos = ti.Vector(
-                [self._body_list[i].pos.x, self._body_list[i].pos.y])
-            if self._body_list[i].shape.type == Shape.Type.Circle:
-                cir: Circle = cast(Circle, self._body_list[i].shape)
-                self._shape_type[i] = 1
-                self._cirpos[i] = pos
-                self._cir_rad[i] = cir.radius
-
-            elif self._body_list[i].shape.type == Shape.Type.Edge:
-                edg: Edge = cast(Edge, self._body_list[i].shape)
-                self._shape_type[i] = 2
-                self._edg_st[i] = ti.Vector([edg.start.x, edg.start.y])
-                self._edg_ed[i] = ti.Vector([edg.end.x, edg.end.y])
-
-            elif self._body_list[i].shape.type == Shape.Type.Polygon:
-                poly: Polygon = cast(Polygon, self._body_list[i].shape)
-                vert_len: int = len(poly.vertices)
-                assert vert_len >= 4
-
-                if vert_len == 4:
-                    self._shape_type[i] = 3
-                    self._poly_tripos[i] = pos
-                    for j in range(3):
-                        self._poly_trist[i, j] = ti.Vector(
-                            [poly.vertices[j].x, poly.vertices[j].y])
-                        self._poly_tried[i, j] = ti.Vector(
-                            [poly.vertices[j + 1].x, poly.vertices[j + 1].y])
-
-                elif vert_len == 5:
-                    self._shape_type[i] = 4
-                    self._poly_recpos[i] = pos
-                    for j in range(4):
-                        self._poly_recst[i, j] = ti.Vector(
-                            [poly.vertices[j].x, poly.vertices[j].y])
-                        self._poly_reced[i, j] = ti.Vector(
-                            [poly.vertices[j + 1].x, poly.vertices[j + 1].y])
-
-                elif vert_len == 6:
-                    self._shape_type[i] = 5
-                    self._poly_penpos[i] = pos
-                    for j in range(5):
-                        self._poly_penst[i, j] = ti.Vector(
-                            [poly.vertices[j].x, poly.vertices[j].y])
-                        self._poly_pened[i, j] = ti.Vector(
-                            [poly.vertices[j + 1].x, poly.vertices[j + 1].y])
-
-                elif vert_len == 7:
-                    self._shape_type[i] = 6
-
-            elif self._body_list[i].shape.type == Shape.Type.Capsule:
-                self._shape_type[i] = 7
-                self._cap_pos[i] = pos
-                cap: Capsule = cast(Capsule, self._body_list[i].shape)
-                self._cap_width[i] = cap.width
-                self._cap_height[i] = cap.height
-
-    @ti.kernel
-    def step_velocity(self, dt: float):
-        lvd = 1.0 / (1.0 + dt * self._linear_vel_damping)
-        avd = 1.0 / (1.0 + dt * self._ang_vel_damping)
-        g = self._grav
-
-        for i in range(self._body_len):
-            if self._phy_type[i] == -1:
+    @staticmethod
+    def _core(shape: Shape) -> Tuple[List[Tuple[float, float]], float]:
+        '''local core vertices in ccw order and the radius of the shape'''
+        if shape.type == Shape.Type.Circle:
+            cir: Circle = cast(Circle, shape)
+            return ([(0.0, 0.0)], cir.radius)
+
+        elif shape.type == Shape.Type.Edge:
+            edg: Edge = cast(Edge, shape)
+            return ([(edg.start.x, edg.start.y), (edg.end.x, edg.end.y)], 0.0)
+
+        elif shape.type == Shape.Type.Capsule:
+            cap: Capsule = cast(Capsule, shape)
+            if cap.width > cap.height:
+                half: float = (cap.width - cap.height) / 2.0
+                return ([(-half, 0.0), (half, 0.0)], cap.height / 2.0)
+
+            half = (cap.height - cap.width) / 2.0
+            return ([(0.0, -half), (0.0, half)], cap.width / 2.0)
+
+        elif shape.type == Shape.Type.Polygon:
+            poly: Polygon = cast(Polygon, shape)
+            # NOTE: the last vertex closes the ring
+            verts: List[Tuple[float, float]] = [(v.x, v.y)
+                                                for v in poly.vertices[:-1]]
+            area: float = 0.0
+            for i in range(len(verts)):
+                nxt: Tuple[float, float] = verts[(i + 1) % len(verts)]
+                area += verts[i][0] * nxt[1] - nxt[0] * verts[i][1]
+
+            if area < 0.0:
+                verts.reverse()
+            return (verts, 0.0)
+
+        raise ValueError(
+            f'unsupported shape type {shape.type.name} in the taichi world')
+
+    @staticmethod
+    def _shape_data(
+            shape: Shape) -> Tuple[int, int, float, np.ndarray, np.ndarray]:
+        '''render shape type, core vertex num, radius, local core
+        vertices and face normals of the shape'''
+        verts, radius = PhysicsWorld._core(shape)
+        num: int = len(verts)
+        vert: np.ndarray = np.array(verts, dtype=float).reshape(num, 2)
+        norm: np.ndarray = np.zeros((num, 2))
+        face: np.ndarray = np.roll(vert, -1, axis=0) - vert
+        face_len: np.ndarray = np.hypot(face[:, 0], face[:, 1])
+        ok: np.ndarray = face_len > 0.0
+        norm[ok] = np.stack(
+            (face[ok, 1], -face[ok, 0]), axis=1) / face_len[ok, None]
+
+        shape_type: int = 0
+        if shape.type == Shape.Type.Circle:
+            shape_type = 1
+        elif shape.type == Shape.Type.Edge:
+            shape_type = 2
+        elif shape.type == Shape.Type.Polygon:
+            assert num >= 3
+            shape_type = 3
+        elif shape.type == Shape.Type.Capsule:
+            shape_type = 4
+
+        return (shape_type, num, radius, vert, norm)
+
+    def init_data(self) -> None:
+        '''upload the new bodies and the dirty values of the bodies
+
+        The new bodies are appended, growing the fields if needed. Only
+        the rows with dirty bits are uploaded: the dynamic state by
+        one kernel, and the params and the shapes by another one for
+        the rows whose params are changed.
+        '''
+        store: BodyStore = self._store
+        num: int = store.size
+        self.reserve(num)
+        self._body_num[None] = num
+        rows: np.ndarray = np.flatnonzero(store.dirty).astype(np.int32)
+        if rows.size == 0:
+            return
+
+        dirty: np.ndarray = store.dirty[rows]
+        params: np.ndarray = rows[(dirty & BodyStore.DirtyParams) != 0]
+        if params.size > 0:
+            self._upload_params(params)
+
+        self._upload_state(self._field_gen, rows, dirty.astype(np.int32),
+                           store._pos[rows], store._vel[rows],
+                           store._rot[rows], store._ang_vel[rows],
+                           store._forces[rows], store._torques[rows])
+        store.dirty[:] = 0
+
+    def _upload_params(self, rows: np.ndarray) -> None:
+        bodies: List[Body] = [self._body_list[i] for i in rows]
+        num: int = len(bodies)
+        # NOTE: the bodies sharing a shape share its packed data
+        shape_data: Dict[int, Tuple] = {}
+        for body in bodies:
+            if id(body.shape) not in shape_data:
+                shape_data[id(body.shape)] = PhysicsWorld._shape_data(
+                    body.shape)
+        data: List[Tuple] = [shape_data[id(body.shape)] for body in bodies]
+
+        # NOTE: a body whose shape grows gets a new range at the end of
+        # the pool and its old range is cleared, the pool is compacted by
+        # `clear_all_bodies` only
+        vert_num: np.ndarray = np.array([val[1] for val in data],
+                                        dtype=np.int64)
+        vert_range: np.ndarray = self._vert_range
+        grow: np.ndarray = vert_num > vert_range[rows, 1]
+        old: np.ndarray = vert_range[rows[grow]]
+        new_num: np.ndarray = vert_num[grow]
+        vert_range[rows[grow],
+                   0] = self._vert_cnt + np.cumsum(new_num) - new_num
+        vert_range[rows[grow], 1] = new_num
+        self._vert_cnt += int(new_num.sum())
+        self.reserve(0, 0, self._vert_cnt)
+
+        # NOTE: the whole range of each body is written, the rows past
+        # the vertex num and the cleared ranges are zeros
+        vert_off: np.ndarray = vert_range[rows, 0]
+        vert_cap: np.ndarray = vert_range[rows, 1]
+        packed: np.ndarray = PhysicsWorld._ranges(
+            np.cumsum(vert_cap) - vert_cap, vert_num)
+        vert_idx: np.ndarray = np.concatenate(
+            (PhysicsWorld._ranges(vert_off, vert_cap),
+             PhysicsWorld._ranges(old[:, 0], old[:, 1])))
+        vert: np.ndarray = np.zeros((vert_idx.shape[0], 2))
+        norm: np.ndarray = np.zeros((vert_idx.shape[0], 2))
+        vert[packed] = np.concatenate([val[3] for val in data])
+        norm[packed] = np.concatenate([val[4] for val in data])
+
+        store: BodyStore = self._store
+        phy_type: np.ndarray = store._type[rows].astype(np.int32)
+        static: np.ndarray = phy_type == Body.Type.Static
+        cap_size: np.ndarray = np.zeros((num, 2))
+        for k, body in enumerate(bodies):
+            if body.shape.type == Shape.Type.Capsule:
+                cap: Capsule = cast(Capsule, body.shape)
+                cap_size[k] = (cap.width, cap.height)
+
+        self._upload(self._field_gen, rows, store._mass[rows],
+                     np.array([body.inertia for body in bodies]),
+                     np.where(static, 0.0, store._inv_mass[rows]),
+                     np.where(static, 0.0, store._inv_inertia[rows]),
+                     np.array([body.fric for body in bodies]),
+                     np.array([body.restit for body in bodies]), phy_type,
+                     np.array([val[0] for val in data], dtype=np.int32),
+                     vert_off.astype(np.int32), vert_num.astype(np.int32),
+                     np.array([val[2] for val in data]), cap_size)
+        self._upload_verts(self._field_gen, vert_idx.astype(np.int32), vert,
+                           norm)
+
+    @staticmethod
+    def _ranges(start: np.ndarray, num: np.ndarray) -> np.ndarray:
+        '''concatenated index ranges [start, start + num)'''
+        return np.repeat(start - np.cumsum(num) + num, num) + np.arange(
+            num.sum(), dtype=np.int64)
+
+    @ti.kernel
+    def _upload(self, gen: ti.template(), rows: ti.types.ndarray(),
+                mass: ti.types.ndarray(), inertia: ti.types.ndarray(),
+                inv_mass: ti.types.ndarray(), inv_inertia: ti.types.ndarray(),
+                fric: ti.types.ndarray(), restit: ti.types.ndarray(),
+                phy_type: ti.types.ndarray(), shape_type: ti.types.ndarray(),
+                vert_off: ti.types.ndarray(), vert_num: ti.types.ndarray(),
+                radius: ti.types.ndarray(), cap_size: ti.types.ndarray()):
+        for k in range(rows.shape[0]):
+            i = rows[k]
+            self._mass[i] = mass[k]
+            self._inertia[i] = inertia[k]
+            self._inv_mass[i] = inv_mass[k]
+            self._inv_inertia[i] = inv_inertia[k]
+            self._fric[i] = fric[k]
+            self._restit[i] = restit[k]
+            self._phy_type[i] = phy_type[k]
+            self._shape_type[i] = shape_type[k]
+            self._vert_off[i] = vert_off[k]
+            self._vert_num[i] = vert_num[k]
+            self._radius[i] = radius[k]
+
+            # the local data of the render
+            if shape_type[k] == 1:
+                self._cir_rad[i] = radius[k]
+            elif shape_type[k] == 4:
+                self._cap_width[i] = cap_size[k, 0]
+                self._cap_height[i] = cap_size[k, 1]
+
+    @ti.kernel
+    def _upload_verts(self, gen: ti.template(), vert_idx: ti.types.ndarray(),
+                      vert: ti.types.ndarray(), norm: ti.types.ndarray()):
+        for k in range(vert_idx.shape[0]):
+            v = vert_idx[k]
+            self._vert[v] = ti.Vector([vert[k, 0], vert[k, 1]])
+            self._norm[v] = ti.Vector([norm[k, 0], norm[k, 1]])
+            self._vert_sst[v] = ti.Vector([0.0, 0.0])
+            self._vert_sed[v] = ti.Vector([0.0, 0.0])
+            self._tri_a[v] = ti.Vector([0.0, 0.0])
+            self._tri_b[v] = ti.Vector([0.0, 0.0])
+            self._tri_c[v] = ti.Vector([0.0, 0.0])
+
+    @ti.kernel
+    def _upload_state(self, gen: ti.template(), rows: ti.types.ndarray(),
+                      dirty: ti.types.ndarray(), pos: ti.types.ndarray(),
+                      vel: ti.types.ndarray(), rot: ti.types.ndarray(),
+                      ang_vel: ti.types.ndarray(), force: ti.types.ndarray(),
+                      torque: ti.types.ndarray()):
+        for k in range(rows.shape[0]):
+            i = rows[k]
+            bits = dirty[k]
+            if bits & BodyStore.DirtyPos:
+                self._pos[i] = ti.Vector([pos[k, 0], pos[k, 1]])
+            if bits & BodyStore.DirtyVel:
+                self._vel[i] = ti.Vector([vel[k, 0], vel[k, 1]])
+            if bits & BodyStore.DirtyRot:
+                self._rot[i] = rot[k]
+            if bits & BodyStore.DirtyAngVel:
+                self._ang_vel[i] = ang_vel[k]
+            if bits & BodyStore.DirtyForces:
+                self._force[i] = ti.Vector([force[k, 0], force[k, 1]])
+            if bits & BodyStore.DirtyTorques:
+                self._torque[i] = torque[k]
+
+            self._sync_render_row(i)
+
+    def sync_bodies(
+        self, fields: Tuple[str,
+                            ...] = ('pos', 'vel', 'rot', 'ang_vel')) -> None:
+        '''download the fields back into the store of the bodies
+
+        Parameters
+        ----------
+        fields : Tuple[str, ...]
+            body attrs to download, the keys of `SyncFields`
+
+        The downloads do not set the dirty bits, and the dirty values
+        set since the last upload are kept.
+        '''
+        store: BodyStore = self._store
+        num: int = min(self._body_num[None], store.size)
+        dirty: np.ndarray = store.dirty[:num]
+        for name in fields:
+            fld, arr_name, bit = PhysicsWorld.SyncFields[name]
+            src: np.ndarray = getattr(self, fld).to_numpy()[:num]
+            dst: np.ndarray = getattr(store, arr_name)[:num]
+            keep: np.ndarray = (dirty & bit) == 0
+            np.copyto(dst, src, where=keep if dst.ndim == 1 else keep[:, None])
+
+    def step(self, dt: float) -> None:
+        '''run one step of the full sim pipeline in kernels
+
+        Parameters
+        ----------
+        dt : float
+            time step
+        '''
+        start: float = self._tic()
+        tick: float = start
+        self.init_data()
+        tick = self._toc('upload', tick)
+
+        self.step_velocity(dt)
+        tick = self._toc('integrate_velocity', tick)
+
+        self._update_geometry(self._field_gen)
+        tick = self._toc('broadphase_update', tick)
+
+        self._find_pairs()
+        tick = self._toc('pair_generation', tick)
+
+        self._narrowphase(self._field_gen)
+        tick = self._toc('narrowphase', tick)
+
+        self._color_pairs(self._field_gen)
+        self._prepare_contacts(self._field_gen,
+                               int(self._solver == PhysicsWorld.Solver.Jacobi))
+        starts: np.ndarray = self._color_start.to_numpy()
+        tick = self._toc('contact_prepare', tick)
+
+        self._solve_velocity(starts)
+        tick = self._toc('velocity_iterations', tick)
+
+        self.step_position(dt)
+        tick = self._toc('integrate_position', tick)
+
+        self._solve_position(starts)
+        self._save_contacts(self._field_gen)
+        self._sync_render(self._field_gen)
+        self._toc('position_iterations', tick)
+
+        if Profiler.enabled:
+            Profiler.count('pairs', self._pair_num[None])
+            Profiler.count('colors', int(np.count_nonzero(np.diff(starts))))
+            Profiler.count('contact_points',
+                           int(self._contact_num.to_numpy().sum()))
+
+        self._toc('step', start)
+        Profiler.end_frame()
+
+    def warmup(self) -> None:
+        '''compile the kernels of the step ahead of the first step
+
+        The kernels run on no rows and the state of the world is kept.
+        Only the solver kernels of the current `solver` are compiled.
+        With the offline cache of taichi on, see `ti_init`, the later
+        processes load the compiled kernels from the cache. The kernels
+        are compiled again when the fields grow, `reserve` the rows
+        before to warm up the grown fields.
+        '''
+        gen: int = self._field_gen
+        counters = (self._body_num, self._pair_num, self._prev_pair_num)
+        saved: List[int] = [fld[None] for fld in counters]
+        for fld in counters:
+            fld[None] = 0
+
+        # NOTE: the ndarray args are compiled for their dtypes, the
+        # same as the uploads
+        store: BodyStore = self._store
+        rows: np.ndarray = np.zeros(0, dtype=np.int32)
+        val: np.ndarray = store._mass[:0]
+        vec: np.ndarray = store._pos[:0]
+        self._upload(gen, rows, val, val, val, val, val, val, rows, rows, rows,
+                     rows, val, vec)
+        self._upload_verts(gen, rows, vec, vec)
+        self._upload_state(gen, rows, rows, vec, vec, val, val, vec, val)
+
+        self.step_velocity(0.0)
+        self._update_geometry(gen)
+        self._find_pairs()
+        self._narrowphase(gen)
+        self._color_pairs(gen)
+        self._prepare_contacts(gen,
+                               int(self._solver == PhysicsWorld.Solver.Jacobi))
+        args = (self._bias_factor, self._penetration_max)
+        if self._solver == PhysicsWorld.Solver.Jacobi:
+            self._solve_velocity_jacobi(gen)
+            self._solve_position_jacobi(gen, *args)
+        else:
+            # NOTE: the color solver runs the overflow color serially
+            self._solve_velocity_serial(gen, 0, 0, 0)
+            self._solve_position_serial(gen, 0, 0, 0, *args)
+            if self._solver == PhysicsWorld.Solver.Color:
+                self._solve_velocity_color(gen, 0, 0)
+                self._solve_position_color(gen, 0, 0, *args)
+
+        self.step_position(0.0)
+        self._save_contacts(gen)
+        self._sync_render(gen)
+        for fld, num in zip(counters, saved):
+            fld[None] = num
+
+        # NOTE: the downloads of the step and of `sync_bodies` compile
+        # a kernel per field too
+        self._color_start.to_numpy()
+        for name, _, _ in PhysicsWorld.SyncFields.values():
+            getattr(self, name).to_numpy()
+
+    def detect(self) -> None:
+        '''upload the bodies and find the contacts of their current
+        state without stepping, read them by `contacts`'''
+        self.init_data()
+        self._update_geometry(self._field_gen)
+        self._find_pairs()
+        self._narrowphase(self._field_gen)
+
+    def contacts(self) -> Tuple[np.ndarray, ...]:
+        '''download the contacts of the last narrowphase
+
+        Returns
+        -------
+        Tuple[np.ndarray, ...]
+            per pair, the body indices (a, b), the contact num, the
+            normal from b to a, the penetration, and the up to 2
+            contact points on a and on b. Only the first contact num
+            points are valid, a pair without points does not collide
+        '''
+        num: int = self._pair_num[None]
+        pair: np.ndarray = self._pair.to_numpy()[:num]
+        pos: np.ndarray = self._pos.to_numpy()
+        return (pair, self._contact_num.to_numpy()[:num],
+                self._normal.to_numpy()[:num],
+                self._penetration.to_numpy()[:num],
+                self._ra.to_numpy()[:num] + pos[pair[:, 0], None],
+                self._rb.to_numpy()[:num] + pos[pair[:, 1], None])
+
+    def _find_pairs(self) -> None:
+        # NOTE: grow the entries and the pairs and run the pass again
+        # if they overflow
+        self._grid_insert(self._field_gen, self._cell_size)
+        if self._entry_num[None] > self._entry_len:
+            self.reserve(0, 0, 0, self._entry_num[None])
+            self._grid_insert(self._field_gen, self._cell_size)
+        self._grid_pairs(self._field_gen)
+        if self._pair_num[None] > self._pair_len:
+            self.reserve(0, self._pair_num[None])
+            self._grid_pairs(self._field_gen)
+
+    def _tic(self) -> float:
+        return Profiler.tic()
+
+    def _toc(self, name: str, start: float) -> float:
+        # NOTE: the kernel launches are async on the gpu, wait for them
+        # to time the stage
+        if not Profiler.enabled:
+            return 0.0
+
+        ti.sync()
+        Profiler.toc(name, start)
+        return Profiler.tic()
+
+    def step_velocity(self, dt: float) -> None:
+        lvd: float = 1.0
+        avd: float = 1.0
+        if self._damping_ena:
+            lvd = 1.0 / (1.0 + dt * self._linear_vel_damping)
+            avd = 1.0 / (1.0 + dt * self._ang_vel_damping)
+
+        grav: ti.Vector = self._grav if self._grav_ena else ti.Vector(
+            [0.0, 0.0])
+        self._step_velocity(self._field_gen, dt, grav.x, grav.y, lvd, avd)
+
+    @ti.kernel
+    def _step_velocity(self, gen: ti.template(), dt: float, gx: float,
+                       gy: float, lvd: float, avd: float):
+        g = ti.Vector([gx, gy])
+        for i in range(self._body_num[None]):
+            if self._phy_type[i] == Body.Type.Static:
                 self._vel[i] = ti.Vector([0.0, 0.0])
                 self._ang_vel[i] = 0.0
 
-            elif self._phy_type[i] == 0:
-                self._force[i] = self._force[i] + self._mass[i] * g
-                self._vel[
-                    i] = self._vel[i] + self._force[i] / self._mass[i] * dt
-                self._ang_vel[i] = self._ang_vel[
-                    i] + self._torque[i] / self._inertia[i] * dt
+            elif self._phy_type[i] == Body.Type.Dynamic or self._phy_type[
+                    i] == Body.Type.Kinematic:
+                if self._phy_type[i] == Body.Type.Dynamic:
+                    self._force[i] = self._force[i] + self._mass[i] * g
 
-                self._vel[i] = self._vel[i] * lvd
-                self._ang_vel[i] = self._ang_vel[i] * avd
-
-            elif self._phy_type[i] == 1:
                 self._vel[
-                    i] = self._vel[i] + self._force[i] / self._mass[i] * dt
+                    i] = self._vel[i] + self._force[i] * dt * self._inv_mass[i]
                 self._ang_vel[i] = self._ang_vel[
-                    i] + self._torque[i] / self._inertia[i] * dt
+                    i] + self._inv_inertia[i] * self._torque[i] * dt
 
                 self._vel[i] = self._vel[i] * lvd
                 self._ang_vel[i] = self._ang_vel[i] * avd
 
-    @ti.kernel
-    def step_position(self, dt: float):
-        for i in range(self._body_len):
-            if self._phy_type[i] == 0:
-                pass
+    def step_position(self, dt: float) -> None:
+        self._step_position(self._field_gen, dt)
 
-            elif self._phy_type[i] == 1 or self._phy_type[i] == 3:
-                # self._pos[i] = self._pos[i] + self._vel[i] * dt
+    @ti.kernel
+    def _step_position(self, gen: ti.template(), dt: float):
+        for i in range(self._body_num[None]):
+            if self._phy_type[i] == Body.Type.Kinematic or self._phy_type[
+                    i] == Body.Type.Dynamic:
+                self._pos[i] = self._pos[i] + self._vel[i] * dt
                 self._rot[i] = self._rot[i] + self._ang_vel[i] * dt
                 self._force[i] = ti.Vector([0.0, 0.0])
                 self._torque[i] = 0.0
 
+    @ti.func
+    def _movable(self, i):
+        return self._inv_mass[i] > 0.0 or self._inv_inertia[i] > 0.0
+
+    @ti.func
+    def _cross(self, lhs, rhs):
+        return lhs.x * rhs.y - lhs.y * rhs.x
+
+    @ti.func
+    def _cross_product2(self, w, r):
+        return ti.Vector([-r.y * w, r.x * w])
+
+    @ti.func
+    def _rotate(self, rot, vec):
+        cos_val = ti.cos(rot)
+        sin_val = ti.sin(rot)
+        return ti.Vector([
+            cos_val * vec.x - sin_val * vec.y,
+            sin_val * vec.x + cos_val * vec.y
+        ])
+
+    @ti.kernel
+    def _update_geometry(self, gen: ti.template()):
+        self._extent_sum[None] = ti.Vector([0.0, 0.0])
+        for i in range(self._body_num[None]):
+            lower = ti.Vector([1e30, 1e30])
+            upper = ti.Vector([-1e30, -1e30])
+            off = self._vert_off[i]
+            for k in range(self._vert_num[i]):
+                vert = self._pos[i] + self._rotate(self._rot[i],
+                                                   self._vert[off + k])
+                self._wvert[off + k] = vert
+                self._wnorm[off + k] = self._rotate(self._rot[i],
+                                                    self._norm[off + k])
+                lower = ti.min(lower, vert)
+                upper = ti.max(upper, vert)
+
+            self._aabb_min[i] = lower - self._radius[i]
+            self._aabb_max[i] = upper + self._radius[i]
+            if self._movable(i):
+                ext = upper - lower + 2.0 * self._radius[i]
+                self._extent_sum[None] += ti.Vector(
+                    [ti.max(ext.x, ext.y), 1.0])
+
+    @ti.func
+    def _overlap(self, i, j):
+        res = False
+        if self._movable(i) or self._movable(j):
+            res = (self._aabb_min[i] <= self._aabb_max[j]).all() and (
+                self._aabb_min[j] <= self._aabb_max[i]).all()
+        return res
+
+    @ti.func
+    def _cell_hash(self, cell):
+        return ((cell.x * 73856093) ^
+                (cell.y * 19349663)) & (self._grid_len - 1)
+
+    @ti.func
+    def _large(self, i):
+        size = self._cell_hi[i] - self._cell_lo[i] + 1
+        return size.x * size.y > PhysicsWorld.CellMax
+
+    @ti.kernel
+    def _grid_insert(self, gen: ti.template(), cell_size: float):
+        # NOTE: count the entries of each cell, scan the counts and fill
+        # the entries of the cells. The entry num is the total count,
+        # the caller grows the entry fields and runs it again if it is
+        # over the capacity
+        n = self._body_num[None]
+        cell = cell_size
+        if cell <= 0.0:
+            cell = 1.0
+            ext = self._extent_sum[None]
+            if ext.y > 0.0:
+                cell = 2.0 * ext.x / ext.y
+        self._grid_cell[None] = cell
+        self._large_num[None] = 0
+        for b in range(self._grid_len):
+            self._cell_cnt[b] = 0
+
+        for i in range(n):
+            h = self._grid_cell[None]
+            lo = ti.cast(ti.floor(self._aabb_min[i] / h), int)
+            hi = ti.cast(ti.floor(self._aabb_max[i] / h), int)
+            self._cell_lo[i] = lo
+            self._cell_hi[i] = hi
+            if self._large(i):
+                k = ti.atomic_add(self._large_num[None], 1)
+                self._large_list[k] = i
+            else:
+                # NOTE: keep the slot of the body in the cell, so the
+                # fill below needs no atomics
+                k = 0
+                for cx in range(lo.x, hi.x + 1):
+                    for cy in range(lo.y, hi.y + 1):
+                        b = self._cell_hash(ti.Vector([cx, cy]))
+                        self._cell_slot[i, k] = ti.atomic_add(
+                            self._cell_cnt[b], 1)
+                        k += 1
+
+        self._entry_num[None] = 0
+        ti.loop_config(serialize=True)
+        for b in range(self._grid_len):
+            self._cell_start[b] = self._entry_num[None]
+            self._entry_num[None] += self._cell_cnt[b]
+
+        for i in range(n):
+            if not self._large(i):
+                lo = self._cell_lo[i]
+                hi = self._cell_hi[i]
+                k = 0
+                for cx in range(lo.x, hi.x + 1):
+                    for cy in range(lo.y, hi.y + 1):
+                        c = ti.Vector([cx, cy])
+                        b = self._cell_hash(c)
+                        e = self._cell_start[b] + self._cell_slot[i, k]
+                        k += 1
+                        if e < self._entry_len:
+                            self._entry_body[e] = i
+                            self._entry_cell[e] = c
+
+    @ti.func
+    def _emit_pair(self, off, i, j, fill):
+        if fill and off < self._pair_len:
+            self._pair[off] = ti.Vector([i, j])
+
+    @ti.func
+    def _row_pairs(self, i, fill):
+        # NOTE: count the pairs (i, j > i) of the row, and write them
+        # from the row offset if fill
+        n = self._body_num[None]
+        off = self._pair_off[i]
+        cnt = 0
+        if self._large(i):
+            for j in range(i + 1, n):
+                if self._overlap(i, j):
+                    self._emit_pair(off + cnt, i, j, fill)
+                    cnt += 1
+        else:
+            h = self._grid_cell[None]
+            lo = self._cell_lo[i]
+            hi = self._cell_hi[i]
+            for cx in range(lo.x, hi.x + 1):
+                for cy in range(lo.y, hi.y + 1):
+                    c = ti.Vector([cx, cy])
+                    b = self._cell_hash(c)
+                    start = self._cell_start[b]
+                    for e in range(start, start + self._cell_cnt[b]):
+                        j = self._entry_body[e]
+                        if j > i and (self._entry_cell[e]
+                                      == c).all() and self._overlap(i, j):
+                            # the pair is found in the cell of the min
+                            # corner of the overlap only
+                            home = ti.cast(
+                                ti.floor(
+                                    ti.max(self._aabb_min[i],
+                                           self._aabb_min[j]) / h), int)
+                            if (home == c).all():
+                                self._emit_pair(off + cnt, i, j, fill)
+                                cnt += 1
+
+            for k in range(self._large_num[None]):
+                j = self._large_list[k]
+                if j > i and self._overlap(i, j):
+                    self._emit_pair(off + cnt, i, j, fill)
+                    cnt += 1
+
+            # NOTE: the rows of the large bodies are in order, the
+            # short rows of the others are sorted by insertion
+            if fill:
+                if off + cnt <= self._pair_len:
+                    for k in range(off + 1, off + cnt):
+                        val = self._pair[k]
+                        m = k - 1
+                        while m >= off:
+                            if self._pair[m].y <= val.y:
+                                break
+                            self._pair[m + 1] = self._pair[m]
+                            m -= 1
+                        self._pair[m + 1] = val
+        return cnt
+
+    def _grid_pairs(self, gen: int) -> None:
+        # NOTE: count the pairs of each row, then scan the counts and
+        # fill the rows, the pairs are in the order of (a, b). The pair
+        # num is the total count, the caller grows the pair fields and
+        # runs it again if it is over the capacity. The row kernel is
+        # launched twice to compile the grid query once
+        self._grid_rows(gen, 0)
+        self._scan_pairs(gen)
+        self._grid_rows(gen, 1)
+
+    @ti.kernel
+    def _grid_rows(self, gen: ti.template(), fill: int):
+        for i in range(self._body_num[None]):
+            cnt = self._row_pairs(i, fill)
+            if not fill:
+                self._pair_cnt[i] = cnt
+
+    @ti.kernel
+    def _scan_pairs(self, gen: ti.template()):
+        self._pair_num[None] = 0
+        ti.loop_config(serialize=True)
+        for i in range(self._body_num[None]):
+            self._pair_off[i] = self._pair_num[None]
+            self._pair_num[None] += self._pair_cnt[i]
+
+    @ti.func
+    def _add_contact(self, p, pa, pb):
+        a = self._pair[p].x
+        b = self._pair[p].y
+        k = self._contact_num[p]
+        if k < 2:
+            self._ra[p, k] = pa - self._pos[a]
+            self._rb[p, k] = pb - self._pos[b]
+            self._contact_num[p] = k + 1
+
+    @ti.func
+    def _max_separation(self, i, j):
+        # NOTE: the face of i with the max separation of the cores
+        best = -1e30
+        face = 0
+        oi = self._vert_off[i]
+        oj = self._vert_off[j]
+        for k in range(self._vert_num[i]):
+            sep = 1e30
+            for m in range(self._vert_num[j]):
+                sep = ti.min(
+                    sep, self._wnorm[oi + k].dot(self._wvert[oj + m] -
+                                                 self._wvert[oi + k]))
+            if sep > best:
+                best = sep
+                face = k
+        return best, face
+
+    @ti.func
+    def _segment_distance(self, p1, q1, p2, q2):
+        # NOTE: the closest points of the segments p1q1 and p2q2 and
+        # their fractions on the segments
+        d1 = q1 - p1
+        d2 = q2 - p2
+        r = p1 - p2
+        dd1 = d1.dot(d1)
+        dd2 = d2.dot(d2)
+        rd1 = r.dot(d1)
+        rd2 = r.dot(d2)
+        f1 = 0.0
+        f2 = 0.0
+        eps = 1e-12
+        if dd1 < eps or dd2 < eps:
+            if dd1 >= eps:
+                f1 = ti.min(ti.max(-rd1 / dd1, 0.0), 1.0)
+            elif dd2 >= eps:
+                f2 = ti.min(ti.max(rd2 / dd2, 0.0), 1.0)
+        else:
+            d12 = d1.dot(d2)
+            denom = dd1 * dd2 - d12 * d12
+            if denom != 0.0:
+                f1 = ti.min(ti.max((d12 * rd2 - rd1 * dd2) / denom, 0.0), 1.0)
+            f2 = (d12 * f1 + rd2) / dd2
+            if f2 < 0.0:
+                f2 = 0.0
+                f1 = ti.min(ti.max(-rd1 / dd1, 0.0), 1.0)
+            elif f2 > 1.0:
+                f2 = 1.0
+                f1 = ti.min(ti.max((d12 - rd1) / dd1, 0.0), 1.0)
+        return p1 + d1 * f1, p2 + d2 * f2, f1, f2
+
+    @ti.func
+    def _collide_circles(self, p, a, b):
+        ca = self._wvert[self._vert_off[a]]
+        cb = self._wvert[self._vert_off[b]]
+        d = ca - cb
+        dist = d.norm()
+        if dist <= self._radius[a] + self._radius[b]:
+            normal = ti.Vector([0.0, 1.0])
+            if dist > 0.0:
+                normal = d / dist
+            self._normal[p] = normal
+            self._penetration[p] = self._radius[a] + self._radius[b] - dist
+            self._add_contact(p, ca - normal * self._radius[a],
+                              cb + normal * self._radius[b])
+
+    @ti.func
+    def _collide_circle_polygon(self, p, cir, poly, flip):
+        # NOTE: the normal is from the polygon to the circle, it is
+        # flipped when the circle is body b
+        center = self._wvert[self._vert_off[cir]]
+        total = self._radius[cir] + self._radius[poly]
+        off = self._vert_off[poly]
+        n = self._vert_num[poly]
+        sep = -1e30
+        face = 0
+        for k in range(n):
+            s = self._wnorm[off + k].dot(center - self._wvert[off + k])
+            if s > sep:
+                sep = s
+                face = k
+
+        if sep <= total:
+            v1 = self._wvert[off + face]
+            v2 = self._wvert[off + (face + 1) % n]
+            normal = self._wnorm[off + face]
+            near = center - normal * sep
+            hit = True
+            vert = v1
+            in_vert = False
+            if sep > 0.0 and (center - v1).dot(v2 - v1) < 0.0:
+                in_vert = True
+            elif sep > 0.0 and (center - v2).dot(v1 - v2) < 0.0:
+                in_vert = True
+                vert = v2
+
+            depth = total - sep
+            if in_vert:
+                d = center - vert
+                dist = d.norm()
+                if dist > total or dist <= 0.0:
+                    hit = False
+                else:
+                    normal = d / dist
+                    near = vert
+                    depth = total - dist
+
+            if hit:
+                self._penetration[p] = depth
+                pcir = center - normal * self._radius[cir]
+                ppoly = near + normal * self._radius[poly]
+                if flip:
+                    self._normal[p] = -normal
+                    self._add_contact(p, ppoly, pcir)
+                else:
+                    self._normal[p] = normal
+                    self._add_contact(p, pcir, ppoly)
+
+    @ti.func
+    def _collide_polygons(self, p, a, b):
+        sep_a, face_a = self._max_separation(a, b)
+        sep_b, face_b = self._max_separation(b, a)
+        total = self._radius[a] + self._radius[b]
+        if ti.max(sep_a, sep_b) <= total:
+            ref = a
+            inc = b
+            face = face_a
+            flip = False
+            if sep_b > sep_a + PhysicsWorld.RefTolerance:
+                ref = b
+                inc = a
+                face = face_b
+                flip = True
+
+            o_ref = self._vert_off[ref]
+            o_inc = self._vert_off[inc]
+            n_ref = self._vert_num[ref]
+            n_inc = self._vert_num[inc]
+            r1 = self._wvert[o_ref + face]
+            r2 = self._wvert[o_ref + (face + 1) % n_ref]
+            normal = self._wnorm[o_ref + face]
+
+            # the incident face is the most anti-parallel one
+            inc_face = 0
+            min_dot = 1e30
+            for k in range(n_inc):
+                val = self._wnorm[o_inc + k].dot(normal)
+                if val < min_dot:
+                    min_dot = val
+                    inc_face = k
+
+            v1 = self._wvert[o_inc + inc_face]
+            v2 = self._wvert[o_inc + (inc_face + 1) % n_inc]
+            r_ref = self._radius[ref]
+            r_inc = self._radius[inc]
+
+            # NOTE: the separated rounded cores touching at a vertex
+            # have one point on the line of the closest points
+            c1, c2, f1, f2 = self._segment_distance(r1, r2, v1, v2)
+            vertex = (f1 == 0.0 or f1 == 1.0) and (f2 == 0.0 or f2 == 1.0)
+            if ti.max(sep_a, sep_b) > 0.0 and vertex:
+                d = c2 - c1
+                dist = d.norm()
+                if dist <= total and dist > 0.0:
+                    self._penetration[p] = total - dist
+                    n = d / dist
+                    p_ref = c1 + n * r_ref
+                    p_inc = c2 - n * r_inc
+                    if flip:
+                        self._normal[p] = n
+                        self._add_contact(p, p_inc, p_ref)
+                    else:
+                        self._normal[p] = -n
+                        self._add_contact(p, p_ref, p_inc)
+            else:
+                self._penetration[p] = total - ti.max(sep_a, sep_b)
+                tangent = r2 - r1
+                tangent_len = tangent.norm()
+                if tangent_len > 0.0:
+                    tangent = tangent / tangent_len
+                lower = tangent.dot(r1)
+                upper = tangent.dot(r2)
+                # clip the incident face by the side planes of the
+                # reference face
+                s1 = tangent.dot(v1)
+                s2 = tangent.dot(v2)
+                cl1 = v1
+                cl2 = v2
+                if s1 < lower and s2 >= lower:
+                    cl1 = v1 + (v2 - v1) * ((lower - s1) / (s2 - s1))
+                elif s2 < lower and s1 >= lower:
+                    cl2 = v2 + (v1 - v2) * ((lower - s2) / (s1 - s2))
+                s1 = tangent.dot(cl1)
+                s2 = tangent.dot(cl2)
+                if s1 > upper and s2 <= upper:
+                    cl1 = cl2 + (cl1 - cl2) * ((upper - s2) / (s1 - s2))
+                elif s2 > upper and s1 <= upper:
+                    cl2 = cl1 + (cl2 - cl1) * ((upper - s1) / (s2 - s1))
+
+                for m in ti.static(range(2)):
+                    cl = cl1 if m == 0 else cl2
+                    dist = normal.dot(cl - r1)
+                    if dist <= total:
+                        p_inc = cl - normal * r_inc
+                        p_ref = cl - normal * (dist - r_ref)
+                        if flip:
+                            self._normal[p] = normal
+                            self._add_contact(p, p_inc, p_ref)
+                        else:
+                            self._normal[p] = -normal
+                            self._add_contact(p, p_ref, p_inc)
+
+    @ti.kernel
+    def _narrowphase(self, gen: ti.template()):
+        for p in range(self._pair_num[None]):
+            a = self._pair[p].x
+            b = self._pair[p].y
+            self._contact_num[p] = 0
+            self._penetration[p] = 0.0
+            if self._vert_num[a] == 1 and self._vert_num[b] == 1:
+                self._collide_circles(p, a, b)
+            elif self._vert_num[a] == 1:
+                self._collide_circle_polygon(p, a, b, False)
+            elif self._vert_num[b] == 1:
+                self._collide_circle_polygon(p, b, a, True)
+            else:
+                self._collide_polygons(p, a, b)
+
+    @ti.kernel
+    def _color_pairs(self, gen: ti.template()):
+        # NOTE: greedy coloring in the pair order, a contacting pair
+        # takes the lowest color not taken by a pair of its movable
+        # bodies, then the pairs are sorted by the color. The pairs of
+        # each body as b are listed in the pair order, and the contact
+        # points of each body are counted for the jacobi solver
+        for i in range(self._body_num[None]):
+            self._color_mask[i] = 0
+            self._pair_b_cnt[i] = 0
+            self._contact_cnt[i] = 0
+        for c in range(PhysicsWorld.ColorMax):
+            self._color_cnt[c] = 0
+
+        ti.loop_config(serialize=True)
+        for p in range(self._pair_num[None]):
+            a = self._pair[p].x
+            b = self._pair[p].y
+            self._pair_color[p] = -1
+            if self._contact_num[p] > 0:
+                used = 0
+                if self._movable(a):
+                    used |= self._color_mask[a]
+                if self._movable(b):
+                    used |= self._color_mask[b]
+                c = 0
+                while c < PhysicsWorld.ColorMax - 1 and (used >> c) & 1:
+                    c += 1
+                if c < PhysicsWorld.ColorMax - 1:
+                    self._color_mask[a] |= 1 << c
+                    self._color_mask[b] |= 1 << c
+                self._pair_color[p] = c
+                self._pair_slot[p] = self._color_cnt[c]
+                self._color_cnt[c] += 1
+                self._pair_b_cnt[b] += 1
+                self._contact_cnt[a] += self._contact_num[p]
+                self._contact_cnt[b] += self._contact_num[p]
+
+        ti.loop_config(serialize=True)
+        for c in range(PhysicsWorld.ColorMax + 1):
+            self._color_start[c] = 0
+            if c > 0:
+                self._color_start[c] = self._color_start[
+                    c - 1] + self._color_cnt[c - 1]
+
+        ti.loop_config(serialize=True)
+        for i in range(self._body_num[None]):
+            self._pair_b_off[i] = 0
+            if i > 0:
+                self._pair_b_off[i] = self._pair_b_off[
+                    i - 1] + self._pair_b_cnt[i - 1]
+
+        for p in range(self._pair_num[None]):
+            c = self._pair_color[p]
+            if c >= 0:
+                self._color_order[self._color_start[c] +
+                                  self._pair_slot[p]] = p
+
+        for i in range(self._body_num[None]):
+            self._pair_b_cnt[i] = 0
+
+        ti.loop_config(serialize=True)
+        for p in range(self._pair_num[None]):
+            if self._pair_color[p] >= 0:
+                b = self._pair[p].y
+                self._pair_b_list[self._pair_b_off[b] +
+                                  self._pair_b_cnt[b]] = p
+                self._pair_b_cnt[b] += 1
+
+    @ti.func
+    def _find_prev(self, key):
+        # NOTE: binary search in the sorted pairs of the last step
+        lo = 0
+        hi = self._prev_pair_num[None]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._prev_key[mid] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        res = -1
+        if lo < self._prev_pair_num[None] and self._prev_key[lo] == key:
+            res = lo
+        return res
+
+    @ti.kernel
+    def _prepare_contacts(self, gen: ti.template(), split: int):
+        # NOTE: the jacobi solver splits the mass of each body over its
+        # contact points
+        for p in range(self._pair_num[None]):
+            a = self._pair[p].x
+            b = self._pair[p].y
+            prev = self._find_prev(a * self._body_len + b)
+            normal = self._normal[p]
+            tangent = ti.Vector([-normal.y, normal.x])
+            im_a = self._inv_mass[a]
+            im_b = self._inv_mass[b]
+            ii_a = self._inv_inertia[a]
+            ii_b = self._inv_inertia[b]
+            restit = ti.min(self._restit[a], self._restit[b])
+            share_a = 1.0
+            share_b = 1.0
+            if split:
+                share_a = ti.cast(ti.max(self._contact_cnt[a], 1), float)
+                share_b = ti.cast(ti.max(self._contact_cnt[b], 1), float)
+            self._contact_fric[p] = ti.sqrt(self._fric[a] * self._fric[b])
+            for k in range(self._contact_num[p]):
+                ra = self._ra[p, k]
+                rb = self._rb[p, k]
+                rn_a = self._cross(ra, normal)
+                rn_b = self._cross(rb, normal)
+                rt_a = self._cross(ra, tangent)
+                rt_b = self._cross(rb, tangent)
+                k_normal = (im_a + ii_a * rn_a * rn_a) * share_a + (
+                    im_b + ii_b * rn_b * rn_b) * share_b
+                k_tangent = (im_a + ii_a * rt_a * rt_a) * share_a + (
+                    im_b + ii_b * rt_b * rt_b) * share_b
+                self._eff_mass_normal[p, k] = 0.0
+                self._eff_mass_tangent[p, k] = 0.0
+                if k_normal > 0.0:
+                    self._eff_mass_normal[p, k] = 1.0 / k_normal
+                if k_tangent > 0.0:
+                    self._eff_mass_tangent[p, k] = 1.0 / k_tangent
+
+                va = self._vel[a] + self._cross_product2(self._ang_vel[a], ra)
+                vb = self._vel[b] + self._cross_product2(self._ang_vel[b], rb)
+                self._vel_bias[p, k] = (va - vb) * -restit
+
+                # inherit the impulses of the nearest contact of the
+                # same pair in the last step
+                locala = self._rotate(-self._rot[a], ra)
+                self._locala[p, k] = locala
+                self._accum_normal_impulse[p, k] = 0.0
+                self._accum_tangent_impulse[p, k] = 0.0
+                if prev >= 0:
+                    best = PhysicsWorld.WarmStartDist
+                    for m in range(self._prev_contact_num[prev]):
+                        dist = (self._prev_locala[prev, m] - locala).norm()
+                        if dist < best:
+                            best = dist
+                            self._accum_normal_impulse[
+                                p, k] = self._prev_normal_impulse[prev, m]
+                            self._accum_tangent_impulse[
+                                p, k] = self._prev_tangent_impulse[prev, m]
+
+        for p in range(self._pair_num[None]):
+            normal = self._normal[p]
+            tangent = ti.Vector([-normal.y, normal.x])
+            for k in range(self._contact_num[p]):
+                self._impulse[p, k] = normal * self._accum_normal_impulse[
+                    p, k] + tangent * self._accum_tangent_impulse[p, k]
+
+        for i in range(self._body_num[None]):
+            if self._movable(i):
+                dv, dw = self._sum_impulses(i)
+                self._vel[i] = self._vel[i] + dv * self._inv_mass[i]
+                self._ang_vel[i] = self._ang_vel[i] + self._inv_inertia[i] * dw
+
+    @ti.func
+    def _apply_impulse(self, i, impulse, r):
+        # NOTE: the static bodies are shared by the pairs of a color,
+        # they are only read
+        if self._movable(i):
+            self._vel[i] = self._vel[i] + impulse * self._inv_mass[i]
+            self._ang_vel[i] = self._ang_vel[
+                i] + self._inv_inertia[i] * self._cross(r, impulse)
+
+    @ti.func
+    def _sum_impulses(self, i):
+        # NOTE: the sums of the `_impulse` of the contacts of the body
+        # and of their torques, in the pair order
+        dv = ti.Vector([0.0, 0.0])
+        dw = 0.0
+        for q in range(self._pair_off[i],
+                       self._pair_off[i] + self._pair_cnt[i]):
+            for k in range(self._contact_num[q]):
+                dv += self._impulse[q, k]
+                dw += self._cross(self._ra[q, k], self._impulse[q, k])
+        for e in range(self._pair_b_off[i],
+                       self._pair_b_off[i] + self._pair_b_cnt[i]):
+            q = self._pair_b_list[e]
+            for k in range(self._contact_num[q]):
+                dv -= self._impulse[q, k]
+                dw -= self._cross(self._rb[q, k], self._impulse[q, k])
+        return dv, dw
+
+    @ti.func
+    def _solve_pair_velocity(self, p):
+        # NOTE: same as `ContactMaintainer.solve_velocity`
+        a = self._pair[p].x
+        b = self._pair[p].y
+        normal = self._normal[p]
+        tangent = ti.Vector([-normal.y, normal.x])
+        for k in range(self._contact_num[p]):
+            ra = self._ra[p, k]
+            rb = self._rb[p, k]
+            va = self._vel[a] + self._cross_product2(self._ang_vel[a], ra)
+            vb = self._vel[b] + self._cross_product2(self._ang_vel[b], rb)
+            jv = -normal.dot(va - vb - self._vel_bias[p, k])
+            lambda_n = self._eff_mass_normal[p, k] * jv
+            old_impulse = self._accum_normal_impulse[p, k]
+            self._accum_normal_impulse[p, k] = ti.max(old_impulse + lambda_n,
+                                                      0.0)
+            lambda_n = self._accum_normal_impulse[p, k] - old_impulse
+            impulse_n = normal * lambda_n
+            self._apply_impulse(a, impulse_n, ra)
+            self._apply_impulse(b, -impulse_n, rb)
+
+            va = self._vel[a] + self._cross_product2(self._ang_vel[a], ra)
+            vb = self._vel[b] + self._cross_product2(self._ang_vel[b], rb)
+            lambda_t = self._eff_mass_tangent[p, k] * -tangent.dot(va - vb)
+            max_t = self._contact_fric[p] * self._accum_normal_impulse[p, k]
+            old_impulse = self._accum_tangent_impulse[p, k]
+            self._accum_tangent_impulse[p, k] = ti.min(
+                ti.max(old_impulse + lambda_t, -max_t), max_t)
+            lambda_t = self._accum_tangent_impulse[p, k] - old_impulse
+            impulse_t = tangent * lambda_t
+            self._apply_impulse(a, impulse_t, ra)
+            self._apply_impulse(b, -impulse_t, rb)
+
+    @ti.func
+    def _solve_pair_position(self, p, bias_factor, penetration_max):
+        # NOTE: push the bodies apart by the penetration along the
+        # normal, the lever arms are kept from the prepare
+        a = self._pair[p].x
+        b = self._pair[p].y
+        for k in range(self._contact_num[p]):
+            ra = self._ra[p, k]
+            rb = self._rb[p, k]
+            impulse = self._position_impulse(p, k, bias_factor,
+                                             penetration_max)
+            if self._movable(a):
+                self._pos[a] = self._pos[a] + impulse * self._inv_mass[a]
+                self._rot[a] = self._rot[
+                    a] + self._inv_inertia[a] * self._cross(ra, impulse)
+            if self._movable(b):
+                self._pos[b] = self._pos[b] - impulse * self._inv_mass[b]
+                self._rot[b] = self._rot[
+                    b] - self._inv_inertia[b] * self._cross(rb, impulse)
+
+    @ti.func
+    def _position_impulse(self, p, k, bias_factor, penetration_max):
+        a = self._pair[p].x
+        b = self._pair[p].y
+        normal = self._normal[p]
+        c = (self._pos[a] + self._ra[p, k]) - (self._pos[b] + self._rb[p, k])
+        bias = bias_factor * ti.max(-c.dot(normal) - penetration_max, 0.0)
+        return normal * (self._eff_mass_normal[p, k] * bias)
+
+    def _solve_velocity(self, starts: np.ndarray) -> None:
+        # NOTE: the color order is in the rows [starts[c], starts[c + 1])
+        gen: int = self._field_gen
+        if self._solver == PhysicsWorld.Solver.Serial:
+            self._solve_velocity_serial(gen, self._vel_iter, 0, starts[-1])
+        elif self._solver == PhysicsWorld.Solver.Jacobi:
+            for i in range(self._vel_iter):
+                self._solve_velocity_jacobi(gen)
+        else:
+            colors: np.ndarray = np.flatnonzero(np.diff(starts))
+            for i in range(self._vel_iter):
+                for c in colors:
+                    if c == PhysicsWorld.ColorMax - 1:
+                        self._solve_velocity_serial(gen, 1, starts[c],
+                                                    starts[c + 1])
+                    else:
+                        self._solve_velocity_color(gen, starts[c],
+                                                   starts[c + 1])
+
+    @ti.kernel
+    def _solve_velocity_serial(self, gen: ti.template(), iters: int,
+                               begin: int, end: int):
+        ti.loop_config(serialize=True)
+        for it in range(iters):
+            for q in range(begin, end):
+                self._solve_pair_velocity(self._color_order[q])
+
+    @ti.kernel
+    def _solve_velocity_color(self, gen: ti.template(), begin: int, end: int):
+        for q in range(begin, end):
+            self._solve_pair_velocity(self._color_order[q])
+
+    @ti.kernel
+    def _solve_velocity_jacobi(self, gen: ti.template()):
+        # NOTE: the impulses of all contacts from the same velocities,
+        # then summed per body
+        for p in range(self._pair_num[None]):
+            a = self._pair[p].x
+            b = self._pair[p].y
+            normal = self._normal[p]
+            tangent = ti.Vector([-normal.y, normal.x])
+            for k in range(self._contact_num[p]):
+                ra = self._ra[p, k]
+                rb = self._rb[p, k]
+                va = self._vel[a] + self._cross_product2(self._ang_vel[a], ra)
+                vb = self._vel[b] + self._cross_product2(self._ang_vel[b], rb)
+                jv = -normal.dot(va - vb - self._vel_bias[p, k])
+                lambda_n = self._eff_mass_normal[p, k] * jv
+                old_impulse = self._accum_normal_impulse[p, k]
+                self._accum_normal_impulse[p,
+                                           k] = ti.max(old_impulse + lambda_n,
+                                                       0.0)
+                lambda_n = self._accum_normal_impulse[p, k] - old_impulse
+
+                lambda_t = self._eff_mass_tangent[p, k] * -tangent.dot(va - vb)
+                max_t = self._contact_fric[p] * self._accum_normal_impulse[p,
+                                                                           k]
+                old_impulse = self._accum_tangent_impulse[p, k]
+                self._accum_tangent_impulse[p, k] = ti.min(
+                    ti.max(old_impulse + lambda_t, -max_t), max_t)
+                lambda_t = self._accum_tangent_impulse[p, k] - old_impulse
+                self._impulse[p, k] = normal * lambda_n + tangent * lambda_t
+
+        for i in range(self._body_num[None]):
+            if self._movable(i):
+                dv, dw = self._sum_impulses(i)
+                self._vel[i] = self._vel[i] + dv * self._inv_mass[i]
+                self._ang_vel[i] = self._ang_vel[i] + self._inv_inertia[i] * dw
+
+    def _solve_position(self, starts: np.ndarray) -> None:
+        gen: int = self._field_gen
+        args = (self._bias_factor, self._penetration_max)
+        if self._solver == PhysicsWorld.Solver.Serial:
+            self._solve_position_serial(gen, self._pos_iter, 0, starts[-1],
+                                        *args)
+        elif self._solver == PhysicsWorld.Solver.Jacobi:
+            for i in range(self._pos_iter):
+                self._solve_position_jacobi(gen, *args)
+        else:
+            colors: np.ndarray = np.flatnonzero(np.diff(starts))
+            for i in range(self._pos_iter):
+                for c in colors:
+                    if c == PhysicsWorld.ColorMax - 1:
+                        self._solve_position_serial(gen, 1, starts[c],
+                                                    starts[c + 1], *args)
+                    else:
+                        self._solve_position_color(gen, starts[c],
+                                                   starts[c + 1], *args)
+
+    @ti.kernel
+    def _solve_position_serial(self, gen: ti.template(), iters: int,
+                               begin: int, end: int, bias_factor: float,
+                               penetration_max: float):
+        ti.loop_config(serialize=True)
+        for it in range(iters):
+            for q in range(begin, end):
+                self._solve_pair_position(self._color_order[q], bias_factor,
+                                          penetration_max)
+
+    @ti.kernel
+    def _solve_position_color(self, gen: ti.template(), begin: int, end: int,
+                              bias_factor: float, penetration_max: float):
+        for q in range(begin, end):
+            self._solve_pair_position(self._color_order[q], bias_factor,
+                                      penetration_max)
+
+    @ti.kernel
+    def _solve_position_jacobi(self, gen: ti.template(), bias_factor: float,
+                               penetration_max: float):
+        for p in range(self._pair_num[None]):
+            for k in range(self._contact_num[p]):
+                self._impulse[p, k] = self._position_impulse(
+                    p, k, bias_factor, penetration_max)
+
+        for i in range(self._body_num[None]):
+            if self._movable(i):
+                dv, dw = self._sum_impulses(i)
+                self._pos[i] = self._pos[i] + dv * self._inv_mass[i]
+                self._rot[i] = self._rot[i] + self._inv_inertia[i] * dw
+
+    @ti.kernel
+    def _save_contacts(self, gen: ti.template()):
+        self._prev_pair_num[None] = self._pair_num[None]
+        for p in range(self._pair_num[None]):
+            self._prev_key[
+                p] = self._pair[p].x * self._body_len + self._pair[p].y
+            self._prev_contact_num[p] = self._contact_num[p]
+            for k in range(self._contact_num[p]):
+                self._prev_locala[p, k] = self._locala[p, k]
+                self._prev_normal_impulse[p, k] = self._accum_normal_impulse[p,
+                                                                             k]
+                self._prev_tangent_impulse[p,
+                                           k] = self._accum_tangent_impulse[p,
+                                                                            k]
+
+    @ti.kernel
+    def _sync_render(self, gen: ti.template()):
+        for i in range(self._body_num[None]):
+            self._sync_render_row(i)
+
+    @ti.func
+    def _sync_render_row(self, i):
+        # NOTE: the render reads the pos of each shape kind
+        if self._shape_type[i] == 1:
+            self._cirpos[i] = self._pos[i]
+        elif self._shape_type[i] == 4:
+            self._cap_pos[i] = self._pos[i]
+
     def clear_all_bodies(self) -> None:
+        self._store = BodyStore(self._body_len)
         self._body_list.clear()
+        self._vert_cnt = 0
+        self._vert_range[:] = 0
+        self._body_num[None] = 0
+        self._pair_num[None] = 0
+        self._prev_pair_num[None] = 0
 
     def clear_all_joints(self) -> None:
         self._joint_list.clear()
+
+    @property
+    def grav(self) -> ti.Vector:
+        return self._grav
+
+    @grav.setter
+    def grav(self, val: ti.Vector) -> None:
+        self._grav = val
+
+    @property
+    def vel_iter(self) -> int:
+        return self._vel_iter
+
+    @vel_iter.setter
+    def vel_iter(self, val: int) -> None:
+        self._vel_iter = val
+
+    @property
+    def pos_iter(self) -> int:
+        return self._pos_iter
+
+    @pos_iter.setter
+    def pos_iter(self, val: int) -> None:
+        self._pos_iter = val
+
+    @property
+    def solver(self) -> 'PhysicsWorld.Solver':
+        return self._solver
+
+    @solver.setter
+    def solver(self, val: 'PhysicsWorld.Solver') -> None:
+        self._solver = val
+
+    @property
+    def cell_size(self) -> float:
+        return self._cell_size
+
+    @cell_size.setter
+    def cell_size(self, val: float) -> None:
+        self._cell_size = val
+
+    @property
+    def store(self) -> BodyStore:
+        return self._store
+
+    @property
+    def body_num(self) -> int:
+        return self._body_num[None]
+
+    @property
+    def pair_num(self) -> int:
+        return self._pair_num[None]
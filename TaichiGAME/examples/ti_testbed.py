@@ -10,7 +10,7 @@ import TaichiGAME as ng
 
 from TaichiGAME.ti_scene import Scene
 
-ti.init(arch=ti.gpu, excepthook=True)
+ng.ti_init(arch=ti.gpu, excepthook=True)
 
 scene = Scene('GPU Testbed')
 
@@ -92,4 +92,5 @@ class FrameBroadPhaseDetect(ng.Frame):
 frame_broad_phase = FrameBroadPhaseDetect()
 scene.register_frame(frame_broad_phase)
 scene.init_frame()
+scene.warmup()
 scene.show()
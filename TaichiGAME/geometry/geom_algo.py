@@ -5,15 +5,15 @@ from typing import List, Tuple, Optional
 
 import numpy as np
 
-from ..math.matrix import Matrix
+from ..common.config import Config
+from ..math.linalg import Vec2, Mat2
 
 
 class GeomAlgo2D():
     class Clipper():
         @staticmethod
         def sutherland_hodgment_polygon_clipping(
-                polygon: List[Matrix],
-                clip_region: List[Matrix]) -> List[Matrix]:
+                polygon: List[Vec2], clip_region: List[Vec2]) -> List[Vec2]:
             '''Sutherland Hodgman Polygon Clipping
             All points is stored in counter clock winding.
             By convention:
@@ -21,22 +21,22 @@ class GeomAlgo2D():
 
             Parameters
             ----------
-            polygon : List[Matrix]
+            polygon : List[Vec2]
                 original polygon
-            clip_region : List[Matrix]
+            clip_region : List[Vec2]
                 ref clip polygon
 
             Returns
             -------
-            List[Matrix]
+            List[Vec2]
                 clipped polygon
             '''
-            res: List[Matrix] = copy.deepcopy(polygon)
+            res: List[Vec2] = copy.deepcopy(polygon)
             clip_len: int = len(clip_region)
             for i in range(clip_len - 1):
-                clipa: Matrix = clip_region[i]
-                clipb: Matrix = clip_region[i + 1]
-                clipdir: Matrix = clip_region[
+                clipa: Vec2 = clip_region[i]
+                clipb: Vec2 = clip_region[i + 1]
+                clipdir: Vec2 = clip_region[
                     1] if i + 2 == clip_len else clip_region[i + 2]
 
                 is_same_side: List[bool] = []
@@ -46,7 +46,7 @@ class GeomAlgo2D():
                         GeomAlgo2D.is_point_on_same_side(
                             clipa, clipb, clipdir, res[j]))
 
-                new_polygon: List[Matrix] = []
+                new_polygon: List[Vec2] = []
                 for j in range(1, poly_len):
                     last_inside: bool = is_same_side[j - 1]
                     cur_inside: bool = is_same_side[j]
@@ -75,16 +75,16 @@ class GeomAlgo2D():
             return res
 
     @staticmethod
-    def is_collinear(pa: Matrix, pb: Matrix, pc: Matrix) -> bool:
+    def is_collinear(pa: Vec2, pb: Vec2, pc: Vec2) -> bool:
         '''check if point pa, pb, pc are collinear
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             point a
-        pb : Matrix
+        pb : Vec2
             point b
-        pc : Matrix
+        pc : Vec2
             point c
 
         Returns
@@ -92,23 +92,23 @@ class GeomAlgo2D():
         bool
             True: collinear False: not collinear
         '''
-        return np.isclose((pa - pb).cross(pa - pc), [0.0, 0.0]).all()
+        return Config.isclose((pa - pb).cross(pa - pc), 0.0)
 
     @staticmethod
     def judge_range(val: float, low: float, high: float) -> bool:
         return low <= val <= high
 
     @staticmethod
-    def is_fuzzy_collinear(pa: Matrix, pb: Matrix, target: Matrix) -> bool:
+    def is_fuzzy_collinear(pa: Vec2, pb: Vec2, target: Vec2) -> bool:
         '''check if the target point is in rectangle which diag is pa-pb
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             point a
-        pb : Matrix
+        pb : Vec2
             point b
-        target : Matrix
+        target : Vec2
             target point
 
         Returns
@@ -125,16 +125,16 @@ class GeomAlgo2D():
                                           target.y, y_min, y_max)
 
     @staticmethod
-    def is_point_on_segment(pa: Matrix, pb: Matrix, target: Matrix) -> bool:
+    def is_point_on_segment(pa: Vec2, pb: Vec2, target: Vec2) -> bool:
         '''check if the target point is on line segment pa-pb
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             point a
-        pb : Matrix
+        pb : Vec2
             point b
-        target : Matrix
+        target : Vec2
             target point
 
         Returns
@@ -146,8 +146,8 @@ class GeomAlgo2D():
             pa, pb, target) and GeomAlgo2D.is_fuzzy_collinear(pa, pb, target)
 
     @staticmethod
-    def line_segment_intersection(pa: Matrix, pb: Matrix, pc: Matrix,
-                                  pd: Matrix) -> Optional[Matrix]:
+    def line_segment_intersection(pa: Vec2, pb: Vec2, pc: Vec2,
+                                  pd: Vec2) -> Optional[Vec2]:
         '''calculate intersected point between line pa-pb and line pc-pd.
         Return if there is a actual intersected point.
         Notices: overlapping is NOT considered as a kind of intersection
@@ -155,109 +155,109 @@ class GeomAlgo2D():
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             point a
-        pb : Matrix
+        pb : Vec2
             point b
-        pc : Matrix
+        pc : Vec2
             point c
-        pd : Matrix
+        pd : Vec2
             point d
 
         Returns
         -------
-        Optional[Matrix]
+        Optional[Vec2]
             If exist, return intersected point, otherwise None
         '''
 
-        ab: Matrix = pb - pa
-        cd: Matrix = pd - pc
-        ac: Matrix = pc - pa
-        ad: Matrix = pd - pa
-        bc: Matrix = pc - pb
+        ab: Vec2 = pb - pa
+        cd: Vec2 = pd - pc
+        ac: Vec2 = pc - pa
+        ad: Vec2 = pd - pa
+        bc: Vec2 = pc - pb
 
-        d1: float = Matrix.cross_product(ab, ac)
-        d2: float = Matrix.cross_product(ab, ad)
-        d3: float = Matrix.cross_product(cd, -ac)
-        d4: float = Matrix.cross_product(cd, -bc)
+        d1: float = Vec2.cross_product(ab, ac)
+        d2: float = Vec2.cross_product(ab, ad)
+        d3: float = Vec2.cross_product(cd, -ac)
+        d4: float = Vec2.cross_product(cd, -bc)
 
         # XXX: need to simplify the code by abstract calc
         # intersection point method with nxt methods
-        def _calc_pos(ab: Matrix, ac: Matrix, cd: Matrix,
-                      pc: Matrix) -> Matrix:
-            t: float = Matrix.cross_product(ab, ac) / Matrix.cross_product(
-                cd, ab)
-            return Matrix([pc.x + t * cd.x, pc.y + t * cd.y], 'vec')
+        def _calc_pos(ab: Vec2, ac: Vec2, cd: Vec2, pc: Vec2) -> Vec2:
+            t: float = Vec2.cross_product(ab, ac) / Vec2.cross_product(cd, ab)
+            return Vec2(pc.x + t * cd.x, pc.y + t * cd.y)
 
         if d1 * d2 < 0 and d3 * d4 < 0:
             return _calc_pos(ab, ac, cd, pc)
-        elif np.isclose(d1, 0) and GeomAlgo2D.is_point_on_segment(pa, pb, pc):
+        elif Config.isclose(d1, 0) and GeomAlgo2D.is_point_on_segment(
+                pa, pb, pc):
             return _calc_pos(ab, ac, cd, pc)
-        elif np.isclose(d2, 0) and GeomAlgo2D.is_point_on_segment(pa, pb, pd):
+        elif Config.isclose(d2, 0) and GeomAlgo2D.is_point_on_segment(
+                pa, pb, pd):
             return _calc_pos(ab, ac, cd, pc)
-        elif np.isclose(d3, 0) and GeomAlgo2D.is_point_on_segment(pc, pd, pa):
+        elif Config.isclose(d3, 0) and GeomAlgo2D.is_point_on_segment(
+                pc, pd, pa):
             return _calc_pos(ab, ac, cd, pc)
-        elif np.isclose(d4, 0) and GeomAlgo2D.is_point_on_segment(pc, pd, pb):
+        elif Config.isclose(d4, 0) and GeomAlgo2D.is_point_on_segment(
+                pc, pd, pb):
             return _calc_pos(ab, ac, cd, pc)
         else:
             return None
 
     @staticmethod
-    def line_intersection(pa: Matrix, pb: Matrix, pc: Matrix,
-                          pd: Matrix) -> Matrix:
+    def line_intersection(pa: Vec2, pb: Vec2, pc: Vec2, pd: Vec2) -> Vec2:
         '''check if line pa-pb and pc-pd is intersection
         if yes, return the intersection point
         https://blog.csdn.net/qq_45735851/article/details/114434281
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             point a
-        pb : Matrix
+        pb : Vec2
             point b
-        pc : Matrix
+        pc : Vec2
             point c
-        pd : Matrix
+        pd : Vec2
             point d
 
         Returns
         -------
-        Optional[Matrix]
+        Optional[Vec2]
             if insect, return insect point, otherwise return None
         '''
-        linea: Matrix = pb - pa  # w
-        lineb: Matrix = pd - pc  # v
-        if np.isclose(Matrix.cross_product(linea, lineb), 0):
-            return Matrix([0.0, 0.0], 'vec')
+        linea: Vec2 = pb - pa  # w
+        lineb: Vec2 = pd - pc  # v
+        if Config.isclose(Vec2.cross_product(linea, lineb), 0):
+            return Vec2(0.0, 0.0)
 
-        u: Matrix = pc - pa
-        t: float = Matrix.cross_product(linea, u) / Matrix.cross_product(
+        u: Vec2 = pc - pa
+        t: float = Vec2.cross_product(linea, u) / Vec2.cross_product(
             lineb, linea)
-        res: Matrix = Matrix([pc.x + t * lineb.x, pc.y + t * lineb.y], 'vec')
+        res: Vec2 = Vec2(pc.x + t * lineb.x, pc.y + t * lineb.y)
 
         return res
 
     @staticmethod
-    def triangle_circum_center(pa: Matrix, pb: Matrix,
-                               pc: Matrix) -> Optional[Matrix]:
+    def triangle_circum_center(pa: Vec2, pb: Vec2, pc: Vec2) -> Optional[Vec2]:
         '''calc the circum-circle center from triangle pa-pb-pc
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             point a
-        pb : Matrix
+        pb : Vec2
             point b
-        pc : Matrix
+        pc : Vec2
             point c
 
         Returns
         -------
-        Optional[Matrix]
+        Optional[Vec2]
             If pa-pb-pc form triangle, return circum-circle center,
             otherwise None
         '''
-        if np.isclose(GeomAlgo2D.triangle_area(pa, pb, pc), 0):
+        if Config.isclose(GeomAlgo2D.triangle_area(pa, pb, pc), 0):
             return None
 
         # 2 * (x2 - x1) * x + 2 * (y2 - y1) y
@@ -268,35 +268,33 @@ class GeomAlgo2D():
         val12: float = 2.0 * (pb.y - pa.y)
         val21: float = 2.0 * (pc.x - pb.x)
         val22: float = 2.0 * (pc.y - pb.y)
-        coef_mat: Matrix = Matrix([val11, val12, val21, val22])
-        equal_val: Matrix = Matrix([
-            pb.len_square() - pa.len_square(),
-            pc.len_square() - pb.len_square()
-        ], 'vec')
+        coef_mat: Mat2 = Mat2(val11, val12, val21, val22)
+        equal_val: Vec2 = Vec2(pb.len_square() - pa.len_square(),
+                               pc.len_square() - pb.len_square())
 
         return coef_mat.invert() * equal_val
 
     @staticmethod
-    def triangle_inscribed_center(pa: Matrix, pb: Matrix,
-                                  pc: Matrix) -> Optional[Matrix]:
+    def triangle_inscribed_center(pa: Vec2, pb: Vec2,
+                                  pc: Vec2) -> Optional[Vec2]:
         '''calc the inscribed-circle center from triangle pa-pb-pc
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             point a
-        pb : Matrix
+        pb : Vec2
             point b
-        pc : Matrix
+        pc : Vec2
             point c
 
         Returns
         -------
-        Optional[Matrix]
+        Optional[Vec2]
             If pa-pb-pc form triangle, return inscribed-circle center,
             otherwise None
         '''
-        if np.isclose(GeomAlgo2D.triangle_area(pa, pb, pc), 0):
+        if Config.isclose(GeomAlgo2D.triangle_area(pa, pb, pc), 0):
             return None
 
         ab_len: float = (pb - pa).len()
@@ -306,58 +304,57 @@ class GeomAlgo2D():
                                                             ca_len)
 
     @staticmethod
-    def calc_circum_center(pa: Matrix, pb: Matrix,
-                           pc: Matrix) -> Optional[Tuple[Matrix, float]]:
+    def calc_circum_center(pa: Vec2, pb: Vec2,
+                           pc: Vec2) -> Optional[Tuple[Vec2, float]]:
         '''return the circum-circle's center and radius from triangle pa-pb-pc
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             point a
-        pb : Matrix
+        pb : Vec2
             point b
-        pc : Matrix
+        pc : Vec2
             point c
 
         Returns
         -------
-        Optional[Tuple[Matrix, float]]
+        Optional[Tuple[Vec2, float]]
             If can, return the (center, radius), otherwise None
         '''
-        if np.isclose(GeomAlgo2D.triangle_area(pa, pb, pc), 0):
+        if Config.isclose(GeomAlgo2D.triangle_area(pa, pb, pc), 0):
             return None
 
-        center: Optional[Matrix] = GeomAlgo2D.triangle_circum_center(
-            pa, pb, pc)
+        center: Optional[Vec2] = GeomAlgo2D.triangle_circum_center(pa, pb, pc)
         assert center is not None
         radius: float = (center - pa).len()
         return (center, radius)
 
     @staticmethod
-    def calc_inscribed_center(pa: Matrix, pb: Matrix,
-                              pc: Matrix) -> Optional[Tuple[Matrix, float]]:
+    def calc_inscribed_center(pa: Vec2, pb: Vec2,
+                              pc: Vec2) -> Optional[Tuple[Vec2, float]]:
         '''return the inscribed-circle's center and radius
         from triangle pa-pb-pc
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             point a
-        pb : Matrix
+        pb : Vec2
             point b
-        pc : Matrix
+        pc : Vec2
             point c
 
         Returns
         -------
-        Optional[Tuple[Matrix, float]]
+        Optional[Tuple[Vec2, float]]
             If can, return the (center, radius), otherwise None
         '''
         area: float = GeomAlgo2D.triangle_area(pa, pb, pc)
-        if np.isclose(area, 0):
+        if Config.isclose(area, 0):
             return None
 
-        center: Optional[Matrix] = GeomAlgo2D.triangle_inscribed_center(
+        center: Optional[Vec2] = GeomAlgo2D.triangle_inscribed_center(
             pa, pb, pc)
         assert center is not None
 
@@ -369,12 +366,12 @@ class GeomAlgo2D():
         return (center, radius)
 
     @staticmethod
-    def is_convex_polygon(vertices: List[Matrix]) -> bool:
+    def is_convex_polygon(vertices: List[Vec2]) -> bool:
         '''check if the polygon is convex
 
         Parameters
         ----------
-        vertices : List[Matrix]
+        vertices : List[Vec2]
             polygon's points
 
         Returns
@@ -388,20 +385,20 @@ class GeomAlgo2D():
             return True
 
         for i in range(vert_len - 1):
-            ab: Matrix = vertices[i + 1] - vertices[i]
-            ac: Matrix = vertices[i + 2] - vertices[
+            ab: Vec2 = vertices[i + 1] - vertices[i]
+            ac: Vec2 = vertices[i + 2] - vertices[
                 i] if i + 2 != vert_len else vertices[1] - vertices[i]
 
-            if Matrix.cross_product(ab, ac) < 0:
+            if Vec2.cross_product(ab, ac) < 0:
                 return False
 
         return True
 
     @staticmethod
-    def graham_scan_cmp(a: Matrix, b: Matrix) -> int:
+    def graham_scan_cmp(a: Vec2, b: Vec2) -> int:
         first_val1: float = np.arctan2(a.y, a.x)
         first_val2: float = np.arctan2(b.y, b.x)
-        if not np.isclose(first_val1, first_val2):
+        if not Config.isclose(first_val1, first_val2):
             if first_val1 < first_val2:
                 return -1
             elif first_val1 > first_val2:
@@ -409,7 +406,7 @@ class GeomAlgo2D():
         else:
             second_val1: float = a.x
             second_val2: float = b.x
-            if not np.isclose(second_val1, second_val2):
+            if not Config.isclose(second_val1, second_val2):
                 if second_val1 < second_val2:
                     return -1
                 elif second_val1 > second_val2:
@@ -417,21 +414,21 @@ class GeomAlgo2D():
         return 0
 
     @staticmethod
-    def graham_scan(vertices: List[Matrix]) -> List[Matrix]:
+    def graham_scan(vertices: List[Vec2]) -> List[Vec2]:
         '''convex hull algorithm: Graham Scan. Given a series of points,
         find the convex polygon that can contains all of these points.
 
         Parameters
         ----------
-        vertices : List[Matrix]
+        vertices : List[Vec2]
             polygon's points
 
         Returns
         -------
-        List[Matrix]
+        List[Vec2]
             convex polygon's point
         '''
-        sort_vert: List[Matrix] = copy.deepcopy(vertices)
+        sort_vert: List[Vec2] = copy.deepcopy(vertices)
         sort_vert.sort(key=cmp_to_key(GeomAlgo2D.graham_scan_cmp))
 
         stack: List[int] = []
@@ -447,42 +444,42 @@ class GeomAlgo2D():
             if check_idx >= len(sort_vert):
                 check_idx = 0
 
-            ab: Matrix = sort_vert[j] - sort_vert[i]
-            ac: Matrix = sort_vert[check_idx] - sort_vert[i]
+            ab: Vec2 = sort_vert[j] - sort_vert[i]
+            ac: Vec2 = sort_vert[check_idx] - sort_vert[i]
 
             if ab.cross(ac) < 0:
                 stack.pop()
             stack.append(check_idx)
             check_idx += 1
 
-        res: List[Matrix] = []
+        res: List[Vec2] = []
         for idx in stack:
             res.append(sort_vert[idx])
 
         return res
 
     @staticmethod
-    def point_to_line_segment(pa: Matrix, pb: Matrix, pc: Matrix) -> Matrix:
+    def point_to_line_segment(pa: Vec2, pb: Vec2, pc: Vec2) -> Vec2:
         '''calculate point on line segment pa-pb that is
         the shortest length to pc
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             point a
-        pb : Matrix
+        pb : Vec2
             point b
-        pc : Matrix
+        pc : Vec2
             point c
 
         Returns
         -------
-        Matrix
+        Vec2
             shortest-dis point to the segment, otherwise zero
         '''
 
         if pa == pb:
-            return Matrix([0.0, 0.0], 'vec')
+            return Vec2(0.0, 0.0)
 
         if GeomAlgo2D.is_collinear(pa, pb, pc):
             if GeomAlgo2D.is_point_on_segment(pa, pb, pc):
@@ -491,10 +488,10 @@ class GeomAlgo2D():
                 return pb if (pc - pa).len_square() > (pc -
                                                        pb).len_square() else pa
 
-        ac: Matrix = pc - pa
-        ab_normal: Matrix = (pb - pa).normal()
-        ac_proj: Matrix = ab_normal * ab_normal.dot(ac)
-        op_proj: Matrix = pa + ac_proj
+        ac: Vec2 = pc - pa
+        ab_normal: Vec2 = (pb - pa).normal()
+        ac_proj: Vec2 = ab_normal * ab_normal.dot(ac)
+        op_proj: Vec2 = pa + ac_proj
 
         if GeomAlgo2D.is_fuzzy_collinear(pa, pb, op_proj):
             return op_proj
@@ -502,8 +499,7 @@ class GeomAlgo2D():
         return pb if (pc - pa).len_square() > (pc - pb).len_square() else pa
 
     @staticmethod
-    def shortest_length_point_of_ellipse(a: float, b: float,
-                                         pc: Matrix) -> Matrix:
+    def shortest_length_point_of_ellipse(a: float, b: float, pc: Vec2) -> Vec2:
         '''calculate point on ellipse that is the shortest length
         to pc(aka projection point)
 
@@ -513,30 +509,28 @@ class GeomAlgo2D():
             semi-major axis len
         b : float
             semi-minor axis len
-        pc : Matrix
+        pc : Vec2
             target point
 
         Returns
         -------
-        Optional[Matrix]
+        Optional[Vec2]
             shortest-dis point to the ellipse, otherwise None
         '''
 
-        if np.isclose(a, 0) or np.isclose(b, 0):
-            return Matrix([0.0, 0.0], 'vec')
+        if Config.isclose(a, 0) or Config.isclose(b, 0):
+            return Vec2(0.0, 0.0)
 
-        if np.isclose(pc.x, 0):
-            return Matrix([0.0, b], 'vec') if pc.y > 0 else Matrix([0.0, -b],
-                                                                   'vec')
+        if Config.isclose(pc.x, 0):
+            return Vec2(0.0, b) if pc.y > 0 else Vec2(0.0, -b)
 
-        if np.isclose(pc.y, 0):
-            return Matrix([a, 0.0], 'vec') if pc.x > 0 else Matrix([-a, 0.0],
-                                                                   'vec')
+        if Config.isclose(pc.y, 0):
+            return Vec2(a, 0.0) if pc.x > 0 else Vec2(-a, 0.0)
 
         x_left: float = 0.0
         x_right: float = 0.0
-        t0: Matrix = Matrix([0.0, 0.0], 'vec')
-        t1: Matrix = Matrix([0.0, 0.0], 'vec')
+        t0: Vec2 = Vec2(0.0, 0.0)
+        t1: Vec2 = Vec2(0.0, 0.0)
         sgn: int = 1 if pc.y > 0 else -1
 
         if pc.x < 0:
@@ -558,11 +552,11 @@ class GeomAlgo2D():
             tmp_y1: float = (b**2 - (b / a)**2 * tmp_x1 * tmp_x0) / tmp_y0
             t1.set_value([tmp_x1, tmp_y1])
 
-            t0t1: Matrix = t1 - t0
-            t0p: Matrix = pc - t0
+            t0t1: Vec2 = t1 - t0
+            t0p: Vec2 = pc - t0
 
             res: float = t0t1.dot(t0p)
-            if np.isclose(np.fabs(res), 0.0):
+            if Config.isclose(np.fabs(res), 0.0):
                 break
 
             if res > 0:
@@ -573,36 +567,36 @@ class GeomAlgo2D():
         return t0
 
     @staticmethod
-    def triangle_centroid(pa: Matrix, pb: Matrix, pc: Matrix) -> Matrix:
+    def triangle_centroid(pa: Vec2, pb: Vec2, pc: Vec2) -> Vec2:
         '''calculate the centroid of the triangle
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             point a
-        pb : Matrix
+        pb : Vec2
             point b
-        pc : Matrix
+        pc : Vec2
             point c
 
         Returns
         -------
-        Matrix
+        Vec2
             centroid point
         '''
         return (pa + pb + pc) / 3.0
 
     @staticmethod
-    def triangle_area(pa: Matrix, pb: Matrix, pc: Matrix) -> float:
+    def triangle_area(pa: Vec2, pb: Vec2, pc: Vec2) -> float:
         '''calculate the area of the triangle
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             point a
-        pb : Matrix
+        pb : Vec2
             point b
-        pc : Matrix
+        pc : Vec2
             point c
 
         Returns
@@ -610,28 +604,28 @@ class GeomAlgo2D():
         float
             triangle area
         '''
-        return np.fabs(Matrix.cross_product(pa - pb, pa - pc) / 2.0)
+        return np.fabs(Vec2.cross_product(pa - pb, pa - pc) / 2.0)
 
     # NOTE: need to focus on the vertices format
     # the vertices format is for the close shape
     @staticmethod
-    def calc_mass_center(vertices: List[Matrix]) -> Matrix:
+    def calc_mass_center(vertices: List[Vec2]) -> Vec2:
         '''calculate the mass center of the convex polygon
 
         Parameters
         ----------
-        vertices : List[Matrix]
+        vertices : List[Vec2]
             polygon's points
 
         Returns
         -------
-        Matrix
+        Vec2
             mass center
         '''
 
         vert_len: int = len(vertices)
         if vert_len >= 4:
-            pos: Matrix = Matrix([0.0, 0.0], 'vec')
+            pos: Vec2 = Vec2(0.0, 0.0)
             tot_area: float = 0.0
 
             for i in range(vert_len - 1):
@@ -642,7 +636,7 @@ class GeomAlgo2D():
 
                 tri_area: float = GeomAlgo2D.triangle_area(
                     vertices[0], vertices[idx1], vertices[idx2])
-                tri_centroid: Matrix = GeomAlgo2D.triangle_centroid(
+                tri_centroid: Vec2 = GeomAlgo2D.triangle_centroid(
                     vertices[0], vertices[idx1], vertices[idx2])
 
                 pos += tri_centroid * tri_area
@@ -652,12 +646,11 @@ class GeomAlgo2D():
 
             return pos
         else:
-            return Matrix([0.0, 0.0], 'vec')
+            return Vec2(0.0, 0.0)
 
     @staticmethod  # FIXME: need to understand the algorithm
-    def shortest_length_line_segment_ellipse(
-            a: float, b: float, pc: Matrix,
-            pd: Matrix) -> Tuple[Matrix, Matrix]:
+    def shortest_length_line_segment_ellipse(a: float, b: float, pc: Vec2,
+                                             pd: Vec2) -> Tuple[Vec2, Vec2]:
         '''calculate two points on line segment and ellipse respectively.
         The length of two points is the shortest distance of line segment
         and ellipse
@@ -668,22 +661,22 @@ class GeomAlgo2D():
             semi-major axis len
         b : float
             semi-minor axis len
-        pc : Matrix
+        pc : Vec2
             line segment point c
-        pd : Matrix
+        pd : Vec2
             line segment point d
 
         Returns
         -------
-        Tuple[Matrix, Matrix]
+        Tuple[Vec2, Vec2]
             the return data
         '''
 
-        res_segm: Matrix = Matrix([0.0, 0.0], 'vec')
-        res_elli: Matrix = Matrix([0.0, 0.0], 'vec')
+        res_segm: Vec2 = Vec2(0.0, 0.0)
+        res_elli: Vec2 = Vec2(0.0, 0.0)
         tmp: float = 0.0
         # FIXME: can write helper func
-        if np.isclose(pc.y, pd.y):
+        if Config.isclose(pc.y, pd.y):
             if not ((pc.x > 0 and pd.x > 0) or (pc.x < 0 and pd.x < 0)):
                 res_elli.set_value([0.0, b if pc.y > 0 else -b])
                 res_segm.set_value([0.0, pc.y])
@@ -692,7 +685,7 @@ class GeomAlgo2D():
                 res_segm.set_value([tmp, pc.y])
                 res_elli = GeomAlgo2D.shortest_length_point_of_ellipse(
                     a, b, res_segm)
-        elif np.isclose(pc.x, pd.x):
+        elif Config.isclose(pc.x, pd.x):
             if not ((pc.y > 0 and pd.y > 0) or (pc.y < 0 and pd.y < 0)):
                 res_elli.set_value([a if pc.x > 0 else -a, 0.0])
                 res_segm.set_value([pc.x, 0.0])
@@ -710,30 +703,30 @@ class GeomAlgo2D():
             f_y2: float = b2 - b2 * f_x2 / a2
             f_x: float = np.sqrt(f_x2)
             f_y: float = np.sqrt(f_y2)
-            f: Matrix = Matrix([0.0, 0.0], 'vec')
-            pcpd: Matrix = (pd - pc).normal()
+            f: Vec2 = Vec2(0.0, 0.0)
+            pcpd: Vec2 = (pd - pc).normal()
 
             # Check which quadrant does nearest point fall in
-            f_arr: List[Matrix] = []
-            f_arr.append(Matrix([f_x, f_y], 'vec'))
-            f_arr.append(Matrix([-f_x, f_y], 'vec'))
-            f_arr.append(Matrix([-f_x, -f_y], 'vec'))
-            f_arr.append(Matrix([f_x, -f_y], 'vec'))
+            f_arr: List[Vec2] = []
+            f_arr.append(Vec2(f_x, f_y))
+            f_arr.append(Vec2(-f_x, f_y))
+            f_arr.append(Vec2(-f_x, -f_y))
+            f_arr.append(Vec2(f_x, -f_y))
 
-            min_val: float = Matrix.cross_product(pcpd, f_arr[0] - pc)
+            min_val: float = Vec2.cross_product(pcpd, f_arr[0] - pc)
             for i in range(1, 4):
-                tmp_val: float = Matrix.cross_product(pcpd, f_arr[i] - pc)
+                tmp_val: float = Vec2.cross_product(pcpd, f_arr[i] - pc)
                 if tmp_val < min_val:
                     f = f_arr[i]
                     min_val = tmp_val
 
-            pcf: Matrix = f - pc
-            pc_fp: Matrix = pcpd * pcpd.dot(pcf)
-            f_proj: Matrix = pc + pc_fp
+            pcf: Vec2 = f - pc
+            pc_fp: Vec2 = pcpd * pcpd.dot(pcf)
+            f_proj: Vec2 = pc + pc_fp
 
             # NOTE: focus the projection dirn
-            if GeomAlgo2D.is_fuzzy_collinear(Matrix([a, 0.0], 'vec'),
-                                             Matrix([b, 0.0], 'vec'), f_proj):
+            if GeomAlgo2D.is_fuzzy_collinear(Vec2(a, 0.0), Vec2(b, 0.0),
+                                             f_proj):
                 res_elli = f
                 res_segm = f_proj
             else:
@@ -750,32 +743,31 @@ class GeomAlgo2D():
         return (res_elli, res_segm)
 
     @staticmethod
-    def raycast(pa: Matrix, dirn: Matrix, pc: Matrix,
-                pd: Matrix) -> Optional[Matrix]:
+    def raycast(pa: Vec2, dirn: Vec2, pc: Vec2, pd: Vec2) -> Optional[Vec2]:
         '''calculate point on line segment pc-pd, if point 'pa'
         can cast ray in 'dirn' direction on line segment pc-pd.
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             ray start point
-        dirn : Matrix
+        dirn : Vec2
             ray direction
-        pc : Matrix
+        pc : Vec2
             line segment point a
-        pd : Matrix
+        pd : Vec2
             line segment point b
 
         Returns
         -------
-        Optional[Matrix]
+        Optional[Vec2]
             If exist, return raycast point, otherwise None
         '''
 
         denominator: float = (pa.x - dirn.x) * (pc.y - pd.y) - (
             pa.y - dirn.y) * (pc.x - pd.x)
 
-        if np.isclose(denominator, 0):
+        if Config.isclose(denominator, 0):
             return None
 
         t: float = ((pa.x - pc.x) * (pc.y - pd.y) - (pa.y - pc.y) *
@@ -784,32 +776,30 @@ class GeomAlgo2D():
                     (pa.x - pc.x)) / denominator
 
         if t >= 0 and 0 <= u <= 1.0:
-            return Matrix(
-                [pa.x + t * (dirn.x - pa.x), pa.y + t * (dirn.y - pa.y)],
-                'vec')
+            return Vec2(pa.x + t * (dirn.x - pa.x), pa.y + t * (dirn.y - pa.y))
 
         return None
 
     @staticmethod
-    def raycast_aabb(pa: Matrix, dirn: Matrix, top_left: Matrix,
-                     bot_right: Matrix) -> Optional[Tuple[Matrix, Matrix]]:
+    def raycast_aabb(pa: Vec2, dirn: Vec2, top_left: Vec2,
+                     bot_right: Vec2) -> Optional[Tuple[Vec2, Vec2]]:
         '''calculate point on  AABB, if point 'pa' can cast ray in 'dirn'
         direction on AABB.
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             ray start point
-        dirn : Matrix
+        dirn : Vec2
             ray direction
-        top_left : Matrix
+        top_left : Vec2
             AABB top left point
-        bot_right : Matrix
+        bot_right : Vec2
             AABB bot right point
 
         Returns
         -------
-        Optional[Matrix]
+        Optional[Vec2]
             If exist, return two raycast point, one is incidence point, another
         is emission point, otherwise None
         '''
@@ -829,12 +819,12 @@ class GeomAlgo2D():
         t_enter: float = 0.0
         t_exit: float = 0.0
 
-        if np.isclose(dirn.x, 0) and not np.isclose(dirn.y, 0):
+        if Config.isclose(dirn.x, 0) and not Config.isclose(dirn.y, 0):
             ty_min = (y_min - pa.y) / dirn.y
             ty_max = (y_max - pa.y) / dirn.y
             t_enter = np.fmin(ty_min, ty_max)
             t_exit = np.fmax(ty_min, ty_max)
-        elif not np.isclose(dirn.x, 0) and np.isclose(dirn.y, 0):
+        elif not Config.isclose(dirn.x, 0) and Config.isclose(dirn.y, 0):
             tx_min = (x_min - pa.x) / dirn.x
             tx_max = (x_max - pa.x) / dirn.x
             t_enter = np.fmin(tx_min, tx_max)
@@ -855,23 +845,22 @@ class GeomAlgo2D():
             return None
 
         # NOTE: just for different with buildin type
-        out_enter: Matrix = pa + dirn * t_enter
-        out_exit: Matrix = pa + dirn * t_exit
+        out_enter: Vec2 = pa + dirn * t_enter
+        out_exit: Vec2 = pa + dirn * t_exit
 
         return (out_enter, out_exit)
 
     @staticmethod
-    def is_point_on_AABB(pa: Matrix, top_left: Matrix,
-                         bot_right: Matrix) -> bool:
+    def is_point_on_AABB(pa: Vec2, top_left: Vec2, bot_right: Vec2) -> bool:
         '''check if the pa is in the AABB
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             target point
-        top_left : Matrix
+        top_left : Vec2
             AABB top left point
-        bot_right : Matrix
+        bot_right : Vec2
             AABB bottom right point
 
         Returns
@@ -885,29 +874,28 @@ class GeomAlgo2D():
                                           pa.y, bot_right.y, top_left.y)
 
     @staticmethod
-    def rotate(pa: Matrix, center: Matrix, radian: float) -> Matrix:
+    def rotate(pa: Vec2, center: Vec2, radian: float) -> Vec2:
         '''rotate point 'pa' around point 'center' by radian
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             source point
-        center : Matrix
+        center : Vec2
             center point
         radian : float
             rotate radian
 
         Returns
         -------
-        Matrix
+        Vec2
             result point
         '''
 
-        return Matrix.rotate_mat(radian) * (pa - center) + center
+        return Mat2.rotate_mat(radian) * (pa - center) + center
 
     @staticmethod
-    def calc_ellipse_project_on_point(a: float, b: float,
-                                      dirn: Matrix) -> Matrix:
+    def calc_ellipse_project_on_point(a: float, b: float, dirn: Vec2) -> Vec2:
         '''calculate the projection axis of ellipse in user-define direction.
         return the maximum point in ellipse
 
@@ -917,22 +905,22 @@ class GeomAlgo2D():
             semi-major axis len
         b : float
             semi-minor axis len
-        dirn : Matrix
+        dirn : Vec2
             user define direction
 
         Returns
         -------
-        Matrix
+        Vec2
             maximum point
         '''
 
-        res: Matrix = Matrix([0.0, 0.0], 'vec')
+        res: Vec2 = Vec2(0.0, 0.0)
         sgn: int = -1
 
-        if np.isclose(dirn.x, 0):
+        if Config.isclose(dirn.x, 0):
             sgn = -1 if dirn.y < 0 else 1
             res.set_value([0.0, sgn * b])
-        elif np.isclose(dirn.y, 0):
+        elif Config.isclose(dirn.y, 0):
             sgn = -1 if dirn.x < 0 else 1
             res.set_value([sgn * a, 0.0])
         else:
@@ -943,7 +931,7 @@ class GeomAlgo2D():
             b2: float = b**2
             k2: float = k**2
             d: float = np.sqrt((a2 + b2 * k2) / k2)
-            if Matrix.dot_product(Matrix([0.0, d], 'vec'), dirn) < 0:
+            if Vec2.dot_product(Vec2(0.0, d), dirn) < 0:
                 d = d * -1
 
             x1: float = k * d - (b2 * k2 * k * d) / (a2 + b2 * k2)
@@ -954,7 +942,7 @@ class GeomAlgo2D():
 
     @staticmethod
     def calc_capsule_project_on_point(width: float, height: float,
-                                      dirn: Matrix) -> Matrix:
+                                      dirn: Vec2) -> Vec2:
         '''calculate the projection axis of capsule in user-define direction.
         return the maximum point in capsule
 
@@ -964,16 +952,16 @@ class GeomAlgo2D():
             capsule width
         height : float
             capsule height
-        dirn : Matrix
+        dirn : Vec2
             user define direction
 
         Returns
         -------
-        Matrix
+        Vec2
             maximum point
         '''
 
-        res: Matrix = Matrix([0.0, 0.0], 'vec')
+        res: Vec2 = Vec2(0.0, 0.0)
         radius: float = 0.0
         offset: float = 0.0
         if width > height:
@@ -999,7 +987,7 @@ class GeomAlgo2D():
 
     @staticmethod
     def calc_sector_project_on_point(start: float, span: float, radius: float,
-                                     dirn: Matrix) -> Matrix:
+                                     dirn: Vec2) -> Vec2:
         '''calculate the projection axis of sector in user-define direction.
         return the maximum point in sector
 
@@ -1011,16 +999,16 @@ class GeomAlgo2D():
             span radian(delta radian)
         radius : float
             radius value
-        dirn : Matrix
+        dirn : Vec2
             user define direction
 
         Returns
         -------
-        Matrix
+        Vec2
             maximum point
         '''
 
-        res: Matrix = Matrix([0.0, 0.0], 'vec')
+        res: Vec2 = Vec2(0.0, 0.0)
 
         def _clamp_radian(radian: float) -> float:
             _res: float = radian
@@ -1045,44 +1033,41 @@ class GeomAlgo2D():
                     theta = origin_theta
 
                 # clamp theta to sector area
-                res = Matrix.rotate_mat(np.clip(
-                    theta, clamp_start, clamp_end)) * Matrix([1.0, 0.0],
-                                                             'vec') * radius
+                res = Mat2.rotate_mat(np.clip(
+                    theta, clamp_start, clamp_end)) * Vec2(1.0, 0.0) * radius
 
         elif origin_start < origin_end:
             if GeomAlgo2D.judge_range(origin_theta, origin_start, origin_end):
-                res = Matrix.rotate_mat(np.clip(
-                    theta, clamp_start, clamp_end)) * Matrix([1.0, 0.0],
-                                                             'vec') * radius
+                res = Mat2.rotate_mat(np.clip(
+                    theta, clamp_start, clamp_end)) * Vec2(1.0, 0.0) * radius
 
-        if np.isclose(origin_start, origin_end):
-            if not np.isclose(theta, origin_start):
+        if Config.isclose(origin_start, origin_end):
+            if not Config.isclose(theta, origin_start):
                 if theta > origin_start:
                     theta = origin_theta
 
                 if clamp_start > clamp_end:
-                    res = Matrix.rotate_mat(
+                    res = Mat2.rotate_mat(
                         np.clip(theta, clamp_start - np.pi * 2.0,
-                                clamp_end)) * Matrix([1.0, 0.0],
-                                                     'vec') * radius
+                                clamp_end)) * Vec2(1.0, 0.0) * radius
                 else:
-                    res = Matrix.rotate_mat(
-                        np.clip(theta, clamp_start, clamp_end)) * Matrix(
-                            [1.0, 0.0], 'vec') * radius
+                    res = Mat2.rotate_mat(
+                        np.clip(theta, clamp_start, clamp_end)) * Vec2(
+                            1.0, 0.0) * radius
 
         return res
 
     @staticmethod
-    def is_triangle_contain_origin(pa: Matrix, pb: Matrix, pc: Matrix) -> bool:
+    def is_triangle_contain_origin(pa: Vec2, pb: Vec2, pc: Vec2) -> bool:
         '''check if the origin point is in the triangle
 
         Parameters
         ----------
-        pa : Matrix
+        pa : Vec2
             point a
-        pb : Matrix
+        pb : Vec2
             point b
-        pc : Matrix
+        pc : Vec2
             point c
 
         Returns
@@ -1098,19 +1083,19 @@ class GeomAlgo2D():
                                                      and rc <= 0)
 
     @staticmethod
-    def is_point_on_same_side(edgp1: Matrix, edgp2: Matrix, ref: Matrix,
-                              target: Matrix) -> bool:
+    def is_point_on_same_side(edgp1: Vec2, edgp2: Vec2, ref: Vec2,
+                              target: Vec2) -> bool:
         '''check if the target and ref point is on edgep1-edgep2 same side
 
         Parameters
         ----------
-        edgp1 : Matrix
+        edgp1 : Vec2
             edge point 1
-        edgp2 : Matrix
+        edgp2 : Vec2
             edge point 2
-        ref : Matrix
+        ref : Vec2
             ref point
-        target : Matrix
+        target : Vec2
             target point
 
         Returns
@@ -6,7 +6,7 @@ from typing import List, Optional, Union
 import numpy as np
 
 from ..common.config import Config
-from ..math.matrix import Matrix
+from ..math.linalg import Vec2, Mat2
 from .geom_algo import GeomAlgo2D
 
 
@@ -39,11 +39,11 @@ class Shape(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def contains(self, point: Matrix) -> bool:
+    def contains(self, point: Vec2) -> bool:
         raise NotImplementedError
 
     @abstractmethod
-    def center(self) -> Matrix:
+    def center(self) -> Vec2:
         raise NotImplementedError
 
 
@@ -54,35 +54,35 @@ class ShapePrimitive():
     def __init__(self):
         self._shape: Optional[Union[Point, Polygon, Rectangle, Circle, Ellipse,
                                     Edge, Curve, Capsule, Sector]] = None
-        self._xform: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._xform: Vec2 = Vec2(0.0, 0.0)
         self._rot: float = 0.0
 
-    def translate(self, src: Matrix) -> Matrix:
+    def translate(self, src: Vec2) -> Vec2:
         assert src.shape == (2, 1)
-        return Matrix.rotate_mat(self._rot) * src + self._xform
+        return Mat2.rotate_mat(self._rot) * src + self._xform
 
 
 class Point(Shape):
     def __init__(self):
         super().__init__()
         self.type = self.Type.Point
-        self._pos: Matrix = Matrix([0.0, 0.0], 'vec')
+        self._pos: Vec2 = Vec2(0.0, 0.0)
 
     @property
-    def pos(self) -> Matrix:
+    def pos(self) -> Vec2:
         return self._pos
 
     @pos.setter
-    def pos(self, pos: Matrix) -> None:
-        self._pos = pos
+    def pos(self, pos: Vec2) -> None:
+        self._pos = Vec2.from_value(pos)
 
     def scale(self, factor: float) -> None:
         self._pos *= factor
 
-    def contains(self, point: Matrix) -> bool:
+    def contains(self, point: Vec2) -> bool:
         return self._pos == point
 
-    def center(self) -> Matrix:
+    def center(self) -> Vec2:
         return self._pos
 
 
@@ -92,18 +92,18 @@ class Polygon(Shape):
     def __init__(self):
         super().__init__()
         self.type = self.Type.Polygon
-        self._vertices: List[Matrix] = []
+        self._vertices: List[Vec2] = []
 
     @property
-    def vertices(self) -> List[Matrix]:
+    def vertices(self) -> List[Vec2]:
         return self._vertices
 
     @vertices.setter
-    def vertices(self, vertices: List[Matrix]) -> None:
-        self._vertices = vertices
+    def vertices(self, vertices: List[Vec2]) -> None:
+        self._vertices = [Vec2.from_value(v) for v in vertices]
         self.update_vertices()
 
-    def append(self, vertice: Matrix) -> None:
+    def append(self, vertice: Vec2) -> None:
         raise AssertionError('dont use, otherwise make gjk algo fail! ')
         self._vertices.append(vertice)
         self.update_vertices()
@@ -112,14 +112,14 @@ class Polygon(Shape):
         assert len(self._vertices) > 0
         self._vertices = [v * factor for v in self._vertices]
 
-    def contains(self, point: Matrix) -> bool:
+    def contains(self, point: Vec2) -> bool:
         assert len(self._vertices) > 2
 
         vert_len: int = len(self._vertices)
         for i in range(vert_len - 1):
-            p1: Matrix = self._vertices[i]
-            p2: Matrix = self._vertices[i + 1]
-            ref: Matrix = self._vertices[
+            p1: Vec2 = self._vertices[i]
+            p2: Vec2 = self._vertices[i + 1]
+            ref: Vec2 = self._vertices[
                 1] if i + 2 == vert_len else self._vertices[i + 2]
             # NOTE: why [1]? according to the vertices list type,
             # shape need to be closed
@@ -128,11 +128,11 @@ class Polygon(Shape):
 
         return True
 
-    def center(self) -> Matrix:
+    def center(self) -> Vec2:
         return GeomAlgo2D.calc_mass_center(self._vertices)
 
     def update_vertices(self) -> None:
-        center_point: Matrix = self.center()
+        center_point: Vec2 = self.center()
         self._vertices = [v - center_point for v in self._vertices]
 
 
@@ -160,12 +160,12 @@ class Rectangle(Polygon):
         self.calc_vertices()
 
     @property
-    def vertices(self) -> List[Matrix]:
+    def vertices(self) -> List[Vec2]:
         return self._vertices
 
     @vertices.setter
-    def vertices(self, vert: List[Matrix]) -> None:
-        self._vertices = vert
+    def vertices(self, vert: List[Vec2]) -> None:
+        self._vertices = [Vec2.from_value(v) for v in vert]
 
     # NOTE: use _var to set val, because property 'width'
     # and 'height' call 'calc_vertices' will use _var in init
@@ -183,23 +183,18 @@ class Rectangle(Polygon):
     def contain_helper(val: float, ref: float) -> bool:
         return -ref * 0.5 < val < ref * 0.5
 
-    def contains(self, point: Matrix) -> bool:
+    def contains(self, point: Vec2) -> bool:
         return self.contain_helper(point.x,
                                    self._width) and self.contain_helper(
                                        point.y, self._height)
 
     def calc_vertices(self) -> None:
-        self._vertices: List[Matrix] = []
-        self._vertices.append(
-            Matrix([-self._width * 0.5, self._height * 0.5], 'vec'))
-        self._vertices.append(
-            Matrix([-self._width * 0.5, -self._height * 0.5], 'vec'))
-        self._vertices.append(
-            Matrix([self._width * 0.5, -self._height * 0.5], 'vec'))
-        self._vertices.append(
-            Matrix([self._width * 0.5, self._height * 0.5], 'vec'))
-        self._vertices.append(
-            Matrix([-self._width * 0.5, self._height * 0.5], 'vec'))
+        self._vertices: List[Vec2] = []
+        self._vertices.append(Vec2(-self._width * 0.5, self._height * 0.5))
+        self._vertices.append(Vec2(-self._width * 0.5, -self._height * 0.5))
+        self._vertices.append(Vec2(self._width * 0.5, -self._height * 0.5))
+        self._vertices.append(Vec2(self._width * 0.5, self._height * 0.5))
+        self._vertices.append(Vec2(-self._width * 0.5, self._height * 0.5))
 
 
 class Circle(Shape):
@@ -219,11 +214,11 @@ class Circle(Shape):
     def scale(self, factor: float) -> None:
         self._radius *= factor
 
-    def contains(self, point: Matrix) -> bool:
+    def contains(self, point: Vec2) -> bool:
         return point.len_square() < self._radius * self._radius
 
-    def center(self) -> Matrix:
-        return Matrix([0.0, 0.0], 'vec')
+    def center(self) -> Vec2:
+        return Vec2(0.0, 0.0)
 
 
 class Ellipse(Shape):
@@ -256,11 +251,11 @@ class Ellipse(Shape):
         self._width *= factor
         self._height *= factor
 
-    def contains(self, point: Matrix) -> bool:
+    def contains(self, point: Vec2) -> bool:
         return False
 
-    def center(self) -> Matrix:
-        return Matrix([0.0, 0.0], 'vec')
+    def center(self) -> Vec2:
+        return Vec2(0.0, 0.0)
 
     def A(self) -> float:
         return self._width / 2.0
@@ -280,52 +275,52 @@ class Edge(Shape):
         self.type = self.Type.Edge
         # set (1.0, 1.0) just for init calc the normal vec correctly
         # if both are (0.0, 0.0), can lead div zero error
-        self.set_value(Matrix([1.0, 1.0], 'vec'), Matrix([0.0, 0.0], 'vec'))
+        self.set_value(Vec2(1.0, 1.0), Vec2(0.0, 0.0))
 
     @property
-    def start(self) -> Matrix:
+    def start(self) -> Vec2:
         return self._start
 
     @start.setter
-    def start(self, point: Matrix) -> None:
-        self._start: Matrix = point
+    def start(self, point: Vec2) -> None:
+        self._start: Vec2 = Vec2.from_value(point)
         self.update_normal()
 
     @property
-    def end(self) -> Matrix:
+    def end(self) -> Vec2:
         return self._end
 
     @end.setter
-    def end(self, point: Matrix) -> None:
-        self._end: Matrix = point
+    def end(self, point: Vec2) -> None:
+        self._end: Vec2 = Vec2.from_value(point)
         self.update_normal()
 
     # the only method to init the edge value
-    def set_value(self, start: Matrix, end: Matrix) -> None:
-        self._start = start
-        self._end = end
+    def set_value(self, start: Vec2, end: Vec2) -> None:
+        self._start = Vec2.from_value(start)
+        self._end = Vec2.from_value(end)
         self.update_normal()
 
     def update_normal(self) -> None:
-        self._normal: Matrix = (self._end -
-                                self._start).perpendicular().normal().negate()
+        self._normal: Vec2 = (self._end -
+                              self._start).perpendicular().normal().negate()
 
     def scale(self, factor: float) -> None:
         self._start *= factor
         self._end *= factor
 
-    def contains(self, point: Matrix) -> bool:
+    def contains(self, point: Vec2) -> bool:
         return GeomAlgo2D.is_point_on_segment(self._start, self._end, point)
 
-    def center(self) -> Matrix:
+    def center(self) -> Vec2:
         return (self._start + self._end) / 2.0
 
     @property
-    def normal(self) -> Matrix:
+    def normal(self) -> Vec2:
         return self._normal
 
     @normal.setter
-    def normal(self, normal: Matrix) -> None:
+    def normal(self, normal: Vec2) -> None:
         self._normal = normal
 
 
@@ -333,47 +328,47 @@ class Curve(Shape):
     def __init__(self):
         super().__init__()
         self.type = self.Type.Curve
-        self.set_value(Matrix([0.0, 0.0], 'vec'), Matrix([0.0, 0.0], 'vec'),
-                       Matrix([0.0, 0.0], 'vec'), Matrix([0.0, 0.0], 'vec'))
+        self.set_value(Vec2(0.0, 0.0), Vec2(0.0, 0.0), Vec2(0.0, 0.0),
+                       Vec2(0.0, 0.0))
 
     @property
-    def start(self) -> Matrix:
+    def start(self) -> Vec2:
         return self._start
 
     @start.setter
-    def start(self, point: Matrix) -> None:
-        self._start: Matrix = point
+    def start(self, point: Vec2) -> None:
+        self._start: Vec2 = Vec2.from_value(point)
 
     @property
-    def ctrl1(self) -> Matrix:
+    def ctrl1(self) -> Vec2:
         return self._ctrl1
 
     @ctrl1.setter
-    def ctrl1(self, point: Matrix) -> None:
-        self._ctrl1: Matrix = point
+    def ctrl1(self, point: Vec2) -> None:
+        self._ctrl1: Vec2 = Vec2.from_value(point)
 
     @property
-    def ctrl2(self) -> Matrix:
+    def ctrl2(self) -> Vec2:
         return self._ctrl2
 
     @ctrl2.setter
-    def ctrl2(self, point: Matrix) -> None:
-        self._ctrl2: Matrix = point
+    def ctrl2(self, point: Vec2) -> None:
+        self._ctrl2: Vec2 = Vec2.from_value(point)
 
     @property
-    def end(self) -> Matrix:
+    def end(self) -> Vec2:
         return self._end
 
     @end.setter
-    def end(self, point: Matrix) -> None:
-        self._end: Matrix = point
+    def end(self, point: Vec2) -> None:
+        self._end: Vec2 = Vec2.from_value(point)
 
-    def set_value(self, start: Matrix, ctrl1: Matrix, ctrl2: Matrix,
-                  end: Matrix) -> None:
-        self._start = start
-        self._ctrl1 = ctrl1
-        self._ctrl2 = ctrl2
-        self._end = end
+    def set_value(self, start: Vec2, ctrl1: Vec2, ctrl2: Vec2,
+                  end: Vec2) -> None:
+        self._start = Vec2.from_value(start)
+        self._ctrl1 = Vec2.from_value(ctrl1)
+        self._ctrl2 = Vec2.from_value(ctrl2)
+        self._end = Vec2.from_value(end)
 
     def scale(self, factor: float) -> None:
         self._start *= factor
@@ -381,11 +376,11 @@ class Curve(Shape):
         self._ctrl2 *= factor
         self._end *= factor
 
-    def contains(self, point: Matrix) -> bool:
+    def contains(self, point: Vec2) -> bool:
         return False
 
-    def center(self) -> Matrix:
-        return Matrix([0.0, 0.0], 'vec')
+    def center(self) -> Vec2:
+        return Vec2(0.0, 0.0)
 
 
 class Capsule(Shape):
@@ -431,20 +426,20 @@ class Capsule(Shape):
     # NOTE: the capsule is made by 2 circle and 1 rectangle with
     # the radius go through the rectangle's width
     # so the top left is the circle's inscribe rectangle's top left point
-    def top_left(self) -> Matrix:
-        return Matrix(self.calc_pos(), 'vec')
+    def top_left(self) -> Vec2:
+        return Vec2(*self.calc_pos())
 
-    def bottom_left(self) -> Matrix:
-        return Matrix(self.calc_pos(-1), 'vec')
+    def bottom_left(self) -> Vec2:
+        return Vec2(*self.calc_pos(-1))
 
-    def top_right(self) -> Matrix:
+    def top_right(self) -> Vec2:
         return -self.bottom_left()
 
-    def bottom_right(self) -> Matrix:
+    def bottom_right(self) -> Vec2:
         return -self.top_left()
 
-    def box_vertices(self) -> List[Matrix]:
-        vertices: List[Matrix] = []
+    def box_vertices(self) -> List[Vec2]:
+        vertices: List[Vec2] = []
         vertices.append(self.top_left())
         vertices.append(self.bottom_left())
         vertices.append(self.bottom_right())
@@ -457,29 +452,28 @@ class Capsule(Shape):
         self._height *= factor
 
     @staticmethod
-    def range_helper_x(p: Matrix, ref1: Matrix, ref2: Matrix,
-                       idx: int) -> bool:
-        if p._val[idx] - ref1._val[idx] <= Config.Epsilon and p._val[
-                idx] - ref2._val[idx] >= Config.Epsilon:
+    def range_helper_x(p: Vec2, ref1: Vec2, ref2: Vec2, idx: int) -> bool:
+        if p[idx] - ref1[idx] <= Config.Epsilon and p[idx] - ref2[
+                idx] >= Config.Epsilon:
             return True
 
         return False
 
     @staticmethod
-    def range_helper_y(p: Matrix, idx: int, dis: float) -> bool:
-        if p._val[idx] - dis <= Config.Epsilon and p._val[
-                idx] + dis >= Config.Epsilon:
+    def range_helper_y(p: Vec2, idx: int, dis: float) -> bool:
+        if p[idx] - dis <= Config.Epsilon and p[idx] + dis >= Config.Epsilon:
             return True
 
         return False
 
     @staticmethod
-    def range_helper_val(p: Matrix, ref: Matrix, dis: float) -> bool:
+    def range_helper_val(p: Vec2, ref: Vec2, dis: float) -> bool:
         return (p - ref).len_square() - dis * dis <= Config.Epsilon
 
-    def contains(self, point: Matrix) -> bool:
-        anchor1: Matrix = Matrix([0.0, 0.0], 'vec')
-        anchor2: Matrix = Matrix([0.0, 0.0], 'vec')
+    def contains(self, point: Vec2) -> bool:
+        point = Vec2.from_value(point)
+        anchor1: Vec2 = Vec2(0.0, 0.0)
+        anchor2: Vec2 = Vec2(0.0, 0.0)
         x_len: float = 0.0
         y_len: float = 0.0
 
@@ -511,7 +505,7 @@ class Capsule(Shape):
         return False
 
     def center(self):
-        return Matrix([0.0, 0.0], 'vec')
+        return Vec2(0.0, 0.0)
 
 
 class Sector(Shape):
@@ -520,15 +514,13 @@ class Sector(Shape):
         self.type = self.Type.Sector
         self.set_value()
 
-    def vertices(self) -> List[Matrix]:
-        res: List[Matrix] = []
-        res.append(Matrix([0.0, 0.0], 'vec'))
-        res.append(
-            Matrix.rotate_mat(self._start) * Matrix([self._radius, 0], 'vec'))
+    def vertices(self) -> List[Vec2]:
+        res: List[Vec2] = []
+        res.append(Vec2(0.0, 0.0))
+        res.append(Mat2.rotate_mat(self._start) * Vec2(self._radius, 0))
         res.append(
-            Matrix.rotate_mat(self._start + self._span) *
-            Matrix([self._radius, 0], 'vec'))
-        res.append(Matrix([0.0, 0.0], 'vec'))
+            Mat2.rotate_mat(self._start + self._span) * Vec2(self._radius, 0))
+        res.append(Vec2(0.0, 0.0))
         return res
 
     @property
@@ -569,8 +561,8 @@ class Sector(Shape):
     def scale(self, factor: float) -> None:
         self._radius *= factor
 
-    def contains(self, point: Matrix) -> bool:
-        if np.isclose(point.x, 0):
+    def contains(self, point: Vec2) -> bool:
+        if Config.isclose(point.x, 0):
             return 0 <= point.y <= self._radius
         else:
             theta: float = point.theta()
@@ -579,16 +571,15 @@ class Sector(Shape):
             len_check: bool = point.len_square() <= self._radius * self._radius
             return ang_check1 and ang_check2 and len_check
 
-    def center(self) -> Matrix:
-        vertices: List[Matrix] = self.vertices()
-        point1: Matrix = vertices[1]
-        point2: Matrix = vertices[2]
-        normal: Matrix = (point1 + point2) / 2
+    def center(self) -> Vec2:
+        vertices: List[Vec2] = self.vertices()
+        point1: Vec2 = vertices[1]
+        point2: Vec2 = vertices[2]
+        normal: Vec2 = (point1 + point2) / 2
         normal.normalize()
 
         point_len: float = (point1 - point2).len()
         rad_len: float = self._radius * self._span
-        res: Matrix = normal * (2.0 * self._radius * point_len /
-                                (3.0 * rad_len))
+        res: Vec2 = normal * (2.0 * self._radius * point_len / (3.0 * rad_len))
 
         return res
@@ -1 +1,2 @@
 from .matrix import *
+from .linalg import *
@@ -0,0 +1,457 @@
+from __future__ import annotations
+from typing import Iterator, List, Tuple, Union
+
+import math
+from numbers import Real
+
+import numpy as np
+
+
+def _isclose(a: float, b: float) -> bool:
+    # NOTE: same tolerance as the np.isclose used by Matrix
+    return abs(a - b) <= 1e-08 + 1e-05 * abs(b)
+
+
+class Vec2():
+    '''2d vector value type.
+
+    Same interface as the 'vec' type Matrix, but the two components
+    are stored as plain python floats, so the arithmetic in the physics
+    hot path does not allocate any ndarray.
+    '''
+    __slots__ = ('x', 'y')
+    # NOTE: keep interoperable with the ndarray-based Matrix
+    _data_type: str = 'vec'
+    # NOTE: make numpy scalars defer to __rmul__
+    __array_ufunc__ = None
+
+    def __init__(self, x: float = 0.0, y: float = 0.0):
+        self.x: float = x
+        self.y: float = y
+
+    @staticmethod
+    def from_matrix(mat) -> Vec2:
+        return Vec2(float(mat.x), float(mat.y))
+
+    @staticmethod
+    def from_value(val) -> Vec2:
+        '''return the val itself if it is a Vec2, otherwise convert it
+
+        Parameters
+        ----------
+        val : Union[Vec2, Matrix, List[float]]
+            source value
+
+        Returns
+        -------
+        Vec2
+            converted vector
+        '''
+        if isinstance(val, Vec2):
+            return val
+        elif isinstance(val, (list, tuple)):
+            return Vec2(val[0], val[1])
+
+        return Vec2.from_matrix(val)
+
+    # unary operator
+    def __neg__(self) -> Vec2:
+        return Vec2(-self.x, -self.y)
+
+    def __pos__(self) -> Vec2:
+        return Vec2(self.x, self.y)
+
+    # binary operator
+    def __add__(self, other: Union[float, int, Vec2]) -> Vec2:
+        if isinstance(other, (float, int)):
+            return Vec2(self.x + other, self.y + other)
+
+        return Vec2(self.x + other.x, self.y + other.y)
+
+    def __sub__(self, other: Union[float, int, Vec2]) -> Vec2:
+        if isinstance(other, (float, int)):
+            return Vec2(self.x - other, self.y - other)
+
+        return Vec2(self.x - other.x, self.y - other.y)
+
+    # NOTE: only scalars scale a vector, the others fall back to their
+    # reflected op or raise TypeError
+    def __mul__(self, other: float) -> Vec2:
+        if not isinstance(other, (float, int, Real)):
+            return NotImplemented
+
+        return Vec2(self.x * other, self.y * other)
+
+    def __rmul__(self, other: float) -> Vec2:
+        if not isinstance(other, (float, int, Real)):
+            return NotImplemented
+
+        return Vec2(self.x * other, self.y * other)
+
+    def __truediv__(self, other: float) -> Vec2:
+        if not isinstance(other, (float, int, Real)):
+            return NotImplemented
+
+        assert not _isclose(other, 0)
+        return Vec2(self.x / other, self.y / other)
+
+    # comparsion operator
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Vec2) and getattr(other, '_data_type',
+                                                   None) != 'vec':
+            return NotImplemented
+
+        return _isclose(self.x, other.x) and _isclose(self.y, other.y)
+
+    def __ne__(self, other) -> bool:
+        res = self.__eq__(other)
+        return res if res is NotImplemented else not res
+
+    # assignment operator
+    def __iadd__(self, other: Union[float, int, Vec2]) -> Vec2:
+        if isinstance(other, (float, int)):
+            self.x += other
+            self.y += other
+        else:
+            self.x += other.x
+            self.y += other.y
+        return self
+
+    def __isub__(self, other: Union[float, int, Vec2]) -> Vec2:
+        if isinstance(other, (float, int)):
+            self.x -= other
+            self.y -= other
+        else:
+            self.x -= other.x
+            self.y -= other.y
+        return self
+
+    def __imul__(self, other: float) -> Vec2:
+        if not isinstance(other, (float, int, Real)):
+            return NotImplemented
+
+        self.x *= other
+        self.y *= other
+        return self
+
+    def __itruediv__(self, other: float) -> Vec2:
+        if not isinstance(other, (float, int, Real)):
+            return NotImplemented
+
+        assert not _isclose(other, 0)
+        self.x /= other
+        self.y /= other
+        return self
+
+    def __getitem__(self, idx: int) -> float:
+        if idx == 0:
+            return self.x
+        elif idx == 1:
+            return self.y
+
+        raise IndexError
+
+    def __iter__(self) -> Iterator[float]:
+        yield self.x
+        yield self.y
+
+    def __str__(self) -> str:
+        return f'[{self.x}]\n[{self.y}]\n'
+
+    def __repr__(self) -> str:
+        return f'Vec2({self.x}, {self.y})'
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return (2, 1)
+
+    @property
+    def size(self) -> int:
+        return 2
+
+    @property
+    def _val(self) -> np.ndarray:
+        # NOTE: only for the Matrix operator overload, the copy
+        # is not the storage of the vector
+        return np.array([[self.x], [self.y]])
+
+    def copy(self) -> Vec2:
+        return Vec2(self.x, self.y)
+
+    def len_square(self) -> float:
+        return self.x * self.x + self.y * self.y
+
+    def len(self) -> float:
+        return math.sqrt(self.x * self.x + self.y * self.y)
+
+    def theta(self) -> float:
+        assert not _isclose(self.x, 0)
+        return math.atan2(self.y, self.x)
+
+    def set_value(self, val: Union[List[float], Vec2]) -> Vec2:
+        if isinstance(val, (list, tuple)):
+            self.x, self.y = val[0], val[1]
+        else:
+            self.x, self.y = val.x, val.y
+        return self
+
+    def clear(self) -> Vec2:
+        self.x = 0.0
+        self.y = 0.0
+        return self
+
+    def negate(self) -> Vec2:
+        self.x = -self.x
+        self.y = -self.y
+        return self
+
+    def negative(self) -> Vec2:
+        return Vec2(-self.x, -self.y)
+
+    def swap(self, other: Vec2) -> Vec2:
+        self.x, other.x = other.x, self.x
+        self.y, other.y = other.y, self.y
+        return self
+
+    def normalize(self) -> Vec2:
+        length: float = self.len()
+        assert not _isclose(length, 0)
+        self.x /= length
+        self.y /= length
+        return self
+
+    def normal(self) -> Vec2:
+        length: float = self.len()
+        assert not _isclose(length, 0)
+        return Vec2(self.x / length, self.y / length)
+
+    def is_origin(self) -> bool:
+        return _isclose(self.x, 0) and _isclose(self.y, 0)
+
+    def dot(self, other: Vec2) -> float:
+        return self.x * other.x + self.y * other.y
+
+    def cross(self, other: Vec2) -> float:
+        return self.x * other.y - self.y * other.x
+
+    def perpendicular(self) -> Vec2:
+        return Vec2(-self.y, self.x)
+
+    @staticmethod
+    def dot_product(veca: Vec2, vecb: Vec2) -> float:
+        return veca.x * vecb.x + veca.y * vecb.y
+
+    @staticmethod
+    def cross_product(veca: Vec2, vecb: Vec2) -> float:
+        return veca.x * vecb.y - veca.y * vecb.x
+
+    @staticmethod
+    def cross_product2(lhs: Union[Vec2, float], rhs: Union[Vec2,
+                                                           float]) -> Vec2:
+        if isinstance(rhs, Vec2):
+            return Vec2(-rhs.y * lhs, rhs.x * lhs)
+        elif isinstance(lhs, Vec2):
+            return Vec2(lhs.y * rhs, -lhs.x * rhs)
+        else:
+            raise TypeError
+
+    @staticmethod
+    def rotate_mat(radian: float) -> Mat2:
+        return Mat2.rotate_mat(radian)
+
+
+class Mat2():
+    '''2x2 matrix value type, stored in row-major order.
+
+    Same interface as the 'mat' type Matrix without ndarray storage.
+    '''
+    __slots__ = ('m00', 'm01', 'm10', 'm11')
+    # NOTE: keep interoperable with the ndarray-based Matrix
+    _data_type: str = 'mat'
+    __array_ufunc__ = None
+
+    def __init__(self,
+                 m00: float = 0.0,
+                 m01: float = 0.0,
+                 m10: float = 0.0,
+                 m11: float = 0.0):
+        self.m00: float = m00
+        self.m01: float = m01
+        self.m10: float = m10
+        self.m11: float = m11
+
+    @staticmethod
+    def from_matrix(mat) -> Mat2:
+        return Mat2(float(mat.value(0, 0)), float(mat.value(0, 1)),
+                    float(mat.value(1, 0)), float(mat.value(1, 1)))
+
+    # unary operator
+    def __neg__(self) -> Mat2:
+        return Mat2(-self.m00, -self.m01, -self.m10, -self.m11)
+
+    def __pos__(self) -> Mat2:
+        return Mat2(self.m00, self.m01, self.m10, self.m11)
+
+    # binary operator
+    def __add__(self, other: Union[float, int, Mat2]) -> Mat2:
+        if isinstance(other, (float, int)):
+            return Mat2(self.m00 + other, self.m01 + other, self.m10 + other,
+                        self.m11 + other)
+
+        return Mat2(self.m00 + other.m00, self.m01 + other.m01,
+                    self.m10 + other.m10, self.m11 + other.m11)
+
+    def __sub__(self, other: Union[float, int, Mat2]) -> Mat2:
+        if isinstance(other, (float, int)):
+            return Mat2(self.m00 - other, self.m01 - other, self.m10 - other,
+                        self.m11 - other)
+
+        return Mat2(self.m00 - other.m00, self.m01 - other.m01,
+                    self.m10 - other.m10, self.m11 - other.m11)
+
+    def __mul__(self, other):
+        if isinstance(other, Vec2):
+            return Vec2(self.m00 * other.x + self.m01 * other.y,
+                        self.m10 * other.x + self.m11 * other.y)
+        elif isinstance(other, Mat2):
+            return Mat2(self.m00 * other.m00 + self.m01 * other.m10,
+                        self.m00 * other.m01 + self.m01 * other.m11,
+                        self.m10 * other.m00 + self.m11 * other.m10,
+                        self.m10 * other.m01 + self.m11 * other.m11)
+        elif isinstance(other, (float, int)):
+            return Mat2(self.m00 * other, self.m01 * other, self.m10 * other,
+                        self.m11 * other)
+        elif other.shape == (2, 1):
+            return self * Vec2.from_matrix(other)
+
+        return self * Mat2.from_matrix(other)
+
+    def __truediv__(self, other: float) -> Mat2:
+        assert not _isclose(other, 0)
+        return Mat2(self.m00 / other, self.m01 / other, self.m10 / other,
+                    self.m11 / other)
+
+    # comparsion operator
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Mat2):
+            # NOTE: keep the broadcast semantics of the Matrix
+            return bool(np.isclose(self._val, other._val).all())
+
+        return _isclose(self.m00, other.m00) and _isclose(
+            self.m01, other.m01) and _isclose(
+                self.m10, other.m10) and _isclose(self.m11, other.m11)
+
+    def __ne__(self, other) -> bool:
+        return not self.__eq__(other)
+
+    # assignment operator
+    def __iadd__(self, other: Union[float, int, Mat2]) -> Mat2:
+        return self.set_value(self + other)
+
+    def __isub__(self, other: Union[float, int, Mat2]) -> Mat2:
+        return self.set_value(self - other)
+
+    def __imul__(self, other: Union[float, int, Mat2]) -> Mat2:
+        assert not isinstance(other, Vec2)
+        return self.set_value(self * other)
+
+    def __str__(self) -> str:
+        return f'[{self.m00} {self.m01}]\n[{self.m10} {self.m11}]\n'
+
+    def __repr__(self) -> str:
+        return f'Mat2({self.m00}, {self.m01}, {self.m10}, {self.m11})'
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return (2, 2)
+
+    @property
+    def size(self) -> int:
+        return 4
+
+    @property
+    def _val(self) -> np.ndarray:
+        # NOTE: only for the Matrix operator overload
+        return np.array([[self.m00, self.m01], [self.m10, self.m11]])
+
+    @property
+    def row1(self) -> Vec2:
+        return Vec2(self.m00, self.m01)
+
+    @property
+    def row2(self) -> Vec2:
+        return Vec2(self.m10, self.m11)
+
+    def copy(self) -> Mat2:
+        return Mat2(self.m00, self.m01, self.m10, self.m11)
+
+    def value(self, row: int = 0, col: int = 0) -> float:
+        assert 0 <= row <= 1
+        assert 0 <= col <= 1
+        if row == 0:
+            return self.m00 if col == 0 else self.m01
+
+        return self.m10 if col == 0 else self.m11
+
+    def determinant(self) -> float:
+        return self.m00 * self.m11 - self.m01 * self.m10
+
+    def transpose(self) -> Mat2:
+        self.m01, self.m10 = self.m10, self.m01
+        return self
+
+    def invert(self) -> Mat2:
+        det: float = self.determinant()
+        assert not _isclose(det, 0)
+        inv_det: float = 1.0 / det
+        self.m00, self.m01, self.m10, self.m11 = (self.m11 * inv_det,
+                                                  -self.m01 * inv_det,
+                                                  -self.m10 * inv_det,
+                                                  self.m00 * inv_det)
+        return self
+
+    def skew_symmetric_mat(self, vec: Vec2) -> Mat2:
+        return Mat2(0.0, -vec.y, vec.x, 0.0)
+
+    def identity_mat(self) -> Mat2:
+        return Mat2(1.0, 0.0, 0.0, 1.0)
+
+    def len_square(self) -> float:
+        return (self.m00 * self.m00 + self.m01 * self.m01 +
+                self.m10 * self.m10 + self.m11 * self.m11)
+
+    def len(self) -> float:
+        return math.sqrt(self.len_square())
+
+    def set_value(self, val: Union[List[float], Mat2]) -> Mat2:
+        if isinstance(val, (list, tuple)):
+            self.m00, self.m01, self.m10, self.m11 = val[0], val[1], val[
+                2], val[3]
+        else:
+            self.m00, self.m01 = val.m00, val.m01
+            self.m10, self.m11 = val.m10, val.m11
+        return self
+
+    def clear(self) -> Mat2:
+        self.m00 = self.m01 = self.m10 = self.m11 = 0.0
+        return self
+
+    def negate(self) -> Mat2:
+        self.m00, self.m01 = -self.m00, -self.m01
+        self.m10, self.m11 = -self.m10, -self.m11
+        return self
+
+    def negative(self) -> Mat2:
+        return Mat2(-self.m00, -self.m01, -self.m10, -self.m11)
+
+    def swap(self, other: Mat2) -> Mat2:
+        tmp: Mat2 = self.copy()
+        self.set_value(other)
+        other.set_value(tmp)
+        return self
+
+    @staticmethod
+    def rotate_mat(radian: float) -> Mat2:
+        cos_val: float = math.cos(radian)
+        sin_val: float = math.sin(radian)
+        return Mat2(cos_val, -sin_val, sin_val, cos_val)
@@ -253,6 +253,9 @@ class Matrix():
             self._val = np.array(val).reshape(self._val.shape)
         elif isinstance(val, Matrix):
             self._val = val._val
+        else:
+            # NOTE: Vec2 and Mat2 only expose a copy of their value
+            self._val = val._val.reshape(self._val.shape)
         return self
 
     def clear(self) -> Matrix:
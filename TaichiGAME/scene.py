@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Dict, Tuple, Union, List, cast, Optional
+from typing import Dict, Union, List, cast, Optional
 
 import taichi as ti
 
@@ -9,10 +9,10 @@ from .common.export_manager import ExportManager
 from .frame import Frame
 from .collision.broad_phase.dbvt import DBVT
 from .collision.broad_phase.aabb import AABB
-from .math.matrix import Matrix
-from .collision.detector import Collsion, Detector
+from .math.linalg import Vec2, Mat2
 from .dynamics.body import Body
 from .dynamics.phy_world import PhysicsWorld
+from .dynamics.island import IslandSolver
 from .dynamics.constraint.contact import ContactMaintainer
 from .dynamics.joint.point import PointJoint, PointJointPrimitive
 
@@ -32,13 +32,14 @@ class Scene():
         self._ex_mgn: ExportManager = ExportManager()
         # the physics world, all sim is run in physics world
         self._world: PhysicsWorld = PhysicsWorld()
-        self._dbvt: DBVT = DBVT()
-        self._maintainer: ContactMaintainer = ContactMaintainer()
+        # NOTE: the broadphase and the contacts are owned by the world
+        self._dbvt: DBVT = self._world.dbvt
+        self._maintainer: ContactMaintainer = self._world.maintainer
         # the view camera, all viewport scale is in camera
         self._cam: Camera = Camera()
 
         # physics init settings
-        self._world.grav = Matrix([0.0, -9.8], 'vec')
+        self._world.grav = Vec2(0.0, -9.8)
         self._world.damping_ena = True
         self._world._linear_vel_damping = 0.1
         self._world.ang_vel_damping = 0.1
@@ -47,8 +48,8 @@ class Scene():
         self._world.vel_iter = 6
 
         # camera init settings
-        self._cam.viewport = Camera.Viewport(Matrix([0.0, height], 'vec'),
-                                             Matrix([width, 0.0], 'vec'))
+        self._cam.viewport = Camera.Viewport(Vec2(0.0, height),
+                                             Vec2(width, 0.0))
         self._cam.body_visible = True
         self._cam.center_visible = True
         self._cam.rot_line_visible = True
@@ -68,7 +69,7 @@ class Scene():
         self._paused = False
         # NOTE: some algorithm need to cacluate the pos's len
         # in init state
-        self._mouse_pos: Matrix = Matrix([1.0, 1.0], 'vec')
+        self._mouse_pos: Vec2 = Vec2(1.0, 1.0)
         # the right-mouse btn drag move flag(change viewport)
         self._mouse_viewport_move: bool = False
 
@@ -80,6 +81,14 @@ class Scene():
         self._mouse_joint.active = False
         self._mouse_select_body: Optional[Body] = None
 
+    @property
+    def island_solver(self) -> Optional[IslandSolver]:
+        return self._world.island_solver
+
+    @island_solver.setter
+    def island_solver(self, island_solver: Optional[IslandSolver]) -> None:
+        self._world.island_solver = island_solver
+
     def register_frame(self, frame: Frame) -> None:
         self._ext_frame_list.append(frame)
 
@@ -114,38 +123,7 @@ class Scene():
         self._ext_frame_list[self._ext_frame_idx].load()
 
     def physics_sim(self) -> None:
-        for elem in self._world._body_list:
-            self._dbvt.update(elem)
-
-        self._world.step_velocity(self._dt)
-
-        pot_list: List[Tuple[Body, Body]] = self._dbvt.generate()
-        # print('sim')
-        for pot in pot_list:
-            # print('pot')
-            # print(f'bodya: ({pot[0].pos.x}, {pot[0].pos.y}), {pot[0].rot}')
-            # print(f'bodyb: ({pot[1].pos.x}, {pot[1].pos.y}), {pot[1].rot}')
-
-            res: Collsion = Detector.detect(pot[0], pot[1])
-            if res._is_colliding:
-                # print('collid')
-                # print(f'contact list len: {len(res._contact_list)}')
-                self._maintainer.add(res)
-
-        self._maintainer.clear_inactive_points()
-        self._world.prepare_velocity_constraint(self._dt)
-
-        for i in range(self._world.vel_iter):
-            self._world.solve_velocity_constraint(self._dt)
-            self._maintainer.solve_velocity(self._dt)
-
-        self._world.step_position(self._dt)
-
-        for i in range(self._world.pos_iter):
-            self._maintainer.solve_position(self._dt)
-            self._world.solve_position_constraint(self._dt)
-
-        self._maintainer.deactivate_all_points()
+        self._world.step(self._dt)
 
     def render(self) -> None:
         self._cam.render(self._gui)
@@ -155,7 +133,7 @@ class Scene():
                                                    ti.GUI.RELEASE], x: float,
                                 y: float) -> None:
 
-        self._mouse_pos = self._cam.screen_to_world(Matrix([x, y], 'vec'))
+        self._mouse_pos = self._cam.screen_to_world(Vec2(x, y))
         if state == ti.GUI.PRESS:
             if self._mouse_joint is None:
                 return
@@ -165,8 +143,8 @@ class Scene():
             bd_list: List[Body] = self._dbvt.query(mouse_box)
             for bd in bd_list:
                 # print(bd.id)
-                point: Matrix = self._mouse_pos - bd.pos
-                point = Matrix.rotate_mat(-bd.rot) * point
+                point: Vec2 = self._mouse_pos - bd.pos
+                point = Mat2.rotate_mat(-bd.rot) * point
 
                 if bd.shape.contains(
                         point) and self._mouse_select_body is None:
@@ -190,8 +168,8 @@ class Scene():
             self._mouse_viewport_move = False
 
     def handle_mouse_move_event(self, x: float, y: float) -> None:
-        cur_pos: Matrix = self._cam.screen_to_world(Matrix([x, y], 'vec'))
-        delta_pos: Matrix = cur_pos - self._mouse_pos
+        cur_pos: Vec2 = self._cam.screen_to_world(Vec2(x, y))
+        delta_pos: Vec2 = cur_pos - self._mouse_pos
 
         if self._mouse_viewport_move:
             # print(f'delta_pos1: {delta_pos}')
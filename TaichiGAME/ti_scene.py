@@ -54,8 +54,7 @@ class Scene():
         self._ext_frame_idx: int = 0
 
     def physics_sim(self) -> None:
-        self._world.step_velocity(self._dt)
-        self._world.step_position(self._dt)
+        self._world.step(self._dt)
 
     def render(self) -> None:
         self.smooth_scale()
@@ -90,6 +89,20 @@ class Scene():
         # set the data to the world
         self._world.init_data()
 
+    def warmup(self) -> None:
+        '''compile the kernels of the world and of the render, so the
+        first frames do not stall, call it after `init_frame`'''
+        self._world.warmup()
+        self.gen_axis_data(self._meter_to_pixel, self._origin.x,
+                           self._origin.y, self._xform.x, self._xform.y,
+                           self._viewport.width, self._viewport.height)
+        # NOTE: draw a frame for the downloads of the render fields, and
+        # drop it
+        self.render_body()
+        self.render_center()
+        self.render_rot_line()
+        self._gui.clear()
+
     def change_frame(self, delta: int) -> None:
         self.clear_all()
         self.calc_nxt_frame(delta)
@@ -159,9 +172,12 @@ class Scene():
         return res
 
     @ti.kernel
-    def gen_body_data(self, scale: float, origx: float, origy: float,
-                      xformx: float, xformy: float, vw: float, vh: float):
-        for i in range(len(self._world._body_list)):
+    def gen_body_data(self, gen: ti.template(), scale: float, origx: float,
+                      origy: float, xformx: float, xformy: float, vw: float,
+                      vh: float):
+        # NOTE: gen is the generation of the world fields, compile it
+        # again when the fields grow
+        for i in range(self._world._body_num[None]):
             rot_mat = self.rotate_mat(self._world._rot[i])
 
             if self._world._shape_type[i] == 1:
@@ -170,77 +186,12 @@ class Scene():
                     xformy, vw, vh)
                 self._world._scir_rad[i] = self._world._cir_rad[i] * scale
 
-            elif self._world._shape_type[i] == 2:
-                pass
             elif self._world._shape_type[i] == 3:
-                self._world._poly_trispos[i] = self.world_to_screen(
-                    self._world._poly_tripos[i], scale, origx, origy, xformx,
-                    xformy, vw, vh)
-                for j in range(3):
-                    self._world._poly_trisst[i, j] = self.world_to_screen(
-                        self._world._poly_tripos[i] +
-                        rot_mat @ self._world._poly_trist[i, j], scale, origx, origy,
-                        xformx, xformy, vw, vh)
-
-                    self._world._poly_trised[i, j] = self.world_to_screen(
-                        self._world._poly_tripos[i] +
-                        rot_mat @ self._world._poly_tried[i, j], scale, origx, origy,
-                        xformx, xformy, vw, vh)
-
-                self._world._poly_tri_a[i, 0] = self._world._poly_trisst[i, 0]
-                self._world._poly_tri_b[i, 0] = self._world._poly_trisst[i, 1]
-                self._world._poly_tri_c[i, 0] = self._world._poly_trisst[i, 2]
+                self._world._poly_spos[i] = self.world_to_screen(
+                    self._world._pos[i], scale, origx, origy, xformx, xformy,
+                    vw, vh)
 
             elif self._world._shape_type[i] == 4:
-                self._world._poly_recspos[i] = self.world_to_screen(
-                    self._world._poly_recpos[i], scale, origx, origy, xformx,
-                    xformy, vw, vh)
-                for j in range(4):
-                    self._world._poly_recsst[i, j] = self.world_to_screen(
-                        self._world._poly_recpos[i] +
-                        rot_mat @ self._world._poly_recst[i, j], scale, origx, origy,
-                        xformx, xformy, vw, vh)
-
-                    self._world._poly_recsed[i, j] = self.world_to_screen(
-                        self._world._poly_recpos[i] +
-                        rot_mat @ self._world._poly_reced[i, j], scale, origx, origy,
-                        xformx, xformy, vw, vh)
-
-                    if j >= 2:
-                        self._world._poly_rec_a[
-                            i, j - 2] = self._world._poly_recsst[i, 0]
-                        self._world._poly_rec_b[
-                            i, j - 2] = self._world._poly_recsst[i, j - 1]
-                        self._world._poly_rec_c[
-                            i, j - 2] = self._world._poly_recsst[i, j]
-
-            elif self._world._shape_type[i] == 5:
-                self._world._poly_penspos[i] = self.world_to_screen(
-                    self._world._poly_penpos[i], scale, origx, origy, xformx,
-                    xformy, vw, vh)
-                for j in range(5):
-                    self._world._poly_pensst[i, j] = self.world_to_screen(
-                        self._world._poly_penpos[i] +
-                        rot_mat @ self._world._poly_penst[i, j], scale, origx, origy,
-                        xformx, xformy, vw, vh)
-
-                    self._world._poly_pensed[i, j] = self.world_to_screen(
-                        self._world._poly_penpos[i] +
-                        rot_mat @ self._world._poly_pened[i, j], scale, origx, origy,
-                        xformx, xformy, vw, vh)
-
-                    if j >= 2:
-                        self._world._poly_pen_a[
-                            i, j - 2] = self._world._poly_pensst[i, 0]
-                        self._world._poly_pen_b[
-                            i, j - 2] = self._world._poly_pensst[i, j - 1]
-                        self._world._poly_pen_c[
-                            i, j - 2] = self._world._poly_pensst[i, j]
-
-            elif self._world._shape_type[i] == 6:
-                pass
-
-            elif self._world._shape_type[i] == 7:
                 self._world._cap_spos[i] = self.world_to_screen(
                     self._world._cap_pos[i], scale, origx, origy, xformx,
                     xformy, vw, vh)
@@ -305,66 +256,59 @@ class Scene():
                         self._world._cap_pos[i] + rot_mat @ self._world._cap_p[i, j + 2],
                         scale, origx, origy, xformx, xformy, vw, vh)
 
+            # NOTE: the faces of the polygons and the edges, and the fan
+            # triangles of the polygons, the other pool rows are cleared
+            shape_type = self._world._shape_type[i]
+            off = self._world._vert_off[i]
+            n = self._world._vert_num[i]
+            for j in range(n):
+                st = ti.Vector([0.0, 0.0])
+                ed = ti.Vector([0.0, 0.0])
+                if shape_type == 2 or shape_type == 3:
+                    st = self.world_to_screen(
+                        self._world._pos[i] +
+                        rot_mat @ self._world._vert[off + j], scale, origx,
+                        origy, xformx, xformy, vw, vh)
+                    ed = self.world_to_screen(
+                        self._world._pos[i] +
+                        rot_mat @ self._world._vert[off + (j + 1) % n], scale,
+                        origx, origy, xformx, xformy, vw, vh)
+                self._world._vert_sst[off + j] = st
+                self._world._vert_sed[off + j] = ed
+
+            for j in range(n):
+                tri_a = ti.Vector([0.0, 0.0])
+                tri_b = ti.Vector([0.0, 0.0])
+                tri_c = ti.Vector([0.0, 0.0])
+                if shape_type == 3 and j < n - 2:
+                    tri_a = self._world._vert_sst[off]
+                    tri_b = self._world._vert_sst[off + j + 1]
+                    tri_c = self._world._vert_sst[off + j + 2]
+                self._world._tri_a[off + j] = tri_a
+                self._world._tri_b[off + j] = tri_b
+                self._world._tri_c[off + j] = tri_c
+
     def render_body(self) -> None:
         # self._world.random_set()
-        self.gen_body_data(self._meter_to_pixel, self._origin.x,
-                           self._origin.y, self._xform.x, self._xform.y,
-                           self._viewport.width, self._viewport.height)
+        self.gen_body_data(self._world._field_gen, self._meter_to_pixel,
+                           self._origin.x, self._origin.y, self._xform.x,
+                           self._xform.y, self._viewport.width,
+                           self._viewport.height)
 
         self._gui.circles(self._world._cirspos.to_numpy(),
                           radius=self._world._scir_rad[1],
                           color=Config.FillColor)
 
-        tri_st = self._world._poly_trisst.to_numpy()
-        tri_ed = self._world._poly_trised.to_numpy()
-        tri_st = tri_st.reshape(tri_st.shape[0] * tri_st.shape[1], -1)
-        tri_ed = tri_ed.reshape(tri_ed.shape[0] * tri_ed.shape[1], -1)
-        self._gui.lines(begin=tri_st,
-                        end=tri_ed,
+        vert_cnt: int = self._world._vert_cnt
+        self._gui.lines(begin=self._world._vert_sst.to_numpy()[:vert_cnt],
+                        end=self._world._vert_sed.to_numpy()[:vert_cnt],
                         color=Config.OuterLineColor,
                         radius=2)
 
-        rec_st = self._world._poly_recsst.to_numpy()
-        rec_ed = self._world._poly_recsed.to_numpy()
-        rec_st = rec_st.reshape(rec_st.shape[0] * rec_st.shape[1], -1)
-        rec_ed = rec_ed.reshape(rec_ed.shape[0] * rec_ed.shape[1], -1)
-        self._gui.lines(begin=rec_st,
-                        end=rec_ed,
-                        color=Config.OuterLineColor,
-                        radius=2)
-
-        pen_st = self._world._poly_pensst.to_numpy()
-        pen_ed = self._world._poly_pensed.to_numpy()
-        pen_st = pen_st.reshape(pen_st.shape[0] * pen_st.shape[1], -1)
-        pen_ed = pen_ed.reshape(pen_ed.shape[0] * pen_ed.shape[1], -1)
-        self._gui.lines(begin=pen_st,
-                        end=pen_ed,
-                        color=Config.OuterLineColor,
-                        radius=2)
-
-        tri_a = self._world._poly_tri_a.to_numpy()
-        tri_b = self._world._poly_tri_b.to_numpy()
-        tri_c = self._world._poly_tri_c.to_numpy()
-        tri_a = tri_a.reshape(tri_a.shape[0] * tri_a.shape[1], -1)
-        tri_b = tri_b.reshape(tri_b.shape[0] * tri_b.shape[1], -1)
-        tri_c = tri_c.reshape(tri_c.shape[0] * tri_c.shape[1], -1)
-        self._gui.triangles(a=tri_a, b=tri_b, c=tri_c, color=Config.FillColor)
-
-        rec_a = self._world._poly_rec_a.to_numpy()
-        rec_b = self._world._poly_rec_b.to_numpy()
-        rec_c = self._world._poly_rec_c.to_numpy()
-        rec_a = rec_a.reshape(rec_a.shape[0] * rec_a.shape[1], -1)
-        rec_b = rec_b.reshape(rec_b.shape[0] * rec_b.shape[1], -1)
-        rec_c = rec_c.reshape(rec_c.shape[0] * rec_c.shape[1], -1)
-        self._gui.triangles(a=rec_a, b=rec_b, c=rec_c, color=Config.FillColor)
-
-        pen_a = self._world._poly_pen_a.to_numpy()
-        pen_b = self._world._poly_pen_b.to_numpy()
-        pen_c = self._world._poly_pen_c.to_numpy()
-        pen_a = pen_a.reshape(pen_a.shape[0] * pen_a.shape[1], -1)
-        pen_b = pen_b.reshape(pen_b.shape[0] * pen_b.shape[1], -1)
-        pen_c = pen_c.reshape(pen_c.shape[0] * pen_c.shape[1], -1)
-        self._gui.triangles(a=pen_a, b=pen_b, c=pen_c, color=Config.FillColor)
+        self._gui.triangles(a=self._world._tri_a.to_numpy()[:vert_cnt],
+                            b=self._world._tri_b.to_numpy()[:vert_cnt],
+                            c=self._world._tri_c.to_numpy()[:vert_cnt],
+                            color=Config.FillColor)
 
         offset = np.fmin(self._world._cap_width[0],
                          self._world._cap_height[0]) / 2.0
@@ -389,15 +333,7 @@ class Scene():
                           color=Config.BodyCenterColor,
                           radius=4)
 
-        self._gui.circles(self._world._poly_trispos.to_numpy(),
-                          color=Config.BodyCenterColor,
-                          radius=4)
-
-        self._gui.circles(self._world._poly_recspos.to_numpy(),
-                          color=Config.BodyCenterColor,
-                          radius=4)
-
-        self._gui.circles(self._world._poly_penspos.to_numpy(),
+        self._gui.circles(self._world._poly_spos.to_numpy(),
                           color=Config.BodyCenterColor,
                           radius=4)
 
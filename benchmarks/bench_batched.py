@@ -0,0 +1,81 @@
+'''benchmark of the BatchedWorld against separate PhysicsWorlds
+
+step N copies of a small circle pile and compare the throughput with
+N separate `PhysicsWorld.step` calls, run from the repo root:
+
+    python -m benchmarks.bench_batched [num ...]
+'''
+import sys
+import time
+from typing import List
+
+from TaichiGAME.common.config import Config
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Circle, Edge
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.batched_world import BatchedWorld
+from TaichiGAME.dynamics.phy_world import PhysicsWorld
+
+
+def build_world(body_num: int = 8) -> PhysicsWorld:
+    world: PhysicsWorld = PhysicsWorld()
+    world.grav = Vec2(0.0, -9.8)
+    world.vel_iter = 6
+    world.pos_iter = 8
+    world.sleep_ena = False
+
+    edg: Edge = Edge()
+    edg.set_value(Vec2(-20.0, 0.0), Vec2(20.0, 0.0))
+    ground: Body = world.create_body()
+    ground.shape = edg
+    ground.mass = Config.Max
+    ground.type = Body.Type.Static
+    world.dbvt.insert(ground)
+
+    cir: Circle = Circle(0.5)
+    for i in range(body_num):
+        bd: Body = world.create_body()
+        bd.shape = cir
+        bd.mass = 1.0
+        bd.pos = Vec2(i % 4 * 1.1 + i // 4 * 0.3, i // 4 * 1.2 + 0.6)
+        bd.type = Body.Type.Dynamic
+        world.dbvt.insert(bd)
+
+    return world
+
+
+def bench_world(steps: int) -> float:
+    world: PhysicsWorld = build_world()
+    dt: float = 1 / 120
+    start: float = time.perf_counter()
+    for i in range(steps):
+        world.step(dt)
+
+    return (time.perf_counter() - start) / steps
+
+
+def bench_batched(num: int, steps: int) -> float:
+    dut: BatchedWorld = BatchedWorld(build_world(), num)
+    dt: float = 1 / 120
+    start: float = time.perf_counter()
+    for i in range(steps):
+        dut.step(dt)
+
+    return (time.perf_counter() - start) / steps
+
+
+def main() -> None:
+    nums: List[int] = [int(v) for v in sys.argv[1:]] or [1, 16, 128, 1024]
+    steps: int = 60
+    single: float = bench_world(steps)
+    print(f'PhysicsWorld: {single * 1e3:.3f} ms/step, '
+          f'{1.0 / single:.1f} world steps/s')
+    print(f'{"num":>6} {"ms/step":>9} {"world steps/s":>14} {"speedup":>8}')
+    for num in nums:
+        cost: float = bench_batched(num, steps)
+        print(f'{num:>6} {cost * 1e3:>9.3f} {num / cost:>14.1f} '
+              f'{single * num / cost:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
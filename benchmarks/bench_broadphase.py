@@ -0,0 +1,89 @@
+'''benchmark of the broadphases of the cpu PhysicsWorld
+
+scatter circles of similar size like particles and debris, then time the
+update of the moved bodies and the pair generation of the `DBVT`, the
+`UniformGrid` and the `SweepAndPrune`, run from the repo root:
+
+    python -m benchmarks.bench_broadphase [body_num ...]
+
+the bodies move a little between the steps as in a running scene, the
+grid cell is about the size of the bodies. The sweep and prune sorts
+its ends again in `generate`, so its update is only the new aabbs
+'''
+import random
+import sys
+import time
+from typing import Dict, List
+
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Circle
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.collision.broad_phase.dbvt import DBVT
+from TaichiGAME.collision.broad_phase.grid import UniformGrid
+from TaichiGAME.collision.broad_phase.sap import SweepAndPrune
+
+
+def build(body_num: int) -> List[Body]:
+    rng: random.Random = random.Random(0)
+    # NOTE: keep the density, about 1 body per 4 cells
+    half: float = (body_num**0.5) * 0.8
+    cir: Circle = Circle(0.2)
+    bodies: List[Body] = []
+    for i in range(body_num):
+        bd: Body = Body()
+        bd.shape = cir
+        bd.pos = Vec2(rng.uniform(-half, half), rng.uniform(-half, half))
+        bodies.append(bd)
+
+    return bodies
+
+
+def bench_broadphase(broadphase, bodies: List[Body],
+                     steps: int) -> Dict[str, float]:
+    for bd in bodies:
+        broadphase.insert(bd)
+
+    rng: random.Random = random.Random(1)
+    update_time: float = 0.0
+    generate_time: float = 0.0
+    pair_num: int = 0
+    for i in range(steps):
+        for bd in bodies:
+            bd.pos = bd.pos + Vec2(rng.uniform(-0.02, 0.02),
+                                   rng.uniform(-0.02, 0.02))
+
+        tick: float = time.perf_counter()
+        for bd in bodies:
+            broadphase.update(bd)
+        update_time += time.perf_counter() - tick
+
+        tick = time.perf_counter()
+        pair_num = len(broadphase.generate())
+        generate_time += time.perf_counter() - tick
+
+    return {
+        'update': update_time / steps,
+        'generate': generate_time / steps,
+        'pairs': pair_num
+    }
+
+
+def main() -> None:
+    nums: List[int] = [int(v) for v in sys.argv[1:]] or [500, 2000]
+    print(f'{"bodies":>8} {"broadphase":>12} {"pairs":>7} '
+          f'{"update ms":>10} {"generate ms":>12} {"speedup":>8}')
+    for num in nums:
+        ref: float = 0.0
+        for name, broadphase in (('dbvt', DBVT()), ('grid', UniformGrid(0.4)),
+                                 ('sap', SweepAndPrune())):
+            res: Dict[str, float] = bench_broadphase(broadphase, build(num),
+                                                     10)
+            ref = ref or res['generate']
+            print(f'{num:>8} {name:>12} {res["pairs"]:>7} '
+                  f'{res["update"] * 1e3:>10.2f} '
+                  f'{res["generate"] * 1e3:>12.2f} '
+                  f'{ref / res["generate"]:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
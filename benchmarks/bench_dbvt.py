@@ -0,0 +1,77 @@
+'''benchmark of the dbvt queries on large trees
+
+scatter circles like particles, build the tree, then time the aabb
+queries of the bodies, the raycasts and the pair generation, run from
+the repo root:
+
+    python -m benchmarks.bench_dbvt [leaf_num ...]
+
+the build is the insert of all the bodies, the query and the raycast
+times are per call
+'''
+import random
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.collision.broad_phase.aabb import AABB
+from TaichiGAME.collision.broad_phase.dbvt import DBVT
+from benchmarks.bench_broadphase import build
+
+
+def bench_dbvt(bodies: List[Body], queries: int) -> Dict[str, float]:
+    dbvt: DBVT = DBVT()
+    tick: float = time.perf_counter()
+    for bd in bodies:
+        dbvt.insert(bd)
+    build_time: float = time.perf_counter() - tick
+
+    rng: random.Random = random.Random(2)
+    boxes: List[AABB] = [
+        AABB.from_body(bodies[rng.randrange(len(bodies))])
+        for i in range(queries)
+    ]
+    hits: int = 0
+    tick = time.perf_counter()
+    for box in boxes:
+        hits += len(dbvt.query(box))
+    query_time: float = time.perf_counter() - tick
+
+    rays: List[float] = [rng.uniform(0.0, 2.0 * np.pi) for i in range(queries)]
+    tick = time.perf_counter()
+    for ang in rays:
+        dbvt.raycast(Vec2(0.0, 0.0), Vec2(np.cos(ang), np.sin(ang)))
+    raycast_time: float = time.perf_counter() - tick
+
+    tick = time.perf_counter()
+    pair_num: int = len(dbvt.generate())
+    generate_time: float = time.perf_counter() - tick
+
+    return {
+        'build': build_time,
+        'query': query_time / queries,
+        'raycast': raycast_time / queries,
+        'generate': generate_time,
+        'hits': hits / queries,
+        'pairs': pair_num
+    }
+
+
+def main() -> None:
+    nums: List[int] = [int(v) for v in sys.argv[1:]] or [1000, 10000]
+    print(f'{"leaves":>8} {"build ms":>10} {"query ms":>10} '
+          f'{"raycast ms":>11} {"generate ms":>12} {"pairs":>7}')
+    for num in nums:
+        res: Dict[str, float] = bench_dbvt(build(num), 100)
+        print(f'{num:>8} {res["build"] * 1e3:>10.1f} '
+              f'{res["query"] * 1e3:>10.3f} '
+              f'{res["raycast"] * 1e3:>11.3f} '
+              f'{res["generate"] * 1e3:>12.1f} {res["pairs"]:>7}')
+
+
+if __name__ == '__main__':
+    main()
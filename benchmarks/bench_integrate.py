@@ -0,0 +1,55 @@
+'''benchmark of the PhysicsWorld integration stage
+
+time `step_velocity` + `step_position` for large sparse worlds,
+run from the repo root:
+
+    python -m benchmarks.bench_integrate [body_num ...]
+'''
+import sys
+import time
+from typing import List
+
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Circle
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.phy_world import PhysicsWorld
+
+
+def build_world(body_num: int) -> PhysicsWorld:
+    world: PhysicsWorld = PhysicsWorld()
+    cir: Circle = Circle(0.5)
+    # NOTE: 80% dynamic, 10% kinematic and 10% static bodies
+    types: List[Body.Type] = [Body.Type.Dynamic] * 8 + [
+        Body.Type.Kinematic, Body.Type.Static
+    ]
+    for i in range(body_num):
+        bd: Body = world.create_body()
+        bd.shape = cir
+        bd.mass = 1.0
+        bd.pos = Vec2(i % 1000 * 1.5, i // 1000 * 1.5)
+        bd.vel = Vec2(0.1, 0.0)
+        bd.type = types[i % len(types)]
+
+    return world
+
+
+def bench_integrate(body_num: int, steps: int = 10) -> float:
+    world: PhysicsWorld = build_world(body_num)
+    dt: float = 1 / 120
+    start: float = time.perf_counter()
+    for i in range(steps):
+        world.step_velocity(dt)
+        world.step_position(dt)
+
+    return (time.perf_counter() - start) / steps
+
+
+def main() -> None:
+    nums: List[int] = [int(v) for v in sys.argv[1:]] or [1000, 10000, 100000]
+    print(f'{"bodies":>8} {"ms/step":>9}')
+    for num in nums:
+        print(f'{num:>8} {bench_integrate(num) * 1e3:>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+'''benchmark of the island solver on worlds made of separate piles
+
+time the steps of the global solve loop against the IslandSolver
+in place and in a process pool, run from the repo root:
+
+    python -m benchmarks.bench_islands [piles] [workers ...]
+
+sleeping is disabled to keep every pile in the solver
+'''
+import sys
+import time
+from typing import List, Optional
+
+from TaichiGAME.geometry.shape import Rectangle
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.island import IslandSolver
+from .bench_step import HeadlessScene, ground
+
+
+def build_scene(piles: int) -> HeadlessScene:
+    scene: HeadlessScene = HeadlessScene()
+    scene._world.sleep_ena = False
+    ground(scene, piles * 4.0 + 10.0, [0.0, 0.0], 0.2, 0.0)
+    rect: Rectangle = Rectangle(1.0, 1.0)
+    max_layer: int = 3
+    for k in range(piles):
+        offset: float = k * 5.0
+        for i in range(max_layer):
+            for j in range(max_layer - i):
+                scene.add_body(rect, [offset + j * 1.1 + i * 0.55, i + 0.5],
+                               0.2, Body.Type.Dynamic, 0.8, 0.0)
+
+    return scene
+
+
+def bench_islands(piles: int,
+                  solver: Optional[IslandSolver],
+                  steps: int = 120) -> float:
+    scene: HeadlessScene = build_scene(piles)
+    scene._world.island_solver = solver
+    # NOTE: untimed first steps to start the pool and settle the contacts
+    for i in range(10):
+        scene.step()
+
+    start: float = time.perf_counter()
+    for i in range(steps):
+        scene.step()
+
+    return (time.perf_counter() - start) / steps
+
+
+def main() -> None:
+    piles: int = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    workers: List[int] = [int(v) for v in sys.argv[2:]] or [2, 4]
+    print(f'{"solver":<12} {"islands":>7} {"ms/step":>9}')
+    print(f'{"global":<12} {piles:>7} '
+          f'{bench_islands(piles, None) * 1e3:>9.3f}')
+    print(f'{"island":<12} {piles:>7} '
+          f'{bench_islands(piles, IslandSolver(1)) * 1e3:>9.3f}')
+    for num in workers:
+        solver: IslandSolver = IslandSolver(num)
+        per_step: float = bench_islands(piles, solver)
+        solver.close()
+        print(f'{"pool x" + str(num):<12} {piles:>7} {per_step * 1e3:>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
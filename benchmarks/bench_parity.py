@@ -0,0 +1,213 @@
+'''benchmark of the python and the taichi PhysicsWorld on the same scenes
+
+load the testbed frames of `bench_step` and the synthetic piles of
+bodies into both worlds with the same settings, step them side by side
+on `ti.cpu` and report the steps per second, the memory and the
+divergence of the body trajectories, run from the repo root:
+
+    python -m benchmarks.bench_parity [steps] [body_num ...]
+
+the memory of the python world is the tracemalloc peak of the build and
+the first steps, the one of the taichi world is the bytes of its fields.
+The divergence is the distance between the positions of the same body
+in both worlds, the max over all steps and the mean of the last step.
+The taichi world runs in f32 without sleeping and joints, so the python
+world runs without sleeping, the divergence of the frames with many
+contacts grows with the steps
+'''
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import taichi as ti
+from taichi.lang.util import to_numpy_type
+
+from TaichiGAME.math.matrix import Matrix
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Circle, Rectangle
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.phy_world import PhysicsWorld
+from TaichiGAME.dynamics import ti_phy_world
+from benchmarks.bench_step import FRAMES, ground
+
+
+class ParityScene():
+    '''the same bodies and physics settings in both worlds
+
+    Same `add_body` as the `HeadlessScene`, so the frames of `bench_step`
+    load into both worlds. The bodies are created in the same order, so
+    the rows of the body stores match.
+    '''
+    def __init__(self, with_ti: bool = True):
+        self._dt: float = 1 / 120
+        self._world: PhysicsWorld = PhysicsWorld()
+        self._world.grav = Matrix([0.0, -9.8], 'vec')
+        self._world.damping_ena = True
+        self._world._linear_vel_damping = 0.1
+        self._world.ang_vel_damping = 0.1
+        self._world.pos_iter = 8
+        self._world.vel_iter = 6
+        self._world.sleep_ena = False
+
+        self._ti_world: Optional[ti_phy_world.PhysicsWorld] = None
+        if with_ti:
+            self._ti_world = ti_phy_world.PhysicsWorld()
+            self._ti_world.grav = ti.Vector([0.0, -9.8])
+            self._ti_world._linear_vel_damping = 0.1
+            self._ti_world._ang_vel_damping = 0.1
+            self._ti_world.pos_iter = 8
+            self._ti_world.vel_iter = 6
+            # NOTE: the position correction of the contact maintainer
+            self._ti_world._bias_factor = self._world.maintainer._bias_factor
+            self._ti_world._penetration_max = (
+                self._world.maintainer._penetration_max)
+
+    def add_body(self,
+                 shape,
+                 pos: List[float],
+                 mass: float,
+                 body_type,
+                 fric: float,
+                 restit: float,
+                 rot: float = 0.0) -> Body:
+        worlds: List = [self._world]
+        if self._ti_world is not None:
+            worlds.append(self._ti_world)
+
+        for world in worlds:
+            bd: Body = world.create_body()
+            bd.shape = shape
+            bd.pos = Vec2(pos[0], pos[1])
+            bd.rot = rot
+            bd.mass = mass
+            bd.type = body_type
+            bd.fric = fric
+            bd.restit = restit
+
+        self._world.dbvt.insert(self._world._body_list[-1])
+        return bd
+
+    @property
+    def body_num(self) -> int:
+        return len(self._world._body_list)
+
+    def step_py(self) -> None:
+        self._world.step(self._dt)
+
+    def step_ti(self) -> None:
+        self._ti_world.step(self._dt)
+        ti.sync()
+
+    def divergence(self) -> np.ndarray:
+        '''distance between the positions of each body in both worlds'''
+        self._ti_world.sync_bodies(('pos', ))
+        num: int = self.body_num
+        return np.hypot(*(self._world.store.pos[:num] -
+                          self._ti_world.store.pos[:num]).T)
+
+
+def pile(body_num: int) -> Callable[[ParityScene], None]:
+    '''synthetic frame of a jittered grid of circles and boxes falling
+    onto the ground'''
+
+    def load(scene: ParityScene) -> None:
+        rng: random.Random = random.Random(0)
+        cols: int = int(np.ceil(np.sqrt(body_num)))
+        ground(scene, cols * 0.6, [0.0, 0.0], 0.2, 0.0)
+        cir: Circle = Circle(0.2)
+        rect: Rectangle = Rectangle(0.4, 0.4)
+        for i in range(body_num):
+            pos: List[float] = [
+                (i % cols - cols / 2) * 0.5 + rng.uniform(-0.03, 0.03),
+                0.5 + (i // cols) * 0.5
+            ]
+            scene.add_body(cir if i % 2 == 0 else rect, pos, 1.0,
+                           Body.Type.Dynamic, 0.4, 0.0, rng.uniform(0, 1.0))
+
+    return load
+
+
+def field_bytes(world: ti_phy_world.PhysicsWorld) -> int:
+    res: int = 0
+    for specs in (world.BodyFields, world.GridFields, world.EntryFields,
+                  world.VertFields, world.PairFields):
+        for name, _, _, _ in specs:
+            fld = getattr(world, name)
+            num: int = int(np.prod(fld.shape)) * getattr(fld, 'n', 1)
+            res += num * np.dtype(to_numpy_type(fld.dtype)).itemsize
+
+    return res
+
+
+def py_memory(load: Callable[[ParityScene], None], steps: int) -> int:
+    '''tracemalloc peak of building and stepping the python world'''
+    tracemalloc.start()
+    scene: ParityScene = ParityScene(with_ti=False)
+    load(scene)
+    for i in range(steps):
+        scene.step_py()
+
+    res: int = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return res
+
+
+def bench_parity(load: Callable[[ParityScene], None],
+                 steps: int) -> Dict[str, float]:
+    scene: ParityScene = ParityScene()
+    load(scene)
+    # NOTE: compile the kernels before the timed steps, the state of
+    # the world is kept
+    scene._ti_world.init_data()
+    scene._ti_world.warmup()
+
+    py_time: float = 0.0
+    ti_time: float = 0.0
+    err_max: float = 0.0
+    err: np.ndarray = np.zeros(0)
+    for i in range(steps):
+        tick: float = time.perf_counter()
+        scene.step_py()
+        py_time += time.perf_counter() - tick
+        tick = time.perf_counter()
+        scene.step_ti()
+        ti_time += time.perf_counter() - tick
+
+        err = scene.divergence()
+        err_max = max(err_max, float(err.max()))
+
+    return {
+        'bodies': scene.body_num,
+        'py_sps': steps / py_time,
+        'ti_sps': steps / ti_time,
+        'py_mb': py_memory(load, min(steps, 10)) / 2**20,
+        'ti_mb': field_bytes(scene._ti_world) / 2**20,
+        'err_max': err_max,
+        'err_mean': float(err.mean()),
+    }
+
+
+def main() -> None:
+    ti.init(arch=ti.cpu, log_level=ti.ERROR)
+    steps: int = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    nums: List[int] = [int(v) for v in sys.argv[2:]] or [100, 300]
+    loads: List[Tuple[str, Callable[[ParityScene],
+                                    None]]] = list(FRAMES.items())
+    loads += [(f'pile_{num}', pile(num)) for num in nums]
+
+    print(f'{"frame":<12} {"bodies":>6} {"py step/s":>10} '
+          f'{"ti step/s":>10} {"py MB":>7} {"ti MB":>7} '
+          f'{"err max":>9} {"err mean":>9}')
+    for name, load in loads:
+        res: Dict[str, float] = bench_parity(load, steps)
+        print(f'{name:<12} {res["bodies"]:>6} {res["py_sps"]:>10.1f} '
+              f'{res["ti_sps"]:>10.1f} {res["py_mb"]:>7.2f} '
+              f'{res["ti_mb"]:>7.2f} {res["err_max"]:>9.2e} '
+              f'{res["err_mean"]:>9.2e}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+'''benchmark of PhysicsWorld.snapshot / restore
+
+time the snapshot and the restore of a world with resting contacts,
+and the one-time copy of the shared broadphase paid by the first step
+after a restore, run from the repo root:
+
+    python -m benchmarks.bench_snapshot [body_num] [collider_num]
+
+only the first collider_num bodies are inserted into the broadphase,
+all of them by default.
+'''
+import sys
+import time
+
+from TaichiGAME.common.config import Config
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Circle, Edge
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.phy_world import PhysicsWorld
+from TaichiGAME.dynamics.snapshot import WorldSnapshot
+
+
+def build_world(body_num: int, collider_num: int) -> PhysicsWorld:
+    world: PhysicsWorld = PhysicsWorld()
+    world.grav = Vec2(0.0, -9.8)
+    world.sleep_ena = False
+
+    # NOTE: one row of circles on the ground, the rest flying above
+    edg: Edge = Edge()
+    edg.set_value(Vec2(-1000.0, 0.0), Vec2(1000.0, 0.0))
+    ground: Body = world.create_body()
+    ground.shape = edg
+    ground.mass = Config.Max
+    ground.type = Body.Type.Static
+    world.dbvt.insert(ground)
+
+    cir: Circle = Circle(0.5)
+    for i in range(body_num - 1):
+        bd: Body = world.create_body()
+        bd.shape = cir
+        bd.mass = 1.0
+        bd.pos = Vec2(i % 1000 * 1.0 - 500.0, i // 1000 * 3.0 + 0.49)
+        bd.type = Body.Type.Dynamic
+        if i < collider_num:
+            world.dbvt.insert(bd)
+
+    return world
+
+
+def main() -> None:
+    body_num: int = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    collider_num: int = int(sys.argv[2]) if len(sys.argv) > 2 else body_num
+    world: PhysicsWorld = build_world(body_num, collider_num)
+    dt: float = 1 / 120
+    world.step(dt)
+    contacts: int = sum(
+        len(val) for val in world.maintainer._contact_table.values())
+
+    rounds: int = 100
+    start: float = time.perf_counter()
+    for i in range(rounds):
+        snap: WorldSnapshot = world.snapshot()
+    snapshot_cost: float = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for i in range(rounds):
+        world.restore(snap)
+    restore_cost: float = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    world.dbvt._own()
+    world.pair_manager._own()
+    copy_cost: float = time.perf_counter() - start
+
+    print(f'bodies: {body_num}, contact points: {contacts}, '
+          f'snapshot size: {snap.nbytes() / 1024:.1f} KiB')
+    print(f'snapshot: {snapshot_cost * 1e3:.3f} ms')
+    print(f'restore: {restore_cost * 1e3:.3f} ms')
+    print(f'copy on the next step: {copy_cost * 1e3:.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
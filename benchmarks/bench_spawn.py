@@ -0,0 +1,53 @@
+'''benchmark of the body spawn / despawn of the PhysicsWorld
+
+spawn bodies like projectiles and remove them in random order, run
+from the repo root:
+
+    python -m benchmarks.bench_spawn [body_num ...]
+'''
+import random
+import sys
+import time
+from typing import List, Tuple
+
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Circle
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.phy_world import PhysicsWorld
+
+
+def bench_spawn(body_num: int) -> Tuple[float, float]:
+    world: PhysicsWorld = PhysicsWorld()
+    cir: Circle = Circle(0.1)
+    rng: random.Random = random.Random(0)
+    start: float = time.perf_counter()
+    bodies: List[Body] = []
+    for i in range(body_num):
+        bd: Body = world.create_body()
+        bd.shape = cir
+        bd.mass = 1.0
+        bd.pos = Vec2(0.0, 0.0)
+        bd.vel = Vec2(10.0, 0.0)
+        bd.type = Body.Type.Dynamic
+        bodies.append(bd)
+
+    spawn_cost: float = time.perf_counter() - start
+    rng.shuffle(bodies)
+    start = time.perf_counter()
+    for bd in bodies:
+        world.remove_body(bd)
+
+    return (spawn_cost, time.perf_counter() - start)
+
+
+def main() -> None:
+    nums: List[int] = [int(v) for v in sys.argv[1:]] or [1000, 4000, 16000]
+    print(f'{"bodies":>8} {"spawn us/body":>14} {"despawn us/body":>16}')
+    for num in nums:
+        spawn, despawn = bench_spawn(num)
+        print(f'{num:>8} {spawn / num * 1e6:>14.2f} '
+              f'{despawn / num * 1e6:>16.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+'''headless per-step benchmark of the cpu physics pipeline
+
+rebuild the testbed frames without the gui and time the
+`PhysicsWorld.step` used by `Scene.physics_sim`, run from the repo root:
+
+    python -m benchmarks.bench_step [steps] [settle_steps]
+
+the optional settle steps run untimed before the timed steps, such
+as 1200 to time the settled frames where most bodies sleep. The
+reinserts are the dbvt reinsertions of all the steps
+'''
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from TaichiGAME.common.config import Config
+from TaichiGAME.math.matrix import Matrix
+from TaichiGAME.geometry.shape import Capsule, Circle, Edge, Rectangle
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.phy_world import PhysicsWorld
+from TaichiGAME.collision.broad_phase.dbvt import DBVT
+
+
+class HeadlessScene():
+    '''same physics settings as the `Scene` without gui'''
+    def __init__(self):
+        self._world: PhysicsWorld = PhysicsWorld()
+        self._dbvt: DBVT = self._world.dbvt
+        self._dt: float = 1 / 120
+
+        self._world.grav = Matrix([0.0, -9.8], 'vec')
+        self._world.damping_ena = True
+        self._world._linear_vel_damping = 0.1
+        self._world.ang_vel_damping = 0.1
+        self._world.air_fric_coeff = 0.8
+        self._world.pos_iter = 8
+        self._world.vel_iter = 6
+
+    def add_body(self, shape, pos: List[float], mass: float, body_type,
+                 fric: float, restit: float, rot: float = 0.0) -> Body:
+        bd: Body = self._world.create_body()
+        bd.shape = shape
+        bd.pos = Matrix(pos, 'vec')
+        bd.rot = rot
+        bd.mass = mass
+        bd.type = body_type
+        bd.fric = fric
+        bd.restit = restit
+        self._dbvt.insert(bd)
+        return bd
+
+    def step(self) -> None:
+        self._world.step(self._dt)
+
+
+def ground(scene: HeadlessScene, half_len: float, pos: List[float],
+           fric: float, restit: float) -> Body:
+    edg: Edge = Edge()
+    edg.set_value(Matrix([-half_len, 0.0], 'vec'),
+                  Matrix([half_len, 0.0], 'vec'))
+    return scene.add_body(edg, pos, Config.Max, Body.Type.Static, fric,
+                          restit)
+
+
+def frame_stack(scene: HeadlessScene) -> None:
+    ground(scene, 100.0, [0.0, 0.0], 0.2, 0.0)
+    rect: Rectangle = Rectangle(1.0, 1.0)
+    offset: float = 0.0
+    max_layer: int = 4
+    for i in range(max_layer):
+        for j in range(max_layer - i):
+            scene.add_body(rect, [-10.0 + j * 1.1 + offset, i * 1.8 + 2.0],
+                           0.2, Body.Type.Dynamic, 0.8, 0.0)
+        offset += 0.5
+
+
+def frame_restitution(scene: HeadlessScene) -> None:
+    ground(scene, 100.0, [0.0, 0.0], 0.9, 1.0)
+    cir: Circle = Circle(1.0)
+    for i in range(10):
+        scene.add_body(cir, [i * 2.5 - 10.0, 10.0], 10, Body.Type.Dynamic,
+                       0.1, i / 10.0)
+
+
+def frame_friction(scene: HeadlessScene) -> None:
+    ramp: Edge = Edge()
+    ramp.set_value(Matrix([-10.0, 4.0], 'vec'), Matrix([0.0, 0.0], 'vec'))
+    rect: Rectangle = Rectangle(0.5, 0.5)
+    for i in range(3):
+        ground(scene, 5.0, [5.0, i * 3.0], 0.1, 0.0)
+        scene.add_body(ramp, [0.0, i * 3.0], Config.Max, Body.Type.Static,
+                       0.1, 0.0)
+
+    for i in range(1, 4):
+        scene.add_body(rect, [-5.0, i * 3.5], 1, Body.Type.Dynamic, i * 0.3,
+                       0.0)
+
+
+def frame_collision(scene: HeadlessScene) -> None:
+    ground(scene, 10.0, [0.0, 0.0], 0.7, 1.0)
+    cap: Capsule = Capsule(2.0, 1.0)
+    scene.add_body(cap, [0.0, 6.0], 1, Body.Type.Dynamic, 0.4, 0.0)
+
+
+def frame_domino(scene: HeadlessScene) -> None:
+    ground(scene, 100.0, [0.0, 0.0], 0.1, 0.0)
+    floor: Rectangle = Rectangle(15.0, 0.5)
+    for pos, deg in (([4.0, 8.0], 15), ([-4.0, 4.0], -15), ([-5.0, 10.0],
+                                                            0)):
+        scene.add_body(floor, pos, Config.Max, Body.Type.Static, 0.1, 0.0,
+                       np.pi / 180 * deg)
+
+    brick: Rectangle = Rectangle(0.3, 3.0)
+    for i in range(9):
+        scene.add_body(brick, [-10.0 + i * 1.2, 12.0], 10, Body.Type.Dynamic,
+                       0.1, 0.0)
+
+
+FRAMES: Dict[str, Callable[[HeadlessScene], None]] = {
+    'stack': frame_stack,
+    'restitution': frame_restitution,
+    'friction': frame_friction,
+    'collision': frame_collision,
+    'domino': frame_domino,
+}
+
+
+def bench_frame(load: Callable[[HeadlessScene], None],
+                steps: int,
+                settle: int = 0) -> Tuple[float, HeadlessScene]:
+    scene: HeadlessScene = HeadlessScene()
+    load(scene)
+    for i in range(settle):
+        scene.step()
+
+    start: float = time.perf_counter()
+    for i in range(steps):
+        scene.step()
+
+    return (time.perf_counter() - start) / steps, scene
+
+
+def main() -> None:
+    steps: int = int(sys.argv[1]) if len(sys.argv) > 1 else 240
+    settle: int = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    total: float = 0.0
+    print(f'{"frame":<12} {"bodies":>6} {"asleep":>6} {"reinserts":>9} '
+          f'{"ms/step":>9}')
+    for name, load in FRAMES.items():
+        per_step, scene = bench_frame(load, steps, settle)
+        total += per_step
+        print(f'{name:<12} {len(scene._world._body_list):>6} '
+              f'{int(scene._world.store.sleep.sum()):>6} '
+              f'{scene._dbvt.reinsertions:>9} {per_step * 1e3:>9.3f}')
+
+    print(f'{"total":<12} {"":>6} {"":>6} {"":>9} {total * 1e3:>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
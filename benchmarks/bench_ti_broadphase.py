@@ -0,0 +1,80 @@
+'''benchmark of the uniform grid broadphase of the taichi PhysicsWorld
+
+time the pair generation of random circles on a ground, without the
+kernel compilation, run from the repo root:
+
+    python -m benchmarks.bench_ti_broadphase [body_num ...]
+'''
+import sys
+import time
+from typing import List, Tuple
+
+import numpy as np
+import taichi as ti
+
+from TaichiGAME.common.config import Config
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Circle, Edge
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.ti_phy_world import PhysicsWorld
+
+
+def build(body_num: int) -> PhysicsWorld:
+    world: PhysicsWorld = PhysicsWorld(body_num + 1)
+    rng: np.random.Generator = np.random.default_rng(0)
+    # NOTE: about 0.5 bodies per square meter
+    side: float = np.sqrt(body_num * 2.0)
+    edg: Edge = Edge()
+    edg.set_value(Vec2(-side, 0.0), Vec2(side, 0.0))
+    grd: Body = world.create_body()
+    grd.shape = edg
+    grd.mass = Config.Max
+    grd.type = Body.Type.Static
+
+    cir: Circle = Circle(0.3)
+    pos: np.ndarray = rng.uniform((-side, 0.0), (side, side), (body_num, 2))
+    for x, y in pos:
+        bd: Body = world.create_body()
+        bd.shape = cir
+        bd.mass = 1.0
+        bd.pos = Vec2(float(x), float(y))
+        bd.type = Body.Type.Dynamic
+
+    world.init_data()
+    return world
+
+
+def bench_pairs(world: PhysicsWorld, iters: int = 10) -> Tuple[float, int]:
+    gen: int = world._field_gen
+    world._update_geometry(gen)
+    world._grid_insert(gen, world.cell_size)
+    if world._entry_num[None] > world._entry_len:
+        world.reserve(0, 0, 0, world._entry_num[None])
+        gen = world._field_gen
+    world._grid_insert(gen, world.cell_size)
+    world._grid_pairs(gen)
+    if world.pair_num > world._pair_len:
+        world.reserve(0, world.pair_num)
+        gen = world._field_gen
+    world._grid_pairs(gen)
+    ti.sync()
+
+    start: float = time.perf_counter()
+    for i in range(iters):
+        world._grid_insert(gen, world.cell_size)
+        world._grid_pairs(gen)
+    ti.sync()
+    return ((time.perf_counter() - start) / iters, world.pair_num)
+
+
+def main() -> None:
+    ti.init(arch=ti.cpu)
+    nums: List[int] = [int(v) for v in sys.argv[1:]] or [10000, 100000]
+    for num in nums:
+        cost, pair_num = bench_pairs(build(num))
+        print(f'bodies: {num}, pairs: {pair_num}, '
+              f'pair generation: {cost * 1e3:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
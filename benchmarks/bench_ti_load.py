@@ -0,0 +1,68 @@
+'''benchmark of the scene load of the taichi PhysicsWorld
+
+time the upload of a mixed scene into the fields by `init_data`, the
+upload of a few moved bodies, and the download of the positions back
+into the bodies by `sync_bodies`. The first load of a world includes
+the kernel compilation, run from the repo root:
+
+    python -m benchmarks.bench_ti_load [body_num ...]
+'''
+import sys
+import time
+from typing import List, Tuple
+
+import taichi as ti
+
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Capsule, Circle, Rectangle, Shape
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.ti_phy_world import PhysicsWorld
+
+
+def load_bodies(world: PhysicsWorld, body_num: int) -> None:
+    shapes: List[Shape] = [Circle(0.4), Rectangle(0.8, 0.8), Capsule(1.0, 0.4)]
+    for i in range(body_num):
+        bd: Body = world.create_body()
+        bd.shape = shapes[i % len(shapes)]
+        bd.mass = 1.0
+        bd.pos = Vec2(i % 100 * 1.5, i // 100 * 1.5)
+        bd.type = Body.Type.Dynamic
+
+
+def bench_load(world: PhysicsWorld,
+               body_num: int) -> Tuple[float, float, float]:
+    # NOTE: reload the scene like a frame change of the scene
+    world.clear_all_bodies()
+    load_bodies(world, body_num)
+    start: float = time.perf_counter()
+    world.init_data()
+    ti.sync()
+    load_cost: float = time.perf_counter() - start
+
+    # NOTE: teleport 1% of the bodies, only their rows are uploaded
+    for bd in world._body_list[::100]:
+        bd.pos += Vec2(0.0, 10.0)
+    start = time.perf_counter()
+    world.init_data()
+    ti.sync()
+    dirty_cost: float = time.perf_counter() - start
+
+    start = time.perf_counter()
+    world.sync_bodies(('pos', ))
+    return (load_cost, dirty_cost, time.perf_counter() - start)
+
+
+def main() -> None:
+    ti.init(arch=ti.cpu)
+    nums: List[int] = [int(v) for v in sys.argv[1:]] or [1000, 4000]
+    for num in nums:
+        world: PhysicsWorld = PhysicsWorld(num)
+        cold = bench_load(world, num)[0]
+        load, dirty, sync = bench_load(world, num)
+        print(f'bodies: {num}, first load: {cold * 1e3:.1f} ms, '
+              f'load: {load * 1e3:.1f} ms, 1% moved: {dirty * 1e3:.2f} ms, '
+              f'sync pos back: {sync * 1e3:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+'''benchmark of the contact solver modes of the taichi PhysicsWorld
+
+time the solver stages of a wall of resting circles for each
+`PhysicsWorld.Solver`, without the kernel compilation, run from the
+repo root:
+
+    python -m benchmarks.bench_ti_solver [body_num ...]
+
+the pairs of a color are solved in parallel, so the Color and the
+Jacobi solvers scale with the threads of `ti.cpu`, the kernel launch
+per color is paid on the small worlds
+'''
+import sys
+from typing import Dict, List
+
+import numpy as np
+import taichi as ti
+
+from TaichiGAME.common.config import Config
+from TaichiGAME.common.profiler import Profiler
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Circle, Edge
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.ti_phy_world import PhysicsWorld
+
+Stages: List[str] = [
+    'contact_prepare', 'velocity_iterations', 'position_iterations'
+]
+
+
+def build(body_num: int, solver: PhysicsWorld.Solver) -> PhysicsWorld:
+    world: PhysicsWorld = PhysicsWorld(body_num + 1)
+    world.grav = ti.Vector([0.0, -9.8])
+    world.solver = solver
+    cols: int = int(np.sqrt(body_num * 4.0))
+    edg: Edge = Edge()
+    edg.set_value(Vec2(-cols * 0.4, 0.0), Vec2(cols * 0.4, 0.0))
+    grd: Body = world.create_body()
+    grd.shape = edg
+    grd.mass = Config.Max
+    grd.type = Body.Type.Static
+
+    # NOTE: a wall of touching circles, 4 times wider than high
+    cir: Circle = Circle(0.3)
+    for i in range(body_num):
+        bd: Body = world.create_body()
+        bd.shape = cir
+        bd.mass = 1.0
+        bd.pos = Vec2((i % cols - cols / 2) * 0.6, 0.3 + (i // cols) * 0.6)
+        bd.type = Body.Type.Dynamic
+
+    return world
+
+
+def bench_solver(world: PhysicsWorld, steps: int = 20) -> Dict[str, float]:
+    for i in range(10):
+        world.step(1 / 120)
+
+    Profiler.reset()
+    Profiler.enable()
+    for i in range(steps):
+        world.step(1 / 120)
+    Profiler.enable(False)
+
+    res: Dict[str, float] = {
+        name: Profiler.report()['stages'][name]['mean']
+        for name in Stages
+    }
+    res['colors'] = Profiler.report()['counters']['colors']['mean']
+    return res
+
+
+def main() -> None:
+    ti.init(arch=ti.cpu)
+    nums: List[int] = [int(v) for v in sys.argv[1:]] or [1000, 10000]
+    print(f'{"bodies":>8} {"solver":>8} {"colors":>7} ' +
+          ' '.join(f'{name + " ms":>22}' for name in Stages))
+    for num in nums:
+        for solver in PhysicsWorld.Solver:
+            res: Dict[str, float] = bench_solver(build(num, solver))
+            print(f'{num:>8} {solver.name:>8} {res["colors"]:>7.1f} ' +
+                  ' '.join(f'{res[name]:>22.2f}' for name in Stages))
+
+
+if __name__ == '__main__':
+    main()
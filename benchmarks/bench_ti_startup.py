@@ -0,0 +1,81 @@
+'''benchmark of the startup of the taichi PhysicsWorld
+
+time to the first step of a new process with an empty offline cache
+(cold) and with the cache filled by the cold process (warm), run from
+the repo root:
+
+    python -m benchmarks.bench_ti_startup [body_num]
+
+each process inits taichi by `ti_init`, builds the world, compiles the
+kernels by `PhysicsWorld.warmup` and runs the first step
+'''
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+Stages: List[str] = ['init', 'warmup', 'first_step', 'total']
+
+
+def run_child(cache_dir: str, body_num: int) -> None:
+    start: float = time.perf_counter()
+    import taichi as ti
+    from TaichiGAME.common.config import Config
+    from TaichiGAME.common.ti_setup import ti_init
+    from TaichiGAME.math.linalg import Vec2
+    from TaichiGAME.geometry.shape import Circle, Rectangle
+    from TaichiGAME.dynamics.body import Body
+    from TaichiGAME.dynamics.ti_phy_world import PhysicsWorld
+
+    Config.OfflineCacheDir = cache_dir
+    ti_init(arch=ti.cpu, log_level=ti.ERROR)
+    res: Dict[str, float] = {'init': time.perf_counter() - start}
+
+    world: PhysicsWorld = PhysicsWorld(body_num)
+    for i in range(body_num):
+        bd: Body = world.create_body()
+        bd.shape = Circle(0.3) if i % 2 == 0 else Rectangle(0.5, 0.5)
+        bd.mass = 1.0
+        bd.pos = Vec2((i % 10) * 0.7, (i // 10) * 0.7)
+        bd.type = Body.Type.Dynamic
+
+    tick: float = time.perf_counter()
+    world.warmup()
+    ti.sync()
+    res['warmup'] = time.perf_counter() - tick
+    tick = time.perf_counter()
+    world.step(1 / 120)
+    ti.sync()
+    res['first_step'] = time.perf_counter() - tick
+    res['total'] = time.perf_counter() - start
+    print(json.dumps(res))
+
+
+def run(cache_dir: str, body_num: int) -> Dict[str, float]:
+    args: List[str] = [
+        sys.executable, '-m', 'benchmarks.bench_ti_startup', '--child',
+        cache_dir,
+        str(body_num)
+    ]
+    proc = subprocess.run(args, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        run_child(sys.argv[2], int(sys.argv[3]))
+        return
+
+    body_num: int = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    print(f'{"cache":>6} ' + ' '.join(f'{name + " s":>12}' for name in Stages))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name in ('cold', 'warm'):
+            res: Dict[str, float] = run(cache_dir, body_num)
+            print(f'{name:>6} ' + ' '.join(f'{res[stage]:>12.2f}'
+                                           for stage in Stages))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,8 @@
 import numpy as np
 
-from TaichiGAME.collision.broad_phase.aabb import AABB
+from TaichiGAME.collision.broad_phase.aabb import AABB, aabb_bounds
+from TaichiGAME.collision.broad_phase.aabb import bounds_overlap, ray_bounds
+from TaichiGAME.math.linalg import Vec2
 from TaichiGAME.math.matrix import Matrix
 
 
@@ -89,3 +91,20 @@ class TestAABB():
 
     def test_from_box(self):
         assert 1
+
+    def test_aabb_bounds(self):
+        dut: AABB = AABB(2.0, 4.0)
+        dut.pos = Vec2(1.0, -1.0)
+        assert aabb_bounds(dut) == (0.0, -3.0, 2.0, 1.0)
+
+    def test_bounds_overlap(self):
+        assert bounds_overlap((0.0, 0.0, 1.0, 1.0), (0.5, 0.5, 2.0, 2.0))
+        assert bounds_overlap((0.0, 0.0, 1.0, 1.0), (1.0, 0.0, 2.0, 1.0))
+        assert not bounds_overlap((0.0, 0.0, 1.0, 1.0), (0.0, 1.5, 1.0, 2.0))
+
+    def test_ray_bounds(self):
+        bounds = (1.0, -1.0, 3.0, 1.0)
+        assert ray_bounds(0.0, 0.0, 1.0, 0.0, bounds) == (1.0, 3.0)
+        assert ray_bounds(0.0, 0.0, -1.0, 0.0, bounds) is None
+        assert ray_bounds(2.0, 2.0, 0.0, -2.0, bounds) == (0.5, 1.5)
+        assert ray_bounds(0.0, 2.0, 1.0, 0.0, bounds) is None
@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+
+from TaichiGAME.common.config import Config
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Circle, Edge, Rectangle
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.batched_world import BatchedWorld
+from TaichiGAME.dynamics.joint.distance import DistanceJointPrimitive
+from TaichiGAME.dynamics.phy_world import PhysicsWorld
+
+
+class TestBatchedWorld():
+    def setup_method(self):
+        self.dt: float = 1 / 120
+
+    def build(self, rect: bool = False) -> PhysicsWorld:
+        world: PhysicsWorld = PhysicsWorld()
+        world.grav = Vec2(0.0, -9.8)
+        world.vel_iter = 6
+        world.pos_iter = 8
+        world.sleep_ena = False
+
+        edg: Edge = Edge()
+        edg.set_value(Vec2(-10.0, 0.0), Vec2(10.0, 0.0))
+        shapes = [(edg, Vec2(0.0, 0.0), Config.Max, Body.Type.Static),
+                  (Circle(0.5), Vec2(0.0, 1.0), 1.0, Body.Type.Dynamic),
+                  (Circle(0.5), Vec2(0.0, 2.2), 1.0, Body.Type.Dynamic)]
+        if rect:
+            shapes.append(
+                (Rectangle(1.0, 1.0), Vec2(3.0, 0.6), 1.0, Body.Type.Dynamic))
+
+        for shape, pos, mass, body_type in shapes:
+            bd: Body = world.create_body()
+            bd.shape = shape
+            bd.pos = pos
+            bd.mass = mass
+            bd.type = body_type
+            world.dbvt.insert(bd)
+
+        return world
+
+    def step(self, dut: BatchedWorld, num: int, mask=None) -> None:
+        for i in range(num):
+            dut.step(self.dt, mask)
+
+    def test_identical(self):
+        dut: BatchedWorld = BatchedWorld(self.build(True), 3)
+        assert dut.pos.shape == (3, 4, 2)
+        self.step(dut, 120)
+        assert (dut.pos[0] == dut.pos[1]).all()
+        assert (dut.pos[0] == dut.pos[2]).all()
+        assert (dut.rot[0] == dut.rot[2]).all()
+
+    def test_independent(self):
+        dut: BatchedWorld = BatchedWorld(self.build(True), 3)
+        dut.pos[:, 2, 0] = [-0.3, 0.0, 0.4]
+        dut.vel[:, 1, 0] = [0.0, 1.0, -2.0]
+        dut.save_init()
+        self.step(dut, 90)
+
+        for i in range(3):
+            ref: BatchedWorld = BatchedWorld(self.build(True), 1)
+            ref.pos[0, 2, 0] = dut._init_state[0][i, 2, 0]
+            ref.vel[0, 1, 0] = dut._init_state[1][i, 1, 0]
+            self.step(ref, 90)
+            assert (ref.pos[0] == dut.pos[i]).all()
+            assert (ref.ang_vel[0] == dut.ang_vel[i]).all()
+
+    def test_rest(self):
+        world: PhysicsWorld = self.build()
+        dut: BatchedWorld = BatchedWorld(world, 2)
+        for i in range(180):
+            world.step(self.dt)
+            dut.step(self.dt)
+
+        # the circles stack on the ground like in the template world
+        assert np.allclose(dut.pos[0, 1:, 1], [0.5, 1.5], atol=0.05)
+        assert np.allclose(dut.vel[0], 0.0, atol=0.05)
+        assert np.allclose(dut.pos[0], world.store.pos, atol=0.05)
+
+    def test_bitmask(self):
+        # NOTE: the upper circle falls through the lower one
+        world: PhysicsWorld = self.build()
+        world._body_list[0].bitmask = 3
+        world._body_list[2].bitmask = 2
+        dut: BatchedWorld = BatchedWorld(world, 2)
+        assert len(dut._pair_a) == 2
+        for i in range(180):
+            world.step(self.dt)
+            dut.step(self.dt)
+
+        assert np.allclose(dut.pos[0, 1:, 1], [0.5, 0.5], atol=0.05)
+        assert np.allclose(dut.pos[0], world.store.pos, atol=0.05)
+        assert (dut.pos[0] == dut.pos[1]).all()
+
+    def test_mask(self):
+        dut: BatchedWorld = BatchedWorld(self.build(), 3)
+        mask: np.ndarray = np.array([True, False, True])
+        self.step(dut, 30, mask)
+        assert (dut.pos[1] == dut._init_state[0][1]).all()
+        assert (dut.vel[1] == 0.0).all()
+        assert (dut.pos[0] == dut.pos[2]).all()
+        assert dut.pos[0, 1, 1] < 1.0
+
+        # the frozen copy runs the same steps later
+        self.step(dut, 30, ~mask)
+        assert (dut.pos[1] == dut.pos[0]).all()
+
+    def test_reset(self):
+        world: PhysicsWorld = self.build()
+        dut: BatchedWorld = BatchedWorld(world, 2)
+        self.step(dut, 60)
+        assert len(dut._accum) > 0
+
+        dut.reset([1])
+        assert (dut.pos[1] == world.store.pos).all()
+        assert (dut.vel[1] == 0.0).all()
+        assert all((acc[1] == 0.0).all() for acc in dut._accum.values())
+        assert not (dut.pos[0] == world.store.pos).all()
+
+        dut.sync_world(0, world)
+        assert world._body_list[1].pos == Vec2(dut.pos[0, 1, 0], dut.pos[0, 1,
+                                                                         1])
+
+        self.step(dut, 60, np.array([False, True]))
+        assert (dut.pos[1] == dut.pos[0]).all()
+
+        dut.reset()
+        dut.pos[:, 1, 1] = 3.0
+        dut.save_init([0])
+        dut.reset()
+        assert dut.pos[0, 1, 1] == 3.0
+        assert dut.pos[1, 1, 1] == 1.0
+
+    def test_joint(self):
+        world: PhysicsWorld = self.build()
+        prim: DistanceJointPrimitive = DistanceJointPrimitive()
+        prim._bodya = world._body_list[1]
+        world.create_joint(prim)
+        with pytest.raises(ValueError, match='joints'):
+            BatchedWorld(world, 2)
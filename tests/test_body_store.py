@@ -0,0 +1,143 @@
+import numpy as np
+
+from TaichiGAME.geometry.shape import Circle
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.math.matrix import Matrix
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.body_store import BodyStore
+from TaichiGAME.dynamics.phy_world import PhysicsWorld
+
+
+class TestBodyStore():
+    def test__init__(self):
+        dut: BodyStore = BodyStore(4)
+        assert dut.size == 0
+        assert len(dut) == 0
+        assert dut.capacity == 4
+        assert dut.pos.shape == (0, 2)
+
+    def test_alloc(self):
+        dut: BodyStore = BodyStore(1)
+        bodies = [Body(dut) for i in range(5)]
+        assert dut.size == 5
+        assert dut.capacity >= 5
+        assert [bd.idx for bd in bodies] == [0, 1, 2, 3, 4]
+        assert dut.bodies == bodies
+        assert (dut.type == Body.Type.Static).all()
+
+    def test_body_view(self):
+        dut: BodyStore = BodyStore()
+        bd: Body = Body(dut)
+        bd.pos = Vec2(1.0, 2.0)
+        bd.vel = Matrix([3.0, 4.0], 'vec')
+        bd.rot = 0.5
+        bd.ang_vel = 0.6
+        bd.forces = Vec2(7.0, 8.0)
+        bd.torques = 0.9
+        bd.type = Body.Type.Dynamic
+        bd.shape = Circle(1.0)
+        bd.mass = 2.0
+
+        assert np.allclose(dut.pos[bd.idx], [1.0, 2.0])
+        assert np.allclose(dut.vel[bd.idx], [3.0, 4.0])
+        assert np.isclose(dut.rot[bd.idx], 0.5)
+        assert np.isclose(dut.ang_vel[bd.idx], 0.6)
+        assert np.allclose(dut.forces[bd.idx], [7.0, 8.0])
+        assert np.isclose(dut.torques[bd.idx], 0.9)
+        assert np.isclose(dut.inv_mass[bd.idx], 0.5)
+        assert np.isclose(dut.inv_inertia[bd.idx], bd.inv_inertia)
+        assert dut.type[bd.idx] == Body.Type.Dynamic
+
+        dut.vel[bd.idx] = [5.0, 6.0]
+        assert bd.vel == Vec2(5.0, 6.0)
+
+        bd.vel += Vec2(1.0, 1.0)
+        assert bd.vel == Vec2(6.0, 7.0)
+
+        bd.clear_forces()
+        bd.clear_torque()
+        assert bd.forces.is_origin()
+        assert np.isclose(bd.torques, 0.0)
+
+    def test_getter_return_copy(self):
+        bd: Body = Body()
+        vel: Vec2 = bd.vel
+        vel.x = 3.0
+        assert bd.vel == Vec2(0.0, 0.0)
+
+    def test_free(self):
+        dut: BodyStore = BodyStore()
+        bodies = [Body(dut) for i in range(3)]
+        for i, bd in enumerate(bodies):
+            bd.pos = Vec2(i, i)
+
+        dut.detach(bodies[0])
+        assert dut.size == 2
+        assert bodies[2].idx == 0
+        assert bodies[2].pos == Vec2(2.0, 2.0)
+        assert bodies[1].pos == Vec2(1.0, 1.0)
+        # detached body keeps its state in a private store
+        assert bodies[0].store is not dut
+        assert bodies[0].pos == Vec2(0.0, 0.0)
+
+    def test_attach(self):
+        dut: BodyStore = BodyStore()
+        bd: Body = Body()
+        bd.pos = Vec2(1.0, 2.0)
+        bd.type = Body.Type.Dynamic
+        dut.attach(bd)
+        assert bd.store is dut
+        assert dut.size == 1
+        assert bd.pos == Vec2(1.0, 2.0)
+        assert dut.type[bd.idx] == Body.Type.Dynamic
+
+    def test_reserve(self):
+        dut: BodyStore = BodyStore(2)
+        bd: Body = Body(dut)
+        bd.pos = Vec2(1.0, 2.0)
+        dut.reserve(64)
+        assert dut.capacity == 64
+        assert bd.pos == Vec2(1.0, 2.0)
+
+    def test_clear_forces(self):
+        dut: BodyStore = BodyStore()
+        bodies = [Body(dut) for i in range(3)]
+        for bd in bodies:
+            bd.forces = Vec2(1.0, 1.0)
+            bd.torques = 1.0
+
+        dut.clear_forces()
+        assert not dut.forces.any()
+        assert not dut.torques.any()
+
+    def test_dirty(self):
+        dut: BodyStore = BodyStore()
+        bodies = [Body(dut) for i in range(3)]
+        assert (dut.dirty == BodyStore.DirtyAll).all()
+
+        dut.dirty[:] = 0
+        bodies[1].vel = Vec2(1.0, 0.0)
+        bodies[1].torques = 1.0
+        bodies[2].shape = Circle(1.0)
+        assert list(dut.dirty) == [
+            0, BodyStore.DirtyVel | BodyStore.DirtyTorques,
+            BodyStore.DirtyParams
+        ]
+
+        # the bits move with the rows
+        dut.free(0)
+        assert dut.dirty[0] == BodyStore.DirtyParams
+
+    def test_world(self):
+        world: PhysicsWorld = PhysicsWorld()
+        bda: Body = world.create_body()
+        bdb: Body = world.create_body()
+        assert bda.store is world.store
+        assert world.store.size == 2
+
+        world.remove_body(bda)
+        assert world.store.size == 1
+        assert bdb.idx == 0
+
+        world.clear_all_bodies()
+        assert world.store.size == 0
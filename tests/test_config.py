@@ -19,4 +19,8 @@ class TestConfig():
         assert np.isclose(dut, 2.8)
 
         dut = Config.clamp(1.3911111111, low_limit, high_limit)
-        assert np.isclose(dut, low_limit)
\ No newline at end of file
+        assert np.isclose(dut, low_limit)
+    def test_isclose(self):
+        for a, b in ((0.0, 0.0), (1e-9, 0.0), (1e-7, 0.0), (1.0, 1.0 + 1e-6),
+                     (1.0, 1.0001), (-3.0, 3.0), (1e6, 1e6 + 5.0)):
+            assert Config.isclose(a, b) == np.isclose(a, b)
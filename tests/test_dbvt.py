@@ -1,10 +1,61 @@
+import random
+from typing import List, Set, Tuple
+
 import numpy as np
 
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Circle, Edge, Rectangle
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.phy_world import PhysicsWorld
 from TaichiGAME.collision.broad_phase.dbvt import DBVT
-from TaichiGAME.collision.broad_phase.aabb import AABB
+from TaichiGAME.collision.broad_phase.aabb import AABB, aabb_bounds
+from TaichiGAME.collision.broad_phase.aabb import ray_bounds
 
 
 class TestDVBT():
+
+    @staticmethod
+    def build_bodies(num: int, seed: int = 0) -> List[Body]:
+        rng: random.Random = random.Random(seed)
+        shapes = [Circle(0.3), Rectangle(0.5, 0.3), Circle(0.15)]
+        bodies: List[Body] = []
+        for i in range(num):
+            bd: Body = Body()
+            bd.shape = shapes[i % len(shapes)]
+            bd.pos = Vec2(rng.uniform(-8.0, 8.0), rng.uniform(-8.0, 8.0))
+            bd.rot = rng.uniform(0.0, np.pi)
+            bd.bitmask = 1 if i % 7 else 2
+            bodies.append(bd)
+
+        return bodies
+
+    @staticmethod
+    def check_tree(dut: DBVT) -> None:
+        '''the links, bounds and heights of the nodes are consistent'''
+        num: int = 0
+        stack: List[int] = [] if dut._root_idx == -1 else [dut._root_idx]
+        while len(stack) > 0:
+            idx: int = stack.pop()
+            num += 1
+            left: int = int(dut._left[idx])
+            right: int = int(dut._right[idx])
+            if left == -1:
+                assert right == -1
+                assert dut._height[idx] == 1
+                assert dut._body_table[dut._bodies[idx]] == idx
+                continue
+
+            assert dut._parent[left] == idx and dut._parent[right] == idx
+            assert np.allclose(dut._lo[idx],
+                               np.minimum(dut._lo[left], dut._lo[right]))
+            assert np.allclose(dut._hi[idx],
+                               np.maximum(dut._hi[left], dut._hi[right]))
+            assert dut._height[idx] == max(dut._height[left],
+                                           dut._height[right]) + 1
+            stack += [left, right]
+
+        assert num + len(dut._empty_list) == dut._size
+
     def test_node__init__(self):
         dut: DBVT.Node = DBVT.Node()
 
@@ -80,33 +131,213 @@ class TestDVBT():
 
         assert np.isclose(dut._fat_expansion_factor, 0.5)
         assert dut._root_idx == -1
-        assert len(dut._tree) == 0
+        assert len(dut.tree()) == 0
         assert len(dut._empty_list) == 0
         assert len(dut._body_table) == 0
 
     def test_query(self):
-        assert 1
+        bodies: List[Body] = TestDVBT.build_bodies(300)
+        dut: DBVT = DBVT()
+        for bd in bodies:
+            dut.insert(bd)
+
+        box: AABB = AABB(3.0, 2.0)
+        box.pos = Vec2(1.0, -0.5)
+        res: List[Body] = dut.query(box)
+        assert len(res) == len(set(res))
+        assert set(res) == {
+            bd
+            for bd in bodies if dut.fat_aabb(bd).collide(box)
+        }
+        assert bodies[0] in dut.query(bodies[0])
+        assert DBVT().query(box) == []
+
+        pairs: List[Tuple[Body, Body]] = dut.query_pairs(bodies[:20])
+        assert {(id(a), id(b))
+                for a, b in pairs} == {
+                    (id(a), id(b))
+                    for a in bodies[:20]
+                    for b in bodies
+                    if a is not b and dut.fat_aabb(a).collide(dut.fat_aabb(b))
+                }
 
     def test_raycast(self):
-        assert 1
+        bodies: List[Body] = TestDVBT.build_bodies(300)
+        dut: DBVT = DBVT()
+        for bd in bodies:
+            dut.insert(bd)
+
+        rng: random.Random = random.Random(3)
+        for i in range(50):
+            start: Vec2 = Vec2(rng.uniform(-12.0, 12.0),
+                               rng.uniform(-12.0, 12.0))
+            ang: float = rng.uniform(0.0, 2.0 * np.pi)
+            dirn: Vec2 = Vec2(np.cos(ang), np.sin(ang))
+            if i % 10 == 0:
+                dirn = Vec2(0.0, 1.0) if i % 20 == 0 else Vec2(-1.0, 0.0)
+
+            res: List[Body] = dut.raycast(start, dirn)
+            assert len(res) == len(set(res))
+            assert set(res) == {
+                bd
+                for bd in bodies
+                if ray_bounds(start.x, start.y, dirn.x, dirn.y,
+                              aabb_bounds(dut.fat_aabb(bd))) is not None
+            }
 
     def test_generate(self):
-        assert 1
+        bodies: List[Body] = TestDVBT.build_bodies(300)
+        dut: DBVT = DBVT()
+        for bd in bodies:
+            dut.insert(bd)
+
+        ref: Set[Tuple[int, int]] = set()
+        for i in range(len(bodies)):
+            for j in range(i + 1, len(bodies)):
+                if bodies[i].bitmask & bodies[j].bitmask and AABB.from_body(
+                        bodies[i]).collide(AABB.from_body(bodies[j])):
+                    ref.add((i, j))
+
+        idx = {id(bd): i for i, bd in enumerate(bodies)}
+        pairs: List[Tuple[int, int]] = [(min(idx[id(a)], idx[id(b)]),
+                                         max(idx[id(a)], idx[id(b)]))
+                                        for a, b in dut.generate()]
+        assert len(pairs) == len(set(pairs))
+        assert set(pairs) == ref
+        assert DBVT().generate() == []
 
     def test_insert(self):
-        assert 1
+        # NOTE: the deep trees are walked without the recursion
+        bodies: List[Body] = TestDVBT.build_bodies(2000)
+        dut: DBVT = DBVT()
+        for bd in bodies:
+            dut.insert(bd)
+        TestDVBT.check_tree(dut)
+        assert len(dut.tree()) == dut._size
+        assert len(dut.query(AABB(40.0, 40.0))) == 2000
+
+        rng: random.Random = random.Random(1)
+        for bd in bodies:
+            bd.pos = bd.pos + Vec2(rng.uniform(-1.0, 1.0),
+                                   rng.uniform(-1.0, 1.0))
+            dut.update(bd)
+        assert dut.reinsertions > 0
+        TestDVBT.check_tree(dut)
 
     def test_remove(self):
-        assert 1
+        bodies: List[Body] = TestDVBT.build_bodies(300)
+        dut: DBVT = DBVT()
+        for bd in bodies:
+            dut.insert(bd)
+
+        for bd in bodies[::2]:
+            dut.remove(bd)
+        dut.remove(bodies[0])
+        TestDVBT.check_tree(dut)
+        assert set(dut.query(AABB(40.0, 40.0))) == set(bodies[1::2])
+
+        # NOTE: the free rows are reused
+        size: int = dut._size
+        for bd in bodies[::2]:
+            dut.insert(bd)
+        assert dut._size == size
+        TestDVBT.check_tree(dut)
+
+        for bd in bodies:
+            dut.remove(bd)
+        assert dut._root_idx == -1
+        assert dut.query(AABB(40.0, 40.0)) == []
 
     def test_clear_all(self):
         assert 1
 
     def test_update(self):
-        assert 1
+        dut: DBVT = DBVT()
+        bd: Body = Body()
+        bd.shape = Rectangle(2.0, 1.0)
+        bd.pos = Vec2(0.0, 0.0)
+        dut.insert(bd)
+        # NOTE: expanded by the factor plus the ratio of the size
+        leaf: AABB = dut.fat_aabb(bd)
+        assert np.isclose(leaf._width, 2.0 + 0.5 + 0.2)
+        assert np.isclose(leaf._height, 1.0 + 0.5 + 0.2)
+
+        # NOTE: the small moves stay in the fat aabb
+        bd.pos = Vec2(0.3, -0.3)
+        dut.update(bd)
+        assert dut.reinsertions == 0
+        assert dut.fat_aabb(bd) == leaf
+
+        # NOTE: the reinserted leaf is stretched along the velocity
+        bd.pos = Vec2(1.0, 0.0)
+        bd.vel = Vec2(12.0, -6.0)
+        dut.update(bd, 0.1)
+        assert dut.reinsertions == 1
+        leaf = dut.fat_aabb(bd)
+        assert np.isclose(leaf._width, 2.7 + 4.8)
+        assert np.isclose(leaf._height, 1.7 + 2.4)
+        assert leaf._pos == Vec2(1.0 + 2.4, -1.2)
+
+        dut.fat_expansion_factor = 0.0
+        dut.fat_ratio = 0.0
+        dut.predict_factor = 0.0
+        bd.pos = Vec2(20.0, 0.0)
+        dut.update(bd, 0.1)
+        assert dut.reinsertions == 2
+        assert dut.fat_aabb(bd) == AABB.from_body(bd)
+
+        dut.clear_all()
+        assert dut.reinsertions == 0
+
+    def test_update_world(self):
+        world: PhysicsWorld = PhysicsWorld()
+        world.grav = Vec2(0.0, -9.8)
+        edg: Edge = Edge()
+        edg.set_value(Vec2(-10.0, 0.0), Vec2(10.0, 0.0))
+        grd: Body = world.create_body()
+        grd.shape = edg
+        grd.mass = 1.0
+        grd.type = Body.Type.Static
+        world.dbvt.insert(grd)
+        for i in range(5):
+            bd: Body = world.create_body()
+            bd.shape = Circle(0.5)
+            bd.mass = 1.0
+            bd.pos = Vec2(i * 1.2, 0.5)
+            bd.type = Body.Type.Dynamic
+            world.dbvt.insert(bd)
+
+        # NOTE: the resting bodies stay in their fat aabbs, and the
+        # static bodies are not updated by the step
+        for i in range(60):
+            world.step(1 / 120)
+        assert world.dbvt.reinsertions == 0
+
+        grd.pos = Vec2(0.0, 5.0)
+        world.step(1 / 120)
+        assert world.dbvt.reinsertions == 0
 
     def test_tree(self):
-        assert 1
+        dut: DBVT = DBVT()
+        bd1: Body = Body()
+        bd1.shape = Rectangle(1.0, 1.0)
+        bd1.pos = Vec2(0.0, 0.0)
+        bd2: Body = Body()
+        bd2.shape = Rectangle(1.0, 1.0)
+        bd2.pos = Vec2(2.0, 0.0)
+        dut.fat_expansion_factor = 0.0
+        dut.fat_ratio = 0.0
+        dut.insert(bd1)
+        dut.insert(bd2)
+
+        tree: List[DBVT.Node] = dut.tree()
+        root: DBVT.Node = tree[dut.root_index()]
+        assert len(tree) == 3
+        assert root.is_root()
+        assert tree[root._left_idx]._body is bd1
+        assert tree[root._right_idx]._body is bd2
+        assert tree[root._left_idx].is_leaf()
+        assert root._aabb == AABB.from_box(Vec2(-0.5, 0.5), Vec2(2.5, -0.5))
 
     def test_root_index(self):
         assert 1
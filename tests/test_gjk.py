@@ -195,7 +195,11 @@ class TestGJK():
         for m in simplex._vertices:
             print(f'point: {m._res}')
 
-        assert 1
+        # NOTE: no iteration runs with the iter_val of 0
+        (is_collision, simplex) = GJK.gjk(prima, primb, 0)
+        assert not is_collision
+        assert len(GJK.epa(prima, primb, simplex,
+                           0)._vertices) == len(simplex._vertices)
 
     def test_epa(self):
         # tested in test_gjk
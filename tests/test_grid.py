@@ -0,0 +1,214 @@
+import random
+from typing import List, Set, Tuple
+
+import numpy as np
+
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Circle, Edge, Rectangle
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.collision.broad_phase.aabb import AABB, ray_bounds
+from TaichiGAME.collision.broad_phase.dbvt import DBVT
+from TaichiGAME.collision.broad_phase.grid import UniformGrid
+
+
+class TestUniformGrid():
+    @staticmethod
+    def build_bodies(num: int, seed: int = 0) -> List[Body]:
+        rng: random.Random = random.Random(seed)
+        shapes = [Circle(0.3), Rectangle(0.5, 0.3), Circle(0.15)]
+        bodies: List[Body] = []
+        for i in range(num):
+            bd: Body = Body()
+            bd.shape = shapes[i % len(shapes)]
+            bd.pos = Vec2(rng.uniform(-8.0, 8.0), rng.uniform(-8.0, 8.0))
+            bd.rot = rng.uniform(0.0, np.pi)
+            bd.bitmask = 1 if i % 7 else 2
+            bodies.append(bd)
+
+        return bodies
+
+    @staticmethod
+    def ground(half_len: float = 20.0) -> Body:
+        edg: Edge = Edge()
+        edg.set_value(Vec2(-half_len, 0.0), Vec2(half_len, 0.0))
+        bd: Body = Body()
+        bd.shape = edg
+        bd.bitmask = 3
+        return bd
+
+    @staticmethod
+    def brute_pairs(bodies: List[Body]) -> Set[Tuple[int, int]]:
+        res: Set[Tuple[int, int]] = set()
+        aabbs: List[AABB] = [AABB.from_body(bd) for bd in bodies]
+        for i in range(len(bodies)):
+            for j in range(i + 1, len(bodies)):
+                if bodies[i].bitmask & bodies[j].bitmask and aabbs[i].collide(
+                        aabbs[j]):
+                    res.add((i, j))
+
+        return res
+
+    @staticmethod
+    def to_index(bodies: List[Body],
+                 pairs: List[Tuple[Body, Body]]) -> List[Tuple[int, int]]:
+        idx = {bd: i for i, bd in enumerate(bodies)}
+        return [(min(idx[a], idx[b]), max(idx[a], idx[b])) for a, b in pairs]
+
+    def test__init__(self):
+        dut: UniformGrid = UniformGrid(0.5)
+        assert np.isclose(dut.cell_size, 0.5)
+        assert len(dut._cells) == 0
+        assert dut._extent is None
+        assert dut.generate() == []
+        assert dut.raycast(Vec2(0.0, 0.0), Vec2(1.0, 0.0)) == []
+
+    def test_insert_remove(self):
+        dut: UniformGrid = UniformGrid(1.0)
+        bd: Body = Body()
+        bd.shape = Rectangle(1.0, 1.0)
+        bd.pos = Vec2(0.0, 0.0)
+        dut.insert(bd)
+        # NOTE: the box from -0.5 to 0.5 overlaps 4 cells
+        assert dut._ranges[bd] == (-1, -1, 0, 0)
+        assert sorted(dut._cells) == [(-1, -1), (-1, 0), (0, -1), (0, 0)]
+
+        grd: Body = TestUniformGrid.ground(50.0)
+        dut.insert(grd)
+        assert dut._large == [grd]
+        assert len(dut._cells) == 4
+
+        dut.remove(bd)
+        dut.remove(grd)
+        dut.remove(bd)
+        assert len(dut._cells) == 0
+        assert len(dut._large) == 0
+        assert len(dut._bounds) == 0
+
+    def test_update(self):
+        dut: UniformGrid = UniformGrid(1.0)
+        bd: Body = Body()
+        bd.shape = Rectangle(1.0, 1.0)
+        bd.pos = Vec2(0.6, 0.6)
+        dut.insert(bd)
+        assert sorted(dut._cells) == [(0, 0), (0, 1), (1, 0), (1, 1)]
+
+        bd.pos = Vec2(1.6, 0.6)
+        dut.update(bd)
+        assert dut._ranges[bd] == (1, 0, 2, 1)
+        assert sorted(dut._cells) == [(1, 0), (1, 1), (2, 0), (2, 1)]
+        assert all(cell == [bd] for cell in dut._cells.values())
+
+        # NOTE: a body growing over the large cells leaves the cells
+        bd.shape = Rectangle(20.0, 20.0)
+        dut.update(bd)
+        assert dut._large == [bd]
+        assert len(dut._cells) == 0
+        bd.shape = Rectangle(1.0, 1.0)
+        dut.update(bd)
+        assert dut._large == []
+        assert len(dut._cells) == 4
+
+    def test_generate(self):
+        for cell_size in (0.3, 1.0, 4.0):
+            bodies: List[Body] = TestUniformGrid.build_bodies(300)
+            bodies.append(TestUniformGrid.ground())
+            dut: UniformGrid = UniformGrid(cell_size)
+            for bd in bodies:
+                dut.insert(bd)
+
+            pairs: List[Tuple[int, int]] = TestUniformGrid.to_index(
+                bodies, dut.generate())
+            assert len(pairs) == len(set(pairs))
+            assert set(pairs) == TestUniformGrid.brute_pairs(bodies)
+
+            # NOTE: move the bodies and update them incrementally
+            rng: random.Random = random.Random(1)
+            for bd in bodies[:-1]:
+                bd.pos = bd.pos + Vec2(rng.uniform(-0.7, 0.7),
+                                       rng.uniform(-0.7, 0.7))
+                dut.update(bd)
+
+            pairs = TestUniformGrid.to_index(bodies, dut.generate())
+            assert len(pairs) == len(set(pairs))
+            assert set(pairs) == TestUniformGrid.brute_pairs(bodies)
+
+    def test_generate_dbvt(self):
+        bodies: List[Body] = TestUniformGrid.build_bodies(200, 2)
+        dut: UniformGrid = UniformGrid(0.7)
+        dbvt: DBVT = DBVT()
+        for bd in bodies:
+            dut.insert(bd)
+            dbvt.insert(bd)
+
+        assert set(TestUniformGrid.to_index(bodies, dut.generate())) == set(
+            TestUniformGrid.to_index(bodies, dbvt.generate()))
+
+    def test_query(self):
+        bodies: List[Body] = TestUniformGrid.build_bodies(200)
+        bodies.append(TestUniformGrid.ground())
+        dut: UniformGrid = UniformGrid(1.0)
+        for bd in bodies:
+            dut.insert(bd)
+
+        box: AABB = AABB(3.0, 2.0)
+        box.pos = Vec2(1.0, -0.5)
+        ref = {bd for bd in bodies if AABB.from_body(bd).collide(box)}
+        res: List[Body] = dut.query(box)
+        assert len(res) == len(set(res))
+        assert set(res) == ref
+        assert bodies[0] in dut.query(bodies[0])
+
+    def test_raycast(self):
+        bodies: List[Body] = TestUniformGrid.build_bodies(300)
+        bodies.append(TestUniformGrid.ground())
+        dut: UniformGrid = UniformGrid(0.8)
+        for bd in bodies:
+            dut.insert(bd)
+
+        rng: random.Random = random.Random(3)
+        for i in range(50):
+            start: Vec2 = Vec2(rng.uniform(-12.0, 12.0),
+                               rng.uniform(-12.0, 12.0))
+            ang: float = rng.uniform(0.0, 2.0 * np.pi)
+            dirn: Vec2 = Vec2(np.cos(ang), np.sin(ang))
+            if i % 10 == 0:
+                dirn = Vec2(0.0, 1.0) if i % 20 == 0 else Vec2(-1.0, 0.0)
+
+            ref = {
+                bd
+                for bd in bodies
+                if ray_bounds(start.x, start.y, dirn.x, dirn.y,
+                              dut._bounds[bd]) is not None
+            }
+            res: List[Body] = dut.raycast(start, dirn)
+            assert len(res) == len(set(res))
+            assert set(res) == ref
+
+        # NOTE: the bodies of the cells are in the order along the ray
+        line: List[Body] = []
+        dut.clear_all()
+        for i in range(5):
+            bd: Body = Body()
+            bd.shape = Circle(0.2)
+            bd.pos = Vec2(4.0 - i, 0.5)
+            dut.insert(bd)
+            line.append(bd)
+
+        assert dut.raycast(Vec2(5.0, 0.5), Vec2(-1.0, 0.0)) == line
+        assert dut.raycast(Vec2(5.0, 0.5), Vec2(1.0, 0.0)) == []
+
+        # NOTE: the ray without direction hits the bodies at its start
+        assert dut.raycast(Vec2(2.1, 0.5), Vec2(0.0, 0.0)) == [line[2]]
+        assert dut.raycast(Vec2(2.5, 0.5), Vec2(0.0, 0.0)) == []
+
+    def test_cell_size(self):
+        bodies: List[Body] = TestUniformGrid.build_bodies(100)
+        dut: UniformGrid = UniformGrid(1.0)
+        for bd in bodies:
+            dut.insert(bd)
+
+        ref: Set[Tuple[int, int]] = set(
+            TestUniformGrid.to_index(bodies, dut.generate()))
+        dut.cell_size = 0.4
+        assert len(dut._ranges) == 100
+        assert set(TestUniformGrid.to_index(bodies, dut.generate())) == ref
@@ -0,0 +1,45 @@
+from TaichiGAME.common.handle_table import HandleTable
+
+
+class TestHandleTable():
+    def test_insert_remove(self):
+        dut: HandleTable = HandleTable()
+        ha: int = dut.insert('a')
+        hb: int = dut.insert('b')
+        hc: int = dut.insert('c')
+        assert len(dut) == 3
+        assert ha != 0 and len({ha, hb, hc}) == 3
+        assert dut.get(hb) == 'b' and hb in dut
+
+        # the last object fills the hole
+        assert dut.remove(ha) == 'a'
+        assert dut.values == ['c', 'b']
+        assert dut.handles == [hc, hb]
+        assert dut.get(ha) is None and ha not in dut
+        assert dut.remove(ha) is None
+        assert dut.get(hc) == 'c'
+
+        # the reused slot gets a new generation
+        hd: int = dut.insert('d')
+        assert hd & HandleTable.SlotMask == ha & HandleTable.SlotMask
+        assert hd != ha
+        assert dut.get(ha) is None
+        assert dut.get(hd) == 'd'
+        assert dut.get(12345) is None
+
+    def test_save_load(self):
+        dut: HandleTable = HandleTable()
+        handles = [dut.insert(v) for v in range(4)]
+        values = dut.values
+        state = dut.save()
+
+        dut.remove(handles[1])
+        dut.insert(10)
+        dut.load(state)
+        assert dut.values is values
+        assert values == [0, 1, 2, 3]
+        assert [dut.get(h) for h in handles] == [0, 1, 2, 3]
+
+        dut.clear()
+        assert len(dut) == 0
+        assert all(h not in dut for h in handles)
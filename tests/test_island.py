@@ -0,0 +1,91 @@
+import numpy as np
+
+from TaichiGAME.common.config import Config
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Edge, Rectangle
+from TaichiGAME.collision.broad_phase.dbvt import DBVT
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.island import IslandBuilder, IslandSolver
+from TaichiGAME.dynamics.joint.revolute import RevoluteJointPrimitive
+from TaichiGAME.dynamics.phy_world import PhysicsWorld
+
+
+class TestIsland():
+    def build(self, piles: int = 3):
+        world: PhysicsWorld = PhysicsWorld()
+        world.grav = Vec2(0.0, -9.8)
+        world.vel_iter = 6
+        world.pos_iter = 8
+        world.sleep_ena = False
+        dbvt: DBVT = world.dbvt
+
+        edg: Edge = Edge()
+        edg.set_value(Vec2(-50.0, 0.0), Vec2(50.0, 0.0))
+        rect: Rectangle = Rectangle(1.0, 1.0)
+        shapes = [(edg, Vec2(0.0, 0.0), Config.Max, Body.Type.Static)]
+        for k in range(piles):
+            for i in range(2):
+                shapes.append(
+                    (rect, Vec2(k * 5.0 + i * 0.3,
+                                i * 1.0 + 0.5), 1.0, Body.Type.Dynamic))
+
+        for shape, pos, mass, body_type in shapes:
+            bd: Body = world.create_body()
+            bd.shape = shape
+            bd.pos = pos
+            bd.mass = mass
+            bd.type = body_type
+            dbvt.insert(bd)
+
+        prim: RevoluteJointPrimitive = RevoluteJointPrimitive()
+        prim._bodya = world._body_list[1]
+        prim._bodyb = world._body_list[3]
+        prim._local_pointa = Vec2(2.5, 0.0)
+        prim._local_pointb = Vec2(-2.5, 0.0)
+        world.create_joint(prim)
+        return world, dbvt
+
+    def run(self, solver, steps: int = 30) -> np.ndarray:
+        world, dbvt = self.build()
+        world.island_solver = solver
+        for i in range(steps):
+            world.step(1 / 120)
+
+        store = world.store
+        return np.hstack(
+            (store.pos, store.vel, store.rot[:, None], store.ang_vel[:, None]))
+
+    def test_build(self):
+        world, dbvt = self.build()
+        for i in range(30):
+            world.step(1 / 120)
+
+        islands = world.islands
+        bodies = world._body_list
+        # the joint links the first two piles, the static ground links none
+        assert len(islands) == 2
+        assert set(islands[0].bodies) == set(bodies[1:5])
+        assert set(islands[1].bodies) == set(bodies[5:7])
+        assert len(islands[0].joints) == 1
+        assert len(islands[1].joints) == 0
+        assert islands[0].rows == [bd.idx for bd in islands[0].bodies]
+
+        labels: np.ndarray = world.island_builder.labels
+        assert labels[bodies[0].idx] == -1
+        assert labels[bodies[5].idx] == labels[bodies[6].idx] == 1
+
+    def test_build_empty(self):
+        world: PhysicsWorld = PhysicsWorld()
+        world.create_body()
+        dut: IslandBuilder = IslandBuilder()
+        assert dut.build(world.store, {}, []) == []
+        assert (dut.labels == -1).all()
+
+    def test_solver(self):
+        ref: np.ndarray = self.run(None)
+        assert (self.run(IslandSolver(1)) == ref).all()
+
+        dut: IslandSolver = IslandSolver(2)
+        res: np.ndarray = self.run(dut)
+        dut.close()
+        assert (res == ref).all()
@@ -0,0 +1,195 @@
+import numpy as np
+import pytest
+
+from TaichiGAME.math.linalg import Vec2, Mat2
+from TaichiGAME.math.matrix import Matrix
+
+
+class TestVec2():
+    def test__init__(self):
+        dut: Vec2 = Vec2()
+        assert dut.x == 0.0 and dut.y == 0.0
+        assert dut.shape == (2, 1)
+        assert dut.size == 2
+
+        dut = Vec2(1.0, 2.0)
+        assert dut.x == 1.0 and dut.y == 2.0
+        assert list(dut) == [1.0, 2.0]
+        assert dut[0] == 1.0 and dut[1] == 2.0
+
+    def test_from_value(self):
+        dut: Vec2 = Vec2(1.0, 2.0)
+        assert Vec2.from_value(dut) is dut
+        assert Vec2.from_value([1.0, 2.0]) == dut
+        assert Vec2.from_value(Matrix([1.0, 2.0], 'vec')) == dut
+        assert isinstance(Vec2.from_value(Matrix([1.0, 2.0], 'vec')), Vec2)
+
+    def test_unary_operator(self):
+        dut: Vec2 = Vec2(1.0, -2.0)
+        assert -dut == Vec2(-1.0, 2.0)
+        assert +dut == dut
+        assert +dut is not dut
+
+    def test_binary_operator(self):
+        dut1: Vec2 = Vec2(1.0, 2.0)
+        dut2: Vec2 = Vec2(3.0, 4.0)
+        assert dut1 + dut2 == Vec2(4.0, 6.0)
+        assert dut1 - dut2 == Vec2(-2.0, -2.0)
+        assert dut1 + 1.0 == Vec2(2.0, 3.0)
+        assert dut1 - 1 == Vec2(0.0, 1.0)
+        assert dut1 * 2.0 == Vec2(2.0, 4.0)
+        assert 2.0 * dut1 == Vec2(2.0, 4.0)
+        assert np.float64(2.0) * dut1 == Vec2(2.0, 4.0)
+        assert dut1 * np.float32(2.0) == Vec2(2.0, 4.0)
+        assert dut2 / 2.0 == Vec2(1.5, 2.0)
+
+        # NOTE: only scalars scale a vector
+        with pytest.raises(TypeError):
+            dut1 * dut2
+        with pytest.raises(TypeError):
+            dut1 / dut2
+        with pytest.raises(TypeError):
+            dut1 *= dut2
+
+    def test_eq_operator(self):
+        assert Vec2(1.0, 2.0) == Vec2(1.0, 2.0 + 1e-9)
+        assert Vec2(1.0, 2.0) != Vec2(1.0, 2.1)
+        assert Vec2(1.0, 2.0) == Matrix([1.0, 2.0], 'vec')
+        assert Matrix([1.0, 2.0], 'vec') == Vec2(1.0, 2.0)
+        assert Vec2(1.0, 2.0) != None  # noqa: E711
+        assert not Vec2(1.0, 2.0) == (1.0, 2.0)
+        assert Vec2(1.0, 2.0) != 'vec'
+
+    def test_assignment_operator(self):
+        dut: Vec2 = Vec2(1.0, 2.0)
+        ref: Vec2 = dut
+        dut += Vec2(1.0, 1.0)
+        dut -= 0.5
+        dut *= 2.0
+        dut /= 4.0
+        assert dut is ref
+        assert dut == Vec2(0.75, 1.25)
+
+    def test_len(self):
+        dut: Vec2 = Vec2(3.0, 4.0)
+        assert np.isclose(dut.len_square(), 25.0)
+        assert np.isclose(dut.len(), 5.0)
+        assert dut.normal() == Vec2(0.6, 0.8)
+        assert dut == Vec2(3.0, 4.0)
+        assert dut.normalize() == Vec2(0.6, 0.8)
+        assert dut == Vec2(0.6, 0.8)
+
+    def test_theta(self):
+        assert np.isclose(Vec2(1.0, 1.0).theta(), np.pi / 4)
+
+    def test_set_value(self):
+        dut: Vec2 = Vec2()
+        dut.set_value([1.0, 2.0])
+        assert dut == Vec2(1.0, 2.0)
+        dut.set_value(Vec2(3.0, 4.0))
+        assert dut == Vec2(3.0, 4.0)
+        dut.clear()
+        assert dut.is_origin()
+
+    def test_negate(self):
+        dut: Vec2 = Vec2(1.0, 2.0)
+        assert dut.negative() == Vec2(-1.0, -2.0)
+        assert dut == Vec2(1.0, 2.0)
+        dut.negate()
+        assert dut == Vec2(-1.0, -2.0)
+
+    def test_swap(self):
+        dut1: Vec2 = Vec2(1.0, 2.0)
+        dut2: Vec2 = Vec2(3.0, 4.0)
+        dut1.swap(dut2)
+        assert dut1 == Vec2(3.0, 4.0)
+        assert dut2 == Vec2(1.0, 2.0)
+
+    def test_product(self):
+        dut1: Vec2 = Vec2(1.0, 2.0)
+        dut2: Vec2 = Vec2(3.0, 4.0)
+        assert np.isclose(dut1.dot(dut2), 11.0)
+        assert np.isclose(dut1.cross(dut2), -2.0)
+        assert np.isclose(Vec2.dot_product(dut1, dut2), 11.0)
+        assert np.isclose(Vec2.cross_product(dut1, dut2), -2.0)
+        assert dut1.perpendicular() == Vec2(-2.0, 1.0)
+
+    def test_cross_product2(self):
+        vec: Vec2 = Vec2(1.0, 2.0)
+        mat_vec: Matrix = Matrix([1.0, 2.0], 'vec')
+        assert Vec2.cross_product2(2.0, vec) == Matrix.cross_product2(
+            2.0, mat_vec)
+        assert Vec2.cross_product2(vec, 2.0) == Matrix.cross_product2(
+            mat_vec, 2.0)
+
+    def test_matrix_interop(self):
+        vec: Vec2 = Vec2(1.0, 2.0)
+        mat_vec: Matrix = Matrix([3.0, 4.0], 'vec')
+        assert mat_vec + vec == Matrix([4.0, 6.0], 'vec')
+        assert vec + mat_vec == Vec2(4.0, 6.0)
+        assert Matrix([1.0, 2.0, 3.0, 4.0]) * vec == Matrix([5.0, 11.0], 'vec')
+        mat_vec.set_value(vec)
+        assert mat_vec == Matrix([1.0, 2.0], 'vec')
+
+
+class TestMat2():
+    def test__init__(self):
+        dut: Mat2 = Mat2(1.0, 2.0, 3.0, 4.0)
+        assert dut.shape == (2, 2)
+        assert dut.size == 4
+        assert dut.value(0, 1) == 2.0
+        assert dut.value(1, 0) == 3.0
+        assert dut.row1 == Vec2(1.0, 2.0)
+        assert dut.row2 == Vec2(3.0, 4.0)
+
+    def test_operator(self):
+        mat1: Mat2 = Mat2(1.0, 2.0, 3.0, 4.0)
+        mat2: Mat2 = Mat2(5.0, 6.0, 7.0, 8.0)
+        assert -mat1 == Mat2(-1.0, -2.0, -3.0, -4.0)
+        assert mat1 + mat2 == Mat2(6.0, 8.0, 10.0, 12.0)
+        assert mat1 - mat2 == Mat2(-4.0, -4.0, -4.0, -4.0)
+        assert mat1 * 2.0 == Mat2(2.0, 4.0, 6.0, 8.0)
+        assert mat1 / 2.0 == Mat2(0.5, 1.0, 1.5, 2.0)
+        assert mat1 * Vec2(1.0, 2.0) == Vec2(5.0, 11.0)
+        assert mat1 * mat2 == Mat2(19.0, 22.0, 43.0, 50.0)
+        assert mat1 * Matrix([1.0, 2.0], 'vec') == Vec2(5.0, 11.0)
+        assert mat1 == Matrix([1.0, 2.0, 3.0, 4.0])
+
+    def test_assignment_operator(self):
+        dut: Mat2 = Mat2(1.0, 2.0, 3.0, 4.0)
+        ref: Mat2 = dut
+        dut *= Mat2(5.0, 6.0, 7.0, 8.0)
+        dut += 1.0
+        dut -= Mat2(1.0, 1.0, 1.0, 1.0)
+        assert dut is ref
+        assert dut == Mat2(19.0, 22.0, 43.0, 50.0)
+
+    def test_determinant(self):
+        dut: Mat2 = Mat2(1.0, 2.0, 3.0, 4.0)
+        assert np.isclose(dut.determinant(), -2.0)
+
+    def test_transpose(self):
+        dut: Mat2 = Mat2(1.0, 2.0, 3.0, 4.0)
+        dut.transpose()
+        assert dut == Mat2(1.0, 3.0, 2.0, 4.0)
+
+    def test_invert(self):
+        dut: Mat2 = Mat2(1.0, 2.0, 3.0, 4.0)
+        dut.invert()
+        assert dut == Matrix([1.0, 2.0, 3.0, 4.0]).invert()
+        assert dut * Mat2(1.0, 2.0, 3.0, 4.0) == Mat2().identity_mat()
+
+    def test_rotate_mat(self):
+        assert Mat2.rotate_mat(np.pi / 3) == Matrix.rotate_mat(np.pi / 3)
+        assert Mat2.rotate_mat(np.pi / 2) * Vec2(1.0, 0.0) == Vec2(0.0, 1.0)
+
+    def test_set_value(self):
+        dut: Mat2 = Mat2()
+        dut.set_value([1.0, 2.0, 3.0, 4.0])
+        assert dut == Mat2(1.0, 2.0, 3.0, 4.0)
+        dut.negate()
+        assert dut == Mat2(-1.0, -2.0, -3.0, -4.0)
+        dut.clear()
+        assert dut == Mat2()
+        assert dut.skew_symmetric_mat(Vec2(1.0, 2.0)) == Mat2(
+            0.0, -2.0, 1.0, 0.0)
@@ -0,0 +1,203 @@
+import random
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Circle, Edge, Rectangle
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.phy_world import PhysicsWorld
+from TaichiGAME.collision.broad_phase.dbvt import DBVT
+from TaichiGAME.collision.broad_phase.pair_manager import PairManager
+
+
+class TestPairManager():
+    @staticmethod
+    def build_world(num: int) -> PhysicsWorld:
+        rng: random.Random = random.Random(0)
+        shapes = [Circle(0.3), Rectangle(0.5, 0.3), Circle(0.15)]
+        world: PhysicsWorld = PhysicsWorld()
+        for i in range(num):
+            bd: Body = world.create_body()
+            bd.shape = shapes[i % len(shapes)]
+            bd.pos = Vec2(rng.uniform(-5.0, 5.0), rng.uniform(-5.0, 5.0))
+            bd.rot = rng.uniform(0.0, np.pi)
+            bd.bitmask = 1 if i % 7 else 2
+            bd.mass = 1.0
+            bd.type = Body.Type.Dynamic
+            world.dbvt.insert(bd)
+
+        edg: Edge = Edge()
+        edg.set_value(Vec2(-20.0, 0.0), Vec2(20.0, 0.0))
+        grd: Body = world.create_body()
+        grd.shape = edg
+        grd.bitmask = 3
+        grd.mass = float('inf')
+        grd.type = Body.Type.Static
+        world.dbvt.insert(grd)
+        return world
+
+    @staticmethod
+    def keys(pairs: List[Tuple[Body, Body]]) -> Set[Tuple[int, int]]:
+        return {(min(a.id, b.id), max(a.id, b.id)) for a, b in pairs}
+
+    @staticmethod
+    def move(world: PhysicsWorld, seed: int, dist: float) -> None:
+        rng: random.Random = random.Random(seed)
+        for bd in world._body_list:
+            if bd.type == Body.Type.Static:
+                continue
+
+            bd.pos = bd.pos + Vec2(rng.uniform(-dist, dist),
+                                   rng.uniform(-dist, dist))
+            world.dbvt.update(bd)
+
+    @staticmethod
+    def check_index(dut: PairManager) -> None:
+        index: Dict[Body, Set[Tuple[int, int]]] = {}
+        for key, pair in dut._pairs.items():
+            for body in pair:
+                index.setdefault(body, set()).add(key)
+
+        assert {
+            body: keys
+            for body, keys in dut._body_pairs.items() if keys
+        } == index
+
+    def test__init__(self):
+        dbvt: DBVT = DBVT()
+        dut: PairManager = PairManager(dbvt)
+        assert dut.dbvt is dbvt
+        assert dut.generate() == []
+        assert dut.added_pairs == []
+        assert dut.removed_pairs == []
+
+    def test_generate(self):
+        world: PhysicsWorld = TestPairManager.build_world(200)
+        dut: PairManager = world.pair_manager
+        pairs: List[Tuple[Body, Body]] = dut.generate()
+        assert all(a.id < b.id for a, b in pairs)
+        assert len(pairs) == len(TestPairManager.keys(pairs))
+        assert TestPairManager.keys(pairs) == TestPairManager.keys(
+            world.dbvt.generate())
+
+        # NOTE: the events follow the fat pairs, the generated pairs
+        # follow the tight aabbs
+        old: Set[Tuple[int, int]] = set(dut._pairs)
+        for i in range(5):
+            TestPairManager.move(world, i, 0.6)
+            pairs = dut.generate()
+            assert TestPairManager.keys(pairs) == TestPairManager.keys(
+                world.dbvt.generate())
+
+            new: Set[Tuple[int, int]] = set(dut._pairs)
+            masked: Set[Tuple[int, int]] = {
+                key
+                for key, pair in dut._pairs.items()
+                if pair[0].bitmask & pair[1].bitmask
+            }
+            added: Set[Tuple[int, int]] = TestPairManager.keys(dut.added_pairs)
+            removed: Set[Tuple[int,
+                               int]] = TestPairManager.keys(dut.removed_pairs)
+            assert len(added) == len(dut.added_pairs)
+            assert added == (new - old) & masked
+            assert removed <= old - new
+            assert len(added) + len(removed) > 0
+            TestPairManager.check_index(dut)
+            old = new
+
+        # NOTE: no moves, no events
+        dut.generate()
+        assert dut.added_pairs == []
+        assert dut.removed_pairs == []
+
+    def test_remove(self):
+        world: PhysicsWorld = TestPairManager.build_world(100)
+        dut: PairManager = world.pair_manager
+        dut.generate()
+        bd: Body = world._body_list[-1]
+        ref: Set[Tuple[int, int]] = {
+            key
+            for key, pair in dut._pairs.items()
+            if bd in pair and pair[0].bitmask & pair[1].bitmask
+        }
+        assert len(ref) > 0
+
+        world.remove_body(bd)
+        pairs: List[Tuple[Body, Body]] = dut.generate()
+        assert all(bd not in pair for pair in pairs)
+        assert TestPairManager.keys(dut.removed_pairs) == ref
+        assert dut.added_pairs == []
+        assert bd not in dut._body_pairs
+        TestPairManager.check_index(dut)
+
+        dut.clear_all()
+        assert len(dut._pairs) == 0
+        assert len(dut._body_pairs) == 0
+
+    def test_world(self):
+        # NOTE: the contacts of a removed body are dropped, even if its
+        # neighbours are sleeping
+        world: PhysicsWorld = PhysicsWorld()
+        grd: Body = world.create_body()
+        grd.shape = Rectangle(10.0, 1.0)
+        grd.pos = Vec2(0.0, -0.5)
+        grd.mass = float('inf')
+        grd.type = Body.Type.Static
+        world.dbvt.insert(grd)
+        box: Body = world.create_body()
+        box.shape = Rectangle(1.0, 1.0)
+        box.pos = Vec2(0.0, 0.5)
+        box.mass = 1.0
+        box.type = Body.Type.Dynamic
+        world.dbvt.insert(box)
+
+        for i in range(10):
+            world.step(1.0 / 60.0)
+        assert len(world.maintainer._contact_table) == 1
+
+        snap = world.snapshot()
+        world.remove_body(box)
+        world.step(1.0 / 60.0)
+        assert len(world.maintainer._contact_table) == 0
+
+        world.restore(snap)
+        assert len(world.maintainer._contact_table) == 1
+        assert TestPairManager.keys(world.pair_manager._pairs.values()) == {
+            (grd.id, box.id)
+        }
+        world.step(1.0 / 60.0)
+        assert len(world.maintainer._contact_table) == 1
+
+    def test_restore(self):
+        # NOTE: the pairs are restored as they were, without queries,
+        # and the moves pending at the snapshot are kept
+        world: PhysicsWorld = TestPairManager.build_world(100)
+        dut: PairManager = world.pair_manager
+        dut.generate()
+        bd: Body = world.create_body()
+        bd.shape = Circle(0.5)
+        bd.pos = world._body_list[1].pos
+        bd.mass = 1.0
+        bd.type = Body.Type.Dynamic
+        world.dbvt.insert(bd)
+        snap = world.snapshot()
+        pairs: Dict[Tuple[int, int], Tuple[Body, Body]] = dut._pairs
+
+        for i in range(3):
+            TestPairManager.move(world, i, 0.6)
+            dut.generate()
+
+        assert dut._pairs is not pairs
+        world.restore(snap)
+        assert dut._pairs is pairs
+        assert world.dbvt._moved == {bd: None}
+        assert dut.added_pairs == []
+        assert dut.removed_pairs == []
+
+        res: List[Tuple[Body, Body]] = dut.generate()
+        assert TestPairManager.keys(res) == TestPairManager.keys(
+            world.dbvt.generate())
+        assert any(bd in pair for pair in res)
+        assert all(bd in pair for pair in dut.added_pairs)
+        TestPairManager.check_index(dut)
@@ -1,10 +1,65 @@
+import subprocess
+import sys
+from typing import List, Tuple
+
 import numpy as np
 
+from TaichiGAME.common.config import Config
+from TaichiGAME.geometry.shape import Circle, Edge
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.joint.distance import DistanceJointPrimitive
 from TaichiGAME.dynamics.phy_world import PhysicsWorld
+from TaichiGAME.math.linalg import Vec2
 from TaichiGAME.math.matrix import Matrix
 
 
 class TestPhysicsWorld():
+    def build_world(self) -> Tuple[PhysicsWorld, List[Body]]:
+        dut: PhysicsWorld = PhysicsWorld()
+        dut.grav = Vec2(0.3, -9.8)
+        cir: Circle = Circle(0.7)
+        bodies: List[Body] = []
+        for i, tp in enumerate([
+                Body.Type.Dynamic, Body.Type.Kinematic, Body.Type.Static,
+                Body.Type.Bullet, Body.Type.Dynamic
+        ]):
+            bd: Body = dut.create_body()
+            bd.shape = cir
+            bd.mass = 1.3 + i
+            bd.type = tp
+            bd.pos = Vec2(0.1 * i, 0.7 * i)
+            bd.vel = Vec2(1.1 + i, -0.3 * i)
+            bd.ang_vel = 0.37 * i
+            bd.forces = Vec2(0.9 * i, 1.7)
+            bd.torques = 0.11 * i
+            bodies.append(bd)
+
+        return (dut, bodies)
+
+    @staticmethod
+    def ref_step_velocity(world: PhysicsWorld, body: Body,
+                          dt: float) -> Tuple[Vec2, float, Vec2]:
+        # NOTE: the per-body impl before the array-based integration
+        g: Vec2 = world.grav
+        lvd: float = 1.0 / (1.0 + dt * world.lin_vel_damping)
+        avd: float = 1.0 / (1.0 + dt * world.ang_vel_damping)
+        vel: Vec2 = body.vel
+        ang_vel: float = body.ang_vel
+        forces: Vec2 = body.forces
+        if body.type == Body.Type.Static:
+            return (Vec2(0.0, 0.0), 0.0, forces)
+        elif body.type == Body.Type.Bullet:
+            return (vel, ang_vel, forces)
+
+        if body.type == Body.Type.Dynamic:
+            forces += g * body.mass
+
+        vel += forces * dt * body.inv_mass
+        ang_vel += body.inv_inertia * body.torques * dt
+        vel *= lvd
+        ang_vel *= avd
+        return (vel, ang_vel, forces)
+
     def test__init__(self):
         dut: PhysicsWorld = PhysicsWorld()
 
@@ -27,19 +82,90 @@ class TestPhysicsWorld():
         assert 1
 
     def test_step_velocity(self):
-        assert 1
+        dut, bodies = self.build_world()
+        dt: float = 1.0 / 60.0
+        refs = [
+            TestPhysicsWorld.ref_step_velocity(dut, bd, dt) for bd in bodies
+        ]
+        dut.step_velocity(dt)
+
+        # NOTE: need to be bit-compatible with the per-body impl
+        for bd, (vel, ang_vel, forces) in zip(bodies, refs):
+            assert (bd.vel.x, bd.vel.y) == (vel.x, vel.y)
+            assert bd.ang_vel == ang_vel
+            assert (bd.forces.x, bd.forces.y) == (forces.x, forces.y)
 
     def test_solve_velocity_constraint(self):
         # NOTE: just call joint.solve_velocity
         assert 1
 
     def test_step_position(self):
-        assert 1
+        dut, bodies = self.build_world()
+        dt: float = 1.0 / 60.0
+        refs = []
+        for bd in bodies:
+            pos: Vec2 = bd.pos
+            rot: float = bd.rot
+            if bd.type in (Body.Type.Dynamic, Body.Type.Kinematic):
+                pos += bd.vel * dt
+                rot += bd.ang_vel * dt
+            refs.append((pos, rot))
+
+        dut.step_position(dt)
+        for bd, (pos, rot) in zip(bodies, refs):
+            assert (bd.pos.x, bd.pos.y) == (pos.x, pos.y)
+            assert bd.rot == rot
+            if bd.type in (Body.Type.Dynamic, Body.Type.Kinematic):
+                assert bd.forces.is_origin()
+                assert bd.torques == 0.0
+            else:
+                assert not bd.forces.is_origin()
 
     def test_solve_position_constrain(self):
         # NOTE: just call joint.solve_position
         assert 1
 
+    def test_step(self):
+        dut: PhysicsWorld = PhysicsWorld()
+        dut.grav = Vec2(0.0, -9.8)
+        dut.vel_iter = 6
+        dut.pos_iter = 8
+
+        edg: Edge = Edge()
+        edg.set_value(Vec2(-10.0, 0.0), Vec2(10.0, 0.0))
+        grd: Body = dut.create_body()
+        grd.shape = edg
+        grd.mass = Config.Max
+        grd.type = Body.Type.Static
+        dut.dbvt.insert(grd)
+
+        bd: Body = dut.create_body()
+        bd.shape = Circle(0.5)
+        bd.pos = Vec2(0.0, 2.0)
+        bd.mass = 1.0
+        bd.type = Body.Type.Dynamic
+        dut.dbvt.insert(bd)
+
+        for i in range(240):
+            dut.step(1 / 120)
+
+        # rest on the ground
+        assert len(dut.maintainer._contact_table) == 1
+        assert np.isclose(bd.pos.y, 0.5, atol=0.05)
+        assert np.isclose(bd.pos.x, 0.0)
+
+        dut.remove_body(bd)
+        assert len(dut.dbvt._body_table) == 1
+
+    def test_headless(self):
+        # NOTE: run in a new process to check the imported modules
+        code: str = ('import sys\n'
+                     'from TaichiGAME.dynamics.phy_world import PhysicsWorld\n'
+                     'PhysicsWorld().step(1 / 60)\n'
+                     'assert \'taichi\' not in sys.modules\n')
+        res = subprocess.run([sys.executable, '-c', code])
+        assert res.returncode == 0
+
     def test_grav(self):
         dut: PhysicsWorld = PhysicsWorld()
         dut.grav = Matrix([1.1, -1.0], 'vec')
@@ -104,10 +230,38 @@ class TestPhysicsWorld():
         assert 1
 
     def test_remove_body(self):
-        assert 1
+        dut, bodies = self.build_world()
+        handle: int = bodies[1].id
+        assert dut.get_body(handle) is bodies[1]
+
+        # the last body is swapped into the freed row
+        dut.remove_body(bodies[1])
+        assert dut._body_list == [bodies[0], bodies[4], bodies[2], bodies[3]]
+        assert dut.store.bodies == dut._body_list
+        assert bodies[4].idx == 1
+        assert dut.get_body(handle) is None
+        assert bodies[4].mass == 5.3
+
+        # stale or foreign bodies are ignored
+        dut.remove_body(bodies[1])
+        dut.remove_body(Body())
+        assert len(dut._body_list) == 4
+        assert dut.create_body().id != handle
 
     def test_remove_joint(self):
-        assert 1
+        dut, bodies = self.build_world()
+        prim: DistanceJointPrimitive = DistanceJointPrimitive()
+        prim._bodya = bodies[0]
+        joints = [dut.create_joint(prim) for i in range(3)]
+        assert dut.get_joint(joints[2].id) is joints[2]
+
+        dut.remove_joint(joints[0])
+        dut.remove_joint(joints[0])
+        assert dut._joint_list == [joints[2], joints[1]]
+        assert dut.get_joint(joints[0].id) is None
+
+        dut.clear_all_joints()
+        assert len(dut._joint_list) == 0
 
     def test_clear_all_bodies(self):
         assert 1
@@ -0,0 +1,99 @@
+import json
+
+import numpy as np
+
+from TaichiGAME.common.config import Config
+from TaichiGAME.common.profiler import Profiler, Stat
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Edge, Rectangle
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.phy_world import PhysicsWorld
+
+
+class TestProfiler():
+    def setup_method(self):
+        Profiler.reset()
+
+    def teardown_method(self):
+        Profiler.enable(False)
+        Profiler.reset()
+
+    def build(self) -> PhysicsWorld:
+        world: PhysicsWorld = PhysicsWorld()
+        world.grav = Vec2(0.0, -9.8)
+        edg: Edge = Edge()
+        edg.set_value(Vec2(-10.0, 0.0), Vec2(10.0, 0.0))
+        shapes = [(edg, Vec2(0.0, 0.0), Config.Max, Body.Type.Static),
+                  (Rectangle(1.0, 1.0), Vec2(0.0,
+                                             0.49), 1.0, Body.Type.Dynamic)]
+        for shape, pos, mass, body_type in shapes:
+            bd: Body = world.create_body()
+            bd.shape = shape
+            bd.pos = pos
+            bd.mass = mass
+            bd.type = body_type
+            world.dbvt.insert(bd)
+
+        return world
+
+    def test_stat(self):
+        dut: Stat = Stat(2)
+        assert dut.mean == 0.0 and dut.rolling_mean == 0.0
+        for val in (3.0, 1.0, 2.0):
+            dut.add(val)
+
+        assert dut.calls == 3
+        assert dut.total == 6.0
+        assert dut.last == 2.0
+        assert dut.min == 1.0 and dut.max == 3.0
+        assert dut.mean == 2.0
+        assert dut.rolling_mean == 1.5
+        assert dut.rolling_max == 2.0
+        assert dut.to_dict(1e3)['max'] == 3e3
+
+    def test_disabled(self):
+        world: PhysicsWorld = self.build()
+        assert Profiler.tic() == 0.0
+        for i in range(3):
+            world.step(1 / 120)
+
+        Profiler.count('pairs')
+        Profiler.end_frame()
+        assert Profiler.report() == {'frames': 0, 'stages': {}, 'counters': {}}
+
+    def test_step(self, tmp_path):
+        world: PhysicsWorld = self.build()
+        Profiler.enable()
+        for i in range(5):
+            world.step(1 / 120)
+
+        assert Profiler.frames == 5
+        for name in ('broadphase_update', 'integrate_velocity',
+                     'pair_generation', 'narrowphase', 'contact_prepare',
+                     'velocity_iterations', 'integrate_position',
+                     'position_iterations', 'sleep_update', 'step'):
+            assert Profiler.stage(name).calls == 5
+
+        step_time: float = Profiler.stage('step').total
+        assert 0.0 < Profiler.stage('narrowphase').total < step_time
+
+        for name in ('pairs', 'tested_pairs', 'colliding_pairs',
+                     'contact_points', 'gjk_iterations'):
+            assert Profiler.counter(name).calls == 5
+            assert Profiler.counter(name).last > 0
+
+        assert Profiler.counter('colliding_pairs').last == 1
+        assert Profiler.counter('contact_points').last == 2
+
+        # move the box far away to reinsert it into the dbvt
+        world._body_list[1].pos = Vec2(100.0, 100.0)
+        world.step(1 / 120)
+        assert Profiler.counter('dbvt_reinsertions').last == 1
+        assert Profiler.counter('colliding_pairs').last == 0
+
+        path = tmp_path / 'profile.json'
+        res = json.loads(Profiler.dump_json(str(path)))
+        assert res == json.loads(path.read_text())
+        assert res['frames'] == 6
+        assert np.isclose(res['stages']['step']['total'],
+                          step_time * 1e3 + res['stages']['step']['last'])
@@ -0,0 +1,203 @@
+import random
+from typing import List, Set, Tuple
+
+import numpy as np
+
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Circle, Edge, Rectangle
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.collision.broad_phase.aabb import AABB, aabb_bounds, ray_bounds
+from TaichiGAME.collision.broad_phase.sap import SweepAndPrune
+
+
+class TestSweepAndPrune():
+    @staticmethod
+    def build_bodies(num: int, seed: int = 0) -> List[Body]:
+        rng: random.Random = random.Random(seed)
+        shapes = [Circle(0.3), Rectangle(0.5, 0.3), Circle(0.15)]
+        bodies: List[Body] = []
+        for i in range(num):
+            bd: Body = Body()
+            bd.shape = shapes[i % len(shapes)]
+            bd.pos = Vec2(rng.uniform(-6.0, 6.0), rng.uniform(-6.0, 6.0))
+            bd.rot = rng.uniform(0.0, np.pi)
+            bd.bitmask = 1 if i % 7 else 2
+            bodies.append(bd)
+
+        edg: Edge = Edge()
+        edg.set_value(Vec2(-20.0, 0.0), Vec2(20.0, 0.0))
+        grd: Body = Body()
+        grd.shape = edg
+        grd.bitmask = 3
+        bodies.append(grd)
+        return bodies
+
+    @staticmethod
+    def brute_pairs(bodies: List[Body]) -> Set[Tuple[Body, Body]]:
+        res: Set[Tuple[Body, Body]] = set()
+        aabbs: List[AABB] = [AABB.from_body(bd) for bd in bodies]
+        for i in range(len(bodies)):
+            for j in range(i + 1, len(bodies)):
+                if bodies[i].bitmask & bodies[j].bitmask and aabbs[i].collide(
+                        aabbs[j]):
+                    res.add(TestSweepAndPrune.key(bodies[i], bodies[j]))
+
+        return res
+
+    @staticmethod
+    def key(a: Body, b: Body) -> Tuple[Body, Body]:
+        return (a, b) if id(a) < id(b) else (b, a)
+
+    @staticmethod
+    def keys(pairs: List[Tuple[Body, Body]]) -> List[Tuple[Body, Body]]:
+        return [TestSweepAndPrune.key(a, b) for a, b in pairs]
+
+    def test__init__(self):
+        dut: SweepAndPrune = SweepAndPrune()
+        assert dut.generate() == []
+        assert dut.added_pairs == []
+        assert dut.removed_pairs == []
+
+    def test_generate(self):
+        bodies: List[Body] = TestSweepAndPrune.build_bodies(300)
+        dut: SweepAndPrune = SweepAndPrune()
+        for bd in bodies:
+            dut.insert(bd)
+
+        pairs: List[Tuple[Body, Body]] = TestSweepAndPrune.keys(dut.generate())
+        ref: Set[Tuple[Body, Body]] = TestSweepAndPrune.brute_pairs(bodies)
+        assert len(pairs) == len(set(pairs))
+        assert set(pairs) == ref
+        assert set(TestSweepAndPrune.keys(dut.added_pairs)) == ref
+
+        # NOTE: move the bodies a little, the ends are sorted again
+        rng: random.Random = random.Random(1)
+        for i in range(5):
+            old: Set[Tuple[Body, Body]] = ref
+            for bd in bodies[:-1]:
+                bd.pos = bd.pos + Vec2(rng.uniform(-0.2, 0.2),
+                                       rng.uniform(-0.2, 0.2))
+                dut.update(bd)
+
+            pairs = TestSweepAndPrune.keys(dut.generate())
+            ref = TestSweepAndPrune.brute_pairs(bodies)
+            assert len(pairs) == len(set(pairs))
+            assert set(pairs) == ref
+            added: List[Tuple[Body,
+                              Body]] = TestSweepAndPrune.keys(dut.added_pairs)
+            removed: List[Tuple[Body, Body]] = TestSweepAndPrune.keys(
+                dut.removed_pairs)
+            assert len(added) == len(set(added))
+            assert set(added) == ref - old
+            assert set(removed) == old - ref
+
+    def test_insert_remove(self):
+        bodies: List[Body] = TestSweepAndPrune.build_bodies(200)
+        dut: SweepAndPrune = SweepAndPrune()
+        for bd in bodies:
+            dut.insert(bd)
+        old: Set[Tuple[Body,
+                       Body]] = set(TestSweepAndPrune.keys(dut.generate()))
+
+        # NOTE: a few inserts go by the insertion sort, the removed
+        # bodies reuse their proxies
+        more: List[Body] = TestSweepAndPrune.build_bodies(10, 1)[:-1]
+        for bd in bodies[:5]:
+            dut.remove(bd)
+        for bd in more:
+            dut.insert(bd)
+        assert dut._new * 4 <= len(dut._proxy)
+
+        bodies = bodies[5:] + more
+        ref: Set[Tuple[Body, Body]] = TestSweepAndPrune.brute_pairs(bodies)
+        assert set(TestSweepAndPrune.keys(dut.generate())) == ref
+        assert set(TestSweepAndPrune.keys(dut.added_pairs)) == ref - old
+        assert set(TestSweepAndPrune.keys(dut.removed_pairs)) == old - ref
+        assert all(len(ends) == len(bodies) * 2 for ends in dut._ends)
+
+        dut.clear_all()
+        assert dut.generate() == []
+        assert len(dut._ends[0]) == 0
+
+    def test_touching(self):
+        dut: SweepAndPrune = SweepAndPrune()
+        bd1: Body = Body()
+        bd1.shape = Rectangle(1.0, 1.0)
+        bd1.pos = Vec2(0.0, 0.0)
+        bd2: Body = Body()
+        bd2.shape = Rectangle(1.0, 1.0)
+        bd2.pos = Vec2(2.0, 0.0)
+        dut.insert(bd1)
+        dut.insert(bd2)
+        assert dut.generate() == []
+
+        # NOTE: the touching aabbs overlap, as by `AABB.collide`
+        bd2.pos = Vec2(1.0, 0.0)
+        dut.update(bd2)
+        assert dut.generate() == [(bd1, bd2)]
+        assert dut.added_pairs == [(bd1, bd2)]
+
+        bd2.pos = Vec2(3.0, 0.0)
+        dut.update(bd2)
+        assert dut.generate() == []
+        assert dut.removed_pairs == [(bd1, bd2)]
+
+    def test_query_raycast(self):
+        bodies: List[Body] = TestSweepAndPrune.build_bodies(100)
+        dut: SweepAndPrune = SweepAndPrune()
+        for bd in bodies:
+            dut.insert(bd)
+
+        box: AABB = AABB(3.0, 2.0)
+        box.pos = Vec2(1.0, -0.5)
+        assert set(dut.query(box)) == {
+            bd
+            for bd in bodies if AABB.from_body(bd).collide(box)
+        }
+        assert bodies[-1] in dut.raycast(Vec2(0.0, 5.0), Vec2(0.0, -1.0))
+        assert bodies[-1] not in dut.raycast(Vec2(0.0, 5.0), Vec2(0.0, 1.0))
+
+        # NOTE: the queries sort the moved and the removed ends first
+        rng: random.Random = random.Random(2)
+        for bd in bodies[:50]:
+            bd.pos = bd.pos + Vec2(rng.uniform(-1.0, 1.0), 0.0)
+            dut.update(bd)
+        for bd in bodies[50:60]:
+            dut.remove(bd)
+        bodies = bodies[:50] + bodies[60:]
+        for i in range(20):
+            box = AABB(rng.uniform(0.0, 4.0), rng.uniform(0.0, 4.0))
+            box.pos = Vec2(rng.uniform(-7.0, 7.0), rng.uniform(-7.0, 7.0))
+            assert sorted(map(id, dut.query(box))) == sorted(
+                id(bd) for bd in bodies if AABB.from_body(bd).collide(box))
+
+            start: Vec2 = Vec2(rng.uniform(-7.0, 7.0), rng.uniform(-7.0, 7.0))
+            dirn: Vec2 = [
+                Vec2(rng.uniform(-1.0, 1.0), rng.uniform(-1.0, 1.0)),
+                Vec2(0.0, rng.uniform(-1.0, 1.0)),
+                Vec2(0.0, 0.0)
+            ][i % 3]
+            assert sorted(map(id, dut.raycast(start, dirn))) == sorted(
+                id(bd) for bd in bodies
+                if ray_bounds(start.x, start.y, dirn.x, dirn.y,
+                              aabb_bounds(AABB.from_body(bd))) is not None)
+
+    def test_remove_pairs(self):
+        bodies: List[Body] = TestSweepAndPrune.build_bodies(100)
+        dut: SweepAndPrune = SweepAndPrune()
+        for bd in bodies:
+            dut.insert(bd)
+        old: Set[Tuple[Body,
+                       Body]] = set(TestSweepAndPrune.keys(dut.generate()))
+
+        # NOTE: the pairs of the removed bodies go by their links
+        dut.remove(bodies[-1])
+        dut.remove(bodies[0])
+        ref: Set[Tuple[Body,
+                       Body]] = TestSweepAndPrune.brute_pairs(bodies[1:-1])
+        assert set(TestSweepAndPrune.keys(dut.generate())) == ref
+        assert set(TestSweepAndPrune.keys(dut.removed_pairs)) == old - ref
+        assert all(
+            all(proxy in key for key in links)
+            for proxy, links in enumerate(dut._links))
+        assert sum(len(links) for links in dut._links) == len(dut._pairs) * 2
@@ -0,0 +1,166 @@
+import numpy as np
+
+from TaichiGAME.common.config import Config
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Circle, Edge, Rectangle
+from TaichiGAME.collision.broad_phase.dbvt import DBVT
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.constraint.contact import ContactMaintainer
+from TaichiGAME.dynamics.joint.distance import DistanceJointPrimitive
+from TaichiGAME.dynamics.joint.point import PointJointPrimitive
+from TaichiGAME.dynamics.phy_world import PhysicsWorld
+
+
+class TestSleep():
+    def setup_method(self):
+        self.world: PhysicsWorld = PhysicsWorld()
+        self.world.grav = Vec2(0.0, -9.8)
+        self.world.vel_iter = 6
+        self.world.pos_iter = 8
+        self.world.sleep_time_thold = 0.2
+        self.dbvt: DBVT = self.world.dbvt
+        self.maintainer: ContactMaintainer = self.world.maintainer
+        self.dt: float = 1 / 120
+
+        edg: Edge = Edge()
+        edg.set_value(Vec2(-10.0, 0.0), Vec2(10.0, 0.0))
+        self.ground: Body = self.add_body(edg, Vec2(0.0, 0.0), Config.Max,
+                                          Body.Type.Static)
+
+    def add_body(self, shape, pos: Vec2, mass: float,
+                 body_type: Body.Type) -> Body:
+        bd: Body = self.world.create_body()
+        bd.shape = shape
+        bd.pos = pos
+        bd.mass = mass
+        bd.type = body_type
+        self.dbvt.insert(bd)
+        return bd
+
+    def step(self, num: int = 1) -> None:
+        for i in range(num):
+            self.world.step(self.dt)
+
+    def settle(self, bodies) -> None:
+        for i in range(600):
+            self.step()
+            if all(bd.sleep for bd in bodies):
+                return
+
+    def test_free_body_sleep(self):
+        bd: Body = self.add_body(Circle(0.5), Vec2(0.0, 5.0), 1.0,
+                                 Body.Type.Dynamic)
+        self.world.grav_ena = False
+        self.step(int(0.2 / self.dt) + 2)
+        assert bd.sleep
+        assert not self.ground.sleep
+
+        pos: Vec2 = bd.pos
+        self.world.grav_ena = True
+        self.step(10)
+        assert bd.pos == pos
+
+    def test_island_sleep(self):
+        rect: Rectangle = Rectangle(1.0, 1.0)
+        bda: Body = self.add_body(rect, Vec2(0.0, 0.5), 1.0, Body.Type.Dynamic)
+        bdb: Body = self.add_body(rect, Vec2(0.0, 1.5), 1.0, Body.Type.Dynamic)
+        self.settle([bda, bdb])
+        assert bda.sleep and bdb.sleep
+        assert bda.vel.is_origin()
+        assert np.isclose(bda.ang_vel, 0.0)
+
+        islands = self.world.island_builder.islands
+        assert len(islands) == 1
+        assert set(islands[0].bodies) == {bda, bdb}
+        # the ground contact belongs to the island of the box
+        assert len(islands[0].contacts) == 2
+
+        # the contacts of the sleeping island are kept
+        table_len: int = len(self.maintainer._contact_table)
+        pos: Vec2 = bdb.pos
+        self.step(10)
+        assert len(self.maintainer._contact_table) == table_len
+        assert bdb.pos == pos
+
+    def test_wake_by_impulse(self):
+        rect: Rectangle = Rectangle(1.0, 1.0)
+        bda: Body = self.add_body(rect, Vec2(0.0, 0.5), 1.0, Body.Type.Dynamic)
+        bdb: Body = self.add_body(rect, Vec2(0.0, 1.5), 1.0, Body.Type.Dynamic)
+        self.settle([bda, bdb])
+        assert bda.sleep and bdb.sleep
+
+        bdb.apply_impulse(Vec2(0.0, 5.0), Vec2(0.0, 0.0))
+        assert not bdb.sleep
+        assert bda.sleep
+        self.step()
+        # the whole island wakes
+        assert not bda.sleep
+        assert bdb.pos.y > 1.5
+
+    def test_wake_by_contact(self):
+        rect: Rectangle = Rectangle(1.0, 1.0)
+        bda: Body = self.add_body(rect, Vec2(0.0, 0.5), 1.0, Body.Type.Dynamic)
+        self.settle([bda])
+        assert bda.sleep
+
+        bdb: Body = self.add_body(Circle(0.5), Vec2(0.0, 2.0), 1.0,
+                                  Body.Type.Dynamic)
+        bdb.vel = Vec2(0.0, -5.0)
+        for i in range(30):
+            self.step()
+            if not bda.sleep:
+                break
+
+        assert not bda.sleep
+
+    def test_wake_by_joint(self):
+        bd: Body = self.add_body(Circle(0.5), Vec2(0.0, 0.5), 1.0,
+                                 Body.Type.Dynamic)
+        self.settle([bd])
+        assert bd.sleep
+
+        prim: DistanceJointPrimitive = DistanceJointPrimitive()
+        prim._bodya = bd
+        self.world.create_joint(prim)
+        assert not bd.sleep
+
+    def test_wake_by_mouse_joint(self):
+        # NOTE: the mouse joint of the scene is created inactive, then
+        # attached to the selected body and moved by the mouse
+        bd: Body = self.add_body(Rectangle(1.0, 1.0), Vec2(0.0, 0.5), 1.0,
+                                 Body.Type.Dynamic)
+        mouse_prim: PointJointPrimitive = PointJointPrimitive()
+        mouse_prim._bodya = Body()
+        joint = self.world.create_joint(mouse_prim)
+        joint.active = False
+        self.settle([bd])
+        assert bd.sleep
+
+        prim: PointJointPrimitive = joint.prim()
+        prim._bodya = bd
+        joint.set_value(prim)
+        assert bd.sleep
+
+        prim._local_pointa = bd.to_local_point(bd.pos)
+        prim._target_point = bd.pos
+        joint.active = True
+        joint.set_value(prim)
+        assert not bd.sleep
+
+        self.settle([bd])
+        assert bd.sleep
+        prim._target_point = Vec2(0.0, 3.0)
+        joint.set_value(prim)
+        self.step(60)
+        assert bd.pos.y > 1.5
+
+    def test_sleep_disable(self):
+        bd: Body = self.add_body(Circle(0.5), Vec2(0.0, 0.5), 1.0,
+                                 Body.Type.Dynamic)
+        self.settle([bd])
+        assert bd.sleep
+
+        self.world.sleep_ena = False
+        assert not bd.sleep
+        self.step(60)
+        assert not bd.sleep
@@ -0,0 +1,135 @@
+import numpy as np
+
+from TaichiGAME.common.config import Config
+from TaichiGAME.math.linalg import Vec2
+from TaichiGAME.geometry.shape import Circle, Edge, Rectangle
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.joint.revolute import RevoluteJointPrimitive
+from TaichiGAME.dynamics.phy_world import PhysicsWorld
+from TaichiGAME.dynamics.snapshot import WorldSnapshot
+
+
+class TestSnapshot():
+    def setup_method(self):
+        self.dt: float = 1 / 120
+
+        self.world: PhysicsWorld = PhysicsWorld()
+        self.world.grav = Vec2(0.0, -9.8)
+        self.world.vel_iter = 4
+        self.world.pos_iter = 4
+
+        edg: Edge = Edge()
+        edg.set_value(Vec2(-10.0, 0.0), Vec2(10.0, 0.0))
+        rect: Rectangle = Rectangle(1.0, 1.0)
+        self.add_body(edg, Vec2(0.0, 0.0), Config.Max, Body.Type.Static)
+        bda: Body = self.add_body(rect, Vec2(0.0, 0.5), 1.0, Body.Type.Dynamic)
+        bdb: Body = self.add_body(rect, Vec2(0.2, 1.5), 1.0, Body.Type.Dynamic)
+        self.add_body(Circle(0.5), Vec2(3.0, 2.0), 1.0, Body.Type.Dynamic)
+
+        prim: RevoluteJointPrimitive = RevoluteJointPrimitive()
+        prim._bodya = bda
+        prim._bodyb = bdb
+        prim._local_pointa = Vec2(0.5, 0.5)
+        prim._local_pointb = Vec2(0.3, -0.5)
+        self.world.create_joint(prim)
+
+    def add_body(self, shape, pos: Vec2, mass: float,
+                 body_type: Body.Type) -> Body:
+        bd: Body = self.world.create_body()
+        bd.shape = shape
+        bd.pos = pos
+        bd.mass = mass
+        bd.type = body_type
+        self.world.dbvt.insert(bd)
+        return bd
+
+    def step(self, num: int) -> None:
+        for i in range(num):
+            self.world.step(self.dt)
+
+    def state(self) -> np.ndarray:
+        store = self.world.store
+        return np.hstack(
+            (store.pos, store.vel, store.rot[:, None], store.ang_vel[:, None]))
+
+    def impulses(self):
+        return [(key, ccp._vcp._accum_normal_impulse,
+                 ccp._vcp._accum_tangent_impulse)
+                for key, val in self.world.maintainer._contact_table.items()
+                for ccp in val]
+
+    def test_rollback(self):
+        self.step(20)
+        snap: WorldSnapshot = self.world.snapshot()
+        assert snap.body_num == 4
+        assert snap.nbytes() > 0
+        impulses = self.impulses()
+        assert len(impulses) > 0
+
+        self.step(30)
+        ref: np.ndarray = self.state()
+        ref_impulses = self.impulses()
+
+        # restore the same snapshot twice, like a branching search
+        for i in range(2):
+            self.world.restore(snap)
+            assert self.impulses() == impulses
+            self.step(30)
+            assert (self.state() == ref).all()
+            assert self.impulses() == ref_impulses
+
+    def test_joint(self):
+        self.step(20)
+        joint = self.world._joint_list[0]
+        impulse = joint.accum_impulse()
+        snap: WorldSnapshot = self.world.snapshot()
+        self.step(5)
+        assert joint.accum_impulse() != impulse
+
+        self.world.restore(snap)
+        assert joint.accum_impulse() == impulse
+
+    def test_membership(self):
+        self.step(10)
+        bodies = list(self.world._body_list)
+        snap: WorldSnapshot = self.world.snapshot()
+        ref: np.ndarray = self.state()
+
+        removed: Body = bodies[1]
+        self.world.remove_body(removed)
+        added: Body = self.add_body(Circle(0.2), Vec2(-3.0, 1.0), 1.0,
+                                    Body.Type.Dynamic)
+        self.step(5)
+
+        self.world.restore(snap)
+        assert self.world._body_list == bodies
+        assert self.world.store.bodies == bodies
+        assert [bd.idx for bd in bodies] == [0, 1, 2, 3]
+        assert removed.mass == 1.0 and removed.pos == Vec2(*ref[1, :2])
+        assert (self.state() == ref).all()
+        assert added.store is not self.world.store
+        # the added body took the slot of the removed one
+        assert added.id != removed.id
+        assert self.world.get_body(removed.id) is removed
+        assert self.world.get_body(added.id) is None
+
+        dbvt = self.world.dbvt
+        assert removed in dbvt._body_table
+        assert added not in dbvt._body_table
+        self.step(5)
+        assert self.world.store.size == 4
+
+    def test_contacts(self):
+        # NOTE: the contacts are copied, not shared, and rebuilt when
+        # the table lost them
+        self.step(20)
+        snap: WorldSnapshot = self.world.snapshot()
+        impulses = self.impulses()
+        self.step(30)
+        ref: np.ndarray = self.state()
+
+        self.world.maintainer.clear_all()
+        self.world.restore(snap)
+        assert self.impulses() == impulses
+        self.step(30)
+        assert (self.state() == ref).all()
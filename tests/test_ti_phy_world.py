@@ -0,0 +1,420 @@
+import numpy as np
+import pytest
+import taichi as ti
+
+from TaichiGAME.common.config import Config
+from TaichiGAME.collision.detector import Detector
+from TaichiGAME.common.profiler import Profiler
+from TaichiGAME.geometry.shape import Capsule, Circle, Edge, Polygon, Rectangle
+from TaichiGAME.geometry.shape import Ellipse
+from TaichiGAME.geometry.shape import Shape
+from TaichiGAME.dynamics.body import Body
+from TaichiGAME.dynamics.body_store import BodyStore
+from TaichiGAME.dynamics.ti_phy_world import PhysicsWorld
+from TaichiGAME.math.linalg import Vec2
+
+
+def support(shape: Shape, rot: float, axis: np.ndarray) -> float:
+    if isinstance(shape, Circle):
+        return shape.radius
+
+    c, s = np.cos(rot), np.sin(rot)
+    return max((c * v.x - s * v.y) * axis[0] + (s * v.x + c * v.y) * axis[1]
+               for v in shape.vertices)
+
+
+class TestTiPhysicsWorld():
+    def setup_class(self):
+        ti.init(arch=ti.cpu)
+
+    def teardown_method(self):
+        Profiler.enable(False)
+        Profiler.reset()
+
+    def build(self, shapes, body_len: int = 16) -> PhysicsWorld:
+        dut: PhysicsWorld = PhysicsWorld(body_len)
+        dut.grav = ti.Vector([0.0, -9.8])
+        edg: Edge = Edge()
+        edg.set_value(Vec2(-20.0, 0.0), Vec2(20.0, 0.0))
+        grd: Body = dut.create_body()
+        grd.shape = edg
+        grd.mass = Config.Max
+        grd.type = Body.Type.Static
+
+        for shape, pos, rot in shapes:
+            bd: Body = dut.create_body()
+            bd.shape = shape
+            bd.pos = pos
+            bd.rot = rot
+            bd.mass = 1.0
+            bd.type = Body.Type.Dynamic
+
+        dut.init_data()
+        return dut
+
+    def test_init_data(self):
+        # NOTE: a cw triangle is stored in ccw order
+        tri: Polygon = Polygon()
+        tri.vertices = [
+            Vec2(0.0, 1.0),
+            Vec2(1.0, -1.0),
+            Vec2(-1.0, -1.0),
+            Vec2(0.0, 1.0)
+        ]
+        dut: PhysicsWorld = self.build([(tri, Vec2(1.0, 2.0), 0.5),
+                                        (Capsule(0.5, 1.5), Vec2(3.0,
+                                                                 4.0), 0.0)])
+        bd: Body = dut._body_list[1]
+        assert dut.body_num == 3
+        assert np.allclose(dut._pos[1], (1.0, 2.0))
+        assert np.isclose(dut._rot[1], 0.5)
+        assert np.isclose(dut._inv_mass[1], bd.inv_mass)
+        assert np.isclose(dut._inv_inertia[1], bd.inv_inertia)
+        assert dut._inv_mass[0] == 0.0
+        assert dut._phy_type[0] == Body.Type.Static
+        # the cores are packed into the vertex pool after the ground
+        assert dut._shape_type[1] == 3
+        assert dut._vert_off[1] == 2
+        assert dut._vert_num[1] == 3
+        assert dut._vert_cnt == 7
+        # the vertices are centered by the polygon
+        assert np.allclose(dut._vert.to_numpy()[2:5], [(-1.0, -2.0 / 3.0),
+                                                       (1.0, -2.0 / 3.0),
+                                                       (0.0, 4.0 / 3.0)])
+        assert np.allclose(dut._norm[2], (0.0, -1.0))
+
+        assert dut._shape_type[2] == 4
+        assert np.isclose(dut._radius[2], 0.25)
+        assert dut._vert_off[2] == 5
+        assert np.allclose(dut._vert.to_numpy()[5:7], [(0.0, -0.5),
+                                                       (0.0, 0.5)])
+        assert np.isclose(dut._cap_height[2], 1.5)
+
+        # the state is written back to the bodies
+        dut._vel[1] = (1.0, -2.0)
+        dut.sync_bodies()
+        assert bd.vel == Vec2(1.0, -2.0)
+        assert np.isclose(bd.rot, 0.5)
+
+    def test_rest(self):
+        tri: Polygon = Polygon()
+        tri.vertices = [
+            Vec2(-1.0, 1.0),
+            Vec2(0.0, -2.0),
+            Vec2(1.0, -1.0),
+            Vec2(-1.0, 1.0)
+        ]
+        tri.update_vertices()
+        # NOTE: a stack, a tilted box and a circle on a capsule
+        dut: PhysicsWorld = self.build([
+            (Rectangle(1.0, 1.0), Vec2(0.0, 0.5), 0.0),
+            (Rectangle(1.0, 1.0), Vec2(0.0, 1.5), 0.0),
+            (Rectangle(1.0, 1.0), Vec2(-4.0, 2.0), 0.3),
+            (Capsule(1.5, 0.5), Vec2(4.0, 2.0), 0.0),
+            (Circle(0.3), Vec2(4.2, 3.5), 0.0),
+            (tri, Vec2(-8.0, 3.0), 0.0),
+        ])
+        for i in range(720):
+            dut.step(1 / 120)
+
+        dut.sync_bodies()
+        bodies = dut._body_list[1:]
+        heights = (0.5, 1.5, 0.5, 0.25, 0.8, 4.0 / 3.0)
+        for body, height in zip(bodies, heights):
+            assert np.isclose(body.pos.y, height, atol=0.02)
+            assert body.vel.len() < 0.01
+
+        assert np.isclose(bodies[0].pos.x, 0.0, atol=1e-3)
+        assert np.isclose(bodies[1].pos.x, 0.0, atol=1e-3)
+        # the tilted box falls flat
+        assert np.isclose(np.cos(4.0 * bodies[2].rot), 1.0, atol=1e-3)
+
+        # the pairs are sorted by the body index
+        pairs = dut._pair.to_numpy()[:dut.pair_num]
+        keys = pairs[:, 0] * 16 + pairs[:, 1]
+        assert (pairs[:, 0] < pairs[:, 1]).all()
+        assert (np.diff(keys) > 0).all()
+        assert dut.pair_num == 6
+
+    def test_profile(self):
+        dut: PhysicsWorld = self.build([(Circle(0.5), Vec2(0.0, 0.45), 0.0)])
+        Profiler.enable()
+        for i in range(3):
+            dut.step(1 / 120)
+
+        for name in ('integrate_velocity', 'broadphase_update',
+                     'pair_generation', 'narrowphase', 'contact_prepare',
+                     'velocity_iterations', 'integrate_position',
+                     'position_iterations', 'step'):
+            assert Profiler.stage(name).calls == 3
+
+        assert Profiler.counter('pairs').last == 1
+        assert Profiler.counter('contact_points').last == 1
+
+    def test_grow(self):
+        boxes = [(Rectangle(1.0, 1.0), Vec2(0.0, 0.5 + i), 0.0)
+                 for i in range(3)]
+        dut: PhysicsWorld = self.build(boxes, 2)
+        assert dut._body_len == 4
+        assert dut._pair_len == 8
+        for i in range(60):
+            dut.step(1 / 120)
+
+        # the new bodies are appended, the state of the old ones is kept
+        top: float = dut._pos[3].y
+        for i in range(8):
+            bd: Body = dut.create_body()
+            bd.shape = Circle(0.5)
+            bd.pos = Vec2(-18.0 + 2.0 * i, 0.5)
+            bd.mass = 1.0
+            bd.type = Body.Type.Dynamic
+
+        dut.init_data()
+        assert dut._body_len == 12
+        assert dut._pos[3].y == top
+        assert dut._pair_len == 8
+
+        for i in range(240):
+            dut.step(1 / 120)
+
+        assert dut.pair_num == 11
+        assert dut._pair_len == 16
+        dut.sync_bodies()
+        for body in dut._body_list[1:]:
+            assert body.vel.len() < 0.01
+        assert np.isclose(dut._body_list[3].pos.y, 2.5, atol=0.02)
+
+    def test_dirty(self):
+        dut: PhysicsWorld = self.build([(Circle(0.5), Vec2(0.0, 0.5), 0.0),
+                                        (Circle(0.5), Vec2(5.0, 0.5), 0.0)])
+        assert (dut.store.dirty == 0).all()
+        for i in range(10):
+            dut.step(1 / 120)
+
+        # only the set values of the setters are uploaded
+        bd: Body = dut._body_list[2]
+        bd.pos = Vec2(10.0, 3.0)
+        bd.fric = 0.5
+        assert dut.store.dirty[2] == (BodyStore.DirtyPos
+                                      | BodyStore.DirtyParams)
+        assert (dut.store.dirty[:2] == 0).all()
+        dut._vel[2] = (1.0, 0.0)
+        dut.init_data()
+        assert (dut.store.dirty == 0).all()
+        assert np.allclose(dut._pos[2], (10.0, 3.0))
+        assert np.allclose(dut._vel[2], (1.0, 0.0))
+        assert np.isclose(dut._fric[2], 0.5)
+        assert np.allclose(dut._cirpos[2], (10.0, 3.0))
+
+        # only the asked fields are downloaded, the dirty values are kept
+        dut.step(1 / 120)
+        dut._body_list[1].pos = Vec2(-5.0, 0.5)
+        dut.sync_bodies(('pos', ))
+        assert bd.pos.x > 10.0
+        assert bd.vel == Vec2(0.0, 0.0)
+        assert dut._body_list[1].pos == Vec2(-5.0, 0.5)
+        assert dut.store.dirty[1] == BodyStore.DirtyPos
+
+        dut.step(1 / 120)
+        assert np.allclose(dut._pos[1], (-5.0, 0.5), atol=1e-3)
+
+    def test_vert_pool(self):
+        # NOTE: a decagon, more vertices than the old fixed slots
+        ring: Polygon = Polygon()
+        ring.vertices = [
+            Vec2(np.cos(k * np.pi / 5.0), np.sin(k * np.pi / 5.0))
+            for k in range(11)
+        ]
+        dut: PhysicsWorld = self.build([(ring, Vec2(0.0, 3.0), 0.0),
+                                        (Circle(0.5), Vec2(5.0, 0.5), 0.0)])
+        assert dut._vert_num[1] == 10
+        assert dut._vert_cnt == 13
+        for i in range(240):
+            dut.step(1 / 120)
+
+        dut.sync_bodies()
+        assert dut._body_list[1].vel.len() < 0.01
+        assert np.isclose(dut._body_list[1].pos.y,
+                          np.cos(np.pi / 10.0),
+                          atol=0.02)
+
+        # a smaller shape reuses the range, a larger one is appended
+        # and the unused rows are cleared
+        dut._body_list[1].shape = Rectangle(1.0, 1.0)
+        dut._body_list[2].shape = Rectangle(1.0, 1.0)
+        dut.init_data()
+        assert dut._vert_off[1] == 2
+        assert dut._vert_num[1] == 4
+        assert dut._vert_off[2] == 13
+        assert dut._vert_cnt == 17
+        vert = dut._vert.to_numpy()
+        assert not vert[6:13].any()
+        assert np.allclose(vert[13:17], vert[2:6])
+
+    def test_unsupported_shape(self):
+        # NOTE: the shapes without the core vertices fail on the upload
+        # of the body
+        with pytest.raises(ValueError, match='Ellipse'):
+            self.build([(Ellipse(2.0, 1.0), Vec2(0.0, 3.0), 0.0)])
+
+    def test_grid(self):
+        rng = np.random.default_rng(3)
+        shapes = [(Circle(r), Vec2(x, y), 0.0) for r, x, y in zip(
+            rng.uniform(0.1, 0.6, 300), rng.uniform(-15.0, 15.0, 300),
+            rng.uniform(-1.0, 12.0, 300))]
+        shapes.append((Rectangle(6.0, 0.5), Vec2(3.0, 5.0), 0.0))
+        dut: PhysicsWorld = self.build(shapes, 64)
+        dut._update_geometry(dut._field_gen)
+        lower = dut._aabb_min.to_numpy()[:dut.body_num]
+        upper = dut._aabb_max.to_numpy()[:dut.body_num]
+        idx_a, idx_b = np.triu_indices(dut.body_num, 1)
+        hit = (lower[idx_a] <= upper[idx_b]).all(
+            axis=1) & (lower[idx_b] <= upper[idx_a]).all(axis=1)
+        expect = np.stack((idx_a[hit], idx_b[hit]), axis=1)
+
+        # the same sorted pairs as the brute force for any cell size
+        for cell_size in (0.0, 0.05, 1.0, 50.0):
+            dut.cell_size = cell_size
+            dut._find_pairs()
+            assert dut.pair_num == expect.shape[0]
+            assert (dut._pair.to_numpy()[:dut.pair_num] == expect).all()
+            if cell_size == 0.0:
+                # only the ground covers too many cells
+                assert dut._large_num[None] == 1
+
+    def test_detect(self):
+        rng = np.random.default_rng(5)
+
+        def rand_shape() -> Shape:
+            kind: int = rng.integers(3)
+            if kind == 0:
+                return Circle(rng.uniform(0.3, 1.0))
+            elif kind == 1:
+                return Rectangle(rng.uniform(0.5, 2.0), rng.uniform(0.5, 2.0))
+
+            num: int = rng.integers(3, 8)
+            rad: float = rng.uniform(0.4, 1.2)
+            poly: Polygon = Polygon()
+            poly.vertices = [
+                Vec2(rad * np.cos(2.0 * np.pi * i / num),
+                     rad * np.sin(2.0 * np.pi * i / num))
+                for i in range(num + 1)
+            ]
+            poly.update_vertices()
+            return poly
+
+        # NOTE: random pairs touching along a random axis, from 0.05
+        # apart to 0.1 overlapped along the axis, so the contacts are
+        # shallow and the faces are not ambiguous
+        shapes = []
+        for i in range(200):
+            sa: Shape = rand_shape()
+            sb: Shape = rand_shape()
+            ra, rb, ang = rng.uniform(-np.pi, np.pi, 3)
+            axis = np.array([np.cos(ang), np.sin(ang)])
+            dist: float = support(sa, ra, axis) + support(
+                sb, rb, -axis) - rng.uniform(-0.05, 0.1)
+            pa = np.array([10.0 * (i % 20) - 95.0, 10.0 * (i // 20) + 10.0])
+            pb = pa + axis * dist
+            shapes.append((sa, Vec2(pa[0], pa[1]), ra))
+            shapes.append((sb, Vec2(pb[0], pb[1]), rb))
+
+        dut: PhysicsWorld = self.build(shapes, 512)
+        dut.detect()
+        pair, num, normal, pen, point_a, point_b = dut.contacts()
+        rows = {(a, b): k for k, (a, b) in enumerate(pair)}
+        hits: int = 0
+        for i in range(200):
+            bodya: Body = dut._body_list[2 * i + 1]
+            bodyb: Body = dut._body_list[2 * i + 2]
+            res = Detector.detect(bodya, bodyb)
+            k: int = rows.get((2 * i + 1, 2 * i + 2), -1)
+            assert res._is_colliding == (k >= 0 and num[k] > 0)
+            if not res._is_colliding:
+                continue
+
+            hits += 1
+            # NOTE: the epa of the round shapes is approximated
+            tol: float = 1e-3
+            if isinstance(bodya.shape, Circle) or isinstance(
+                    bodyb.shape, Circle):
+                tol = 1e-2
+
+            assert np.allclose(normal[k], (res._normal.x, res._normal.y),
+                               atol=tol)
+            assert np.isclose(pen[k], res._penetration, atol=1e-3)
+            # NOTE: the detector keeps only the deepest point if the
+            # clipped points do not match the penetration
+            points = np.concatenate((point_a[k], point_b[k]), axis=1)[:num[k]]
+            assert num[k] >= len(res._contact_list)
+            if len(res._contact_list) == 2:
+                assert num[k] == 2
+            for elem in res._contact_list:
+                ref = (elem._pa.x, elem._pa.y, elem._pb.x, elem._pb.y)
+                assert np.isclose(points, ref, atol=1e-3).all(axis=1).any()
+
+        assert hits > 50
+
+    def test_solver(self):
+        # NOTE: a pile of circles and boxes
+        shapes = [(Circle(0.3),
+                   Vec2((i % 10) * 0.6 - 3.0, 0.3 + (i // 10) * 0.6), 0.0)
+                  for i in range(40)]
+        shapes += [(Rectangle(1.0, 1.0), Vec2(-6.0, 0.5 + i), 0.0)
+                   for i in range(4)]
+        res = []
+        for solver in PhysicsWorld.Solver:
+            dut: PhysicsWorld = self.build(shapes, 64)
+            dut.solver = solver
+            for i in range(240):
+                dut.step(1 / 120)
+
+            # the pairs of a color share no movable body
+            num: int = dut.pair_num
+            color = dut._pair_color.to_numpy()[:num]
+            pair = dut._pair.to_numpy()[:num]
+            contact = dut._contact_num.to_numpy()[:num] > 0
+            assert ((color >= 0) == contact).all()
+            for c in range(color.max() + 1):
+                bodies = pair[color == c].ravel()
+                bodies = bodies[bodies > 0]
+                assert len(np.unique(bodies)) == len(bodies)
+
+            starts = dut._color_start.to_numpy()
+            order = dut._color_order.to_numpy()[:starts[-1]]
+            assert (np.sort(order) == np.flatnonzero(contact)).all()
+            assert (color[order] == np.repeat(np.arange(PhysicsWorld.ColorMax),
+                                              np.diff(starts))).all()
+
+            dut.sync_bodies()
+            pos = np.array([(bd.pos.x, bd.pos.y) for bd in dut._body_list])
+            res.append(pos)
+            # the boxes are stacked at rest
+            assert np.allclose(pos[41:, 1], [0.5, 1.5, 2.5, 3.5], atol=0.03)
+            assert np.allclose(pos[41:, 0], -6.0, atol=1e-3)
+
+        # the colors are independent, solving them serially is the same
+        assert (res[0] == res[1]).all()
+
+    def test_warmup(self):
+        shapes = [(Rectangle(1.0, 1.0), Vec2(0.0, 0.5 + i), 0.0)
+                  for i in range(3)]
+        shapes.append((Circle(0.3), Vec2(3.0, 0.5), 0.0))
+        ref: PhysicsWorld = self.build(shapes)
+        dut: PhysicsWorld = self.build(shapes)
+        for i in range(30):
+            ref.step(1 / 120)
+            dut.step(1 / 120)
+
+        # the state and the warm start contacts are kept
+        pair_num: int = dut.pair_num
+        dut.warmup()
+        assert dut.body_num == 5
+        assert dut.pair_num == pair_num
+        assert dut._prev_pair_num[None] == pair_num
+        for i in range(30):
+            ref.step(1 / 120)
+            dut.step(1 / 120)
+
+        assert (dut._pos.to_numpy() == ref._pos.to_numpy()).all()
+        assert (dut._vel.to_numpy() == ref._vel.to_numpy()).all()
@@ -0,0 +1,21 @@
+import subprocess
+import sys
+
+
+class TestTiSetup():
+    def test_ti_init(self, tmp_path):
+        # NOTE: run in a new process, `ti.init` resets the fields of
+        # the other tests
+        code: str = (
+            'import taichi as ti\n'
+            'from taichi.lang import impl\n'
+            'import TaichiGAME as ng\n'
+            f'ng.Config.OfflineCacheDir = {str(tmp_path)!r}\n'
+            'ng.ti_init(arch=ti.cpu)\n'
+            'cfg = impl.default_cfg()\n'
+            f'assert cfg.offline_cache_file_path == {str(tmp_path)!r}\n'
+            'assert cfg.offline_cache\n'
+            'ng.ti_init(arch=ti.cpu, offline_cache=False)\n'
+            'assert not impl.default_cfg().offline_cache\n')
+        res = subprocess.run([sys.executable, '-c', code])
+        assert res.returncode == 0